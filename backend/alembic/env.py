@@ -23,10 +23,25 @@ if config.config_file_name is not None:
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
 from api.modules.users.models.User import User
+from api.modules.users.models.UserPhoto import UserPhoto
+from api.modules.users.models.UserAudit import UserAudit
+from api.modules.users.models.UserArchive import UserArchive
+from api.modules.users.models.UserPhotoArchive import UserPhotoArchive
+from api.modules.products.models.Product import Product
+from api.modules.products.models.StockAlert import StockAlert
+from api.modules.customers.models.Customer import Customer
+from api.modules.customers.models.CustomerPayment import CustomerPayment
+from api.modules.sales.models.Sale import Sale
+from api.modules.sales.models.SaleItem import SaleItem
+from api.modules.reports.models.SalesDaily import SalesDaily
+from api.modules.reports.models.ProductSalesDaily import ProductSalesDaily
+from api.modules.reports.models.ReportRollupState import ReportRollupState
+from api.modules.sync.models.SyncTombstone import SyncTombstone
 
 target_metadata = None
 
 from api.shared.database.connection import Base
+from api.shared.database.seller_partitions import SELLER_PARTITION_PATTERN
 
 DATABASE_URL = settings.DATABASE_URL
 config.set_main_option('sqlalchemy.url', DATABASE_URL)
@@ -35,6 +50,26 @@ config.set_main_option('sqlalchemy.url', SYNC_DATABASE_URL)
 
 target_metadata = Base.metadata
 
+# Partitions are created by migrations and at runtime, never declared as models.
+PARTITIONED_TABLES = tuple(f'{table.name}_' for table in target_metadata.tables.values()
+                           if table.dialect_options['postgresql'].get('partition_by'))
+
+def include_name(name, type_, parent_names):
+    """Skips the partitions of partitioned tables, and their indexes, when comparing."""
+    if type_ == 'table':
+        return (not name.startswith(PARTITIONED_TABLES)
+                and not SELLER_PARTITION_PATTERN.search(name))
+    return True
+
+def include_object(object_, name, type_, reflected, compare_to):
+    """
+    Skips the foreign keys PostgreSQL clones onto the partitions of a table partitioned by
+    seller, once per partition, when it is referenced.
+    """
+    if type_ == 'foreign_key_constraint' and reflected:
+        return not SELLER_PARTITION_PATTERN.search(object_.referred_table.name)
+    return True
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
     This configures the context with just a URL
@@ -46,7 +81,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=target_metadata, literal_binds=True, dialect_opts={"paramstyle": "named"}
+        url=url, target_metadata=target_metadata, literal_binds=True, dialect_opts={"paramstyle": "named"},
+        include_name=include_name, include_object=include_object
     )
 
     with context.begin_transaction():
@@ -64,7 +100,11 @@ def run_migrations_online():
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_name=include_name, include_object=include_object,
+            # Each revision commits on its own, so the online helpers of
+            # api.shared.database.migration_helpers only ever commit their own revision.
+            transaction_per_migration=True
         )
 
         with context.begin_transaction():
@@ -0,0 +1,41 @@
+"""Create products
+
+Revision ID: a3c5e7f9b142
+Revises: f2b8d4a6c071
+Create Date: 2026-10-19 18:02:41.517230
+
+Products belong to a seller, a user who cannot be deleted while owning products. The
+stock quantity and the price can never be negative.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c5e7f9b142'
+down_revision: Union[str, None] = 'f2b8d4a6c071'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('products',
+    sa.Column('id', sa.UUID(), server_default=sa.text('uuid_generate_v7()'), nullable=False),
+    sa.Column('seller_id', sa.UUID(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('price', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('quantity', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('date_created', sa.DateTime(timezone=True), nullable=False),
+    sa.CheckConstraint('quantity >= 0', name='ck_products_quantity_non_negative'),
+    sa.CheckConstraint('price >= 0', name='ck_products_price_non_negative'),
+    sa.ForeignKeyConstraint(['seller_id'], ['users.id'], ondelete='RESTRICT'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_products_seller_id_id', 'products', ['seller_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_products_seller_id_id', table_name='products')
+    op.drop_table('products')
@@ -0,0 +1,64 @@
+"""Add low stock alerts
+
+Revision ID: a6d2e8f4b519
+Revises: e9b5c7d1f436
+Create Date: 2026-10-19 16:02:31.184527
+
+Products get an optional low_stock_threshold, and the products at or below it are indexed
+by the partial index ix_products_low_stock, built concurrently so products stays writable.
+The alerts raised when a stock decrement crosses a threshold are written to the
+stock_alerts outbox, where a partial unique index keeps a single pending alert per product.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from api.shared.database.migration_helpers import (create_index_concurrently,
+                                                   drop_index_concurrently)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d2e8f4b519'
+down_revision: Union[str, None] = 'e9b5c7d1f436'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('products', sa.Column('low_stock_threshold', sa.Integer(), nullable=True))
+    op.create_check_constraint('ck_products_low_stock_threshold_non_negative', 'products',
+                               'low_stock_threshold >= 0')
+    op.create_table('stock_alerts',
+    sa.Column('id', sa.UUID(), server_default=sa.text('uuid_generate_v7()'), nullable=False),
+    sa.Column('seller_id', sa.UUID(), nullable=False),
+    sa.Column('product_id', sa.UUID(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('threshold', sa.Integer(), nullable=False),
+    sa.Column('date_created', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('date_delivered', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'],
+                            name='stock_alerts_product_id_fkey', ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['seller_id'], ['users.id'],
+                            name='stock_alerts_seller_id_fkey', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_stock_alerts_pending_id', 'stock_alerts', ['id'], unique=False,
+                    postgresql_where=sa.text('date_delivered IS NULL'))
+    op.create_index('ux_stock_alerts_pending_product_id', 'stock_alerts', ['product_id'],
+                    unique=True, postgresql_where=sa.text('date_delivered IS NULL'))
+    create_index_concurrently('ix_products_low_stock', 'products',
+                              ['seller_id', 'quantity', 'id'],
+                              where='quantity <= low_stock_threshold')
+
+
+def downgrade() -> None:
+    drop_index_concurrently('ix_products_low_stock', 'products')
+    op.drop_index('ux_stock_alerts_pending_product_id', table_name='stock_alerts',
+                  postgresql_where=sa.text('date_delivered IS NULL'))
+    op.drop_index('ix_stock_alerts_pending_id', table_name='stock_alerts',
+                  postgresql_where=sa.text('date_delivered IS NULL'))
+    op.drop_table('stock_alerts')
+    op.drop_constraint('ck_products_low_stock_threshold_non_negative', 'products',
+                       type_='check')
+    op.drop_column('products', 'low_stock_threshold')
@@ -0,0 +1,54 @@
+"""Default users id to UUIDv7
+
+Revision ID: a91d6f4b2c58
+Revises: 5d7a9e3c0b21
+Create Date: 2026-10-19 13:41:05.672910
+
+The application generates UUIDv7 keys itself. This migration adds the equivalent
+uuid_generate_v7() SQL function and uses it as the server default of users.id, so rows
+inserted outside the application are also time-ordered. Existing uuid4 keys are valid UUIDs
+and are kept as they are; no row is rewritten.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a91d6f4b2c58'
+down_revision: Union[str, None] = '5d7a9e3c0b21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A random uuid4 whose first 48 bits are replaced by the Unix time in milliseconds and
+    # whose version nibble is changed from 4 to 7 by setting bits 52 and 53.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+        BEGIN
+            RETURN encode(
+                set_bit(set_bit(
+                    overlay(uuid_send(gen_random_uuid())
+                            PLACING substring(int8send(floor(
+                                extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                            FROM 1 FOR 6),
+                    52, 1),
+                53, 1),
+                'hex')::uuid;
+        END
+        $$ LANGUAGE plpgsql VOLATILE
+    """)
+    op.alter_column('users', 'id',
+               existing_type=sa.UUID(),
+               server_default=sa.text('uuid_generate_v7()'),
+               existing_nullable=False)
+
+
+def downgrade() -> None:
+    op.alter_column('users', 'id',
+               existing_type=sa.UUID(),
+               server_default=None,
+               existing_nullable=False)
+    op.execute('DROP FUNCTION IF EXISTS uuid_generate_v7()')
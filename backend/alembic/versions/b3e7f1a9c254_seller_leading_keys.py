@@ -0,0 +1,127 @@
+"""Seller leading keys
+
+Revision ID: b3e7f1a9c254
+Revises: a6d2e8f4b519
+Create Date: 2026-10-19 17:24:09.316842
+
+The primary keys of products, customers, sales, sale_items and customer_payments become
+composite keys led by seller_id, so the rows of a seller are clustered in the primary key
+index and the tables can be hash partitioned by seller. sale_items and customer_payments get
+a seller_id column, backfilled from their sale and customer. References between the rows of
+a seller become composite foreign keys, which also keep them from ever pointing to the rows
+of another seller, and the indexes backing them lead with seller_id too.
+
+The new unique indexes are built concurrently first; the primary keys are then swapped
+onto them with ALTER TABLE ... PRIMARY KEY USING INDEX, which only holds the table locks for
+the time it takes to validate the foreign keys.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from api.shared.database.migration_helpers import (create_index_concurrently,
+                                                   drop_index_concurrently)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e7f1a9c254'
+down_revision: Union[str, None] = 'a6d2e8f4b519'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The seller-owned tables and the columns of their primary key, before and after.
+PRIMARY_KEYS = {
+    'products': (['id'], ['seller_id', 'id']),
+    'customers': (['id'], ['seller_id', 'id']),
+    'sales': (['id'], ['seller_id', 'id']),
+    'sale_items': (['sale_id', 'product_id'], ['seller_id', 'sale_id', 'product_id']),
+    'customer_payments': (['id'], ['seller_id', 'id']),
+}
+
+# The foreign keys between seller-owned rows: (table, columns, referred table, on delete).
+FOREIGN_KEYS = [
+    ('sales', 'customer_id', 'customers', 'RESTRICT'),
+    ('sale_items', 'sale_id', 'sales', 'CASCADE'),
+    ('sale_items', 'product_id', 'products', 'RESTRICT'),
+    ('customer_payments', 'customer_id', 'customers', 'RESTRICT'),
+    ('stock_alerts', 'product_id', 'products', 'CASCADE'),
+    ('product_sales_daily', 'product_id', 'products', 'RESTRICT'),
+]
+
+# The indexes backing the foreign keys, on the column alone before and led by seller_id
+# after: (table, column, where).
+FOREIGN_KEY_INDEXES = [
+    ('sales', 'customer_id', 'customer_id IS NOT NULL'),
+    ('sale_items', 'product_id', None),
+    ('customer_payments', 'customer_id', None),
+    ('product_sales_daily', 'product_id', None),
+]
+
+
+def _swap_primary_keys(new: bool) -> None:
+    """Moves every primary key onto its prebuilt unique index."""
+    for table in PRIMARY_KEYS:
+        op.drop_constraint(f'{table}_pkey', table, type_='primary')
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey '
+                   f'PRIMARY KEY USING INDEX {table}_pkey_{"new" if new else "old"}')
+
+
+def _create_foreign_keys(composite: bool) -> None:
+    """Creates the foreign keys between seller-owned rows, composite or on the column alone."""
+    for table, column, referred, ondelete in FOREIGN_KEYS:
+        op.create_foreign_key(f'{table}_{column}_fkey', table, referred,
+                              ['seller_id', column] if composite else [column],
+                              ['seller_id', 'id'] if composite else ['id'],
+                              ondelete=ondelete)
+
+
+def _drop_foreign_keys() -> None:
+    """Drops the foreign keys between seller-owned rows."""
+    for table, column, _, _ in FOREIGN_KEYS:
+        op.drop_constraint(f'{table}_{column}_fkey', table, type_='foreignkey')
+
+
+def upgrade() -> None:
+    for table, parent, column in (('sale_items', 'sales', 'sale_id'),
+                                  ('customer_payments', 'customers', 'customer_id')):
+        op.add_column(table, sa.Column('seller_id', sa.UUID(), nullable=True))
+        op.execute(f'UPDATE {table} SET seller_id = {parent}.seller_id FROM {parent} '
+                   f'WHERE {parent}.id = {table}.{column}')
+        op.alter_column(table, 'seller_id', nullable=False)
+        op.create_foreign_key(f'{table}_seller_id_fkey', table, 'users', ['seller_id'],
+                              ['id'], ondelete='RESTRICT')
+
+    for table, (_, columns) in PRIMARY_KEYS.items():
+        create_index_concurrently(f'{table}_pkey_new', table, columns, unique=True)
+    for table, column, where in FOREIGN_KEY_INDEXES:
+        create_index_concurrently(f'ix_{table}_seller_id_{column}', table,
+                                  ['seller_id', column], where=where)
+
+    _drop_foreign_keys()
+    _swap_primary_keys(new=True)
+    _create_foreign_keys(composite=True)
+
+    for table, column, _ in FOREIGN_KEY_INDEXES:
+        drop_index_concurrently(f'ix_{table}_{column}', table)
+    drop_index_concurrently('ix_products_seller_id_id', 'products')
+    drop_index_concurrently('ix_customers_seller_id_id', 'customers')
+
+
+def downgrade() -> None:
+    create_index_concurrently('ix_products_seller_id_id', 'products', ['seller_id', 'id'])
+    create_index_concurrently('ix_customers_seller_id_id', 'customers', ['seller_id', 'id'])
+    for table, column, where in FOREIGN_KEY_INDEXES:
+        create_index_concurrently(f'ix_{table}_{column}', table, [column], where=where)
+    for table, (columns, _) in PRIMARY_KEYS.items():
+        create_index_concurrently(f'{table}_pkey_old', table, columns, unique=True)
+
+    _drop_foreign_keys()
+    _swap_primary_keys(new=False)
+    _create_foreign_keys(composite=False)
+
+    for table, column, _ in FOREIGN_KEY_INDEXES:
+        drop_index_concurrently(f'ix_{table}_seller_id_{column}', table)
+    for table in ('customer_payments', 'sale_items'):
+        op.drop_constraint(f'{table}_seller_id_fkey', table, type_='foreignkey')
+        op.drop_column(table, 'seller_id')
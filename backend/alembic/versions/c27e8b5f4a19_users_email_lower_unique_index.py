@@ -0,0 +1,33 @@
+"""Unique index on users lower(email)
+
+Revision ID: c27e8b5f4a19
+Revises: a91d6f4b2c58
+Create Date: 2026-10-19 14:52:33.118064
+
+Emails are now normalized to lower case on write. Existing emails are lowered before the
+case-sensitive ix_users_email index is replaced by a unique index on lower(email); the
+migration fails if two users only differ by the case of their email, and those accounts
+must be merged by hand first.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c27e8b5f4a19'
+down_revision: Union[str, None] = 'a91d6f4b2c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_users_email', table_name='users')
+    op.execute('UPDATE users SET email = lower(email) WHERE email <> lower(email)')
+    op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_email_lower', table_name='users')
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
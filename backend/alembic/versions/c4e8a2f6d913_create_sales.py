@@ -0,0 +1,52 @@
+"""Create sales
+
+Revision ID: c4e8a2f6d913
+Revises: a3c5e7f9b142
+Create Date: 2026-10-19 15:03:01.654679
+
+Sales belong to a seller and list their products in sale_items, one line per product,
+with the unit price at the time of the sale. Items are deleted with their sale; sellers
+and sold products cannot be deleted.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a2f6d913'
+down_revision: Union[str, None] = 'a3c5e7f9b142'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('sales',
+    sa.Column('id', sa.UUID(), server_default=sa.text('uuid_generate_v7()'), nullable=False),
+    sa.Column('seller_id', sa.UUID(), nullable=False),
+    sa.Column('total', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('date_created', sa.DateTime(timezone=True), nullable=False),
+    sa.CheckConstraint('total >= 0', name='ck_sales_total_non_negative'),
+    sa.ForeignKeyConstraint(['seller_id'], ['users.id'], ondelete='RESTRICT'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_sales_seller_id_date_created', 'sales', ['seller_id', 'date_created'], unique=False)
+    op.create_table('sale_items',
+    sa.Column('sale_id', sa.UUID(), nullable=False),
+    sa.Column('product_id', sa.UUID(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('unit_price', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.CheckConstraint('quantity > 0', name='ck_sale_items_quantity_positive'),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='RESTRICT'),
+    sa.ForeignKeyConstraint(['sale_id'], ['sales.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('sale_id', 'product_id')
+    )
+    op.create_index('ix_sale_items_product_id', 'sale_items', ['product_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sale_items_product_id', table_name='sale_items')
+    op.drop_table('sale_items')
+    op.drop_index('ix_sales_seller_id_date_created', table_name='sales')
+    op.drop_table('sales')
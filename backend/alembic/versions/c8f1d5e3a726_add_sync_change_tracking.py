@@ -0,0 +1,97 @@
+"""Add sync change tracking
+
+Revision ID: c8f1d5e3a726
+Revises: b3e7f1a9c254
+Create Date: 2026-10-19 16:40:12.508341
+
+The tables synced to the devices of the sellers get the updated_at and change_xid columns,
+maintained by triggers, and their deletes leave tombstones in sync_tombstones. The columns
+are added with constant defaults, so no table is rewritten: existing rows get a change_xid
+of 0, below any sync cursor, as devices fetch them with their first, full sync anyway. The
+(seller_id, change_xid) indexes are built concurrently so the tables stay writable.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from api.shared.database.change_tracking import (CHANGE_TRACKING_FUNCTION, CURRENT_XID,
+                                                 TOMBSTONE_FUNCTION,
+                                                 change_tracking_triggers)
+from api.shared.database.migration_helpers import (create_index_concurrently,
+                                                   drop_index_concurrently)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f1d5e3a726'
+down_revision: Union[str, None] = 'b3e7f1a9c254'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The tracked tables, the name of their rows in the sync stream, the column holding their
+# seller and, for users, the only columns whose updates are changes.
+TRACKED_TABLES = [
+    ('users', 'user', 'id', ['email', 'cpf_cnpj', 'whatsapp', 'name', 'sex', 'date_birthday',
+                             'status']),
+    ('products', 'product', 'seller_id', None),
+    ('customers', 'customer', 'seller_id', None),
+    ('customer_payments', 'customer_payment', 'seller_id', None),
+    ('sales', 'sale', 'seller_id', None),
+]
+
+
+def upgrade() -> None:
+    for table, _, _, _ in TRACKED_TABLES:
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(timezone=True),
+                                       server_default=sa.text('now()'), nullable=False))
+        op.add_column(table, sa.Column('change_xid', sa.BigInteger(), server_default='0',
+                                       nullable=False))
+        op.alter_column(table, 'change_xid', server_default=sa.text(CURRENT_XID))
+    op.add_column('users_archive', sa.Column('updated_at', sa.DateTime(timezone=True),
+                                             server_default=sa.text('now()'), nullable=False))
+    op.add_column('users_archive', sa.Column('change_xid', sa.BigInteger(), server_default='0',
+                                             nullable=False))
+    op.alter_column('users_archive', 'updated_at', server_default=None)
+    op.alter_column('users_archive', 'change_xid', server_default=None)
+
+    op.create_table('sync_tombstones',
+    sa.Column('seller_id', sa.UUID(), nullable=False),
+    sa.Column('entity', sa.String(length=20), nullable=False),
+    sa.Column('entity_id', sa.UUID(), nullable=False),
+    sa.Column('change_xid', sa.BigInteger(), server_default=sa.text(CURRENT_XID),
+              nullable=False),
+    sa.Column('date_deleted', sa.DateTime(timezone=True), server_default=sa.text('now()'),
+              nullable=False),
+    sa.PrimaryKeyConstraint('seller_id', 'entity', 'entity_id')
+    )
+    op.create_index('ix_sync_tombstones_seller_id_change_xid', 'sync_tombstones',
+                    ['seller_id', 'change_xid'], unique=False)
+
+    op.execute(CHANGE_TRACKING_FUNCTION)
+    op.execute(TOMBSTONE_FUNCTION)
+    for table, entity, seller_column, columns in TRACKED_TABLES:
+        for statement in change_tracking_triggers(table, entity, seller_column, columns):
+            op.execute(statement)
+
+    for table, _, seller_column, _ in TRACKED_TABLES:
+        if seller_column == 'seller_id':
+            create_index_concurrently(f'ix_{table}_seller_id_change_xid', table,
+                                      ['seller_id', 'change_xid'])
+
+
+def downgrade() -> None:
+    for table, _, seller_column, _ in TRACKED_TABLES:
+        if seller_column == 'seller_id':
+            drop_index_concurrently(f'ix_{table}_seller_id_change_xid', table)
+    for table, _, _, _ in TRACKED_TABLES:
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_record_tombstone ON {table}')
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_track_change ON {table}')
+        op.drop_column(table, 'change_xid')
+        op.drop_column(table, 'updated_at')
+    op.execute('DROP FUNCTION IF EXISTS record_tombstone()')
+    op.execute('DROP FUNCTION IF EXISTS track_change()')
+
+    op.drop_index('ix_sync_tombstones_seller_id_change_xid', table_name='sync_tombstones')
+    op.drop_table('sync_tombstones')
+    op.drop_column('users_archive', 'change_xid')
+    op.drop_column('users_archive', 'updated_at')
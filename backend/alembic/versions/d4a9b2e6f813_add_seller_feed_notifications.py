@@ -0,0 +1,36 @@
+"""Add seller feed notifications
+
+Revision ID: d4a9b2e6f813
+Revises: c8f1d5e3a726
+Create Date: 2026-10-19 17:12:45.906173
+
+New sales and stock movements are published on the seller_feed channel by statement-level
+triggers on sales and products, which the seller feed of every worker listens to.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from api.shared.database.feed_notifications import (SALE_FEED_FUNCTION, SALE_FEED_TRIGGER,
+                                                    STOCK_FEED_FUNCTION, STOCK_FEED_TRIGGER)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a9b2e6f813'
+down_revision: Union[str, None] = 'c8f1d5e3a726'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(SALE_FEED_FUNCTION)
+    op.execute(SALE_FEED_TRIGGER)
+    op.execute(STOCK_FEED_FUNCTION)
+    op.execute(STOCK_FEED_TRIGGER)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS products_notify_feed ON products')
+    op.execute('DROP TRIGGER IF EXISTS sales_notify_feed ON sales')
+    op.execute('DROP FUNCTION IF EXISTS notify_stock()')
+    op.execute('DROP FUNCTION IF EXISTS notify_sales()')
@@ -0,0 +1,71 @@
+"""Create customers and debts
+
+Revision ID: d7a3f1c9e285
+Revises: c4e8a2f6d913
+Create Date: 2026-10-19 15:07:03.456937
+
+Customers belong to a seller and carry a running balance, what they owe. Sales gain the
+customer who bought and the unpaid part of their total, and payments are recorded in
+customer_payments; both are the history balances are reconciled against. The index on
+sales.customer_id is built concurrently, so sales stays writable during the migration.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from api.shared.database.migration_helpers import (create_index_concurrently,
+                                                   drop_index_concurrently)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a3f1c9e285'
+down_revision: Union[str, None] = 'c4e8a2f6d913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('customers',
+    sa.Column('id', sa.UUID(), server_default=sa.text('uuid_generate_v7()'), nullable=False),
+    sa.Column('seller_id', sa.UUID(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('whatsapp', sa.String(length=14), nullable=True),
+    sa.Column('balance', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+    sa.Column('date_created', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['seller_id'], ['users.id'], ondelete='RESTRICT'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_customers_seller_id_balance', 'customers', ['seller_id', sa.text('balance DESC'), 'id'], unique=False)
+    op.create_index('ix_customers_seller_id_id', 'customers', ['seller_id', 'id'], unique=False)
+    op.create_table('customer_payments',
+    sa.Column('id', sa.UUID(), server_default=sa.text('uuid_generate_v7()'), nullable=False),
+    sa.Column('customer_id', sa.UUID(), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('date_created', sa.DateTime(timezone=True), nullable=False),
+    sa.CheckConstraint('amount > 0', name='ck_customer_payments_amount_positive'),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ondelete='RESTRICT'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_customer_payments_customer_id', 'customer_payments', ['customer_id'], unique=False)
+    op.add_column('sales', sa.Column('customer_id', sa.UUID(), nullable=True))
+    op.add_column('sales', sa.Column('debt', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False))
+    op.create_foreign_key('sales_customer_id_fkey', 'sales', 'customers', ['customer_id'], ['id'], ondelete='RESTRICT')
+    op.create_check_constraint('ck_sales_debt_within_total', 'sales', 'debt >= 0 AND debt <= total')
+    op.create_check_constraint('ck_sales_debt_has_customer', 'sales', 'debt = 0 OR customer_id IS NOT NULL')
+    create_index_concurrently('ix_sales_customer_id', 'sales', ['customer_id'],
+                              where='customer_id IS NOT NULL')
+
+
+def downgrade() -> None:
+    drop_index_concurrently('ix_sales_customer_id', 'sales')
+    op.drop_constraint('ck_sales_debt_has_customer', 'sales', type_='check')
+    op.drop_constraint('ck_sales_debt_within_total', 'sales', type_='check')
+    op.drop_constraint('sales_customer_id_fkey', 'sales', type_='foreignkey')
+    op.drop_column('sales', 'debt')
+    op.drop_column('sales', 'customer_id')
+    op.drop_index('ix_customer_payments_customer_id', table_name='customer_payments')
+    op.drop_table('customer_payments')
+    op.drop_index('ix_customers_seller_id_id', table_name='customers')
+    op.drop_index('ix_customers_seller_id_balance', table_name='customers')
+    op.drop_table('customers')
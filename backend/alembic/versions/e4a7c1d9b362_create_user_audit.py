@@ -0,0 +1,49 @@
+"""Create user audit
+
+Revision ID: e4a7c1d9b362
+Revises: c27e8b5f4a19
+Create Date: 2026-10-19 16:05:48.230417
+
+user_audit is partitioned by range of date_created. This migration creates the parent
+table, its default partition and the trigger that makes it append-only; the application
+creates the monthly partitions of the current and next months when it starts.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from api.modules.users.models.UserAudit import (USER_AUDIT_APPEND_ONLY_FUNCTION,
+                                                USER_AUDIT_APPEND_ONLY_TRIGGER,
+                                                USER_AUDIT_DEFAULT_PARTITION)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7c1d9b362'
+down_revision: Union[str, None] = 'c27e8b5f4a19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('user_audit',
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=False), nullable=False),
+    sa.Column('date_created', sa.DateTime(timezone=True), server_default=sa.text('now()'),
+              nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('action', sa.String(length=20), nullable=False),
+    sa.Column('changes', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.PrimaryKeyConstraint('id', 'date_created'),
+    postgresql_partition_by='RANGE (date_created)'
+    )
+    op.create_index('ix_user_audit_user_id_date_created', 'user_audit',
+                    ['user_id', 'date_created'], unique=False)
+    op.execute(USER_AUDIT_DEFAULT_PARTITION)
+    op.execute(USER_AUDIT_APPEND_ONLY_FUNCTION)
+    op.execute(USER_AUDIT_APPEND_ONLY_TRIGGER)
+
+
+def downgrade() -> None:
+    op.drop_table('user_audit')
+    op.execute('DROP FUNCTION IF EXISTS user_audit_append_only()')
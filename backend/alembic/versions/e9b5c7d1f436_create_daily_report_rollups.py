@@ -0,0 +1,64 @@
+"""Create daily report rollups
+
+Revision ID: e9b5c7d1f436
+Revises: d7a3f1c9e285
+Create Date: 2026-10-19 15:11:48.497401
+
+Sales are rolled up per seller and day into sales_daily, and per seller, day and product
+into product_sales_daily; report_rollup_state holds the last day rolled up. The rollup job
+finds the sales of a day on a BRIN index of sales.date_created, built concurrently so
+sales stays writable during the migration.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from api.shared.database.migration_helpers import (create_index_concurrently,
+                                                   drop_index_concurrently)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9b5c7d1f436'
+down_revision: Union[str, None] = 'd7a3f1c9e285'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('report_rollup_state',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('rolled_up_through', sa.Date(), nullable=False),
+    sa.CheckConstraint('id = 1', name='ck_report_rollup_state_single_row'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('sales_daily',
+    sa.Column('seller_id', sa.UUID(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('sales_count', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Numeric(precision=16, scale=2), nullable=False),
+    sa.Column('debt', sa.Numeric(precision=16, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['seller_id'], ['users.id'], ondelete='RESTRICT'),
+    sa.PrimaryKeyConstraint('seller_id', 'day')
+    )
+    op.create_table('product_sales_daily',
+    sa.Column('seller_id', sa.UUID(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('product_id', sa.UUID(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Numeric(precision=16, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='RESTRICT'),
+    sa.ForeignKeyConstraint(['seller_id'], ['users.id'], ondelete='RESTRICT'),
+    sa.PrimaryKeyConstraint('seller_id', 'day', 'product_id')
+    )
+    op.create_index('ix_product_sales_daily_product_id', 'product_sales_daily', ['product_id'], unique=False)
+    create_index_concurrently('ix_sales_date_created_brin', 'sales', ['date_created'],
+                              using='brin')
+
+
+def downgrade() -> None:
+    drop_index_concurrently('ix_sales_date_created_brin', 'sales')
+    op.drop_index('ix_product_sales_daily_product_id', table_name='product_sales_daily')
+    op.drop_table('product_sales_daily')
+    op.drop_table('sales_daily')
+    op.drop_table('report_rollup_state')
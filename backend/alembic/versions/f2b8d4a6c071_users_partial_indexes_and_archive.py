@@ -0,0 +1,71 @@
+"""Partial indexes on users and users archive
+
+Revision ID: f2b8d4a6c071
+Revises: e4a7c1d9b362
+Create Date: 2026-10-19 17:20:14.602983
+
+Creates the users_archive and user_photos_archive tables, where the archival job moves
+long-inactive users, and two partial indexes on users: one on the identifiers of active
+users for their keyset pages, one on the last activity of the other users for the archival
+job. Both are built concurrently, so users stays writable during the migration.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from api.shared.database.migration_helpers import (create_index_concurrently,
+                                                   drop_index_concurrently)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8d4a6c071'
+down_revision: Union[str, None] = 'e4a7c1d9b362'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('users_archive',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('email', sa.String(length=50), nullable=False),
+    sa.Column('cpf_cnpj', sa.String(length=14), nullable=False),
+    sa.Column('whatsapp', sa.String(length=14), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('password', sa.String(length=255), nullable=False),
+    sa.Column('sex', sa.String(length=1), nullable=False),
+    sa.Column('date_birthday', sa.Date(), nullable=False),
+    sa.Column('date_created', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('status', sa.Integer(), nullable=False),
+    sa.Column('profile_photo', sa.LargeBinary(), nullable=True),
+    sa.Column('date_login', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('date_archived', sa.DateTime(timezone=True), server_default=sa.text('now()'),
+              nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_archive_cpf_cnpj', 'users_archive', ['cpf_cnpj'], unique=False)
+    op.create_index('ix_users_archive_whatsapp', 'users_archive', ['whatsapp'], unique=False)
+    op.create_index('ix_users_archive_email_lower', 'users_archive', [sa.text('lower(email)')],
+                    unique=False)
+    op.create_table('user_photos_archive',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('variant', sa.String(length=10), nullable=False),
+    sa.Column('content', sa.LargeBinary(), nullable=False),
+    sa.Column('content_type', sa.String(length=30), nullable=False),
+    sa.Column('etag', sa.String(length=70), nullable=False),
+    sa.Column('date_created', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users_archive.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'variant')
+    )
+    create_index_concurrently('ix_users_active_id', 'users', ['id'], where='status = 1')
+    create_index_concurrently('ix_users_inactive_last_activity', 'users',
+                              [sa.text('coalesce(date_login, date_created)')],
+                              where='status != 1')
+
+
+def downgrade() -> None:
+    drop_index_concurrently('ix_users_inactive_last_activity', 'users')
+    drop_index_concurrently('ix_users_active_id', 'users')
+    op.drop_table('user_photos_archive')
+    op.drop_table('users_archive')
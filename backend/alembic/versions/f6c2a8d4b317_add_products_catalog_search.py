@@ -0,0 +1,51 @@
+"""Add products catalog search
+
+Revision ID: f6c2a8d4b317
+Revises: d4a9b2e6f813
+Create Date: 2026-10-19 18:05:31.227904
+
+Products get the generated search_vector column, the Portuguese tsvector of their unaccented
+name, and the GIN index of its seller terms. The unaccent extension is installed when
+available, otherwise catalog_unaccent falls back to translating the accented letters of
+Portuguese. Adding a stored generated column rewrites the products table under an exclusive
+lock, once; the GIN index is then built concurrently, so the table stays writable while it
+is built.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from api.shared.database.catalog_search import (CATALOG_SELLER_QUERY_FUNCTION,
+                                                CATALOG_SELLER_TERMS_FUNCTION,
+                                                CATALOG_UNACCENT_FUNCTION, SEARCH_VECTOR)
+from api.shared.database.migration_helpers import (create_index_concurrently,
+                                                   drop_index_concurrently)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6c2a8d4b317'
+down_revision: Union[str, None] = 'd4a9b2e6f813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(CATALOG_UNACCENT_FUNCTION)
+    op.execute(CATALOG_SELLER_TERMS_FUNCTION)
+    op.execute(CATALOG_SELLER_QUERY_FUNCTION)
+    op.add_column('products', sa.Column('search_vector', postgresql.TSVECTOR(),
+                                        sa.Computed(SEARCH_VECTOR, persisted=True),
+                                        nullable=False))
+    create_index_concurrently('ix_products_search_terms', 'products',
+                              [sa.text('catalog_seller_terms(seller_id, search_vector)')],
+                              using='gin')
+
+
+def downgrade() -> None:
+    drop_index_concurrently('ix_products_search_terms', 'products')
+    op.drop_column('products', 'search_vector')
+    op.execute('DROP FUNCTION IF EXISTS catalog_seller_query(uuid, text)')
+    op.execute('DROP FUNCTION IF EXISTS catalog_seller_terms(uuid, tsvector)')
+    op.execute('DROP FUNCTION IF EXISTS catalog_unaccent(text)')
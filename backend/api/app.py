@@ -1,14 +1,73 @@
 """
 This module sets up the FastAPI application for a sales management system. 
 It includes configurationsfor route handling and server initialization. 
-The application serves a user management module and provides a welcoming root endpoint.
+The application serves the user, product, sale and customer management modules, their
+reports, the sync of the devices of the sellers and their live feed, and provides a
+welcoming root endpoint.
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, status
 from api.modules.users.routers.user_router import router as user_router
+from api.modules.products.routers.product_router import router as product_router
+from api.modules.sales.routers.sale_router import router as sale_router
+from api.modules.customers.routers.customer_router import router as customer_router
+from api.modules.reports.routers.report_router import router as report_router
+from api.modules.sync.routers.sync_router import router as sync_router
+from api.modules.feed.routers.feed_router import router as feed_router
+from api.modules.feed.services.seller_feed import seller_feed
+from api.modules.products.services.stock_alert_dispatcher import stock_alert_dispatcher
+from api.modules.users.services.audit_writer import user_audit_writer
+from api.modules.users.services.availability_filters import availability_filters
+from api.modules.users.services.last_login_writer import last_login_writer
+from api.shared.configs.settings import settings
+from api.shared.database.connection import engine
+from api.shared.middlewares.profiler_middleware import ProfilerMiddleware
+from api.shared.middlewares.tracing_middleware import TracingMiddleware
+from api.utils.process_pool import shutdown_process_pool
+from api.utils.tracing import OTLPJsonExporter, Tracer, instrument_engine
 
-app = FastAPI(title='Gerenciador de Vendas')
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    """
+    Manages resources that live as long as the application, releasing them on shutdown.
+    """
+    availability_filters.start()
+    await last_login_writer.start()
+    await user_audit_writer.start()
+    await stock_alert_dispatcher.start()
+    await seller_feed.start()
+    yield
+    await seller_feed.stop()
+    await stock_alert_dispatcher.stop()
+    await user_audit_writer.stop()
+    await last_login_writer.stop()
+    await availability_filters.stop()
+    shutdown_process_pool()
+
+app = FastAPI(title='Gerenciador de Vendas', lifespan=lifespan)
+
+# Profiling is opt-in: without a token or a sample rate the middleware is not installed.
+if settings.PROFILER_TOKEN or settings.PROFILER_SAMPLE_RATE > 0:
+    app.add_middleware(ProfilerMiddleware, output_dir=settings.PROFILER_OUTPUT_DIR,
+                       token=settings.PROFILER_TOKEN,
+                       sample_rate=settings.PROFILER_SAMPLE_RATE,
+                       interval_ms=settings.PROFILER_INTERVAL_MS,
+                       output_format=settings.PROFILER_FORMAT)
+
+# Tracing records every request and only exports the slow ones; it is off by default.
+if settings.TRACING_ENABLED:
+    instrument_engine(engine)
+    app.add_middleware(TracingMiddleware, tracer=Tracer(
+        OTLPJsonExporter(settings.TRACING_EXPORT_PATH, settings.TRACING_SERVICE_NAME),
+        settings.TRACING_SLOW_THRESHOLD_MS, settings.TRACING_MAX_SPANS))
 
 app.include_router(user_router, prefix='/users')
+app.include_router(product_router, prefix='/products')
+app.include_router(sale_router, prefix='/sales')
+app.include_router(customer_router, prefix='/customers')
+app.include_router(report_router, prefix='/reports')
+app.include_router(sync_router, prefix='/sync')
+app.include_router(feed_router, prefix='/feed')
 
 @app.get('/',
          status_code=status.HTTP_200_OK,
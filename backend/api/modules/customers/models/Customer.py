@@ -0,0 +1,40 @@
+"""
+This module defines the Customer model, the people a seller sells to, possibly on credit.
+It sets up the SQLAlchemy ORM mappings for the customers table in the database
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+from sqlalchemy import String, Numeric, DateTime, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.shared.database.connection import Base
+from api.shared.database.change_tracking import track_changes
+from api.shared.database.mixins import (ChangeTrackedMixin, SellerOwnedMixin,
+                                        UUIDv7PrimaryKeyMixin)
+
+class Customer(SellerOwnedMixin, UUIDv7PrimaryKeyMixin, ChangeTrackedMixin, Base):
+    """
+    Customer model for storing the customers of a seller in the 'customers' table in the
+    database.
+
+    The balance is what the customer owes: the unpaid part of their sales minus their
+    payments, a negative balance being a credit. It is a running total, updated in the same
+    transaction as every sale and payment, so it is read without summing any history; the
+    balance reconciler re-derives it from that history to detect drift.
+    """
+    __tablename__ = "customers"
+
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    whatsapp: Mapped[Optional[str]] = mapped_column(String(14), nullable=True)
+    balance: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False,
+                                             server_default='0')
+    date_created: Mapped[datetime] = mapped_column(DateTime(timezone=True),
+                                                   nullable=False, default=func.now()) # pylint: disable=not-callable
+
+# The customers who owe a seller the most are read from the top of this index.
+Index('ix_customers_seller_id_balance', Customer.seller_id, Customer.balance.desc(),
+      Customer.id)
+# The customers changed since the last sync of a device, balances included.
+Index('ix_customers_seller_id_change_xid', Customer.seller_id, Customer.change_xid)
+track_changes(Customer.__table__, 'customer')
@@ -0,0 +1,46 @@
+"""
+This module defines the CustomerPayment model, the payments a customer makes towards their
+debt with a seller.
+It sets up the SQLAlchemy ORM mappings for the customer_payments table in the database
+"""
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (Numeric, DateTime, ForeignKeyConstraint, CheckConstraint, Index,
+                        func)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.shared.database.connection import Base
+from api.shared.database.change_tracking import track_changes
+from api.shared.database.mixins import (ChangeTrackedMixin, SellerOwnedMixin,
+                                        UUIDv7PrimaryKeyMixin)
+
+class CustomerPayment(SellerOwnedMixin, UUIDv7PrimaryKeyMixin, ChangeTrackedMixin, Base):
+    """
+    CustomerPayment model for storing the payments of customers in the 'customer_payments'
+    table in the database.
+
+    Payments are the history the balance of a customer is reconciled against; they are
+    never updated, and a customer cannot be deleted once they have paid.
+    """
+    __tablename__ = "customer_payments"
+    __table_args__ = (
+        CheckConstraint('amount > 0', name='ck_customer_payments_amount_positive'),
+        ForeignKeyConstraint(['seller_id', 'customer_id'],
+                             ['customers.seller_id', 'customers.id'],
+                             name='customer_payments_customer_id_fkey', ondelete='RESTRICT'),
+    )
+
+    customer_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    amount: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
+    date_created: Mapped[datetime] = mapped_column(DateTime(timezone=True),
+                                                   nullable=False, default=func.now()) # pylint: disable=not-callable
+
+# Sums the payments of a customer when their balance is reconciled.
+Index('ix_customer_payments_seller_id_customer_id', CustomerPayment.seller_id,
+      CustomerPayment.customer_id)
+# The payments received since the last sync of a device.
+Index('ix_customer_payments_seller_id_change_xid', CustomerPayment.seller_id,
+      CustomerPayment.change_xid)
+track_changes(CustomerPayment.__table__, 'customer_payment')
@@ -0,0 +1,128 @@
+"""
+This module defines the routing for customer-related operations in the FastAPI application.
+It utilizes dependencies from the shared database module and services from the customer
+module to create and read the customers of the seller making the request, list those who
+owe the most, and record their payments.
+"""
+import uuid
+from fastapi import APIRouter, Depends, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.shared.configs.settings import settings
+from api.shared.database.dependencies import get_seller_id, get_seller_session
+from api.modules.customers.services.customer_service import CustomerService
+from api.modules.customers.schemas.customer_schema import (CustomerBalanceResponse,
+                                                           CustomerCreateRequest,
+                                                           CustomerResponse,
+                                                           DebtorListResponse,
+                                                           PaymentCreateRequest)
+
+router = APIRouter()
+
+@router.post('/',
+             response_model=CustomerResponse,
+             status_code=status.HTTP_201_CREATED,
+             summary='Create new customer',
+             tags=['customers'])
+async def create_customer(data_customer: CustomerCreateRequest,
+                          seller_id: uuid.UUID = Depends(get_seller_id),
+                          db: AsyncSession = Depends(get_seller_session)
+                          ) -> CustomerResponse:
+    """
+    Create a new customer for the seller making the request.
+
+    Args:
+        data_customer (CustomerCreateRequest): The customer data, validated by pydantic.
+        seller_id (uuid.UUID): The seller making the request.
+        db (AsyncSession): The database session dependency, scoped to the seller.
+
+    Returns:
+        CustomerResponse: The created customer.
+
+    Raises:
+        HTTPException: 400 if the seller does not exist.
+    """
+    customer_service = CustomerService(db)
+    customer = await customer_service.create_customer(seller_id, data_customer)
+    return CustomerResponse.model_validate(customer)
+
+@router.get('/debtors',
+            response_model=DebtorListResponse,
+            status_code=status.HTTP_200_OK,
+            summary='List the customers who owe the most',
+            tags=['customers'])
+async def list_debtors(limit: int = Query(settings.CUSTOMER_DEBTORS_DEFAULT_LIMIT, ge=1,
+                                          le=settings.CUSTOMER_DEBTORS_MAX_LIMIT),
+                       seller_id: uuid.UUID = Depends(get_seller_id),
+                       db: AsyncSession = Depends(get_seller_session)
+                       ) -> Response:
+    """
+    List the customers who owe the seller the most, largest balance first.
+
+    Args:
+        limit (int): The maximum number of customers.
+        seller_id (uuid.UUID): The seller making the request.
+        db (AsyncSession): The database session dependency, scoped to the seller.
+
+    Returns:
+        Response: The JSON encoded DebtorListResponse.
+    """
+    customer_service = CustomerService(db)
+    debtors = await customer_service.list_debtors(seller_id, limit)
+    return Response(content=debtors.model_dump_json(), media_type='application/json')
+
+@router.get('/{customer_id}',
+            response_model=CustomerResponse,
+            status_code=status.HTTP_200_OK,
+            summary='Get customer',
+            tags=['customers'])
+async def get_customer(customer_id: uuid.UUID,
+                       seller_id: uuid.UUID = Depends(get_seller_id),
+                       db: AsyncSession = Depends(get_seller_session)
+                       ) -> CustomerResponse:
+    """
+    Get a customer of the seller and their balance.
+
+    Args:
+        customer_id (uuid.UUID): The identifier of the customer.
+        seller_id (uuid.UUID): The seller making the request.
+        db (AsyncSession): The database session dependency, scoped to the seller.
+
+    Returns:
+        CustomerResponse: The customer.
+
+    Raises:
+        HTTPException: 404 if the seller has no such customer.
+    """
+    customer_service = CustomerService(db)
+    customer = await customer_service.get_customer(seller_id, customer_id)
+    return CustomerResponse.model_validate(customer)
+
+@router.post('/{customer_id}/payments',
+             response_model=CustomerBalanceResponse,
+             status_code=status.HTTP_201_CREATED,
+             summary='Record a payment of a customer',
+             tags=['customers'])
+async def add_payment(customer_id: uuid.UUID,
+                      data_payment: PaymentCreateRequest,
+                      seller_id: uuid.UUID = Depends(get_seller_id),
+                      db: AsyncSession = Depends(get_seller_session)
+                      ) -> CustomerBalanceResponse:
+    """
+    Record a payment of a customer towards their debt.
+
+    Args:
+        customer_id (uuid.UUID): The identifier of the customer.
+        data_payment (PaymentCreateRequest): The payment, validated by pydantic.
+        seller_id (uuid.UUID): The seller making the request.
+        db (AsyncSession): The database session dependency, scoped to the seller.
+
+    Returns:
+        CustomerBalanceResponse: The balance of the customer after the payment.
+
+    Raises:
+        HTTPException: 404 if the seller has no such customer.
+    """
+    customer_service = CustomerService(db)
+    balance = await customer_service.add_payment(seller_id, customer_id, data_payment)
+    return CustomerBalanceResponse.model_validate(balance)
@@ -0,0 +1,94 @@
+"""
+This module defines the Pydantic schemas for customer-related operations. These schemas
+are used for validating the data sent to the customer endpoints and for responding with
+customers and their balances.
+"""
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import Annotated, Optional
+from pydantic import Field, field_validator
+
+from api.shared.configs.base_schema import BaseSchema
+from api.shared.validators.phone_validator import validate_and_format_number
+
+class CustomerCreateRequest(BaseSchema):
+    """
+    A schema for customer creation requests. Customers are always created for the seller
+    making the request, with a zero balance.
+    """
+    name: Annotated[
+        str,
+        Field(..., min_length=2, max_length=100,
+              description='Name must be between 2 and 100 characters.')]
+    whatsapp: Annotated[
+        Optional[str],
+        Field(None, min_length=8, max_length=14,
+              description='WhatsApp number with a minimum 8 characters and maximum 14 characters')]
+
+    @field_validator('whatsapp')
+    def whatsapp_validator(cls, value: Optional[str]) -> Optional[str]: # pylint: disable=E0213
+        """
+        Validates whether the input, when given, is a valid phone number.
+
+        Args:
+            value (Optional[str]): The phone number to validate.
+
+        Returns:
+            Optional[str]: The validated phone number.
+
+        Raises:
+            PhoneNumberException: If the phone number is invalid.
+        """
+        return validate_and_format_number(value) if value is not None else None
+
+class CustomerResponse(BaseSchema):
+    """
+    A schema for responding with customer data.
+    """
+    id: Annotated[
+        uuid.UUID,
+        Field(description='The unique identifier for the customer.')]
+    seller_id: Annotated[
+        uuid.UUID,
+        Field(description='The user the customer buys from.')]
+    name: Annotated[
+        str,
+        Field(description='The name of the customer.')]
+    whatsapp: Annotated[
+        Optional[str],
+        Field(description='The WhatsApp number of the customer.')]
+    balance: Annotated[
+        Decimal,
+        Field(description='What the customer owes; a negative balance is a credit.')]
+    date_created: Annotated[
+        datetime,
+        Field(description='The date and time when the customer was created.')]
+
+class DebtorListResponse(BaseSchema):
+    """
+    A schema for the customers who owe a seller the most, largest balance first.
+    """
+    items: Annotated[
+        list[CustomerResponse],
+        Field(description='The customers with a positive balance.')]
+
+class PaymentCreateRequest(BaseSchema):
+    """
+    A schema for the payments of a customer towards their debt.
+    """
+    amount: Annotated[
+        Decimal,
+        Field(..., gt=0, max_digits=14, decimal_places=2,
+              description='The amount paid, with at most two decimal places.')]
+
+class CustomerBalanceResponse(BaseSchema):
+    """
+    A schema for responding with the balance of a customer after a payment.
+    """
+    id: Annotated[
+        uuid.UUID,
+        Field(description='The unique identifier for the customer.')]
+    balance: Annotated[
+        Decimal,
+        Field(description='What the customer owes after the payment.')]
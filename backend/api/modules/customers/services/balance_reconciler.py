@@ -0,0 +1,160 @@
+"""
+This module contains the BalanceReconciler class, the job that checks the running balance
+of every customer against the history it is maintained from: the debts of their sales minus
+their payments. A balance that differs has drifted, through a bug or a manual change; the
+job reports it and, unless asked not to, sets it back to the derived value.
+"""
+import logging
+import time
+import uuid
+from typing import Optional, Union
+
+from sqlalchemy import Row, Select, Update, and_, func, select, tuple_, update
+
+from api.modules.customers.models.Customer import Customer
+from api.modules.customers.models.CustomerPayment import CustomerPayment
+from api.modules.sales.models.Sale import Sale
+from api.shared.database.connection import engine
+
+logger = logging.getLogger(__name__)
+
+# The primary key of a customer: their seller and their identifier.
+CustomerKey = tuple[uuid.UUID, uuid.UUID]
+
+class BalanceReconciler:
+    """
+    A batched job re-deriving the balances of all customers.
+
+    Customers are walked in primary key order, by seller then identifier, batch_size at a
+    time. Each batch runs in its
+    own transaction: the customers of the batch are locked first, so no sale or payment can
+    change their balances while they are compared, then a single statement sums the debts
+    and payments of the whole batch, grouped by customer, and returns or fixes the balances
+    that differ.
+
+    Attributes:
+        batch_size (int): The maximum number of customers checked per transaction.
+        fix (bool): Whether drifted balances are set back to their derived value, or only
+        reported.
+    """
+    def __init__(self, batch_size: int, fix: bool = True):
+        self.batch_size = batch_size
+        self.fix = fix
+
+    async def reconcile(self) -> tuple[int, list[Row]]:
+        """
+        Checks every customer, batch by batch.
+
+        Returns:
+            tuple[int, list[Row]]: The number of customers checked and the drifted
+            balances, each with the customer_id, seller_id, stored and derived balance.
+        """
+        started = time.monotonic()
+        checked, drifts, after = 0, [], None
+        while True:
+            last_key, count, batch_drifts = await self.reconcile_batch(after)
+            checked += count
+            drifts.extend(batch_drifts)
+            for drift in batch_drifts:
+                logger.warning('Balance of customer %s drifted: stored %s, derived %s',
+                               drift.customer_id, drift.stored, drift.derived)
+            if count:
+                elapsed = time.monotonic() - started
+                logger.info('Checked %d customers (%.0f customers/s), %d drifted', checked,
+                            checked / elapsed if elapsed else checked, len(drifts))
+            if count < self.batch_size:
+                break
+            after = last_key
+
+        return checked, drifts
+
+    async def reconcile_batch(self, after: Optional[CustomerKey]
+                              ) -> tuple[Optional[CustomerKey], int, list[Row]]:
+        """
+        Checks the batch of customers following a customer.
+
+        Args:
+            after (Optional[CustomerKey]): The seller and identifier of the last customer of
+            the previous batch.
+
+        Returns:
+            tuple[Optional[CustomerKey], int, list[Row]]: The seller and identifier of the
+            last customer of the batch, the number of customers in it and their drifted
+            balances.
+        """
+        table = Customer.__table__
+        key = tuple_(table.c.seller_id, table.c.id)
+        batch = (select(table.c.seller_id, table.c.id)
+                 .order_by(table.c.seller_id, table.c.id)
+                 .limit(self.batch_size))
+        if after is not None:
+            batch = batch.where(key > tuple_(*after))
+
+        async with engine.begin() as connection:
+            keys = [tuple(row) for row in
+                    await connection.execute(batch.with_for_update(read=not self.fix))]
+            if not keys:
+                return None, 0, []
+            result = await connection.execute(
+                build_reconcile_statement(keys[0], keys[-1], self.fix))
+            drifts = result.all()
+
+        return keys[-1], len(keys), drifts
+
+def build_reconcile_statement(first: CustomerKey, last: CustomerKey,
+                              fix: bool) -> Union[Select, Update]:
+    """
+    Builds the statement comparing the balances of a range of customers with the balances
+    derived from their sales and payments.
+
+    The range is a range of the (seller_id, id) primary key. The debts and the payments of
+    the range are each summed by customer in one aggregate, reading the same range of the
+    ix_sales_seller_id_customer_id and ix_customer_payments_seller_id_customer_id indexes.
+
+    Args:
+        first (CustomerKey): The seller and identifier of the first customer of the range.
+        last (CustomerKey): The seller and identifier of the last customer of the range.
+        fix (bool): Whether to update the drifted balances instead of only selecting them.
+
+    Returns:
+        Union[Select, Update]: The statement, returning the customer_id, seller_id, stored
+        and derived balance of every drifted customer.
+    """
+    customers = Customer.__table__
+    sales = Sale.__table__
+    payments = CustomerPayment.__table__
+
+    def in_range(seller_id, customer_id):
+        key = tuple_(seller_id, customer_id)
+        return and_(key >= tuple_(*first), key <= tuple_(*last))
+
+    debts = (select(sales.c.seller_id, sales.c.customer_id,
+                    func.sum(sales.c.debt).label('amount'))
+             .where(in_range(sales.c.seller_id, sales.c.customer_id))
+             .group_by(sales.c.seller_id, sales.c.customer_id)
+             .subquery('debts'))
+    paid = (select(payments.c.seller_id, payments.c.customer_id,
+                   func.sum(payments.c.amount).label('amount'))
+            .where(in_range(payments.c.seller_id, payments.c.customer_id))
+            .group_by(payments.c.seller_id, payments.c.customer_id)
+            .subquery('paid'))
+    derived = (func.coalesce(debts.c.amount, 0) # pylint: disable=assignment-from-no-return
+               - func.coalesce(paid.c.amount, 0)) # pylint: disable=assignment-from-no-return
+    drifted = (select(customers.c.id.label('customer_id'), customers.c.seller_id,
+                      customers.c.balance.label('stored'), derived.label('derived'))
+               .outerjoin(debts, and_(debts.c.seller_id == customers.c.seller_id,
+                                      debts.c.customer_id == customers.c.id))
+               .outerjoin(paid, and_(paid.c.seller_id == customers.c.seller_id,
+                                     paid.c.customer_id == customers.c.id))
+               .where(in_range(customers.c.seller_id, customers.c.id),
+                      customers.c.balance != derived))
+    if not fix:
+        return drifted.order_by(customers.c.seller_id, customers.c.id)
+
+    drifted = drifted.subquery('drifted')
+    return (update(customers)
+            .where(customers.c.seller_id == drifted.c.seller_id,
+                   customers.c.id == drifted.c.customer_id)
+            .values(balance=drifted.c.derived)
+            .returning(drifted.c.customer_id, drifted.c.seller_id, drifted.c.stored,
+                       drifted.c.derived))
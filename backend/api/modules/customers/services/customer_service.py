@@ -0,0 +1,165 @@
+"""
+This module contains the CustomerService class, which provides methods for managing the
+customers of a seller and the payments of their debts. The balance of a customer is a
+running total: every sale on credit and every payment changes it with a single UPDATE in
+its own transaction, so reading it never sums the history of the customer.
+"""
+import uuid
+from decimal import Decimal
+
+from pydantic import TypeAdapter
+from sqlalchemy import Row, Update, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.modules.customers.models.Customer import Customer
+from api.modules.customers.models.CustomerPayment import CustomerPayment
+from api.modules.customers.schemas.customer_schema import (CustomerCreateRequest,
+                                                           CustomerResponse,
+                                                           DebtorListResponse,
+                                                           PaymentCreateRequest)
+from api.shared.exceptions.not_found_exception import NotFoundException
+from api.shared.handlers.database_handler import handle_database_exceptions
+
+CUSTOMER_LIST_ADAPTER = TypeAdapter(list[CustomerResponse])
+
+class CustomerService:
+    """
+    A service class for handling the customers of a seller.
+
+    Every method takes the seller making the request and only ever sees that seller's
+    customers: a customer of another seller is reported as not found.
+
+    Attributes:
+        session (AsyncSession): An instance of AsyncSession for database transactions.
+    """
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @handle_database_exceptions
+    async def create_customer(self, seller_id: uuid.UUID,
+                              data_customer: CustomerCreateRequest) -> Customer:
+        """
+        Creates a new customer for a seller, with a zero balance.
+
+        Args:
+            seller_id (uuid.UUID): The seller of the customer.
+            data_customer (CustomerCreateRequest): The customer data validated by pydantic.
+
+        Returns:
+            Customer: The new customer.
+
+        Raises:
+            DataBaseTransactionException: If the seller does not exist.
+        """
+        customer = Customer(seller_id=seller_id, **data_customer.model_dump())
+        self.session.add(customer)
+        await self.session.commit()
+        await self.session.refresh(customer)
+
+        return customer
+
+    @handle_database_exceptions
+    async def get_customer(self, seller_id: uuid.UUID, customer_id: uuid.UUID) -> Customer:
+        """
+        Fetches a customer of a seller, with their current balance.
+
+        Args:
+            seller_id (uuid.UUID): The seller of the customer.
+            customer_id (uuid.UUID): The identifier of the customer.
+
+        Returns:
+            Customer: The customer.
+
+        Raises:
+            NotFoundException: If the seller has no such customer.
+        """
+        result = await self.session.execute(
+            select(Customer).where(Customer.seller_id == seller_id, Customer.id == customer_id))
+        customer = result.scalar_one_or_none()
+        if customer is None:
+            raise NotFoundException(f'Key (id)=({customer_id}) Customer not found.')
+
+        return customer
+
+    @handle_database_exceptions
+    async def list_debtors(self, seller_id: uuid.UUID, limit: int) -> DebtorListResponse:
+        """
+        Fetches the customers who owe a seller the most, largest balance first.
+
+        The query reads the top of the ix_customers_seller_id_balance index and stops after
+        limit rows, however many customers the seller has.
+
+        Args:
+            seller_id (uuid.UUID): The seller of the customers.
+            limit (int): The maximum number of customers.
+
+        Returns:
+            DebtorListResponse: The customers with a positive balance.
+        """
+        table = Customer.__table__
+        statement = (select(*(table.c[field] for field in CustomerResponse.model_fields))
+                     .where(table.c.seller_id == seller_id, table.c.balance > 0)
+                     .order_by(table.c.balance.desc(), table.c.id)
+                     .limit(limit))
+
+        connection = await self.session.connection()
+        rows = (await connection.execute(statement)).mappings().all()
+
+        return DebtorListResponse(items=CUSTOMER_LIST_ADAPTER.validate_python(rows))
+
+    @handle_database_exceptions
+    async def add_payment(self, seller_id: uuid.UUID, customer_id: uuid.UUID,
+                          data_payment: PaymentCreateRequest) -> Row:
+        """
+        Records a payment of a customer and takes it from their balance, in one transaction.
+
+        A payment larger than the balance leaves the customer with a credit.
+
+        Args:
+            seller_id (uuid.UUID): The seller of the customer.
+            customer_id (uuid.UUID): The identifier of the customer.
+            data_payment (PaymentCreateRequest): The payment validated by pydantic.
+
+        Returns:
+            Row: The identifier and the new balance of the customer.
+
+        Raises:
+            NotFoundException: If the seller has no such customer.
+        """
+        result = await self.session.execute(
+            build_balance_increment(seller_id, customer_id, -data_payment.amount))
+        balance = result.one_or_none()
+        if balance is None:
+            await self.session.rollback()
+            raise NotFoundException(f'Key (id)=({customer_id}) Customer not found.')
+        await self.session.execute(insert(CustomerPayment.__table__).values(
+            seller_id=seller_id, customer_id=customer_id, amount=data_payment.amount))
+        await self.session.commit()
+
+        return balance
+
+def build_balance_increment(seller_id: uuid.UUID, customer_id: uuid.UUID,
+                            amount: Decimal) -> Update:
+    """
+    Builds the UPDATE customers statement that adds an amount to the balance of a customer
+    of a seller.
+
+    Every change of a balance must go through this statement, in the same transaction as
+    the sale or payment it accounts for.
+
+    Args:
+        seller_id (uuid.UUID): The seller of the customer.
+        customer_id (uuid.UUID): The identifier of the customer.
+        amount (Decimal): The amount owed, negative for a payment.
+
+    Returns:
+        Update: The statement, returning the identifier and new balance of the customer,
+        or no row if the seller has no such customer.
+    """
+    table = Customer.__table__
+    return (
+        update(table)
+        .where(table.c.seller_id == seller_id, table.c.id == customer_id)
+        .values(balance=table.c.balance + amount)
+        .returning(table.c.id, table.c.balance)
+    )
@@ -0,0 +1,59 @@
+"""
+This module defines the routing for the live feed of the sales and stock changes of the
+seller making the request in the FastAPI application, over Server-Sent Events or a
+WebSocket. It utilizes the seller feed of the feed module, which listens to the database
+once per worker, so open dashboards do not poll the database.
+"""
+import uuid
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from api.shared.configs.settings import settings
+from api.shared.database.dependencies import get_seller_id
+from api.modules.feed.services.seller_feed import feed_events, seller_feed
+
+router = APIRouter()
+
+@router.get('/events',
+            response_class=StreamingResponse,
+            status_code=status.HTTP_200_OK,
+            summary='Stream sales and stock events',
+            tags=['feed'])
+async def stream_events(seller_id: uuid.UUID = Depends(get_seller_id)) -> StreamingResponse:
+    """
+    Stream the sales and stock changes of the seller as Server-Sent Events.
+
+    Args:
+        seller_id (uuid.UUID): The seller making the request.
+
+    Returns:
+        StreamingResponse: One event per sale and per stock change, as they are committed.
+    """
+    return StreamingResponse(feed_events(seller_id), media_type='text/event-stream',
+                             headers={'Cache-Control': 'no-cache',
+                                      'X-Accel-Buffering': 'no'})
+
+@router.websocket('/ws')
+async def websocket_events(websocket: WebSocket,
+                           seller_id: uuid.UUID = Depends(get_seller_id)) -> None:
+    """
+    Send the sales and stock changes of the seller over a WebSocket, one JSON text message
+    per event, with a ping message on every heartbeat without events.
+
+    The socket is closed with code 1013, try again later, when the subscriber falls behind,
+    and with code 1001, going away, when the worker shuts down.
+
+    Args:
+        websocket (WebSocket): The connection.
+        seller_id (uuid.UUID): The seller making the request.
+    """
+    await websocket.accept()
+    try:
+        async with seller_feed.subscribe(seller_id) as subscription:
+            async for payload in subscription.events(settings.FEED_HEARTBEAT_SECONDS):
+                await websocket.send_text(payload if payload is not None else '{"type":"ping"}')
+    except (WebSocketDisconnect, OSError):
+        # The client left; servers report a send to a closed socket as an OSError.
+        return
+    await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER if subscription.dropped
+                          else status.WS_1001_GOING_AWAY)
@@ -0,0 +1,271 @@
+"""
+This module contains the SellerFeed class, which pushes the sales and stock changes of the
+sellers to their open dashboards. Each worker holds a single dedicated connection listening
+on the seller_feed channel, whatever the number of dashboards connected to it, and fans the
+notifications out to the subscribers of their seller through in-memory queues, so open
+dashboards no longer poll the database.
+
+Available Functions:
+- feed_events(seller_id) -> AsyncGenerator[bytes, None]: The Server-Sent Events stream of
+  a seller.
+"""
+import asyncio
+import logging
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, Optional
+
+import asyncpg
+import orjson
+
+from api.shared.configs.settings import settings
+from api.shared.database.connection import connect_listener
+from api.shared.database.feed_notifications import FEED_CHANNEL
+from api.utils.background_worker import BackgroundWorker
+
+logger = logging.getLogger(__name__)
+
+class FeedSubscription:
+    """
+    The queue of the events of a seller waiting to be sent to one subscriber.
+
+    The queue is bounded: a subscriber that does not keep up is dropped once its queue is
+    full, instead of holding an ever-growing backlog in memory or slowing the fan-out down
+    for everybody else. A dropped subscriber has missed events and must reload its data
+    before subscribing again.
+
+    Attributes:
+        seller_id (str): The seller whose events are received.
+        dropped (bool): Whether the subscription ended because the subscriber fell behind.
+    """
+    # Queued in place of an event to end the subscription.
+    END = None
+
+    def __init__(self, seller_id: str, max_queued: int):
+        self.seller_id = seller_id
+        self.dropped = False
+        self._queue: asyncio.Queue[Optional[str]] = asyncio.Queue(max_queued + 1)
+        self._max_queued = max_queued
+
+    def offer(self, payload: str) -> bool:
+        """
+        Queues an event without waiting.
+
+        Args:
+            payload (str): The JSON payload of the event.
+
+        Returns:
+            bool: False if the queue is full, in which case the event is not queued.
+        """
+        if self._queue.qsize() >= self._max_queued:
+            return False
+        self._queue.put_nowait(payload)
+        return True
+
+    def end(self, dropped: bool = False) -> None:
+        """
+        Ends the subscription, discarding the queued events if it is dropped.
+
+        Args:
+            dropped (bool): Whether the subscriber fell behind.
+        """
+        if dropped:
+            self.dropped = True
+            while not self._queue.empty():
+                self._queue.get_nowait()
+        self._queue.put_nowait(self.END)
+
+    async def events(self, heartbeat: float) -> AsyncIterator[Optional[str]]:
+        """
+        Yields the events as they arrive, until the subscription ends.
+
+        Args:
+            heartbeat (float): The time, in seconds, after which None is yielded if no event
+            arrived, so the caller can keep an idle connection alive.
+
+        Yields:
+            Optional[str]: The JSON payload of the next event, or None on a heartbeat.
+        """
+        while True:
+            try:
+                payload = await asyncio.wait_for(self._queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            if payload is self.END:
+                return
+            yield payload
+
+class SellerFeed(BackgroundWorker):
+    """
+    A background task listening to the seller_feed channel and fanning the notifications
+    out to the subscribers of their seller.
+
+    The listening connection is opened outside of the engine pool and checked every check
+    interval. When it is lost, every subscriber is ended, as the notifications sent in the
+    meantime are lost, and the connection is opened again. Notifications are dispatched in
+    the callback of the connection, with one lookup of the subscribers of their seller and
+    one non-blocking put per subscriber, so a single notification never waits for any
+    subscriber.
+
+    Attributes:
+        max_queued (int): The maximum number of events queued per subscriber.
+    """
+    def __init__(self, max_queued: int, check_interval_ms: int):
+        super().__init__(check_interval_ms)
+        self.max_queued = max_queued
+        self._subscribers: dict[str, set[FeedSubscription]] = {}
+        self._connection: Optional[asyncpg.Connection] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        """
+        The number of subscribers of every seller.
+        """
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    async def on_start(self) -> None:
+        """
+        Opens the listening connection. If the database cannot be reached, the connection is
+        opened by the next check.
+        """
+        await self._listen()
+
+    async def on_stop(self) -> None:
+        """
+        Closes the listening connection and ends every subscription.
+        """
+        await self._close()
+        self._end_all()
+
+    async def run_once(self) -> None:
+        """
+        Opens the listening connection again if it was lost, ending every subscription.
+        """
+        if self._connection is not None:
+            try:
+                await asyncio.wait_for(self._connection.execute('SELECT 1'), self.interval)
+                return
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError,
+                    asyncpg.InterfaceError):
+                logger.warning('Lost the seller feed connection, listening again.')
+            await self._close()
+            self._end_all(dropped=True)
+        await self._listen()
+
+    @asynccontextmanager
+    async def subscribe(self, seller_id: uuid.UUID) -> AsyncIterator[FeedSubscription]:
+        """
+        Subscribes to the events of a seller for the duration of the context.
+
+        Args:
+            seller_id (uuid.UUID): The seller whose events are received.
+
+        Yields:
+            FeedSubscription: The subscription.
+        """
+        subscription = FeedSubscription(str(seller_id), self.max_queued)
+        self._subscribers.setdefault(subscription.seller_id, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._remove(subscription)
+
+    def publish(self, payload: str) -> None:
+        """
+        Queues an event for every subscriber of its seller, dropping those who fell behind.
+
+        Args:
+            payload (str): The JSON payload of the notification, with its seller_id.
+        """
+        try:
+            seller_id = orjson.loads(payload)['seller_id']
+        except (orjson.JSONDecodeError, KeyError, TypeError):
+            logger.warning('Ignoring malformed seller feed notification: %s', payload[:200])
+            return
+        for subscription in list(self._subscribers.get(seller_id, ())):
+            if not subscription.offer(payload):
+                logger.warning('Dropping a subscriber of seller %s that fell behind.',
+                               seller_id)
+                self._remove(subscription)
+                subscription.end(dropped=True)
+
+    def _on_notification(self, _connection: asyncpg.Connection, _pid: int, _channel: str,
+                         payload: str) -> None:
+        """
+        The callback of the listening connection.
+        """
+        self.publish(payload)
+
+    def _on_termination(self, _connection: asyncpg.Connection) -> None:
+        """
+        Requests a check as soon as the listening connection is closed.
+        """
+        self.wake()
+
+    def _remove(self, subscription: FeedSubscription) -> None:
+        """
+        Removes a subscriber, and its seller once it has no subscriber left.
+        """
+        subscribers = self._subscribers.get(subscription.seller_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.seller_id]
+
+    def _end_all(self, dropped: bool = False) -> None:
+        """
+        Ends every subscription.
+        """
+        subscribers, self._subscribers = self._subscribers, {}
+        for subscriptions in subscribers.values():
+            for subscription in subscriptions:
+                subscription.end(dropped)
+
+    async def _listen(self) -> None:
+        """
+        Opens the listening connection, logging the failure if the database is unreachable.
+        """
+        try:
+            connection = await connect_listener()
+            await connection.add_listener(FEED_CHANNEL, self._on_notification)
+        except (OSError, asyncpg.PostgresError) as exc:
+            logger.warning('Failed to listen to the seller feed, retrying later: %s', exc)
+            return
+        connection.add_termination_listener(self._on_termination)
+        self._connection = connection
+
+    async def _close(self) -> None:
+        """
+        Closes the listening connection, if any.
+        """
+        connection, self._connection = self._connection, None
+        if connection is not None and not connection.is_closed():
+            connection.remove_termination_listener(self._on_termination)
+            await connection.close()
+
+seller_feed = SellerFeed(settings.FEED_QUEUE_SIZE, settings.FEED_CHECK_INTERVAL_MS)
+
+async def feed_events(seller_id: uuid.UUID) -> AsyncGenerator[bytes, None]:
+    """
+    Streams the events of a seller as Server-Sent Events.
+
+    A comment is sent once subscribed and on every heartbeat without events, so proxies
+    keep the connection open. A subscriber dropped for falling behind receives a dropped
+    event before the stream ends, telling the dashboard to reload its data and reconnect.
+
+    Args:
+        seller_id (uuid.UUID): The seller whose events are streamed.
+
+    Yields:
+        bytes: The encoded events.
+    """
+    async with seller_feed.subscribe(seller_id) as subscription:
+        yield b': subscribed\n\n'
+        async for payload in subscription.events(settings.FEED_HEARTBEAT_SECONDS):
+            if payload is None:
+                yield b': heartbeat\n\n'
+            else:
+                yield b'data: ' + payload.encode() + b'\n\n'
+        if subscription.dropped:
+            yield b'event: dropped\ndata: {}\n\n'
@@ -0,0 +1,71 @@
+"""
+This module defines the Product model, the items a seller keeps in stock and sells.
+It sets up the SQLAlchemy ORM mappings for the products table in the database
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+from sqlalchemy import (DDL, String, Integer, Numeric, DateTime, CheckConstraint, Computed, Index,
+                        event, func)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.shared.database.catalog_search import (CATALOG_SELLER_QUERY_FUNCTION,
+                                                CATALOG_SELLER_TERMS_FUNCTION,
+                                                CATALOG_UNACCENT_FUNCTION, SEARCH_VECTOR)
+from api.shared.database.connection import Base
+from api.shared.database.feed_notifications import STOCK_FEED_FUNCTION, STOCK_FEED_TRIGGER
+from api.shared.database.change_tracking import track_changes
+from api.shared.database.mixins import (ChangeTrackedMixin, SellerOwnedMixin,
+                                        UUIDv7PrimaryKeyMixin)
+
+class Product(SellerOwnedMixin, UUIDv7PrimaryKeyMixin, ChangeTrackedMixin, Base):
+    """
+    Product model for storing the products of a seller in the 'products' table in the
+    database.
+
+    The stock quantity can never become negative: the CHECK constraint backs the
+    conditional UPDATE statements that decrement it. The seller is a user, who cannot be
+    deleted or archived while owning products. A product whose quantity is at or below its
+    optional low stock threshold is low on stock. The name is indexed for the catalog
+    search in the generated search_vector column, which is deferred: it is only read by the
+    search queries, never loaded with the product.
+    """
+    __tablename__ = "products"
+    __table_args__ = (
+        CheckConstraint('quantity >= 0', name='ck_products_quantity_non_negative'),
+        CheckConstraint('price >= 0', name='ck_products_price_non_negative'),
+        CheckConstraint('low_stock_threshold >= 0',
+                        name='ck_products_low_stock_threshold_non_negative'),
+    )
+
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    price: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
+    quantity: Mapped[int] = mapped_column(Integer(), nullable=False, server_default='0')
+    low_stock_threshold: Mapped[Optional[int]] = mapped_column(Integer(), nullable=True)
+    date_created: Mapped[datetime] = mapped_column(DateTime(timezone=True),
+                                                   nullable=False, default=func.now()) # pylint: disable=not-callable
+    search_vector: Mapped[str] = mapped_column(TSVECTOR(), Computed(SEARCH_VECTOR, persisted=True),
+                                               nullable=False, deferred=True)
+
+# Only the products low on stock are indexed, so the dashboard listing reads a few entries
+# instead of filtering the whole catalog of the seller.
+Index('ix_products_low_stock', Product.seller_id, Product.quantity, Product.id,
+      postgresql_where=Product.quantity <= Product.low_stock_threshold)
+# The catalog search reads the index entries of the terms of one seller only.
+Index('ix_products_search_terms', func.catalog_seller_terms(Product.seller_id,
+                                                            Product.search_vector),
+      postgresql_using='gin')
+# Every stock movement is a change, so devices see the stock of a product after each sale.
+Index('ix_products_seller_id_change_xid', Product.seller_id, Product.change_xid)
+track_changes(Product.__table__, 'product')
+
+# The generated column and the search index call the catalog search functions, which must
+# exist before the table.
+for function in (CATALOG_UNACCENT_FUNCTION, CATALOG_SELLER_TERMS_FUNCTION,
+                 CATALOG_SELLER_QUERY_FUNCTION):
+    event.listen(Product.__table__, 'before_create', DDL(function))
+
+# Stock movements are published to the seller feed.
+event.listen(Product.__table__, 'after_create', DDL(STOCK_FEED_FUNCTION))
+event.listen(Product.__table__, 'after_create', DDL(STOCK_FEED_TRIGGER))
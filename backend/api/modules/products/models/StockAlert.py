@@ -0,0 +1,49 @@
+"""
+This module defines the StockAlert model, the notices sent to a seller when a product runs
+low on stock.
+It sets up the SQLAlchemy ORM mappings for the stock_alerts table in the database
+"""
+import uuid
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Integer, DateTime, ForeignKey, ForeignKeyConstraint, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.shared.database.connection import Base
+from api.shared.database.mixins import UUIDv7PrimaryKeyMixin
+
+class StockAlert(UUIDv7PrimaryKeyMixin, Base):
+    """
+    StockAlert model for storing the low stock alerts of products in the 'stock_alerts'
+    table in the database.
+
+    The table is an outbox: an alert is inserted in the same transaction as the stock
+    decrement that took its product to or below its threshold, and date_delivered is set
+    once the stock alert dispatcher has delivered it to the seller. A product has at most
+    one pending alert at a time.
+    """
+    __tablename__ = "stock_alerts"
+    __table_args__ = (
+        ForeignKeyConstraint(['seller_id', 'product_id'],
+                             ['products.seller_id', 'products.id'],
+                             name='stock_alerts_product_id_fkey', ondelete='CASCADE'),
+    )
+
+    seller_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True),
+                                                 ForeignKey('users.id', ondelete='CASCADE'),
+                                                 nullable=False)
+    product_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    quantity: Mapped[int] = mapped_column(Integer(), nullable=False)
+    threshold: Mapped[int] = mapped_column(Integer(), nullable=False)
+    date_created: Mapped[datetime] = mapped_column(DateTime(timezone=True),
+                                                   nullable=False, default=func.now()) # pylint: disable=not-callable
+    date_delivered: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True),
+                                                               nullable=True)
+
+# Deduplicates alerts: a product already waiting for delivery gets no second alert.
+Index('ux_stock_alerts_pending_product_id', StockAlert.product_id, unique=True,
+      postgresql_where=StockAlert.date_delivered.is_(None))
+# The dispatcher reads the pending alerts in order, and only them.
+Index('ix_stock_alerts_pending_id', StockAlert.id,
+      postgresql_where=StockAlert.date_delivered.is_(None))
@@ -0,0 +1,247 @@
+"""
+This module defines the routing for product-related operations in the FastAPI application.
+It utilizes dependencies from the shared database module and services from the product
+module to create, read, list and search the products of the seller making the request, to
+add units to or take units from their stock and to follow the products low on stock.
+"""
+import uuid
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.shared.configs.settings import settings
+from api.shared.database.dependencies import get_seller_id, get_seller_session
+from api.modules.products.services.product_service import ProductService
+from api.modules.products.schemas.product_schema import (ProductCreateRequest, ProductResponse,
+                                                         ProductListResponse,
+                                                         ProductStockResponse,
+                                                         LowStockListResponse,
+                                                         ProductSearchResponse,
+                                                         LowStockThresholdRequest,
+                                                         StockChangeRequest)
+
+router = APIRouter()
+
+@router.post('/',
+             response_model=ProductResponse,
+             status_code=status.HTTP_201_CREATED,
+             summary='Create new product',
+             tags=['products'])
+async def create_product(data_product: ProductCreateRequest,
+                         seller_id: uuid.UUID = Depends(get_seller_id),
+                         db: AsyncSession = Depends(get_seller_session)
+                         ) -> ProductResponse:
+    """
+    Create a new product for the seller making the request.
+
+    Args:
+        data_product (ProductCreateRequest): The product data, validated by pydantic.
+        seller_id (uuid.UUID): The seller making the request.
+        db (AsyncSession): The database session dependency, scoped to the seller.
+
+    Returns:
+        ProductResponse: The created product.
+
+    Raises:
+        HTTPException: 400 if the seller does not exist.
+    """
+    product_service = ProductService(db)
+    product = await product_service.create_product(seller_id, data_product)
+    return ProductResponse.model_validate(product)
+
+@router.get('/',
+            response_model=ProductListResponse,
+            status_code=status.HTTP_200_OK,
+            summary='List products',
+            tags=['products'])
+async def list_products(limit: int = Query(settings.PRODUCT_LIST_DEFAULT_LIMIT, ge=1,
+                                           le=settings.PRODUCT_LIST_MAX_LIMIT),
+                        after: Optional[uuid.UUID] = Query(
+                            None, description='The next_after cursor of the previous page.'),
+                        seller_id: uuid.UUID = Depends(get_seller_id),
+                        db: AsyncSession = Depends(get_seller_session)
+                        ) -> Response:
+    """
+    List the products of the seller ordered by identifier, one keyset page at a time.
+
+    Args:
+        limit (int): The maximum number of products in the page.
+        after (Optional[uuid.UUID]): The cursor returned with the previous page.
+        seller_id (uuid.UUID): The seller making the request.
+        db (AsyncSession): The database session dependency, scoped to the seller.
+
+    Returns:
+        Response: The JSON encoded ProductListResponse.
+    """
+    product_service = ProductService(db)
+    page = await product_service.list_products(seller_id, limit, after)
+    return Response(content=page.model_dump_json(), media_type='application/json')
+
+@router.get('/low-stock',
+            response_model=LowStockListResponse,
+            status_code=status.HTTP_200_OK,
+            summary='List products low on stock',
+            tags=['products'])
+async def list_low_stock(limit: int = Query(settings.PRODUCT_LIST_DEFAULT_LIMIT, ge=1,
+                                            le=settings.PRODUCT_LIST_MAX_LIMIT),
+                         seller_id: uuid.UUID = Depends(get_seller_id),
+                         db: AsyncSession = Depends(get_seller_session)
+                         ) -> LowStockListResponse:
+    """
+    List the products of the seller at or below their low stock threshold, lowest quantity
+    first.
+
+    Args:
+        limit (int): The maximum number of products.
+        seller_id (uuid.UUID): The seller making the request.
+        db (AsyncSession): The database session dependency, scoped to the seller.
+
+    Returns:
+        LowStockListResponse: The products low on stock.
+    """
+    product_service = ProductService(db)
+    return await product_service.list_low_stock(seller_id, limit)
+
+@router.get('/search',
+            response_model=ProductSearchResponse,
+            status_code=status.HTTP_200_OK,
+            summary='Search products',
+            tags=['products'])
+async def search_products(q: str = Query(..., min_length=1, max_length=100,
+                                         description='The beginning of words of the name.'),
+                          limit: int = Query(settings.PRODUCT_SEARCH_DEFAULT_LIMIT, ge=1,
+                                             le=settings.PRODUCT_SEARCH_MAX_LIMIT),
+                          seller_id: uuid.UUID = Depends(get_seller_id),
+                          db: AsyncSession = Depends(get_seller_session)
+                          ) -> ProductSearchResponse:
+    """
+    Search the catalog of the seller by name, ignoring accents and matching the beginning of
+    words, so "pao fran" finds "Pão francês", best match first.
+
+    Args:
+        q (str): The search, as typed.
+        limit (int): The maximum number of products.
+        seller_id (uuid.UUID): The seller making the request.
+        db (AsyncSession): The database session dependency, scoped to the seller.
+
+    Returns:
+        ProductSearchResponse: The matching products, ranked by relevance.
+    """
+    product_service = ProductService(db)
+    return await product_service.search_products(seller_id, q, limit)
+
+@router.get('/{product_id}',
+            response_model=ProductResponse,
+            status_code=status.HTTP_200_OK,
+            summary='Get product',
+            tags=['products'])
+async def get_product(product_id: uuid.UUID,
+                      seller_id: uuid.UUID = Depends(get_seller_id),
+                      db: AsyncSession = Depends(get_seller_session)
+                      ) -> ProductResponse:
+    """
+    Get a product of the seller.
+
+    Args:
+        product_id (uuid.UUID): The identifier of the product.
+        seller_id (uuid.UUID): The seller making the request.
+        db (AsyncSession): The database session dependency, scoped to the seller.
+
+    Returns:
+        ProductResponse: The product.
+
+    Raises:
+        HTTPException: 404 if the seller has no such product.
+    """
+    product_service = ProductService(db)
+    product = await product_service.get_product(seller_id, product_id)
+    return ProductResponse.model_validate(product)
+
+@router.put('/{product_id}/low-stock-threshold',
+            response_model=ProductResponse,
+            status_code=status.HTTP_200_OK,
+            summary='Change the low stock threshold of a product',
+            tags=['products'])
+async def set_low_stock_threshold(product_id: uuid.UUID,
+                                  data: LowStockThresholdRequest,
+                                  seller_id: uuid.UUID = Depends(get_seller_id),
+                                  db: AsyncSession = Depends(get_seller_session)
+                                  ) -> ProductResponse:
+    """
+    Change the low stock threshold of a product, or turn its low stock alerts off with null.
+
+    Args:
+        product_id (uuid.UUID): The identifier of the product.
+        data (LowStockThresholdRequest): The new threshold.
+        seller_id (uuid.UUID): The seller making the request.
+        db (AsyncSession): The database session dependency, scoped to the seller.
+
+    Returns:
+        ProductResponse: The updated product.
+
+    Raises:
+        HTTPException: 404 if the seller has no such product.
+    """
+    product_service = ProductService(db)
+    product = await product_service.set_low_stock_threshold(seller_id, product_id,
+                                                            data.low_stock_threshold)
+    return ProductResponse.model_validate(product)
+
+@router.post('/{product_id}/stock/decrement',
+             response_model=ProductStockResponse,
+             status_code=status.HTTP_200_OK,
+             summary='Take units from the stock of a product',
+             tags=['products'])
+async def decrement_stock(product_id: uuid.UUID,
+                          data: StockChangeRequest,
+                          seller_id: uuid.UUID = Depends(get_seller_id),
+                          db: AsyncSession = Depends(get_seller_session)
+                          ) -> ProductStockResponse:
+    """
+    Take units from the stock of a product, atomically and only if enough are left.
+
+    Args:
+        product_id (uuid.UUID): The identifier of the product.
+        data (StockChangeRequest): The number of units to take.
+        seller_id (uuid.UUID): The seller making the request.
+        db (AsyncSession): The database session dependency, scoped to the seller.
+
+    Returns:
+        ProductStockResponse: The remaining stock of the product.
+
+    Raises:
+        HTTPException: 404 if the seller has no such product, 409 if fewer units are in
+        stock.
+    """
+    product_service = ProductService(db)
+    stock = await product_service.decrement_stock(seller_id, product_id, data.quantity)
+    return ProductStockResponse.model_validate(stock)
+
+@router.post('/{product_id}/stock/increment',
+             response_model=ProductStockResponse,
+             status_code=status.HTTP_200_OK,
+             summary='Add units to the stock of a product',
+             tags=['products'])
+async def increment_stock(product_id: uuid.UUID,
+                          data: StockChangeRequest,
+                          seller_id: uuid.UUID = Depends(get_seller_id),
+                          db: AsyncSession = Depends(get_seller_session)
+                          ) -> ProductStockResponse:
+    """
+    Add units to the stock of a product.
+
+    Args:
+        product_id (uuid.UUID): The identifier of the product.
+        data (StockChangeRequest): The number of units to add.
+        seller_id (uuid.UUID): The seller making the request.
+        db (AsyncSession): The database session dependency, scoped to the seller.
+
+    Returns:
+        ProductStockResponse: The new stock of the product.
+
+    Raises:
+        HTTPException: 404 if the seller has no such product.
+    """
+    product_service = ProductService(db)
+    stock = await product_service.increment_stock(seller_id, product_id, data.quantity)
+    return ProductStockResponse.model_validate(stock)
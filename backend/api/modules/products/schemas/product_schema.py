@@ -0,0 +1,118 @@
+"""
+This module defines the Pydantic schemas for product-related operations. These schemas are
+used for validating the data sent to the product endpoints and for responding with products
+and their stock.
+"""
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import Annotated, Optional
+from pydantic import Field
+
+from api.shared.configs.base_schema import BaseSchema
+from api.shared.configs.settings import settings
+
+class ProductCreateRequest(BaseSchema):
+    """
+    A schema for product creation requests. The seller is not part of the body: products are
+    always created for the seller making the request.
+    """
+    name: Annotated[
+        str,
+        Field(..., min_length=2, max_length=100,
+              description='Name must be between 2 and 100 characters.')]
+    price: Annotated[
+        Decimal,
+        Field(..., ge=0, max_digits=12, decimal_places=2,
+              description='The unit price, with at most two decimal places.')]
+    quantity: Annotated[
+        int,
+        Field(0, ge=0, description='The initial stock quantity.')]
+    low_stock_threshold: Annotated[
+        Optional[int],
+        Field(None, ge=0,
+              description='The quantity at or below which the product is low on stock.')]
+
+class ProductResponse(BaseSchema):
+    """
+    A schema for responding with product data.
+    """
+    id: Annotated[
+        uuid.UUID,
+        Field(description='The unique identifier for the product.')]
+    seller_id: Annotated[
+        uuid.UUID,
+        Field(description='The user who sells the product.')]
+    name: Annotated[
+        str,
+        Field(description='The name of the product.')]
+    price: Annotated[
+        Decimal,
+        Field(description='The unit price of the product.')]
+    quantity: Annotated[
+        int,
+        Field(description='The quantity in stock.')]
+    low_stock_threshold: Annotated[
+        Optional[int],
+        Field(description='The quantity at or below which the product is low on stock.')]
+    date_created: Annotated[
+        datetime,
+        Field(description='The date and time when the product was created.')]
+
+class ProductListResponse(BaseSchema):
+    """
+    A schema for a page of products, ordered by identifier.
+    """
+    items: Annotated[
+        list[ProductResponse],
+        Field(description='The products of the page.')]
+    next_after: Annotated[
+        Optional[uuid.UUID],
+        Field(description='The cursor of the next page, or null on the last page.')]
+
+class LowStockListResponse(BaseSchema):
+    """
+    A schema for the products of a seller that are low on stock, lowest quantity first.
+    """
+    items: Annotated[
+        list[ProductResponse],
+        Field(description='The products at or below their low stock threshold.')]
+
+class ProductSearchResponse(BaseSchema):
+    """
+    A schema for the products whose name matches a catalog search, best match first.
+    """
+    items: Annotated[
+        list[ProductResponse],
+        Field(description='The matching products, ranked by relevance.')]
+
+class LowStockThresholdRequest(BaseSchema):
+    """
+    A schema for changing the low stock threshold of a product. A null threshold turns the
+    low stock alerts of the product off.
+    """
+    low_stock_threshold: Annotated[
+        Optional[int],
+        Field(..., ge=0,
+              description='The quantity at or below which the product is low on stock.')]
+
+class StockChangeRequest(BaseSchema):
+    """
+    A schema for stock movements. The quantity is always positive; the endpoint tells
+    whether it is added to or taken from the stock.
+    """
+    quantity: Annotated[
+        int,
+        Field(..., gt=0, le=settings.STOCK_CHANGE_MAX_QUANTITY,
+              description='The number of units to add or remove.')]
+
+class ProductStockResponse(BaseSchema):
+    """
+    A schema for responding with the stock of a product after a movement.
+    """
+    id: Annotated[
+        uuid.UUID,
+        Field(description='The unique identifier for the product.')]
+    quantity: Annotated[
+        int,
+        Field(description='The quantity in stock after the movement.')]
@@ -0,0 +1,398 @@
+"""
+This module contains the ProductService class, which provides methods for managing the
+products of a seller and their stock. Stock movements are single conditional UPDATE ...
+RETURNING statements: the check and the write happen atomically in the database, so
+concurrent sales of the same product can never oversell it, and no row is locked for
+longer than the statement itself. The same statements tell whether a product has just
+reached its low stock threshold, which raises a low stock alert.
+"""
+import uuid
+from typing import Optional
+
+from pydantic import TypeAdapter
+from sqlalchemy import (ColumnElement, Integer, Row, Select, Update, and_, column, func,
+                        literal, select, update, values)
+from sqlalchemy.dialects.postgresql import REGCONFIG, UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.modules.products.models.Product import Product
+from api.modules.products.schemas.product_schema import (LowStockListResponse,
+                                                         ProductCreateRequest,
+                                                         ProductListResponse, ProductResponse,
+                                                         ProductSearchResponse)
+from api.modules.products.services.stock_alert_dispatcher import (build_stock_alert_insert,
+                                                                  stock_alert_dispatcher)
+from api.shared.database.catalog_search import (SEARCH_CONFIG, build_prefix_query,
+                                                search_words)
+from api.shared.exceptions.not_found_exception import NotFoundException
+from api.shared.exceptions.stock_exception import InsufficientStockException
+from api.shared.handlers.database_handler import handle_database_exceptions
+
+PRODUCT_LIST_ADAPTER = TypeAdapter(list[ProductResponse])
+
+class ProductService:
+    """
+    A service class for handling the products of a seller.
+
+    Every method takes the seller making the request and only ever sees that seller's
+    products: a product of another seller is reported as not found.
+
+    Attributes:
+        session (AsyncSession): An instance of AsyncSession for database transactions.
+    """
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @handle_database_exceptions
+    async def create_product(self, seller_id: uuid.UUID,
+                             data_product: ProductCreateRequest) -> Product:
+        """
+        Creates a new product for a seller.
+
+        Args:
+            seller_id (uuid.UUID): The seller of the product.
+            data_product (ProductCreateRequest): The product data validated by pydantic.
+
+        Returns:
+            Product: The new product.
+
+        Raises:
+            DataBaseTransactionException: If the seller does not exist.
+        """
+        product = Product(seller_id=seller_id, **data_product.model_dump())
+        self.session.add(product)
+        await self.session.commit()
+        await self.session.refresh(product)
+
+        return product
+
+    @handle_database_exceptions
+    async def get_product(self, seller_id: uuid.UUID, product_id: uuid.UUID) -> Product:
+        """
+        Fetches a product of a seller.
+
+        Args:
+            seller_id (uuid.UUID): The seller of the product.
+            product_id (uuid.UUID): The identifier of the product.
+
+        Returns:
+            Product: The product.
+
+        Raises:
+            NotFoundException: If the seller has no such product.
+        """
+        result = await self.session.execute(
+            select(Product).where(Product.seller_id == seller_id, Product.id == product_id))
+        product = result.scalar_one_or_none()
+        if product is None:
+            raise NotFoundException(f'Key (id)=({product_id}) Product not found.')
+
+        return product
+
+    @handle_database_exceptions
+    async def list_products(self, seller_id: uuid.UUID, limit: int,
+                            after: Optional[uuid.UUID] = None) -> ProductListResponse:
+        """
+        Fetches a page of the products of a seller ordered by identifier, using keyset
+        pagination on the (seller_id, id) index.
+
+        Args:
+            seller_id (uuid.UUID): The seller of the products.
+            limit (int): The maximum number of products in the page.
+            after (Optional[uuid.UUID]): The last identifier of the previous page.
+
+        Returns:
+            ProductListResponse: The products of the page and the cursor of the next one.
+        """
+        table = Product.__table__
+        statement = (select(*(table.c[field] for field in ProductResponse.model_fields))
+                     .where(table.c.seller_id == seller_id))
+        if after is not None:
+            statement = statement.where(table.c.id > after)
+        statement = statement.order_by(table.c.id).limit(limit + 1)
+
+        connection = await self.session.connection()
+        rows = (await connection.execute(statement)).mappings().all()
+        items = PRODUCT_LIST_ADAPTER.validate_python(rows[:limit])
+        next_after = items[-1].id if len(rows) > limit else None
+
+        return ProductListResponse(items=items, next_after=next_after)
+
+    @handle_database_exceptions
+    async def list_low_stock(self, seller_id: uuid.UUID, limit: int) -> LowStockListResponse:
+        """
+        Fetches the products of a seller that are at or below their low stock threshold,
+        lowest quantity first.
+
+        The query reads the partial index ix_products_low_stock, which only holds the
+        products low on stock, so it does not depend on the size of the catalog.
+
+        Args:
+            seller_id (uuid.UUID): The seller of the products.
+            limit (int): The maximum number of products.
+
+        Returns:
+            LowStockListResponse: The products low on stock.
+        """
+        table = Product.__table__
+        statement = (select(*(table.c[field] for field in ProductResponse.model_fields))
+                     .where(table.c.seller_id == seller_id,
+                            table.c.quantity <= table.c.low_stock_threshold)
+                     .order_by(table.c.quantity, table.c.id)
+                     .limit(limit))
+
+        connection = await self.session.connection()
+        rows = (await connection.execute(statement)).mappings().all()
+
+        return LowStockListResponse(items=PRODUCT_LIST_ADAPTER.validate_python(rows))
+
+    @handle_database_exceptions
+    async def search_products(self, seller_id: uuid.UUID, search: str,
+                              limit: int) -> ProductSearchResponse:
+        """
+        Searches the catalog of a seller for the products whose name has words starting with
+        every word of the search, ignoring accents, best match first.
+
+        The query reads the GIN index of the seller terms, which only holds the words of the
+        catalog of the seller under its prefix, and only the matching products are ranked
+        with ts_rank against their search_vector, so it depends on neither the size of the
+        catalog nor the other catalogs, but on the number of matches.
+
+        Args:
+            seller_id (uuid.UUID): The seller of the products.
+            search (str): The search, as typed.
+            limit (int): The maximum number of products.
+
+        Returns:
+            ProductSearchResponse: The matching products, ranked by relevance.
+        """
+        words = search_words(search)
+        if not words:
+            return ProductSearchResponse(items=[])
+
+        table = Product.__table__
+        seller_terms = func.catalog_seller_terms(table.c.seller_id, table.c.search_vector)
+        seller_query = func.catalog_seller_query(seller_id, ' '.join(words))
+        query = func.to_tsquery(literal(SEARCH_CONFIG).cast(REGCONFIG),
+                                func.catalog_unaccent(build_prefix_query(words)))
+        statement = (select(*(table.c[field] for field in ProductResponse.model_fields))
+                     .where(table.c.seller_id == seller_id,
+                            seller_terms.bool_op('@@')(seller_query))
+                     .order_by(func.ts_rank(table.c.search_vector, query).desc(),
+                               table.c.name, table.c.id)
+                     .limit(limit))
+
+        connection = await self.session.connection()
+        rows = (await connection.execute(statement)).mappings().all()
+
+        return ProductSearchResponse(items=PRODUCT_LIST_ADAPTER.validate_python(rows))
+
+    @handle_database_exceptions
+    async def set_low_stock_threshold(self, seller_id: uuid.UUID, product_id: uuid.UUID,
+                                      threshold: Optional[int]) -> Product:
+        """
+        Changes the low stock threshold of a product.
+
+        Alerts are only raised by stock decrements: a product already at or below its new
+        threshold is listed as low on stock, but is not alerted until its stock is
+        replenished above the threshold and taken below it again.
+
+        Args:
+            seller_id (uuid.UUID): The seller of the product.
+            product_id (uuid.UUID): The identifier of the product.
+            threshold (Optional[int]): The new threshold, or None to turn alerts off.
+
+        Returns:
+            Product: The updated product.
+
+        Raises:
+            NotFoundException: If the seller has no such product.
+        """
+        result = await self.session.execute(
+            update(Product)
+            .where(Product.seller_id == seller_id, Product.id == product_id)
+            .values(low_stock_threshold=threshold)
+            .returning(Product))
+        product = result.scalar_one_or_none()
+        if product is None:
+            await self.session.rollback()
+            raise NotFoundException(f'Key (id)=({product_id}) Product not found.')
+        await self.session.commit()
+
+        return product
+
+    @handle_database_exceptions
+    async def decrement_stock(self, seller_id: uuid.UUID, product_id: uuid.UUID,
+                              quantity: int) -> Row:
+        """
+        Takes units out of the stock of a product, only if enough are left.
+
+        The decrement is a single UPDATE ... SET quantity = quantity - :n WHERE quantity >= :n
+        RETURNING statement. Concurrent decrements of the same product queue on its row lock
+        for the duration of one statement only, and each one re-checks the condition against
+        the latest quantity, so the stock can never go below zero. When the decrement takes
+        the product to or below its low stock threshold, a low stock alert is written in the
+        same transaction and the stock alert dispatcher is woken up once it commits.
+
+        Args:
+            seller_id (uuid.UUID): The seller of the product.
+            product_id (uuid.UUID): The identifier of the product.
+            quantity (int): The number of units to take, greater than zero.
+
+        Returns:
+            Row: The identifier, the remaining quantity and the low stock threshold of the
+        product, and whether the decrement crossed the threshold.
+
+        Raises:
+            NotFoundException: If the seller has no such product.
+            InsufficientStockException: If fewer than quantity units are in stock.
+        """
+        table = Product.__table__
+        result = await self.session.execute(
+            build_stock_decrement(seller_id, quantity).where(table.c.id == product_id))
+        stock = result.one_or_none()
+        if stock is None:
+            current = await self.session.execute(
+                select(table.c.quantity).where(table.c.seller_id == seller_id,
+                                               table.c.id == product_id))
+            await self.session.rollback()
+            available = current.scalar_one_or_none()
+            if available is None:
+                raise NotFoundException(f'Key (id)=({product_id}) Product not found.')
+            raise InsufficientStockException(f'Key (quantity)=({quantity}) Only {available} '
+                                             'units are in stock.')
+        if stock.crossed_low_stock:
+            await self.session.execute(build_stock_alert_insert(seller_id, [stock]))
+        await self.session.commit()
+        if stock.crossed_low_stock:
+            stock_alert_dispatcher.wake()
+
+        return stock
+
+    @handle_database_exceptions
+    async def increment_stock(self, seller_id: uuid.UUID, product_id: uuid.UUID,
+                              quantity: int) -> Row:
+        """
+        Adds units to the stock of a product with a single UPDATE ... RETURNING statement.
+
+        Args:
+            seller_id (uuid.UUID): The seller of the product.
+            product_id (uuid.UUID): The identifier of the product.
+            quantity (int): The number of units to add, greater than zero.
+
+        Returns:
+            Row: The identifier and the new quantity of the product.
+
+        Raises:
+            NotFoundException: If the seller has no such product.
+        """
+        table = Product.__table__
+        result = await self.session.execute(
+            update(table)
+            .where(table.c.seller_id == seller_id, table.c.id == product_id)
+            .values(quantity=table.c.quantity + quantity)
+            .returning(table.c.id, table.c.quantity))
+        stock = result.one_or_none()
+        if stock is None:
+            await self.session.rollback()
+            raise NotFoundException(f'Key (id)=({product_id}) Product not found.')
+        await self.session.commit()
+
+        return stock
+
+def build_stock_decrement(seller_id: uuid.UUID, quantity: int) -> Update:
+    """
+    Builds the conditional UPDATE products statement that takes units from the stock of the
+    products of a seller, skipping any product with fewer units.
+
+    Every single-product stock decrement must go through this statement; callers narrow it
+    down to the product to change with where().
+
+    Args:
+        seller_id (uuid.UUID): The seller of the products.
+        quantity (int): The number of units to take.
+
+    Returns:
+        Update: The statement, returning the identifier, remaining quantity and low stock
+        threshold of every product it changed, and whether it crossed the threshold.
+    """
+    table = Product.__table__
+    return (
+        update(table)
+        .where(table.c.seller_id == seller_id, table.c.quantity >= quantity)
+        .values(quantity=table.c.quantity - quantity)
+        .returning(table.c.id, table.c.quantity, table.c.low_stock_threshold,
+                   crossed_low_stock(quantity))
+    )
+
+def build_batch_stock_decrement(seller_id: uuid.UUID,
+                                quantities: list[tuple[uuid.UUID, int]]) -> Update:
+    """
+    Builds a single conditional UPDATE products ... FROM (VALUES ...) statement that takes
+    units from the stock of several products of a seller at once, skipping any product with
+    fewer units than asked.
+
+    The rows are locked in the order the plan reaches them, which the order of quantities
+    does not decide: a hash join locks them in the order of the products table. Callers
+    whose batches may share products with concurrent ones lock the rows first with
+    build_stock_lock, in the same transaction.
+
+    Args:
+        seller_id (uuid.UUID): The seller of the products.
+        quantities (list[tuple[uuid.UUID, int]]): The product and number of units to take,
+        one line per product.
+
+    Returns:
+        Update: The statement, returning the identifier, price, remaining quantity and low
+        stock threshold of every product it changed, and whether it crossed the threshold.
+    """
+    table = Product.__table__
+    cart = (values(column('product_id', UUID(as_uuid=True)), column('quantity', Integer()),
+                   name='cart')
+            .data(quantities))
+    return (
+        update(table)
+        .where(table.c.id == cart.c.product_id, table.c.seller_id == seller_id,
+               table.c.quantity >= cart.c.quantity)
+        .values(quantity=table.c.quantity - cart.c.quantity)
+        .returning(table.c.id, table.c.price, table.c.quantity, table.c.low_stock_threshold,
+                   crossed_low_stock(cart.c.quantity))
+    )
+
+def build_stock_lock(seller_id: uuid.UUID, product_ids: list[uuid.UUID]) -> Select:
+    """
+    Builds the SELECT ... FOR UPDATE locking the rows of several products of a seller in
+    the order of their identifiers. Run before a batch stock decrement in the same
+    transaction, it makes every batch lock the products it shares with a concurrent one in
+    the same order, so they wait for each other instead of deadlocking.
+
+    Args:
+        seller_id (uuid.UUID): The seller of the products.
+        product_ids (list[uuid.UUID]): The products to lock.
+
+    Returns:
+        Select: The statement, returning the identifier of every product it locked.
+    """
+    table = Product.__table__
+    return (select(table.c.id)
+            .where(table.c.seller_id == seller_id, table.c.id.in_(product_ids))
+            .order_by(table.c.id)
+            .with_for_update())
+
+def crossed_low_stock(taken) -> ColumnElement[bool]:
+    """
+    Builds the RETURNING expression of a stock decrement telling whether the product has
+    just reached its low stock threshold: the remaining quantity is at or below it and was
+    above it before the decrement. A product already low on stock does not cross it again
+    until it is replenished, and a product without a threshold never does.
+
+    Args:
+        taken: The number of units taken, a value or a column.
+
+    Returns:
+        ColumnElement[bool]: The expression, labeled crossed_low_stock.
+    """
+    table = Product.__table__
+    threshold = table.c.low_stock_threshold
+    return and_(threshold.is_not(None), table.c.quantity <= threshold,
+                table.c.quantity + taken > threshold).label('crossed_low_stock')
@@ -0,0 +1,147 @@
+"""
+This module contains the StockAlertDispatcher class, which delivers the low stock alerts of
+products to their sellers. Alerts are written to the stock_alerts outbox by the stock
+decrement that takes a product to or below its threshold, in the same transaction, and
+delivered in the background: detecting low stock never scans the products table, and
+delivering an alert never delays the sale that caused it.
+"""
+import logging
+import uuid
+from typing import Awaitable, Callable, Iterable, Sequence
+
+from sqlalchemy import Insert, Row, Select, and_, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from api.modules.products.models.Product import Product
+from api.modules.products.models.StockAlert import StockAlert
+from api.modules.users.models.User import User
+from api.shared.configs.settings import settings
+from api.shared.database.connection import engine
+from api.utils.background_worker import BackgroundWorker
+
+logger = logging.getLogger(__name__)
+
+StockAlertNotifier = Callable[[Sequence[Row]], Awaitable[None]]
+
+async def log_stock_alerts(alerts: Sequence[Row]) -> None:
+    """
+    Delivers stock alerts by logging them, the default notifier.
+
+    Args:
+        alerts (Sequence[Row]): The alerts, with the product name and the seller contacts.
+    """
+    for alert in alerts:
+        logger.warning('Product %s (%s) of seller %s <%s> is low on stock: %d left, '
+                       'threshold %d.', alert.product_name, alert.product_id,
+                       alert.seller_name, alert.seller_email, alert.quantity, alert.threshold)
+
+class StockAlertDispatcher(BackgroundWorker):
+    """
+    A background task delivering the pending low stock alerts to their sellers.
+
+    The dispatcher is woken up by the services right after they commit a stock decrement
+    that raised an alert, and otherwise polls the outbox every poll interval, so alerts
+    committed while it was stopped or whose delivery failed are delivered later. Pending
+    alerts are read from the partial index ix_stock_alerts_pending_id and locked with SKIP
+    LOCKED, so several processes can dispatch at once without delivering an alert twice.
+    An alert is marked delivered in the transaction that read it, once the notifier has
+    returned; if the notifier fails, the whole batch stays pending and is retried.
+
+    Attributes:
+        batch_size (int): The maximum number of alerts delivered per transaction.
+        notifier (StockAlertNotifier): The coroutine delivering a batch of alerts.
+    """
+    def __init__(self, poll_interval_ms: int, batch_size: int,
+                 notifier: StockAlertNotifier = log_stock_alerts):
+        super().__init__(poll_interval_ms)
+        self.batch_size = batch_size
+        self.notifier = notifier
+
+    async def run_once(self) -> None:
+        """
+        Delivers the pending alerts. Those left when the dispatcher stops stay in the outbox.
+        """
+        await self.dispatch()
+
+    async def dispatch(self) -> int:
+        """
+        Delivers the pending alerts, batch by batch, until none is left.
+
+        Returns:
+            int: The number of alerts delivered.
+        """
+        delivered = 0
+        while True:
+            count = await self.dispatch_batch()
+            delivered += count
+            if count < self.batch_size:
+                return delivered
+
+    async def dispatch_batch(self) -> int:
+        """
+        Delivers one batch of pending alerts, oldest first, and marks them delivered.
+
+        Returns:
+            int: The number of alerts delivered.
+        """
+        alerts_table = StockAlert.__table__
+        async with engine.begin() as connection:
+            alerts = (await connection.execute(build_pending_alerts(self.batch_size))).all()
+            if not alerts:
+                return 0
+            await self.notifier(alerts)
+            await connection.execute(
+                update(alerts_table)
+                .where(alerts_table.c.id.in_([alert.id for alert in alerts]))
+                .values(date_delivered=func.now())) # pylint: disable=not-callable
+
+        return len(alerts)
+
+def build_pending_alerts(batch_size: int) -> Select:
+    """
+    Builds the SELECT locking the oldest pending alerts, with the name of their product and
+    the contacts of their seller, skipping alerts locked by another dispatcher.
+
+    Args:
+        batch_size (int): The maximum number of alerts selected.
+
+    Returns:
+        Select: The statement.
+    """
+    alerts = StockAlert.__table__
+    products = Product.__table__
+    users = User.__table__
+    return (select(alerts.c.id, alerts.c.seller_id, alerts.c.product_id, alerts.c.quantity,
+                   alerts.c.threshold, alerts.c.date_created,
+                   products.c.name.label('product_name'), users.c.name.label('seller_name'),
+                   users.c.email.label('seller_email'),
+                   users.c.whatsapp.label('seller_whatsapp'))
+            .join(products, and_(products.c.seller_id == alerts.c.seller_id,
+                                 products.c.id == alerts.c.product_id))
+            .join(users, users.c.id == alerts.c.seller_id)
+            .where(alerts.c.date_delivered.is_(None))
+            .order_by(alerts.c.id)
+            .limit(batch_size)
+            .with_for_update(of=alerts, skip_locked=True))
+
+def build_stock_alert_insert(seller_id: uuid.UUID, crossings: Iterable[Row]) -> Insert:
+    """
+    Builds the INSERT of the alerts of the products whose stock has just reached their low
+    stock threshold, skipping the products that already have a pending alert.
+
+    Args:
+        seller_id (uuid.UUID): The seller of the products.
+        crossings (Iterable[Row]): The rows returned by a stock decrement for the products
+        that crossed their threshold, with their identifier, quantity and threshold.
+
+    Returns:
+        Insert: The statement.
+    """
+    return (insert(StockAlert.__table__)
+            .values([{'seller_id': seller_id, 'product_id': row.id, 'quantity': row.quantity,
+                      'threshold': row.low_stock_threshold} for row in crossings])
+            .on_conflict_do_nothing(index_elements=['product_id'],
+                                    index_where=StockAlert.date_delivered.is_(None)))
+
+stock_alert_dispatcher = StockAlertDispatcher(settings.STOCK_ALERT_POLL_INTERVAL_MS,
+                                              settings.STOCK_ALERT_BATCH_SIZE)
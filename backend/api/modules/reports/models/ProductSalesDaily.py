@@ -0,0 +1,38 @@
+"""
+This module defines the ProductSalesDaily model, the sales of each product of a seller
+rolled up by day.
+It sets up the SQLAlchemy ORM mappings for the product_sales_daily table in the database
+"""
+import uuid
+from datetime import date
+from decimal import Decimal
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Date, Integer, Numeric, ForeignKeyConstraint, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.shared.database.connection import Base
+from api.shared.database.mixins import SellerOwnedMixin
+
+class ProductSalesDaily(SellerOwnedMixin, Base):
+    """
+    ProductSalesDaily model for storing the daily units and revenue of each product in the
+    'product_sales_daily' table in the database.
+
+    Rows are written by the report rollup job once a day is closed, and only exist for the
+    days a product was sold. Days are calendar days in REPORT_TIMEZONE.
+    """
+    __tablename__ = "product_sales_daily"
+    __table_args__ = (
+        ForeignKeyConstraint(['seller_id', 'product_id'],
+                             ['products.seller_id', 'products.id'],
+                             name='product_sales_daily_product_id_fkey', ondelete='RESTRICT'),
+    )
+
+    day: Mapped[date] = mapped_column(Date(), primary_key=True)
+    product_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    quantity: Mapped[int] = mapped_column(Integer(), nullable=False)
+    revenue: Mapped[Decimal] = mapped_column(Numeric(16, 2), nullable=False)
+
+# Checks the foreign key when a product is deleted.
+Index('ix_product_sales_daily_seller_id_product_id', ProductSalesDaily.seller_id,
+      ProductSalesDaily.product_id)
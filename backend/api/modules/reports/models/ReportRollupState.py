@@ -0,0 +1,25 @@
+"""
+This module defines the ReportRollupState model, the progress of the report rollup job.
+It sets up the SQLAlchemy ORM mappings for the report_rollup_state table in the database
+"""
+from datetime import date
+from sqlalchemy import Date, Integer, CheckConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.shared.database.connection import Base
+
+class ReportRollupState(Base):
+    """
+    ReportRollupState model for storing the last day rolled up by the report rollup job in
+    the single-row 'report_rollup_state' table in the database.
+
+    Reports read the rollup tables up to rolled_up_through and aggregate the sales of the
+    later days live.
+    """
+    __tablename__ = "report_rollup_state"
+    __table_args__ = (
+        CheckConstraint('id = 1', name='ck_report_rollup_state_single_row'),
+    )
+
+    id: Mapped[int] = mapped_column(Integer(), primary_key=True, autoincrement=False, default=1)
+    rolled_up_through: Mapped[date] = mapped_column(Date(), nullable=False)
@@ -0,0 +1,27 @@
+"""
+This module defines the SalesDaily model, the sales of a seller rolled up by day.
+It sets up the SQLAlchemy ORM mappings for the sales_daily table in the database
+"""
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import Date, Integer, Numeric
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.shared.database.connection import Base
+from api.shared.database.mixins import SellerOwnedMixin
+
+class SalesDaily(SellerOwnedMixin, Base):
+    """
+    SalesDaily model for storing the daily totals of the sales of each seller in the
+    'sales_daily' table in the database.
+
+    Rows are written by the report rollup job once a day is closed, and only exist for the
+    days a seller sold something. Days are calendar days in REPORT_TIMEZONE. A seller who
+    has rolled up sales cannot be deleted or archived.
+    """
+    __tablename__ = "sales_daily"
+
+    day: Mapped[date] = mapped_column(Date(), primary_key=True)
+    sales_count: Mapped[int] = mapped_column(Integer(), nullable=False)
+    revenue: Mapped[Decimal] = mapped_column(Numeric(16, 2), nullable=False)
+    debt: Mapped[Decimal] = mapped_column(Numeric(16, 2), nullable=False)
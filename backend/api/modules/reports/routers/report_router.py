@@ -0,0 +1,98 @@
+"""
+This module defines the routing for report-related operations in the FastAPI application.
+It utilizes dependencies from the shared database module and services from the report
+module to serve the sales of the seller making the request by period and the performance
+of their products.
+"""
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.shared.configs.settings import settings
+from api.shared.database.dependencies import get_seller_id, get_seller_session
+from api.shared.validators.period_validator import validate_period
+from api.modules.reports.services.report_service import REPORT_ZONE, ReportService
+from api.modules.reports.schemas.report_schema import (ProductReportResponse,
+                                                       SalesReportResponse)
+
+router = APIRouter()
+
+def get_period(start: Optional[date] = Query(
+                   None, description='The first day, REPORT_DEFAULT_DAYS before end by default.'),
+               end: Optional[date] = Query(
+                   None, description='The last day, today by default.')) -> tuple[date, date]:
+    """
+    Provides the period of a report, both days included, in the report time zone.
+
+    Args:
+        start (Optional[date]): The first day of the period.
+        end (Optional[date]): The last day of the period.
+
+    Returns:
+        tuple[date, date]: The validated period.
+
+    Raises:
+        ReportPeriodException: If start is after end or the period is too long.
+    """
+    end = end or datetime.now(REPORT_ZONE).date()
+    start = start or end - timedelta(days=settings.REPORT_DEFAULT_DAYS - 1)
+    return validate_period(start, end, settings.REPORT_MAX_DAYS)
+
+@router.get('/sales',
+            response_model=SalesReportResponse,
+            status_code=status.HTTP_200_OK,
+            summary='Report the sales by period',
+            tags=['reports'])
+async def sales_report(period: tuple[date, date] = Depends(get_period),
+                       seller_id: uuid.UUID = Depends(get_seller_id),
+                       db: AsyncSession = Depends(get_seller_session)
+                       ) -> Response:
+    """
+    Report the sales of the seller over a period, in total and by day.
+
+    Args:
+        period (tuple[date, date]): The first and last day of the period.
+        seller_id (uuid.UUID): The seller making the request.
+        db (AsyncSession): The database session dependency, scoped to the seller.
+
+    Returns:
+        Response: The JSON encoded SalesReportResponse.
+
+    Raises:
+        HTTPException: 422 if the period is invalid.
+    """
+    report_service = ReportService(db)
+    report = await report_service.sales_report(seller_id, *period)
+    return Response(content=report.model_dump_json(), media_type='application/json')
+
+@router.get('/products',
+            response_model=ProductReportResponse,
+            status_code=status.HTTP_200_OK,
+            summary='Report the best selling products',
+            tags=['reports'])
+async def product_report(period: tuple[date, date] = Depends(get_period),
+                         limit: int = Query(settings.REPORT_PRODUCTS_DEFAULT_LIMIT, ge=1,
+                                            le=settings.REPORT_PRODUCTS_MAX_LIMIT),
+                         seller_id: uuid.UUID = Depends(get_seller_id),
+                         db: AsyncSession = Depends(get_seller_session)
+                         ) -> Response:
+    """
+    Report the products of the seller that sold the most over a period, by revenue.
+
+    Args:
+        period (tuple[date, date]): The first and last day of the period.
+        limit (int): The maximum number of products.
+        seller_id (uuid.UUID): The seller making the request.
+        db (AsyncSession): The database session dependency, scoped to the seller.
+
+    Returns:
+        Response: The JSON encoded ProductReportResponse.
+
+    Raises:
+        HTTPException: 422 if the period is invalid.
+    """
+    report_service = ReportService(db)
+    report = await report_service.product_report(seller_id, *period, limit)
+    return Response(content=report.model_dump_json(), media_type='application/json')
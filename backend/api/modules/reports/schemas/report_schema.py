@@ -0,0 +1,84 @@
+"""
+This module defines the Pydantic schemas for report-related operations. These schemas are
+used for responding with the sales of a seller by period and the performance of their
+products.
+"""
+import uuid
+from datetime import date
+from decimal import Decimal
+from typing import Annotated
+from pydantic import Field
+
+from api.shared.configs.base_schema import BaseSchema
+
+class DailySalesResponse(BaseSchema):
+    """
+    A schema for the sales of a seller on one day.
+    """
+    day: Annotated[
+        date,
+        Field(description='The calendar day, in the report time zone.')]
+    sales_count: Annotated[
+        int,
+        Field(description='The number of sales.')]
+    revenue: Annotated[
+        Decimal,
+        Field(description='The sum of the totals of the sales.')]
+    debt: Annotated[
+        Decimal,
+        Field(description='The part of the revenue sold on credit.')]
+
+class SalesReportResponse(BaseSchema):
+    """
+    A schema for the sales of a seller over a period, in total and by day. Days without
+    sales are omitted.
+    """
+    start: Annotated[
+        date,
+        Field(description='The first day of the period.')]
+    end: Annotated[
+        date,
+        Field(description='The last day of the period.')]
+    sales_count: Annotated[
+        int,
+        Field(description='The number of sales in the period.')]
+    revenue: Annotated[
+        Decimal,
+        Field(description='The sum of the totals of the sales in the period.')]
+    debt: Annotated[
+        Decimal,
+        Field(description='The part of the revenue sold on credit.')]
+    days: Annotated[
+        list[DailySalesResponse],
+        Field(description='The sales of each day with sales, oldest first.')]
+
+class ProductPerformanceResponse(BaseSchema):
+    """
+    A schema for the sales of a product over a period.
+    """
+    product_id: Annotated[
+        uuid.UUID,
+        Field(description='The product sold.')]
+    name: Annotated[
+        str,
+        Field(description='The current name of the product.')]
+    quantity: Annotated[
+        int,
+        Field(description='The number of units sold.')]
+    revenue: Annotated[
+        Decimal,
+        Field(description='The revenue of the units sold.')]
+
+class ProductReportResponse(BaseSchema):
+    """
+    A schema for the best selling products of a seller over a period.
+    """
+    start: Annotated[
+        date,
+        Field(description='The first day of the period.')]
+    end: Annotated[
+        date,
+        Field(description='The last day of the period.')]
+    items: Annotated[
+        list[ProductPerformanceResponse],
+        Field(description='The products sold, highest revenue first.')]
@@ -0,0 +1,150 @@
+"""
+This module contains the ReportRollup class, the job that rolls the sales of each closed
+day up into the sales_daily and product_sales_daily tables, so that reports read one row
+per seller and day instead of every sale. Days are calendar days in REPORT_TIMEZONE.
+
+Available Functions:
+- day_bounds(day: date, zone: ZoneInfo) -> tuple[datetime, datetime]: The instants a day
+  starts and ends at.
+"""
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import Date, and_, delete, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+
+from api.modules.reports.models.ProductSalesDaily import ProductSalesDaily
+from api.modules.reports.models.ReportRollupState import ReportRollupState
+from api.modules.reports.models.SalesDaily import SalesDaily
+from api.modules.sales.models.Sale import Sale
+from api.modules.sales.models.SaleItem import SaleItem
+from api.shared.configs.settings import settings
+from api.shared.database.connection import engine
+
+logger = logging.getLogger(__name__)
+
+def day_bounds(day: date, zone: ZoneInfo) -> tuple[datetime, datetime]:
+    """
+    Computes the instants a calendar day of a time zone starts and ends at.
+
+    Args:
+        day (date): The calendar day.
+        zone (ZoneInfo): The time zone of the day.
+
+    Returns:
+        tuple[datetime, datetime]: The start, included, and the end, excluded, of the day.
+    """
+    return (datetime.combine(day, time(), zone),
+            datetime.combine(day + timedelta(days=1), time(), zone))
+
+class ReportRollup:
+    """
+    An incremental job rolling up the sales of the days closed since its last run.
+
+    A day is closed once it ended more than the grace period ago, so the sales still being
+    committed around midnight are rolled up with their day. Each day is rolled up in its
+    own transaction, which replaces the rows of that day in both rollup tables and moves
+    the rolled_up_through watermark of report_rollup_state forward; rolling a day up again
+    gives the same rows. The state row is locked first, so concurrent runs wait for each
+    other. The sales of a day are found on the BRIN index of sales.date_created.
+
+    Attributes:
+        zone (ZoneInfo): The time zone whose calendar days are rolled up.
+        grace (timedelta): How long after its end a day is rolled up.
+    """
+    def __init__(self, zone: str, grace_minutes: int):
+        self.zone = ZoneInfo(zone)
+        self.grace = timedelta(minutes=grace_minutes)
+
+    def last_closed_day(self, now: datetime) -> date:
+        """
+        Finds the last day that ended more than the grace period before a moment.
+
+        Args:
+            now (datetime): The moment, timezone aware.
+
+        Returns:
+            date: The last closed day.
+        """
+        return (now.astimezone(self.zone) - self.grace).date() - timedelta(days=1)
+
+    async def refresh(self, now: Optional[datetime] = None) -> int:
+        """
+        Rolls up every day closed since the watermark, oldest first.
+
+        On the first run, the rollup starts from the day of the first sale.
+
+        Args:
+            now (Optional[datetime]): The moment closed days are measured from, now by
+            default.
+
+        Returns:
+            int: The number of days rolled up.
+        """
+        last_closed = self.last_closed_day(now or datetime.now(timezone.utc))
+        async with engine.connect() as connection:
+            watermark = await connection.scalar(select(ReportRollupState.rolled_up_through))
+            first_sale = (await connection.scalar(select(func.min(Sale.date_created)))
+                          if watermark is None else None)
+        if watermark is None:
+            watermark = (first_sale.astimezone(self.zone).date() - timedelta(days=1)
+                         if first_sale is not None else last_closed)
+            await self.rollup_day(watermark, rows=False)
+
+        rolled, day = 0, watermark + timedelta(days=1)
+        while day <= last_closed:
+            await self.rollup_day(day)
+            logger.info('Rolled up the sales of %s', day)
+            rolled += 1
+            day += timedelta(days=1)
+
+        return rolled
+
+    async def rollup_day(self, day: date, rows: bool = True) -> None:
+        """
+        Replaces the rollup rows of a day and moves the watermark to it, if it is later.
+
+        Args:
+            day (date): The closed day.
+            rows (bool): Whether to roll the sales up, or only set the watermark.
+        """
+        state = ReportRollupState.__table__
+        sales_daily = SalesDaily.__table__
+        product_sales_daily = ProductSalesDaily.__table__
+        sales = Sale.__table__
+        sale_items = SaleItem.__table__
+        start, end = day_bounds(day, self.zone)
+        of_day = (sales.c.date_created >= start, sales.c.date_created < end)
+
+        upsert_state = insert(state).values(id=1, rolled_up_through=day)
+        upsert_state = upsert_state.on_conflict_do_update(
+            index_elements=[state.c.id],
+            set_={'rolled_up_through': func.greatest(state.c.rolled_up_through,
+                                                     upsert_state.excluded.rolled_up_through)})
+        async with engine.begin() as connection:
+            await connection.execute(upsert_state)
+            if not rows:
+                return
+            await connection.execute(delete(sales_daily).where(sales_daily.c.day == day))
+            await connection.execute(
+                delete(product_sales_daily).where(product_sales_daily.c.day == day))
+            await connection.execute(insert(sales_daily).from_select(
+                ['seller_id', 'day', 'sales_count', 'revenue', 'debt'],
+                select(sales.c.seller_id, literal(day, Date()),
+                       func.count(), func.sum(sales.c.total), func.sum(sales.c.debt)) # pylint: disable=not-callable
+                .where(*of_day)
+                .group_by(sales.c.seller_id)))
+            await connection.execute(insert(product_sales_daily).from_select(
+                ['seller_id', 'day', 'product_id', 'quantity', 'revenue'],
+                select(sales.c.seller_id, literal(day, Date()), sale_items.c.product_id,
+                       func.sum(sale_items.c.quantity),
+                       func.sum(sale_items.c.quantity * sale_items.c.unit_price))
+                .select_from(sales.join(
+                    sale_items, and_(sale_items.c.seller_id == sales.c.seller_id,
+                                     sale_items.c.sale_id == sales.c.id)))
+                .where(*of_day)
+                .group_by(sales.c.seller_id, sale_items.c.product_id)))
+
+report_rollup = ReportRollup(settings.REPORT_TIMEZONE, settings.REPORT_ROLLUP_GRACE_MINUTES)
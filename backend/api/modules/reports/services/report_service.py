@@ -0,0 +1,255 @@
+"""
+This module contains the ReportService class, which builds the sales reports of a seller.
+Each report combines the daily rollups of the days already rolled up with a live
+aggregate of the sales of the later days, usually just today, in a single statement, and
+is cached per seller and period.
+"""
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import Date, Select, and_, cast, func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.modules.products.models.Product import Product
+from api.modules.reports.models.ProductSalesDaily import ProductSalesDaily
+from api.modules.reports.models.ReportRollupState import ReportRollupState
+from api.modules.reports.models.SalesDaily import SalesDaily
+from api.modules.reports.schemas.report_schema import (DailySalesResponse,
+                                                       ProductPerformanceResponse,
+                                                       ProductReportResponse,
+                                                       SalesReportResponse)
+from api.modules.reports.services.report_rollup import day_bounds
+from api.modules.sales.models.Sale import Sale
+from api.modules.sales.models.SaleItem import SaleItem
+from api.shared.configs.settings import settings
+from api.shared.handlers.database_handler import handle_database_exceptions
+from api.utils.ttl_cache import TTLCache
+
+REPORT_ZONE = ZoneInfo(settings.REPORT_TIMEZONE)
+
+report_cache = TTLCache(settings.REPORT_CACHE_MAX_ENTRIES)
+
+class ReportService:
+    """
+    A service class for building the reports of a seller.
+
+    Reports are cached in report_cache per seller, report and period. A period that ends
+    on a rolled up day can no longer change and is cached for REPORT_CACHE_CLOSED_TTL_SECONDS;
+    any other period includes live sales and is cached for REPORT_CACHE_TTL_SECONDS only.
+
+    Attributes:
+        session (AsyncSession): An instance of AsyncSession for database transactions.
+    """
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @handle_database_exceptions
+    async def sales_report(self, seller_id: uuid.UUID, start: date,
+                           end: date) -> SalesReportResponse:
+        """
+        Builds the sales of a seller over a period, in total and by day.
+
+        Args:
+            seller_id (uuid.UUID): The seller of the sales.
+            start (date): The first day of the period.
+            end (date): The last day of the period.
+
+        Returns:
+            SalesReportResponse: The report.
+        """
+        key = ('sales', seller_id, start, end)
+        report = report_cache.get(key)
+        if report is not None:
+            return report
+
+        watermark = await self._watermark()
+        connection = await self.session.connection()
+        rows = (await connection.execute(
+            build_sales_report(seller_id, start, end, watermark))).all()
+        days = [DailySalesResponse(day=row.day, sales_count=row.sales_count,
+                                   revenue=row.revenue, debt=row.debt) for row in rows]
+        report = SalesReportResponse(
+            start=start, end=end, sales_count=sum(day.sales_count for day in days),
+            revenue=sum((day.revenue for day in days), Decimal('0.00')),
+            debt=sum((day.debt for day in days), Decimal('0.00')), days=days)
+
+        report_cache.set(key, report, cache_ttl(end, watermark))
+        return report
+
+    @handle_database_exceptions
+    async def product_report(self, seller_id: uuid.UUID, start: date, end: date,
+                             limit: int) -> ProductReportResponse:
+        """
+        Builds the best selling products of a seller over a period.
+
+        Args:
+            seller_id (uuid.UUID): The seller of the products.
+            start (date): The first day of the period.
+            end (date): The last day of the period.
+            limit (int): The maximum number of products.
+
+        Returns:
+            ProductReportResponse: The report.
+        """
+        key = ('products', seller_id, start, end, limit)
+        report = report_cache.get(key)
+        if report is not None:
+            return report
+
+        watermark = await self._watermark()
+        connection = await self.session.connection()
+        rows = (await connection.execute(
+            build_product_report(seller_id, start, end, watermark, limit))).mappings().all()
+        report = ProductReportResponse(
+            start=start, end=end,
+            items=[ProductPerformanceResponse.model_validate(row) for row in rows])
+
+        report_cache.set(key, report, cache_ttl(end, watermark))
+        return report
+
+    async def _watermark(self) -> Optional[date]:
+        """
+        Reads the last day rolled up, if any.
+        """
+        return await self.session.scalar(select(ReportRollupState.rolled_up_through))
+
+def cache_ttl(end: date, watermark: Optional[date]) -> float:
+    """
+    Chooses how long a report may be cached.
+
+    Args:
+        end (date): The last day of the period of the report.
+        watermark (Optional[date]): The last day rolled up, if any.
+
+    Returns:
+        float: The time to live of the report, in seconds.
+    """
+    if watermark is not None and end <= watermark:
+        return settings.REPORT_CACHE_CLOSED_TTL_SECONDS
+    return settings.REPORT_CACHE_TTL_SECONDS
+
+def split_period(start: date, end: date,
+                 watermark: Optional[date]) -> tuple[Optional[tuple[date, date]],
+                                                     Optional[tuple[date, date]]]:
+    """
+    Splits a period into the days read from the rollups and the days aggregated live.
+
+    Args:
+        start (date): The first day of the period.
+        end (date): The last day of the period.
+        watermark (Optional[date]): The last day rolled up, if any.
+
+    Returns:
+        tuple: The first and last rolled up days, and the first and last live days; either
+        is None when the period has no such day.
+    """
+    if watermark is None or watermark < start:
+        return None, (start, end)
+    if watermark >= end:
+        return (start, end), None
+    return (start, watermark), (watermark + timedelta(days=1), end)
+
+def build_sales_report(seller_id: uuid.UUID, start: date, end: date,
+                       watermark: Optional[date]) -> Select:
+    """
+    Builds the statement reading the sales of a seller by day, from the sales_daily rollup
+    up to the watermark and from the sales themselves after it.
+
+    The live part is a range scan of ix_sales_seller_id_date_created, grouped by the day of
+    each sale in REPORT_TIMEZONE.
+
+    Args:
+        seller_id (uuid.UUID): The seller of the sales.
+        start (date): The first day of the period.
+        end (date): The last day of the period.
+        watermark (Optional[date]): The last day rolled up, if any.
+
+    Returns:
+        Select: The statement, returning the day, sales_count, revenue and debt of every
+        day with sales, oldest first.
+    """
+    sales_daily = SalesDaily.__table__
+    sales = Sale.__table__
+    rolled, live = split_period(start, end, watermark)
+
+    parts = []
+    if rolled is not None:
+        parts.append(select(sales_daily.c.day, sales_daily.c.sales_count,
+                            sales_daily.c.revenue, sales_daily.c.debt)
+                     .where(sales_daily.c.seller_id == seller_id,
+                            sales_daily.c.day.between(*rolled)))
+    if live is not None:
+        day = sale_day(sales.c.date_created)
+        parts.append(select(day.label('day'), func.count().label('sales_count'), # pylint: disable=not-callable
+                            func.sum(sales.c.total).label('revenue'),
+                            func.sum(sales.c.debt).label('debt'))
+                     .where(sales.c.seller_id == seller_id,
+                            sales.c.date_created >= day_bounds(live[0], REPORT_ZONE)[0],
+                            sales.c.date_created < day_bounds(live[1], REPORT_ZONE)[1])
+                     .group_by(day))
+
+    report = (union_all(*parts) if len(parts) > 1 else parts[0]).subquery('report')
+    return select(report).order_by(report.c.day)
+
+def build_product_report(seller_id: uuid.UUID, start: date, end: date,
+                         watermark: Optional[date], limit: int) -> Select:
+    """
+    Builds the statement reading the best selling products of a seller, from the
+    product_sales_daily rollup up to the watermark and from the sale items after it.
+
+    Args:
+        seller_id (uuid.UUID): The seller of the products.
+        start (date): The first day of the period.
+        end (date): The last day of the period.
+        watermark (Optional[date]): The last day rolled up, if any.
+        limit (int): The maximum number of products.
+
+    Returns:
+        Select: The statement, returning the product_id, name, quantity and revenue of the
+        products sold, highest revenue first.
+    """
+    product_sales_daily = ProductSalesDaily.__table__
+    sales = Sale.__table__
+    sale_items = SaleItem.__table__
+    products = Product.__table__
+    rolled, live = split_period(start, end, watermark)
+
+    parts = []
+    if rolled is not None:
+        parts.append(select(product_sales_daily.c.product_id, product_sales_daily.c.quantity,
+                            product_sales_daily.c.revenue)
+                     .where(product_sales_daily.c.seller_id == seller_id,
+                            product_sales_daily.c.day.between(*rolled)))
+    if live is not None:
+        parts.append(select(sale_items.c.product_id, sale_items.c.quantity,
+                            (sale_items.c.quantity * sale_items.c.unit_price).label('revenue'))
+                     .select_from(sales.join(
+                         sale_items, and_(sale_items.c.seller_id == sales.c.seller_id,
+                                          sale_items.c.sale_id == sales.c.id)))
+                     .where(sales.c.seller_id == seller_id,
+                            sales.c.date_created >= day_bounds(live[0], REPORT_ZONE)[0],
+                            sales.c.date_created < day_bounds(live[1], REPORT_ZONE)[1]))
+
+    sold = (union_all(*parts) if len(parts) > 1 else parts[0]).subquery('sold')
+    revenue = func.sum(sold.c.revenue) # pylint: disable=assignment-from-no-return
+    totals = (select(sold.c.product_id, func.sum(sold.c.quantity).label('quantity'),
+                     revenue.label('revenue'))
+              .group_by(sold.c.product_id)
+              .order_by(revenue.desc(), sold.c.product_id)
+              .limit(limit)
+              .subquery('totals'))
+    return (select(totals.c.product_id, products.c.name, totals.c.quantity, totals.c.revenue)
+            .join(products, and_(products.c.seller_id == seller_id,
+                                 products.c.id == totals.c.product_id))
+            .order_by(totals.c.revenue.desc(), totals.c.product_id))
+
+def sale_day(date_created) -> Date:
+    """
+    Builds the expression of the calendar day of a sale in REPORT_TIMEZONE. The zone is
+    inlined, so the expression renders the same in the select list and the GROUP BY.
+    """
+    return cast(func.timezone(literal(settings.REPORT_TIMEZONE, literal_execute=True),
+                              date_created), Date())
@@ -0,0 +1,61 @@
+"""
+This module defines the Sale model, the header of a sale registered by a seller.
+It sets up the SQLAlchemy ORM mappings for the sales table in the database
+"""
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (DDL, Numeric, DateTime, ForeignKeyConstraint, CheckConstraint, Index,
+                        event, func)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.shared.database.connection import Base
+from api.shared.database.feed_notifications import SALE_FEED_FUNCTION, SALE_FEED_TRIGGER
+from api.shared.database.change_tracking import track_changes
+from api.shared.database.mixins import (ChangeTrackedMixin, SellerOwnedMixin,
+                                        UUIDv7PrimaryKeyMixin)
+
+class Sale(SellerOwnedMixin, UUIDv7PrimaryKeyMixin, ChangeTrackedMixin, Base):
+    """
+    Sale model for storing the sales of a seller in the 'sales' table in the database.
+
+    The total is the sum of the items of the sale, computed when it is registered from the
+    prices of the products at that moment. The items are stored in the 'sale_items' table.
+    The debt is the part of the total left unpaid, owed by the customer of the sale and
+    added to their balance. The customer is one of the seller's own customers.
+    """
+    __tablename__ = "sales"
+    __table_args__ = (
+        CheckConstraint('total >= 0', name='ck_sales_total_non_negative'),
+        CheckConstraint('debt >= 0 AND debt <= total', name='ck_sales_debt_within_total'),
+        CheckConstraint('debt = 0 OR customer_id IS NOT NULL',
+                        name='ck_sales_debt_has_customer'),
+        ForeignKeyConstraint(['seller_id', 'customer_id'],
+                             ['customers.seller_id', 'customers.id'],
+                             name='sales_customer_id_fkey', ondelete='RESTRICT'),
+    )
+
+    customer_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True),
+                                                             nullable=True)
+    total: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
+    debt: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, server_default='0')
+    date_created: Mapped[datetime] = mapped_column(DateTime(timezone=True),
+                                                   nullable=False, default=func.now()) # pylint: disable=not-callable
+
+# Sales are listed and reported by seller and period.
+Index('ix_sales_seller_id_date_created', Sale.seller_id, Sale.date_created)
+# Finds the sales of a day across sellers for the report rollup; sales are appended in time
+# order, so a BRIN index is tiny and enough.
+Index('ix_sales_date_created_brin', Sale.date_created, postgresql_using='brin')
+# Sums the debts of a customer when their balance is reconciled.
+Index('ix_sales_seller_id_customer_id', Sale.seller_id, Sale.customer_id,
+      postgresql_where=Sale.customer_id.isnot(None))
+# The sales registered since the last sync of a device; their items are synced with them.
+Index('ix_sales_seller_id_change_xid', Sale.seller_id, Sale.change_xid)
+track_changes(Sale.__table__, 'sale')
+
+# New sales are published to the seller feed.
+event.listen(Sale.__table__, 'after_create', DDL(SALE_FEED_FUNCTION))
+event.listen(Sale.__table__, 'after_create', DDL(SALE_FEED_TRIGGER))
@@ -0,0 +1,40 @@
+"""
+This module defines the SaleItem model, a line of a sale: a product, the units sold and
+their unit price.
+It sets up the SQLAlchemy ORM mappings for the sale_items table in the database
+"""
+import uuid
+from decimal import Decimal
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Integer, Numeric, ForeignKeyConstraint, CheckConstraint, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.shared.database.connection import Base
+from api.shared.database.mixins import SellerOwnedMixin
+
+class SaleItem(SellerOwnedMixin, Base):
+    """
+    SaleItem model for storing the items of a sale in the 'sale_items' table in the
+    database.
+
+    Each product appears at most once per sale, so the seller, the sale and the product form
+    the primary key. The unit price is copied from the product, so later price changes do not alter
+    past sales. Items are deleted with their sale; a product cannot be deleted once sold.
+    """
+    __tablename__ = "sale_items"
+    __table_args__ = (
+        CheckConstraint('quantity > 0', name='ck_sale_items_quantity_positive'),
+        ForeignKeyConstraint(['seller_id', 'sale_id'], ['sales.seller_id', 'sales.id'],
+                             name='sale_items_sale_id_fkey', ondelete='CASCADE'),
+        ForeignKeyConstraint(['seller_id', 'product_id'],
+                             ['products.seller_id', 'products.id'],
+                             name='sale_items_product_id_fkey', ondelete='RESTRICT'),
+    )
+
+    sale_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    product_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    quantity: Mapped[int] = mapped_column(Integer(), nullable=False)
+    unit_price: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
+
+# Checks the foreign key when a product is deleted and finds the sales of a product.
+Index('ix_sale_items_seller_id_product_id', SaleItem.seller_id, SaleItem.product_id)
@@ -0,0 +1,69 @@
+"""
+This module defines the routing for sale-related operations in the FastAPI application.
+It utilizes dependencies from the shared database module and services from the sale module
+to register the sales of the seller making the request and to read them back.
+"""
+import uuid
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.shared.database.dependencies import get_seller_id, get_seller_session
+from api.modules.sales.services.sale_service import SaleService
+from api.modules.sales.schemas.sale_schema import SaleCreateRequest, SaleResponse
+
+router = APIRouter()
+
+@router.post('/',
+             response_model=SaleResponse,
+             status_code=status.HTTP_201_CREATED,
+             summary='Register new sale',
+             tags=['sales'])
+async def create_sale(data_sale: SaleCreateRequest,
+                      seller_id: uuid.UUID = Depends(get_seller_id),
+                      db: AsyncSession = Depends(get_seller_session)
+                      ) -> SaleResponse:
+    """
+    Register a sale of the seller making the request, taking its items from the stock.
+
+    The whole cart is registered in one transaction, or not at all.
+
+    Args:
+        data_sale (SaleCreateRequest): The cart, validated by pydantic.
+        seller_id (uuid.UUID): The seller making the request.
+        db (AsyncSession): The database session dependency, scoped to the seller.
+
+    Returns:
+        SaleResponse: The registered sale and its items.
+
+    Raises:
+        HTTPException: 404 if the seller has no such product, 409 if a product has fewer
+        units in stock than sold, 422 if the cart is invalid.
+    """
+    sale_service = SaleService(db)
+    return await sale_service.create_sale(seller_id, data_sale)
+
+@router.get('/{sale_id}',
+            response_model=SaleResponse,
+            status_code=status.HTTP_200_OK,
+            summary='Get sale',
+            tags=['sales'])
+async def get_sale(sale_id: uuid.UUID,
+                   seller_id: uuid.UUID = Depends(get_seller_id),
+                   db: AsyncSession = Depends(get_seller_session)
+                   ) -> SaleResponse:
+    """
+    Get a sale of the seller and its items.
+
+    Args:
+        sale_id (uuid.UUID): The identifier of the sale.
+        seller_id (uuid.UUID): The seller making the request.
+        db (AsyncSession): The database session dependency, scoped to the seller.
+
+    Returns:
+        SaleResponse: The sale and its items.
+
+    Raises:
+        HTTPException: 404 if the seller has no such sale.
+    """
+    sale_service = SaleService(db)
+    return await sale_service.get_sale(seller_id, sale_id)
@@ -0,0 +1,117 @@
+"""
+This module defines the Pydantic schemas for sale-related operations. These schemas are
+used for validating the cart sent to the sale endpoints and for responding with sales and
+their items.
+"""
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import Annotated, Optional
+from pydantic import Field, field_validator, model_validator
+
+from api.shared.configs.base_schema import BaseSchema
+from api.shared.configs.settings import settings
+from api.shared.exceptions.cart_exception import CartValidationException
+from api.shared.validators.cart_validator import validate_cart
+
+class SaleItemRequest(BaseSchema):
+    """
+    A schema for a line of the cart of a sale.
+    """
+    product_id: Annotated[
+        uuid.UUID,
+        Field(..., description='The product sold.')]
+    quantity: Annotated[
+        int,
+        Field(..., gt=0, le=settings.STOCK_CHANGE_MAX_QUANTITY,
+              description='The number of units sold.')]
+
+class SaleCreateRequest(BaseSchema):
+    """
+    A schema for sale registration requests. The seller is not part of the body: sales are
+    always registered for the seller making the request, and the prices are those of their
+    products. A sale is paid in full unless amount_paid is given; the rest of the total is
+    then owed by the customer of the sale.
+    """
+    items: Annotated[
+        list[SaleItemRequest],
+        Field(..., min_length=1, max_length=settings.SALE_MAX_ITEMS,
+              description='The lines of the cart. Lines of the same product are merged.')]
+    customer_id: Annotated[
+        Optional[uuid.UUID],
+        Field(None, description='The customer buying, required for a sale on credit.')]
+    amount_paid: Annotated[
+        Optional[Annotated[Decimal, Field(ge=0, max_digits=14, decimal_places=2)]],
+        Field(None, description='The amount paid now, the total when omitted.')]
+
+    @field_validator('items')
+    def items_validator(cls, value: list[SaleItemRequest]) -> list[SaleItemRequest]: # pylint: disable=E0213
+        """
+        Merges the lines of the same product and orders the cart by product.
+
+        Args:
+            value (list[SaleItemRequest]): The lines of the cart.
+
+        Returns:
+            list[SaleItemRequest]: One line per product, ordered by product.
+        """
+        cart = validate_cart(((item.product_id, item.quantity) for item in value),
+                             settings.STOCK_CHANGE_MAX_QUANTITY)
+        return [SaleItemRequest(product_id=product_id, quantity=quantity)
+                for product_id, quantity in cart]
+
+    @model_validator(mode='after')
+    def credit_validator(self) -> 'SaleCreateRequest':
+        """
+        Ensures that a sale not paid in full has a customer to owe the rest.
+
+        Returns:
+            SaleCreateRequest: The validated sale.
+
+        Raises:
+            CartValidationException: If amount_paid is given without a customer.
+        """
+        if self.amount_paid is not None and self.customer_id is None:
+            raise CartValidationException(f'Key (amount_paid)=({self.amount_paid}) A sale '
+                                          'not paid in full needs a customer.')
+        return self
+
+class SaleItemResponse(BaseSchema):
+    """
+    A schema for responding with a line of a sale.
+    """
+    product_id: Annotated[
+        uuid.UUID,
+        Field(description='The product sold.')]
+    quantity: Annotated[
+        int,
+        Field(description='The number of units sold.')]
+    unit_price: Annotated[
+        Decimal,
+        Field(description='The price of the product when it was sold.')]
+
+class SaleResponse(BaseSchema):
+    """
+    A schema for responding with a sale and its items.
+    """
+    id: Annotated[
+        uuid.UUID,
+        Field(description='The unique identifier for the sale.')]
+    seller_id: Annotated[
+        uuid.UUID,
+        Field(description='The user who registered the sale.')]
+    customer_id: Annotated[
+        Optional[uuid.UUID],
+        Field(description='The customer who bought, if any.')]
+    total: Annotated[
+        Decimal,
+        Field(description='The sum of the items of the sale.')]
+    debt: Annotated[
+        Decimal,
+        Field(description='The part of the total owed by the customer.')]
+    date_created: Annotated[
+        datetime,
+        Field(description='The date and time when the sale was registered.')]
+    items: Annotated[
+        list[SaleItemResponse],
+        Field(description='The items of the sale, ordered by product.')]
@@ -0,0 +1,208 @@
+"""
+This module contains the SaleService class, which registers the sales of a seller and reads
+them back. A sale is written in a single transaction of four statements, whatever the size
+of its cart: one SELECT locking its products in order, one UPDATE taking the stock of every
+product, one INSERT of the sale and one multi-row INSERT of its items, plus one UPDATE of the
+balance of its customer, if any, and one INSERT of low stock alerts when products reach
+their threshold.
+"""
+import uuid
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.modules.customers.services.customer_service import build_balance_increment
+from api.modules.products.models.Product import Product
+from api.modules.products.services.product_service import (build_batch_stock_decrement,
+                                                           build_stock_lock)
+from api.modules.products.services.stock_alert_dispatcher import (build_stock_alert_insert,
+                                                                  stock_alert_dispatcher)
+from api.modules.sales.models.Sale import Sale
+from api.modules.sales.models.SaleItem import SaleItem
+from api.modules.sales.schemas.sale_schema import (SaleCreateRequest, SaleItemResponse,
+                                                   SaleResponse)
+from api.shared.exceptions.cart_exception import CartValidationException
+from api.shared.exceptions.not_found_exception import NotFoundException
+from api.shared.exceptions.stock_exception import InsufficientStockException
+from api.shared.handlers.database_handler import handle_database_exceptions
+from api.utils.uuid7 import uuid7
+
+class SaleService:
+    """
+    A service class for handling the sales of a seller.
+
+    Every method takes the seller making the request and only ever sees that seller's
+    sales and products.
+
+    Attributes:
+        session (AsyncSession): An instance of AsyncSession for database transactions.
+    """
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @handle_database_exceptions
+    async def create_sale(self, seller_id: uuid.UUID, data_sale: SaleCreateRequest,
+                          sale_id: Optional[uuid.UUID] = None) -> SaleResponse:
+        """
+        Registers a sale, taking its items from the stock.
+
+        The cart has already been merged by product and ordered by pydantic. The rows of its
+        products are locked first, in the order of their identifiers, so concurrent sales
+        sharing products wait for each other instead of deadlocking. The stock of every
+        product is then taken by a single conditional UPDATE, which also returns the current
+        prices. The unpaid part of the total, if any, is added to the balance of the
+        customer, then the sale and its items are inserted with one statement each, and the
+        transaction commits. Products taken to or below their low stock threshold get a low
+        stock alert in the same transaction. If any product is missing or short of stock, or
+        the customer is missing, the transaction is rolled back and nothing is registered.
+
+        Args:
+            seller_id (uuid.UUID): The seller making the sale.
+            data_sale (SaleCreateRequest): The cart validated by pydantic.
+            sale_id (Optional[uuid.UUID]): The identifier of the sale, given by devices
+            registering sales offline, a new UUIDv7 by default.
+
+        Returns:
+            SaleResponse: The registered sale and its items.
+
+        Raises:
+            NotFoundException: If the seller has no such product or customer.
+            InsufficientStockException: If a product has fewer units in stock than sold.
+            CartValidationException: If the amount paid exceeds the total.
+            DataBaseTransactionException: If the seller already has a sale with sale_id.
+        """
+        quantities = [(item.product_id, item.quantity) for item in data_sale.items]
+        await self.session.execute(
+            build_stock_lock(seller_id, [product_id for product_id, _ in quantities]))
+        result = (await self.session.execute(
+            build_batch_stock_decrement(seller_id, quantities))).all()
+        prices = {row.id: row.price for row in result}
+        crossings = [row for row in result if row.crossed_low_stock]
+        if len(prices) < len(quantities):
+            await self._raise_unavailable(seller_id, quantities, prices)
+
+        sale_id = sale_id or uuid7()
+        items = [{'seller_id': seller_id, 'sale_id': sale_id, 'product_id': product_id,
+                  'quantity': quantity, 'unit_price': prices[product_id]}
+                 for product_id, quantity in quantities]
+        total = sum((item['unit_price'] * item['quantity'] for item in items), Decimal(0))
+        debt = await self._charge_customer(seller_id, data_sale, total)
+        sales = Sale.__table__
+        date_created = await self.session.scalar(
+            insert(sales).values(id=sale_id, seller_id=seller_id,
+                                 customer_id=data_sale.customer_id, total=total, debt=debt)
+            .returning(sales.c.date_created))
+        await self.session.execute(insert(SaleItem.__table__).values(items))
+        if crossings:
+            await self.session.execute(build_stock_alert_insert(seller_id, crossings))
+        await self.session.commit()
+        if crossings:
+            stock_alert_dispatcher.wake()
+
+        return SaleResponse(id=sale_id, seller_id=seller_id,
+                            customer_id=data_sale.customer_id, total=total, debt=debt,
+                            date_created=date_created,
+                            items=[SaleItemResponse(**item) for item in items])
+
+    @handle_database_exceptions
+    async def get_sale(self, seller_id: uuid.UUID, sale_id: uuid.UUID) -> SaleResponse:
+        """
+        Fetches a sale of a seller and its items.
+
+        Args:
+            seller_id (uuid.UUID): The seller of the sale.
+            sale_id (uuid.UUID): The identifier of the sale.
+
+        Returns:
+            SaleResponse: The sale and its items.
+
+        Raises:
+            NotFoundException: If the seller has no such sale.
+        """
+        sales, sale_items = Sale.__table__, SaleItem.__table__
+        connection = await self.session.connection()
+        sale = (await connection.execute(
+            select(sales).where(sales.c.seller_id == seller_id, sales.c.id == sale_id)
+        )).mappings().one_or_none()
+        if sale is None:
+            raise NotFoundException(f'Key (id)=({sale_id}) Sale not found.')
+        items = (await connection.execute(
+            select(sale_items.c.product_id, sale_items.c.quantity, sale_items.c.unit_price)
+            .where(sale_items.c.seller_id == seller_id, sale_items.c.sale_id == sale_id)
+            .order_by(sale_items.c.product_id))).mappings().all()
+
+        return SaleResponse(**sale, items=items)
+
+    async def _charge_customer(self, seller_id: uuid.UUID, data_sale: SaleCreateRequest,
+                               total: Decimal) -> Decimal:
+        """
+        Adds the unpaid part of a sale to the balance of its customer.
+
+        The balance of a customer given with a sale paid in full is updated too, by zero,
+        which checks that the customer belongs to the seller.
+
+        Args:
+            seller_id (uuid.UUID): The seller making the sale.
+            data_sale (SaleCreateRequest): The cart validated by pydantic.
+            total (Decimal): The total of the sale.
+
+        Returns:
+            Decimal: The debt of the sale.
+
+        Raises:
+            NotFoundException: If the seller has no such customer.
+            CartValidationException: If the amount paid exceeds the total.
+        """
+        if data_sale.amount_paid is None:
+            debt = Decimal('0.00')
+        elif data_sale.amount_paid > total:
+            await self.session.rollback()
+            raise CartValidationException(f'Key (amount_paid)=({data_sale.amount_paid}) The '
+                                          f'amount paid exceeds the total of {total}.')
+        else:
+            debt = total - data_sale.amount_paid
+
+        if data_sale.customer_id is not None:
+            result = await self.session.execute(
+                build_balance_increment(seller_id, data_sale.customer_id, debt))
+            if result.one_or_none() is None:
+                await self.session.rollback()
+                raise NotFoundException(f'Key (customer_id)=({data_sale.customer_id}) '
+                                        'Customer not found.')
+        return debt
+
+    async def _raise_unavailable(self, seller_id: uuid.UUID,
+                                 quantities: list[tuple[uuid.UUID, int]],
+                                 taken: dict) -> None:
+        """
+        Rolls back a sale whose stock could not all be taken and reports the first product
+        that is missing or short of stock.
+
+        Args:
+            seller_id (uuid.UUID): The seller making the sale.
+            quantities (list[tuple[uuid.UUID, int]]): The product and quantity of each item.
+            taken (dict): The products whose stock was taken.
+
+        Raises:
+            NotFoundException: If the seller has no such product.
+            InsufficientStockException: If a product has fewer units in stock than sold.
+        """
+        table = Product.__table__
+        missing = [(product_id, quantity) for product_id, quantity in quantities
+                   if product_id not in taken]
+        result = await self.session.execute(
+            select(table.c.id, table.c.quantity)
+            .where(table.c.seller_id == seller_id,
+                   table.c.id.in_([product_id for product_id, _ in missing])))
+        available = dict(result.all())
+        await self.session.rollback()
+
+        for product_id, _ in missing:
+            if product_id not in available:
+                raise NotFoundException(f'Key (product_id)=({product_id}) Product not found.')
+        product_id, quantity = missing[0]
+        raise InsufficientStockException(f'Key (quantity)=({quantity}) Only '
+                                         f'{available[product_id]} units of product '
+                                         f'{product_id} are in stock.')
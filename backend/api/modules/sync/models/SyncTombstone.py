@@ -0,0 +1,36 @@
+"""
+This module defines the SyncTombstone model, the record of a synced row that was deleted.
+It sets up the SQLAlchemy ORM mappings for the sync_tombstones table in the database
+"""
+import uuid
+from datetime import datetime
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import BigInteger, DateTime, Index, String, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.shared.database.change_tracking import CURRENT_XID
+from api.shared.database.connection import Base
+
+class SyncTombstone(Base):
+    """
+    SyncTombstone model for storing the deleted rows of the synced tables in the
+    'sync_tombstones' table in the database.
+
+    Tombstones are written by the triggers of the tracked tables, in the transaction of the
+    delete, and tell the devices of a seller to drop their copy of the row. The table has no
+    foreign key to users, so the tombstone of a deleted user is kept too. A row deleted
+    again after being restored keeps a single tombstone, moved to the latest delete.
+    """
+    __tablename__ = "sync_tombstones"
+
+    seller_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    entity: Mapped[str] = mapped_column(String(20), primary_key=True)
+    entity_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    change_xid: Mapped[int] = mapped_column(BigInteger(), nullable=False,
+                                            server_default=text(CURRENT_XID))
+    date_deleted: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False,
+                                                   server_default=func.now()) # pylint: disable=not-callable
+
+# The rows of a seller deleted since the last sync of a device.
+Index('ix_sync_tombstones_seller_id_change_xid', SyncTombstone.seller_id,
+      SyncTombstone.change_xid)
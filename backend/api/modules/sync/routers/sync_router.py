@@ -0,0 +1,73 @@
+"""
+This module defines the routing for the sync operations of the devices of the sellers in
+the FastAPI application. It utilizes dependencies from the shared database module and
+services from the sync module to stream the changes since the last sync of a device and to
+register the sales it made offline.
+"""
+import uuid
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.shared.database.dependencies import get_seller_id, get_seller_session
+from api.modules.sync.services.sync_service import SyncService
+from api.modules.sync.schemas.sync_schema import SyncUploadRequest, SyncUploadResponse
+
+router = APIRouter()
+
+@router.get('/',
+            response_class=StreamingResponse,
+            status_code=status.HTTP_200_OK,
+            summary='Stream changes since the last sync',
+            tags=['sync'])
+async def get_changes(since: Optional[int] = Query(
+                          None, ge=0, description='The cursor returned by the previous sync; '
+                          'every row of the seller when omitted.'),
+                      seller_id: uuid.UUID = Depends(get_seller_id),
+                      db: AsyncSession = Depends(get_seller_session)
+                      ) -> StreamingResponse:
+    """
+    Stream the rows of the seller changed or deleted since the previous sync, as NDJSON.
+
+    Args:
+        since (Optional[int]): The cursor returned by the previous sync.
+        seller_id (uuid.UUID): The seller making the request.
+        db (AsyncSession): The database session dependency, scoped to the seller.
+
+    Returns:
+        StreamingResponse: One line per changed or deleted row, then one line holding the
+        cursor of the next sync.
+    """
+    sync_service = SyncService(db)
+    return StreamingResponse(sync_service.stream_changes(seller_id, since),
+                             media_type='application/x-ndjson')
+
+@router.post('/',
+             response_model=SyncUploadResponse,
+             status_code=status.HTTP_200_OK,
+             summary='Upload sales made offline',
+             tags=['sync'])
+async def upload_sales(data_upload: SyncUploadRequest,
+                       seller_id: uuid.UUID = Depends(get_seller_id),
+                       db: AsyncSession = Depends(get_seller_session)
+                       ) -> SyncUploadResponse:
+    """
+    Register a batch of sales made offline by a device of the seller.
+
+    Each sale is registered or rejected on its own, so the response is 200 OK whatever the
+    outcome of each sale, which is reported in the response.
+
+    Args:
+        data_upload (SyncUploadRequest): The sales, validated by pydantic.
+        seller_id (uuid.UUID): The seller making the request.
+        db (AsyncSession): The database session dependency, scoped to the seller.
+
+    Returns:
+        SyncUploadResponse: The outcome of every sale, in upload order.
+
+    Raises:
+        HTTPException: 422 if a sale of the batch is invalid.
+    """
+    sync_service = SyncService(db)
+    return await sync_service.upload_sales(seller_id, data_upload)
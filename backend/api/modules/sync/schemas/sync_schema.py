@@ -0,0 +1,65 @@
+"""
+This module defines the Pydantic schemas for the sync operations of the devices of the
+sellers. These schemas are used for validating the sales registered offline and uploaded in
+batches, and for responding with the outcome of each one.
+"""
+import uuid
+from enum import Enum
+from typing import Annotated, Optional
+from pydantic import Field
+
+from api.modules.sales.schemas.sale_schema import SaleCreateRequest
+from api.shared.configs.base_schema import BaseSchema
+from api.shared.configs.settings import settings
+
+class OfflineSaleRequest(SaleCreateRequest):
+    """
+    A schema for a sale registered on a device while offline. The identifier is generated by
+    the device, a UUIDv7 preferably, and makes the upload idempotent: a sale uploaded again
+    after a lost response is reported as a duplicate instead of being registered twice.
+    """
+    id: Annotated[
+        uuid.UUID,
+        Field(..., description='The identifier of the sale, generated by the device.')]
+
+class SyncUploadRequest(BaseSchema):
+    """
+    A schema for a batch of sales uploaded by a device when it is back online.
+    """
+    sales: Annotated[
+        list[OfflineSaleRequest],
+        Field(..., min_length=1, max_length=settings.SYNC_MAX_SALES,
+              description='The sales registered offline, in the order they were made.')]
+
+class SyncSaleStatus(str, Enum):
+    """
+    The outcomes of an uploaded sale.
+    """
+    CREATED = 'created'
+    DUPLICATE = 'duplicate'
+    REJECTED = 'rejected'
+
+class SyncSaleResult(BaseSchema):
+    """
+    A schema for the outcome of an uploaded sale.
+    """
+    id: Annotated[
+        uuid.UUID,
+        Field(description='The identifier of the sale.')]
+    status: Annotated[
+        SyncSaleStatus,
+        Field(description='Whether the sale was registered, already registered or rejected.')]
+    status_code: Annotated[
+        Optional[int],
+        Field(None, description='The HTTP status code the sale was rejected with.')]
+    detail: Annotated[
+        Optional[str],
+        Field(None, description='Why the sale was rejected.')]
+
+class SyncUploadResponse(BaseSchema):
+    """
+    A schema for responding with the outcome of every sale of a batch, in upload order.
+    """
+    results: Annotated[
+        list[SyncSaleResult],
+        Field(description='The outcome of each sale.')]
@@ -0,0 +1,199 @@
+"""
+This module contains the SyncService class, which keeps the devices of a seller in sync
+with the database while they work offline most of the time. A device downloads only the
+rows changed or deleted since its last sync, as an NDJSON stream, and uploads the sales it
+registered offline in batches.
+
+A sync cursor is the xmin of the snapshot the previous sync read: every transaction below
+it had committed, or aborted, by then, so its changes were in that sync. The next sync
+streams the rows whose change_xid is at or above the cursor, which includes the changes of
+every transaction still running at the time, however late it committed. A change may
+therefore be streamed twice, and devices apply the stream as upserts.
+"""
+import uuid
+from decimal import Decimal
+from typing import AsyncGenerator, Optional
+
+import orjson
+from fastapi import HTTPException
+from sqlalchemy import Select, Table, and_, select, text, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.modules.customers.models.Customer import Customer
+from api.modules.customers.models.CustomerPayment import CustomerPayment
+from api.modules.products.models.Product import Product
+from api.modules.sales.models.Sale import Sale
+from api.modules.sales.models.SaleItem import SaleItem
+from api.modules.sales.services.sale_service import SaleService
+from api.modules.sync.models.SyncTombstone import SyncTombstone
+from api.modules.sync.schemas.sync_schema import (SyncSaleResult, SyncSaleStatus,
+                                                  SyncUploadRequest, SyncUploadResponse)
+from api.modules.users.models.User import USER_SYNC_COLUMNS, User
+from api.shared.configs.settings import settings
+from api.shared.database.connection import engine
+from api.shared.handlers.database_handler import handle_database_exceptions
+
+# The xmin of the snapshot of the current transaction, the cursor of the next sync.
+SNAPSHOT_XMIN = text('SELECT CAST(CAST(pg_snapshot_xmin(pg_current_snapshot()) AS text) '
+                     'AS bigint)')
+
+# The columns streamed for each synced table. The seller is left out: it is always the
+# seller of the device.
+SYNC_COLUMNS = {
+    'product': ('id', 'name', 'price', 'quantity', 'low_stock_threshold', 'date_created'),
+    'customer': ('id', 'name', 'whatsapp', 'balance', 'date_created'),
+    'customer_payment': ('id', 'customer_id', 'amount', 'date_created'),
+    'sale': ('id', 'customer_id', 'total', 'debt', 'date_created'),
+    'sale_item': ('sale_id', 'product_id', 'quantity', 'unit_price'),
+}
+# The entities whose deletes leave tombstones, named as in the triggers of their tables.
+TRACKED_ENTITIES = ('user', 'product', 'customer', 'customer_payment', 'sale')
+
+class SyncService:
+    """
+    A service class for syncing the devices of a seller.
+
+    Attributes:
+        session (AsyncSession): An instance of AsyncSession for database transactions.
+    """
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def stream_changes(self, seller_id: uuid.UUID,
+                             since: Optional[int] = None) -> AsyncGenerator[bytes, None]:
+        """
+        Streams the rows of a seller changed or deleted since a cursor as NDJSON chunks.
+
+        Every line is an object whose entity names its table: the seller's own user, then
+        their products, customers, customer payments, sales and sale items, then the
+        tombstones of deleted rows, flagged deleted. The last line holds the cursor of the
+        next sync, so a device that did not receive it keeps its previous cursor and simply
+        syncs again. Without a cursor, every row of the seller is streamed and no tombstone.
+
+        Every query reads the same REPEATABLE READ snapshot, through server-side cursors on a
+        dedicated connection, so the stream keeps working after the request session is
+        closed and only one chunk of rows is held in memory at a time. The changes are found
+        on the (seller_id, change_xid) indexes of the tables.
+
+        Args:
+            seller_id (uuid.UUID): The seller of the device.
+            since (Optional[int]): The cursor returned by the previous sync of the device.
+
+        Yields:
+            bytes: The encoded chunk of lines.
+        """
+        async with engine.connect() as connection:
+            connection = await connection.execution_options(isolation_level='REPEATABLE READ',
+                                                            postgresql_readonly=True)
+            async with connection.begin():
+                cursor = await connection.scalar(SNAPSHOT_XMIN)
+                for entity, statement in build_change_statements(seller_id, since):
+                    result = await connection.stream(
+                        statement.execution_options(yield_per=settings.SYNC_CHUNK_SIZE))
+                    async for rows in result.partitions():
+                        yield b''.join(_encode_line({'entity': entity, **row._asdict()})
+                                       for row in rows)
+            yield _encode_line({'cursor': str(cursor)})
+
+    @handle_database_exceptions
+    async def upload_sales(self, seller_id: uuid.UUID,
+                           data_upload: SyncUploadRequest) -> SyncUploadResponse:
+        """
+        Registers a batch of sales made offline, each one in its own transaction.
+
+        Sales are registered in upload order, exactly like sales made online, at the prices
+        and stock of the moment they are uploaded. A sale that cannot be registered, such as
+        one of a product now out of stock, is rejected without affecting the others. A sale
+        whose identifier the seller already has, uploaded before the device lost the
+        response, is reported as a duplicate and left untouched.
+
+        Args:
+            seller_id (uuid.UUID): The seller of the device.
+            data_upload (SyncUploadRequest): The sales validated by pydantic.
+
+        Returns:
+            SyncUploadResponse: The outcome of every sale, in upload order.
+        """
+        sales = Sale.__table__
+        registered = set((await self.session.execute(
+            select(sales.c.id).where(sales.c.seller_id == seller_id,
+                                     sales.c.id.in_([sale.id for sale in data_upload.sales]))
+        )).scalars().all())
+        await self.session.rollback()
+
+        sale_service = SaleService(self.session)
+        results = []
+        for sale in data_upload.sales:
+            if sale.id in registered:
+                results.append(SyncSaleResult(id=sale.id, status=SyncSaleStatus.DUPLICATE))
+                continue
+            try:
+                await sale_service.create_sale(seller_id, sale, sale.id)
+            except HTTPException as error:
+                await self.session.rollback()
+                results.append(SyncSaleResult(id=sale.id, status=SyncSaleStatus.REJECTED,
+                                              status_code=error.status_code,
+                                              detail=error.detail))
+            else:
+                registered.add(sale.id)
+                results.append(SyncSaleResult(id=sale.id, status=SyncSaleStatus.CREATED))
+
+        return SyncUploadResponse(results=results)
+
+def build_change_statements(seller_id: uuid.UUID,
+                            since: Optional[int] = None) -> list[tuple[str, Select]]:
+    """
+    Builds the queries of the rows of a seller changed since a cursor, one per entity.
+
+    Sale items are never updated and are synced with their sale. Tombstones are only
+    queried with a cursor: a device without one has no row to drop.
+
+    Args:
+        seller_id (uuid.UUID): The seller of the rows.
+        since (Optional[int]): The cursor of the previous sync, every row when omitted.
+
+    Returns:
+        list[tuple[str, Select]]: The entity and the query of each synced table.
+    """
+    def changed(table: Table) -> list:
+        return [table.c.change_xid >= since] if since is not None else []
+
+    users = User.__table__
+    sales, sale_items = Sale.__table__, SaleItem.__table__
+    tombstones = SyncTombstone.__table__
+    statements = [('user', select(*(users.c[column] for column in USER_SYNC_COLUMNS))
+                   .where(users.c.id == seller_id, *changed(users)))]
+    for entity, model in (('product', Product), ('customer', Customer),
+                          ('customer_payment', CustomerPayment), ('sale', Sale)):
+        table = model.__table__
+        statements.append((entity, select(*(table.c[column]
+                                            for column in SYNC_COLUMNS[entity]))
+                           .where(table.c.seller_id == seller_id, *changed(table))))
+    statements.append(('sale_item', select(*(sale_items.c[column]
+                                             for column in SYNC_COLUMNS['sale_item']))
+                       .join(sales, and_(sales.c.seller_id == sale_items.c.seller_id,
+                                         sales.c.id == sale_items.c.sale_id))
+                       .where(sales.c.seller_id == seller_id, *changed(sales))))
+    if since is not None:
+        statements += [(entity, select(tombstones.c.entity_id.label('id'),
+                                       true().label('deleted'))
+                        .where(tombstones.c.seller_id == seller_id,
+                               tombstones.c.entity == entity, *changed(tombstones)))
+                       for entity in TRACKED_ENTITIES]
+
+    return statements
+
+def _encode_line(line: dict) -> bytes:
+    """
+    Encodes one line of the sync stream.
+    """
+    return orjson.dumps(line, default=_encode_value) + b'\n'
+
+def _encode_value(value: object) -> str:
+    """
+    Encodes the values orjson does not: amounts as strings, like the other endpoints do, so
+    they keep their exact value, and the UUID subclass returned by asyncpg.
+    """
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
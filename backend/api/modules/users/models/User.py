@@ -2,22 +2,26 @@
 This module defines the User model used across the application for user management.
 It sets up the SQLAlchemy ORM mappings for the users table in the database
 """
-import uuid
 from datetime import date, datetime
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import String, Integer, Date, DateTime, LargeBinary, func
+from sqlalchemy import String, Integer, Date, DateTime, LargeBinary, Index, func, literal
 from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql.elements import ColumnElement
 
 from api.shared.database.connection import Base
+from api.shared.database.change_tracking import track_changes
+from api.shared.database.mixins import ChangeTrackedMixin, UUIDv7PrimaryKeyMixin
 
-class User(Base):
+class User(UUIDv7PrimaryKeyMixin, ChangeTrackedMixin, Base):
     """
     User model for storing user information in the 'users' table in the database.
+    The 'id' primary key is a time-ordered UUIDv7 provided by UUIDv7PrimaryKeyMixin.
+    Long-inactive users are moved to the 'users_archive' table by UserArchiver.
+    A user is synced to their own devices as a seller, so changes to their profile are
+    tracked; logins and photos are not changes.
     """
     __tablename__ = "users"
 
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    email: Mapped[str] = mapped_column(String(50), nullable=False, unique=True, index=True)
+    email: Mapped[str] = mapped_column(String(50), nullable=False)
     cpf_cnpj: Mapped[str] = mapped_column(String(14), nullable=False, unique=True)
     whatsapp: Mapped[str] = mapped_column(String(14), nullable=False, unique=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -27,5 +31,43 @@ class User(Base):
     date_created: Mapped[datetime] = mapped_column(DateTime(timezone=True),
                                                    nullable=False, default=func.now()) # pylint: disable=not-callable
     status: Mapped[int] = mapped_column(Integer(), nullable=False, default=1)
-    profile_photo: Mapped[bytes] = mapped_column(LargeBinary(), nullable=True)
-    date_login: Mapped[datetime] = mapped_column(Date(), nullable=True)
+    profile_photo: Mapped[bytes] = mapped_column(LargeBinary(), nullable=True, deferred=True)
+    date_login: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+    version: Mapped[int] = mapped_column(Integer(), nullable=False, server_default='1')
+
+    __mapper_args__ = {'version_id_col': version}
+
+# Emails are unique regardless of case, and lookups filter on lower(email) to use this index.
+Index('ix_users_email_lower', func.lower(User.email), unique=True)
+
+# The status of active users, the only ones most queries look at.
+ACTIVE_STATUS = 1
+
+def user_status_is(user_status: int) -> ColumnElement[bool]:
+    """
+    Builds the condition users.status = :user_status with the status inlined in the SQL.
+
+    PostgreSQL only uses a partial index when the query predicate implies the index
+    predicate at planning time, which a bound parameter never does in a generic plan.
+    Statuses are few, so inlining them does not bloat the statement caches.
+
+    Args:
+        user_status (int): The status to filter on.
+
+    Returns:
+        ColumnElement[bool]: The condition, usable in any WHERE clause on users.
+    """
+    return User.__table__.c.status == literal(user_status, literal_execute=True)
+
+# Keyset pages of active users walk this index, which skips inactive and suspended users.
+Index('ix_users_active_id', User.id, postgresql_where=User.status == ACTIVE_STATUS)
+# The archival job finds its candidates here without scanning the active users.
+Index('ix_users_inactive_last_activity', func.coalesce(User.date_login, User.date_created),
+      postgresql_where=User.status != ACTIVE_STATUS)
+
+# The columns of a user synced to their devices. Only updates of these columns are changes,
+# so the frequent last login updates never reach the devices.
+USER_SYNC_COLUMNS = ('id', 'email', 'cpf_cnpj', 'whatsapp', 'name', 'sex', 'date_birthday',
+                     'status')
+# A user is looked up by primary key when synced, so change_xid needs no index.
+track_changes(User.__table__, 'user', 'id', USER_SYNC_COLUMNS[1:])
@@ -0,0 +1,43 @@
+"""
+This module defines the UserArchive model, the cold storage of long-inactive users. It sets
+up the SQLAlchemy ORM mappings for the users_archive table in the database, which mirrors
+the users table so that archived users can be read and restored without any conversion.
+"""
+import uuid
+from datetime import date, datetime
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import BigInteger, String, Integer, Date, DateTime, LargeBinary, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.shared.database.connection import Base
+
+class UserArchive(Base):
+    """
+    UserArchive model for storing the users moved out of the 'users' table by the archival
+    job in the 'users_archive' table in the database.
+
+    Rows keep the identifier, version and every column of the original user, including the
+    legacy profile_photo, plus the moment they were archived. The lookup indexes are not
+    unique: a user may register again after being archived and be archived a second time.
+    """
+    __tablename__ = "users_archive"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    email: Mapped[str] = mapped_column(String(50), nullable=False)
+    cpf_cnpj: Mapped[str] = mapped_column(String(14), nullable=False, index=True)
+    whatsapp: Mapped[str] = mapped_column(String(14), nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    password: Mapped[str] = mapped_column(String(255), nullable=False)
+    sex: Mapped[str] = mapped_column(String(1), nullable=False)
+    date_birthday: Mapped[date] = mapped_column(Date(), nullable=False)
+    date_created: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    status: Mapped[int] = mapped_column(Integer(), nullable=False)
+    profile_photo: Mapped[bytes] = mapped_column(LargeBinary(), nullable=True, deferred=True)
+    date_login: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+    version: Mapped[int] = mapped_column(Integer(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    change_xid: Mapped[int] = mapped_column(BigInteger(), nullable=False)
+    date_archived: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False,
+                                                    server_default=func.now()) # pylint: disable=not-callable
+
+Index('ix_users_archive_email_lower', func.lower(UserArchive.email))
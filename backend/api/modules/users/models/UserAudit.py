@@ -0,0 +1,67 @@
+"""
+This module defines the UserAudit model, the append-only history of the changes made to
+users. It sets up the SQLAlchemy ORM mappings for the user_audit table in the database,
+which is partitioned by month on date_created, together with its default partition and the
+trigger that rejects any UPDATE or DELETE of audit rows.
+"""
+import uuid
+from datetime import date, datetime
+from typing import Any, Optional
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy import DDL, BigInteger, DateTime, Identity, Index, String, event, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.shared.database.connection import Base
+
+class UserAudit(Base):
+    """
+    UserAudit model for storing one change made to a user in the 'user_audit' table.
+
+    The table has no foreign key to users, so the history outlives the users it describes.
+    Its primary key includes date_created, as PostgreSQL requires the partition key in every
+    unique constraint of a partitioned table.
+    """
+    __tablename__ = "user_audit"
+    __table_args__ = {'postgresql_partition_by': 'RANGE (date_created)'}
+
+    id: Mapped[int] = mapped_column(BigInteger(), Identity(), primary_key=True)
+    date_created: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True,
+                                                   server_default=func.now()) # pylint: disable=not-callable
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    action: Mapped[str] = mapped_column(String(20), nullable=False)
+    changes: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB(), nullable=True)
+
+Index('ix_user_audit_user_id_date_created', UserAudit.user_id, UserAudit.date_created)
+
+USER_AUDIT_APPEND_ONLY_FUNCTION = """
+    CREATE OR REPLACE FUNCTION user_audit_append_only() RETURNS trigger AS $$
+    BEGIN
+        RAISE EXCEPTION USING MESSAGE = 'user_audit is append-only, ' || TG_OP || ' is not allowed';
+    END
+    $$ LANGUAGE plpgsql
+"""
+USER_AUDIT_APPEND_ONLY_TRIGGER = """
+    CREATE TRIGGER user_audit_append_only BEFORE UPDATE OR DELETE ON user_audit
+    FOR EACH ROW EXECUTE FUNCTION user_audit_append_only()
+"""
+USER_AUDIT_DEFAULT_PARTITION = 'CREATE TABLE user_audit_default PARTITION OF user_audit DEFAULT'
+
+event.listen(UserAudit.__table__, 'after_create', DDL(USER_AUDIT_DEFAULT_PARTITION))
+event.listen(UserAudit.__table__, 'after_create', DDL(USER_AUDIT_APPEND_ONLY_FUNCTION))
+event.listen(UserAudit.__table__, 'after_create', DDL(USER_AUDIT_APPEND_ONLY_TRIGGER))
+
+def user_audit_partition_ddl(month: date) -> str:
+    """
+    Builds the statement creating the partition of user_audit for a calendar month.
+
+    Args:
+        month (date): Any day of the month.
+
+    Returns:
+        str: The CREATE TABLE IF NOT EXISTS ... PARTITION OF user_audit statement.
+    """
+    start = month.replace(day=1)
+    end = (start.replace(year=start.year + 1, month=1) if start.month == 12
+           else start.replace(month=start.month + 1))
+    return (f'CREATE TABLE IF NOT EXISTS user_audit_{start:%Y_%m} PARTITION OF user_audit '
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')")
@@ -0,0 +1,29 @@
+"""
+This module defines the UserPhoto model, which stores the processed thumbnail variants
+of each user's profile photo. It sets up the SQLAlchemy ORM mappings for the
+user_photos table in the database
+"""
+import uuid
+from datetime import datetime
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import String, DateTime, LargeBinary, ForeignKey, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.shared.database.connection import Base
+
+class UserPhoto(Base):
+    """
+    UserPhoto model for storing one encoded variant of a user's profile photo
+    in the 'user_photos' table in the database.
+    """
+    __tablename__ = "user_photos"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True),
+                                               ForeignKey('users.id', ondelete='CASCADE'),
+                                               primary_key=True)
+    variant: Mapped[str] = mapped_column(String(10), primary_key=True)
+    content: Mapped[bytes] = mapped_column(LargeBinary(), nullable=False)
+    content_type: Mapped[str] = mapped_column(String(30), nullable=False)
+    etag: Mapped[str] = mapped_column(String(70), nullable=False)
+    date_created: Mapped[datetime] = mapped_column(DateTime(timezone=True),
+                                                   nullable=False, default=func.now()) # pylint: disable=not-callable
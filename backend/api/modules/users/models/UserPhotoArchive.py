@@ -0,0 +1,28 @@
+"""
+This module defines the UserPhotoArchive model, which keeps the thumbnail variants of the
+profile photos of archived users. It sets up the SQLAlchemy ORM mappings for the
+user_photos_archive table in the database, a mirror of the user_photos table
+"""
+import uuid
+from datetime import datetime
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import String, DateTime, LargeBinary, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.shared.database.connection import Base
+
+class UserPhotoArchive(Base):
+    """
+    UserPhotoArchive model for storing one encoded variant of an archived user's profile
+    photo in the 'user_photos_archive' table in the database.
+    """
+    __tablename__ = "user_photos_archive"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True),
+                                               ForeignKey('users_archive.id', ondelete='CASCADE'),
+                                               primary_key=True)
+    variant: Mapped[str] = mapped_column(String(10), primary_key=True)
+    content: Mapped[bytes] = mapped_column(LargeBinary(), nullable=False)
+    content_type: Mapped[str] = mapped_column(String(30), nullable=False)
+    etag: Mapped[str] = mapped_column(String(70), nullable=False)
+    date_created: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -1,14 +1,33 @@
 """
 This module defines the routing for user-related operations in the FastAPI application.
 It utilizes dependencies from the shared database module and services from the user module
-to perform operations such as creating a new user.
+to perform operations such as creating, reading, listing and partially updating users,
+changing the status of many users at once, reporting user counts, checking signup
+availability, exporting the users table and uploading or serving profile photos.
 """
-from fastapi import APIRouter, Depends, status
+import uuid
+from typing import Optional
+from fastapi import APIRouter, Depends, File, Header, Query, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.shared.configs.settings import settings
 from api.shared.database.dependencies import get_session
+from api.shared.exceptions.availability_exception import AvailabilityQueryException
+from api.shared.exceptions.precondition_required_exception import PreconditionRequiredException
+from api.shared.validators.export_columns_validator import validate_export_columns
+from api.modules.users.services.availability_filters import availability_filters
+from api.modules.users.services.user_read_service import (UserReadService,
+                                                           USER_STATUS_REPORT_ADAPTER)
 from api.modules.users.services.user_service import UserService
-from api.modules.users.schemas.user_schema import UserCreateRequest, UserResponse
+from api.modules.users.schemas.user_schema import (UserCreateRequest, UserUpdateRequest,
+                                                   UserResponse, UserExportFormat,
+                                                   USER_EXPORT_COLUMNS, UserPhotoResponse,
+                                                   UserPhotoVariant, UserAvailabilityResponse,
+                                                   UserListResponse, UserStatusReportResponse,
+                                                   UserStatusChangeRequest,
+                                                   UserStatusChangeResponse)
+from api.utils.http_cache import etag_matches, make_version_etag, parse_version_etags
 
 router = APIRouter()
 
@@ -18,6 +37,7 @@ router = APIRouter()
              summary='Create new user',
              tags=['users'])
 async def create_new_user(data_user: UserCreateRequest,
+                          response: Response,
                           db: AsyncSession = Depends(get_session)
                           ) -> UserResponse:
     """
@@ -26,6 +46,7 @@ async def create_new_user(data_user: UserCreateRequest,
     Args:
         data_user (UserCreateRequest): The user data received from the request, 
         validated by pydantic.
+        response (Response): The outgoing response, used to set the ETag header.
         db (AsyncSession): The database session dependency that allows 
         execution of database operations asynchronously.
 
@@ -39,4 +60,301 @@ async def create_new_user(data_user: UserCreateRequest,
     """
     user_service = UserService(db)
     new_user = await user_service.create_new_user(data_user)
+    response.headers['ETag'] = make_version_etag(new_user.version)
     return UserResponse.model_validate(new_user)
+
+@router.post('/status',
+             response_model=UserStatusChangeResponse,
+             status_code=status.HTTP_200_OK,
+             summary='Change the status of many users',
+             tags=['users'])
+async def change_users_status(data: UserStatusChangeRequest,
+                              db: AsyncSession = Depends(get_session)
+                              ) -> UserStatusChangeResponse:
+    """
+    Suspend, reactivate or deactivate users in bulk, by identifiers or by filter.
+
+    Args:
+        data (UserStatusChangeRequest): The target status and the users to change,
+        validated by pydantic.
+        db (AsyncSession): The database session dependency.
+
+    Returns:
+        UserStatusChangeResponse: The users that changed, the archived ones, which cannot
+        change, and the ones left unchanged.
+
+    Raises:
+        HTTPException: 422 if the status is unknown or the users are not given by exactly
+        one of ids or filter.
+    """
+    user_service = UserService(db)
+    return await user_service.change_users_status(data)
+
+@router.get('/',
+            response_model=UserListResponse,
+            status_code=status.HTTP_200_OK,
+            summary='List users',
+            tags=['users'])
+async def list_users(limit: int = Query(settings.USER_LIST_DEFAULT_LIMIT, ge=1,
+                                        le=settings.USER_LIST_MAX_LIMIT),
+                     after: Optional[uuid.UUID] = Query(
+                         None, description='The next_after cursor of the previous page.'),
+                     user_status: Optional[int] = Query(
+                         None, alias='status', description='List only users with this status.'),
+                     db: AsyncSession = Depends(get_session)
+                     ) -> Response:
+    """
+    List users ordered by identifier, one keyset page at a time.
+
+    The page is validated once by the read service and serialized here straight to JSON,
+    so FastAPI does not validate it a second time against the response model.
+
+    Args:
+        limit (int): The maximum number of users in the page.
+        after (Optional[uuid.UUID]): The cursor returned with the previous page.
+        user_status (Optional[int]): The status used to filter the listed users.
+        db (AsyncSession): The database session dependency.
+
+    Returns:
+        Response: The JSON encoded UserListResponse.
+    """
+    user_read_service = UserReadService(db)
+    page = await user_read_service.list_users(limit, after, user_status)
+    return Response(content=page.model_dump_json(), media_type='application/json')
+
+@router.get('/report/status',
+            response_model=list[UserStatusReportResponse],
+            status_code=status.HTTP_200_OK,
+            summary='Count users by status',
+            tags=['users'])
+async def report_users_by_status(db: AsyncSession = Depends(get_session)) -> Response:
+    """
+    Count the users in each status.
+
+    Args:
+        db (AsyncSession): The database session dependency.
+
+    Returns:
+        Response: The JSON encoded list of UserStatusReportResponse.
+    """
+    user_read_service = UserReadService(db)
+    report = await user_read_service.status_report()
+    return Response(content=USER_STATUS_REPORT_ADAPTER.dump_json(report),
+                    media_type='application/json')
+
+@router.get('/export',
+            response_class=StreamingResponse,
+            status_code=status.HTTP_200_OK,
+            summary='Export users as CSV or NDJSON',
+            tags=['users'])
+async def export_users(export_format: UserExportFormat = Query(UserExportFormat.CSV,
+                                                               alias='format'),
+                       columns: Optional[str] = Query(
+                           None, description='Comma-separated columns to export.'),
+                       user_status: Optional[int] = Query(
+                           None, alias='status', description='Export only users with this status.'),
+                       db: AsyncSession = Depends(get_session)
+                       ) -> StreamingResponse:
+    """
+    Stream every user, or the users with a given status, as a chunked CSV or NDJSON file.
+
+    Args:
+        export_format (UserExportFormat): The output format, csv by default.
+        columns (Optional[str]): The comma-separated columns to export, all exportable
+        columns when omitted.
+        user_status (Optional[int]): The status used to filter the exported users.
+        db (AsyncSession): The database session dependency.
+
+    Returns:
+        StreamingResponse: The chunked export, streamed as rows are read from the database.
+
+    Raises:
+        ExportColumnException: If a requested column is unknown or not exportable. Raised
+        before streaming starts.
+    """
+    selected_columns = validate_export_columns(columns, USER_EXPORT_COLUMNS)
+    user_service = UserService(db)
+    return StreamingResponse(
+        user_service.export_users(selected_columns, export_format, user_status),
+        media_type=export_format.media_type,
+        headers={'Content-Disposition': f'attachment; filename="users.{export_format.value}"'})
+
+@router.get('/availability',
+            response_model=UserAvailabilityResponse,
+            response_model_exclude_none=True,
+            status_code=status.HTTP_200_OK,
+            summary='Check whether signup values are available',
+            tags=['users'])
+async def check_availability(email: Optional[str] = Query(None, max_length=50),
+                             cpf_cnpj: Optional[str] = Query(None, max_length=14),
+                             whatsapp: Optional[str] = Query(None, max_length=14),
+                             db: AsyncSession = Depends(get_session)
+                             ) -> UserAvailabilityResponse:
+    """
+    Check whether an email, CPF/CNPJ or WhatsApp number is already registered.
+
+    Args:
+        email (Optional[str]): The email to check, in any case.
+        cpf_cnpj (Optional[str]): The CPF or CNPJ to check.
+        whatsapp (Optional[str]): The WhatsApp number to check.
+        db (AsyncSession): The database session dependency.
+
+    Returns:
+        UserAvailabilityResponse: For each value sent, whether it is available.
+
+    Raises:
+        AvailabilityQueryException: If no value was sent.
+    """
+    values = {field: value for field, value in
+              (('email', email), ('cpf_cnpj', cpf_cnpj), ('whatsapp', whatsapp)) if value}
+    if not values:
+        raise AvailabilityQueryException('Key (email, cpf_cnpj, whatsapp) At least one value '
+                                         'must be checked.')
+    user_service = UserService(db)
+    return UserAvailabilityResponse(**await user_service.check_availability(values))
+
+@router.get('/availability/stats',
+            status_code=status.HTTP_200_OK,
+            summary='Get the availability filters statistics',
+            tags=['users'])
+async def get_availability_stats() -> dict:
+    """
+    Report the size, false-positive rate and hit counters of the availability filters.
+
+    Returns:
+        dict: The statistics of the availability filters.
+    """
+    return availability_filters.stats()
+
+@router.get('/{user_id}',
+            response_model=UserResponse,
+            status_code=status.HTTP_200_OK,
+            summary='Get user',
+            tags=['users'],
+            responses={status.HTTP_304_NOT_MODIFIED: {'description': 'Not Modified'}})
+async def get_user(user_id: uuid.UUID,
+                   response: Response,
+                   if_none_match: Optional[str] = Header(None),
+                   db: AsyncSession = Depends(get_session)
+                   ) -> UserResponse:
+    """
+    Get a user with an ETag derived from its row version.
+
+    Args:
+        user_id (uuid.UUID): The identifier of the user.
+        response (Response): The outgoing response, used to set the ETag header.
+        if_none_match (Optional[str]): The entity tags cached by the client.
+        db (AsyncSession): The database session dependency.
+
+    Returns:
+        UserResponse: The user data, or 304 Not Modified if the client copy is current.
+
+    Raises:
+        HTTPException: 404 if the user does not exist.
+    """
+    user_service = UserService(db)
+    user = await user_service.get_user(user_id)
+    etag = make_version_etag(user.version)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+    response.headers['ETag'] = etag
+    return UserResponse.model_validate(user)
+
+@router.patch('/{user_id}',
+              response_model=UserResponse,
+              status_code=status.HTTP_200_OK,
+              summary='Partially update user',
+              tags=['users'])
+async def update_user(user_id: uuid.UUID,
+                      data_user: UserUpdateRequest,
+                      response: Response,
+                      if_match: Optional[str] = Header(None),
+                      db: AsyncSession = Depends(get_session)
+                      ) -> UserResponse:
+    """
+    Update only the fields sent, guarded by the ETag of the version being changed.
+
+    Args:
+        user_id (uuid.UUID): The identifier of the user.
+        data_user (UserUpdateRequest): The fields to change, validated by pydantic.
+        response (Response): The outgoing response, used to set the new ETag header.
+        if_match (Optional[str]): The ETag of the user version the client is changing,
+        or '*' to overwrite any version.
+        db (AsyncSession): The database session dependency.
+
+    Returns:
+        UserResponse: The updated user data.
+
+    Raises:
+        HTTPException: 428 if If-Match is missing, 412 if the user changed since the given
+        version, 409 if the user is archived, 404 if the user does not exist.
+    """
+    if not if_match:
+        raise PreconditionRequiredException('Key (If-Match) The ETag of the user version '
+                                            'being changed is required.')
+    user_service = UserService(db)
+    updated_user = await user_service.update_user(user_id, data_user,
+                                                  parse_version_etags(if_match))
+    response.headers['ETag'] = make_version_etag(updated_user.version)
+    return UserResponse.model_validate(updated_user)
+
+@router.put('/{user_id}/photo',
+            response_model=list[UserPhotoResponse],
+            status_code=status.HTTP_200_OK,
+            summary='Upload the user profile photo',
+            tags=['users'])
+async def upload_profile_photo(user_id: uuid.UUID,
+                               photo: UploadFile = File(...),
+                               db: AsyncSession = Depends(get_session)
+                               ) -> list[UserPhotoResponse]:
+    """
+    Upload a JPEG, PNG or WebP profile photo and generate its thumbnail variants.
+
+    Args:
+        user_id (uuid.UUID): The identifier of the user.
+        photo (UploadFile): The uploaded image file.
+        db (AsyncSession): The database session dependency.
+
+    Returns:
+        list[UserPhotoResponse]: The generated variants and their entity tags.
+
+    Raises:
+        HTTPException: 404 if the user does not exist, 422 if the photo is invalid.
+    """
+    content = await photo.read(settings.PHOTO_MAX_UPLOAD_BYTES + 1)
+    user_service = UserService(db)
+    variants = await user_service.save_profile_photo(user_id, content)
+    return [UserPhotoResponse.model_validate(variant) for variant in variants]
+
+@router.get('/{user_id}/photo/{variant}',
+            response_class=Response,
+            status_code=status.HTTP_200_OK,
+            summary='Get a user profile photo variant',
+            tags=['users'])
+async def get_profile_photo(user_id: uuid.UUID,
+                            variant: UserPhotoVariant,
+                            if_none_match: Optional[str] = Header(None),
+                            db: AsyncSession = Depends(get_session)
+                            ) -> Response:
+    """
+    Serve a profile photo variant with cache validators.
+
+    Args:
+        user_id (uuid.UUID): The identifier of the user.
+        variant (UserPhotoVariant): The thumbnail variant (small, medium or large).
+        if_none_match (Optional[str]): The entity tags cached by the client.
+        db (AsyncSession): The database session dependency.
+
+    Returns:
+        Response: The encoded image, or 304 Not Modified if the client copy is current.
+
+    Raises:
+        HTTPException: 404 if the user has no profile photo.
+    """
+    user_service = UserService(db)
+    photo = await user_service.get_profile_photo(user_id, variant, if_none_match)
+    headers = {'ETag': photo.etag,
+               'Cache-Control': f'public, max-age={settings.PHOTO_CACHE_MAX_AGE}'}
+    if etag_matches(if_none_match, photo.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=photo.content, media_type=photo.content_type, headers=headers)
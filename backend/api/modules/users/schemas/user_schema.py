@@ -4,16 +4,21 @@ for validating the data sent to the API endpoints for creating and responding wi
 """
 import uuid
 from datetime import datetime, date
+from enum import Enum
 from typing import Annotated, Optional
-from pydantic import Field, EmailStr, field_validator
+from pydantic import Field, EmailStr, field_validator, model_validator
 
 from api.shared.configs.base_schema import BaseSchema
+from api.shared.configs.settings import settings
 from api.shared.validators.cpf_cnpj_validator import validate_cpf_cnpj
+from api.shared.validators.email_validator import normalize_email
 from api.shared.validators.phone_validator import validate_and_format_number
 from api.shared.validators.name_validator import validate_format_name
 from api.shared.validators.password_validator import validate_password
 from api.shared.validators.sex_validator import validate_sex
 from api.shared.validators.birthdate_validator import validate_birthdate
+from api.shared.validators.status_validator import validate_status
+from api.utils.tracing import traced
 
 class UserCreateRequest(BaseSchema):
     """
@@ -47,7 +52,22 @@ class UserCreateRequest(BaseSchema):
         date,
         Field(..., description='The user date of birth.')]
 
+    @field_validator('email')
+    @traced()
+    def email_validator(cls, value: str) -> str: # pylint: disable=E0213
+        """
+        Normalizes the email so that addresses differing only by case are the same user.
+
+        Args:
+            value (str): The email address, already validated by EmailStr.
+
+        Returns:
+            str: The email address in lower case.
+        """
+        return normalize_email(value)
+
     @field_validator('cpf_cnpj')
+    @traced()
     def cpf_cnpj_validator(cls, value: str) -> str: # pylint: disable=E0213
         """
         Validates whether the input is a valid CPF or CNPJ.
@@ -64,6 +84,7 @@ class UserCreateRequest(BaseSchema):
         return validate_cpf_cnpj(value)
 
     @field_validator('whatsapp')
+    @traced()
     def whatsapp_validator(cls, value: str) -> str: # pylint: disable=E0213
         """
         Validates whether the input is a valid phone number.
@@ -80,6 +101,7 @@ class UserCreateRequest(BaseSchema):
         return validate_and_format_number(value)
 
     @field_validator('name')
+    @traced()
     def name_validator(cls, value: str) -> str: # pylint: disable=E0213
         """
         Validates whether the input is a valid name.
@@ -96,6 +118,7 @@ class UserCreateRequest(BaseSchema):
         return validate_format_name(value)
 
     @field_validator('password')
+    @traced()
     def password_validator(cls, value: str) -> str: # pylint: disable=E0213
         """
         Validates whether the input is a valid password.
@@ -112,6 +135,7 @@ class UserCreateRequest(BaseSchema):
         return validate_password(value)
 
     @field_validator('sex')
+    @traced()
     def sex_validator(cls, value: str) -> str: # pylint: disable=E0213
         """
         Validates whether the input is a valid gender code.
@@ -129,6 +153,7 @@ class UserCreateRequest(BaseSchema):
         return validate_sex(value)
 
     @field_validator('date_birthday')
+    @traced()
     def birthday_validator(cls, value: date) -> date: # pylint: disable=E0213
         """
         Validates whether the input is a 
@@ -146,6 +171,54 @@ class UserCreateRequest(BaseSchema):
         """
         return validate_birthdate(value)
 
+class UserUpdateRequest(UserCreateRequest):
+    """
+    A schema for partial user update requests. Every field is optional, and the validators
+    inherited from UserCreateRequest run only on the fields actually sent. Sending null for
+    a field is rejected, since none of the user columns can be cleared.
+    """
+    email: Annotated[
+        EmailStr,
+        Field(None, max_length=50, description='Email must be at most 50 characters.')]
+    cpf_cnpj: Annotated[
+        str,
+        Field(None, min_length=11, max_length=14,
+              description='CPF must be 11 characters or CNPJ must be 14 characters.')]
+    whatsapp: Annotated[
+        str,
+        Field(None, min_length=8, max_length= 14,
+              description='WhatsApp number with a minimum 8 characters and maximum 14 characters')]
+    name: Annotated[
+        str,
+        Field(None, min_length=7, max_length= 100,
+              description='Name must be between 7 and 100 characters.')]
+    password: Annotated[
+        str,
+        Field(None, min_length=8, max_length=20,
+              description='Password must be between 8 and 20 characters.')]
+    sex: Annotated[
+        str,
+        Field(None, min_length=1, max_length= 1,
+              description='The user gender (M for male, F for female, O for other).')]
+    date_birthday: Annotated[
+        date,
+        Field(None, description='The user date of birth.')]
+
+    @model_validator(mode='after')
+    def not_empty_validator(self) -> 'UserUpdateRequest':
+        """
+        Validates that at least one field was sent.
+
+        Returns:
+            UserUpdateRequest: The validated request.
+
+        Raises:
+            ValueError: If the request body has no fields.
+        """
+        if not self.model_fields_set:
+            raise ValueError('At least one field must be sent.')
+        return self
+
 class UserResponse(BaseSchema):
     """
     A schema for responding with user data. Provides a secure way to present user information
@@ -178,10 +251,218 @@ class UserResponse(BaseSchema):
     date_created: Annotated[
         datetime,
         Field(description='The date and time when the user account was created.')]
-    profile_photo: Annotated[
-        Optional[bytes],
-        Field(description='Profile photo the user')]
     date_login: Annotated[
         Optional[datetime],
         Field(description='The last date and time the user logged in, may be null.')]
-    
\ No newline at end of file
+
+class UserListItemResponse(BaseSchema):
+    """
+    A schema for the users returned by list endpoints. It carries the same fields as
+    UserResponse, but the email is a plain string: list rows come straight from the database,
+    where every address was already validated on write, and EmailStr validation would
+    dominate the cost of validating a page.
+    """
+    id: Annotated[
+        uuid.UUID,
+        Field(description='The unique identifier for the user.')]
+    email: Annotated[
+        str,
+        Field(description='The email address of the user.')]
+    cpf_cnpj: Annotated[
+        str,
+        Field(description='The CPF or CNPJ the user')]
+    whatsapp: Annotated[
+        str,
+        Field(description='Whatsapp the user')]
+    name: Annotated[
+        str,
+        Field(description='The full name of the user.')]
+    sex: Annotated[
+        str,
+        Field(description='The gender of the user (M for male, F for female, O for other).')]
+    date_birthday: Annotated[
+        date,
+        Field(description='The date of birth of the user.')]
+    status: Annotated[
+        int,
+        Field(description='Status the user(1 for Activate, 2 for Inatived, 99 for Suspende).')]
+    date_created: Annotated[
+        datetime,
+        Field(description='The date and time when the user account was created.')]
+    date_login: Annotated[
+        Optional[datetime],
+        Field(description='The last date and time the user logged in, may be null.')]
+
+class UserListResponse(BaseSchema):
+    """
+    A schema for a page of users, ordered by identifier.
+    """
+    items: Annotated[
+        list[UserListItemResponse],
+        Field(description='The users of the page.')]
+    next_after: Annotated[
+        Optional[uuid.UUID],
+        Field(description='The identifier to send as "after" to get the next page, '
+                          'null on the last page.')]
+
+class UserStatusReportResponse(BaseSchema):
+    """
+    A schema for the number of users in each status.
+    """
+    status: Annotated[
+        int,
+        Field(description='Status the user(1 for Activate, 2 for Inatived, 99 for Suspende).')]
+    total: Annotated[
+        int,
+        Field(description='The number of users with this status.')]
+
+# Columns of the users table that may be exported. Password hashes and photos never leave.
+USER_EXPORT_COLUMNS = ('id', 'email', 'cpf_cnpj', 'whatsapp', 'name', 'sex',
+                       'date_birthday', 'status', 'date_created', 'date_login')
+
+class UserExportFormat(str, Enum):
+    """
+    The file formats supported by the user export endpoint.
+    """
+    CSV = 'csv'
+    NDJSON = 'ndjson'
+
+    @property
+    def media_type(self) -> str:
+        """
+        Returns the HTTP media type used to stream this format.
+        """
+        if self is UserExportFormat.CSV:
+            return 'text/csv'
+        return 'application/x-ndjson'
+
+class UserPhotoVariant(str, Enum):
+    """
+    The thumbnail variants generated for every uploaded profile photo.
+    """
+    SMALL = 'small'
+    MEDIUM = 'medium'
+    LARGE = 'large'
+
+class UserPhotoResponse(BaseSchema):
+    """
+    A schema for responding with the variants generated from an uploaded profile photo.
+    """
+    variant: Annotated[
+        UserPhotoVariant,
+        Field(description='The thumbnail variant (small, medium or large).')]
+    content_type: Annotated[
+        str,
+        Field(description='The media type of the encoded variant.')]
+    etag: Annotated[
+        str,
+        Field(description='The strong entity tag served with the variant.')]
+
+class UserAvailabilityResponse(BaseSchema):
+    """
+    A schema for responding to signup availability checks. Only the fields that were
+    checked are present; True means the value is not registered yet.
+    """
+    email: Annotated[
+        Optional[bool],
+        Field(None, description='Whether the email is available.')]
+    cpf_cnpj: Annotated[
+        Optional[bool],
+        Field(None, description='Whether the CPF or CNPJ is available.')]
+    whatsapp: Annotated[
+        Optional[bool],
+        Field(None, description='Whether the WhatsApp number is available.')]
+
+class UserStatusFilter(BaseSchema):
+    """
+    A schema selecting the users whose status changes in a bulk status change. Every
+    condition sent must match, and at least one must be sent.
+    """
+    status: Annotated[
+        Optional[int],
+        Field(None, description='Only users currently in this status.')]
+    date_created_from: Annotated[
+        Optional[datetime],
+        Field(None, description='Only users created at or after this moment.')]
+    date_created_to: Annotated[
+        Optional[datetime],
+        Field(None, description='Only users created before this moment.')]
+
+    @model_validator(mode='after')
+    def not_empty_validator(self) -> 'UserStatusFilter':
+        """
+        Validates that at least one condition was sent, so a filter never matches every user.
+
+        Returns:
+            UserStatusFilter: The validated filter.
+
+        Raises:
+            ValueError: If no condition was sent.
+        """
+        if not self.model_dump(exclude_none=True):
+            raise ValueError('At least one filter condition must be sent.')
+        return self
+
+class UserStatusChangeRequest(BaseSchema):
+    """
+    A schema for bulk status change requests. The users are given either as a list of
+    identifiers or as a filter, never both.
+    """
+    status: Annotated[
+        int,
+        Field(..., description='The new status (1 for active, 2 for inactive, 99 for suspended).')]
+    ids: Annotated[
+        Optional[list[uuid.UUID]],
+        Field(None, min_length=1, max_length=settings.STATUS_CHANGE_MAX_IDS,
+              description='The identifiers of the users to change.')]
+    filter: Annotated[
+        Optional[UserStatusFilter],
+        Field(None, description='The conditions selecting the users to change.')]
+
+    @field_validator('status')
+    def status_validator(cls, value: int) -> int: # pylint: disable=E0213
+        """
+        Validates whether the input is a valid status code.
+
+        Args:
+            value (int): The status code to validate.
+
+        Returns:
+            int: The validated status code.
+
+        Raises:
+            StatusValidationException: If the status code is not one of the accepted values.
+        """
+        return validate_status(value)
+
+    @model_validator(mode='after')
+    def target_validator(self) -> 'UserStatusChangeRequest':
+        """
+        Validates that the users are given either by identifiers or by filter.
+
+        Returns:
+            UserStatusChangeRequest: The validated request.
+
+        Raises:
+            ValueError: If both or neither of ids and filter were sent.
+        """
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError('Exactly one of ids or filter must be sent.')
+        return self
+
+class UserStatusChangeResponse(BaseSchema):
+    """
+    A schema for responding with the outcome of a bulk status change.
+    """
+    status: Annotated[
+        int,
+        Field(description='The new status of the changed users.')]
+    changed: Annotated[
+        list[uuid.UUID],
+        Field(description='The users whose status changed.')]
+    unchanged: Annotated[
+        list[uuid.UUID],
+        Field(description='The requested users that do not exist or already had the status.')]
+    archived: Annotated[
+        list[uuid.UUID],
+        Field(description='The requested users that are archived, whose status cannot change.')]
@@ -0,0 +1,195 @@
+"""
+This module contains the UserAuditWriter class, which records the changes made to users in
+the append-only user_audit table. Changes are queued in memory by UserService and copied to
+the database in batches with the PostgreSQL COPY protocol, so auditing adds no INSERT to the
+latency of the request that made the change.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Iterable, Optional
+
+import orjson
+from sqlalchemy import text
+
+from api.modules.users.models.UserAudit import user_audit_partition_ddl
+from api.shared.configs.settings import settings
+from api.shared.database.connection import engine
+from api.utils.background_worker import BackgroundWorker
+
+logger = logging.getLogger(__name__)
+
+# The user columns whose values never reach the audit log; only the fact they changed does.
+AUDIT_REDACTED_FIELDS = {'password'}
+AUDIT_COLUMNS = ['date_created', 'user_id', 'action', 'changes']
+
+AuditRecord = tuple[datetime, uuid.UUID, str, Optional[str]]
+
+class UserAuditWriter(BackgroundWorker):
+    """
+    A queue of user changes flushed to user_audit in the background with COPY.
+
+    The queue holds at most max_queued changes: once it is full, recording a change waits
+    until the next flush makes room, which slows the requests down instead of letting memory
+    grow. The queue is flushed every flush interval, as soon as it holds flush_max_entries
+    changes, and until it is empty when the writer stops. A batch that fails to be written
+    is kept and retried first on the next flush. Changes recorded while the writer is
+    stopped, left when a flush fails on shutdown or still queued when the process is killed
+    are lost.
+
+    The monthly partition of every change is created before the change is written, so only
+    the changes of a month whose partition could not be created land in the default one.
+
+    Attributes:
+        flush_max_entries (int): The number of queued changes that triggers a flush, and the
+        maximum number of rows written by one COPY.
+        max_queued (int): The maximum number of queued changes.
+    """
+    def __init__(self, flush_interval_ms: int, flush_max_entries: int, max_queued: int):
+        super().__init__(flush_interval_ms)
+        self.flush_max_entries = flush_max_entries
+        self.max_queued = max_queued
+        self._queue: Optional[asyncio.Queue] = None
+        self._unflushed: list[AuditRecord] = []
+        self._partitioned_months: set[date] = set()
+
+    async def on_start(self) -> None:
+        """
+        Creates the partitions of the current and next months and the queue.
+        """
+        today = datetime.now(timezone.utc).date().replace(day=1)
+        await self.create_partitions([today, (today + timedelta(days=32)).replace(day=1)])
+        self._queue = asyncio.Queue(self.max_queued)
+
+    async def on_stop(self) -> None:
+        """
+        Writes every queued change. Once a flush fails, no later one retries the changes
+        left, so they are dropped and counted in the log.
+        """
+        while self._unflushed or not self._queue.empty():
+            await self.flush()
+            if self._unflushed:
+                dropped = len(self._unflushed) + self._queue.qsize()
+                self._unflushed = []
+                while not self._queue.empty():
+                    self._queue.get_nowait()
+                logger.error('Dropped %d audit records that could not be written on shutdown.',
+                             dropped)
+                return
+
+    async def run_once(self) -> None:
+        """
+        Writes the queued changes, then requests another flush right away when producers
+        blocked on a full queue refilled it while the batch was written.
+        """
+        await self.flush()
+        if not self._unflushed and (self._queue.full()
+                                    or self._queue.qsize() >= self.flush_max_entries):
+            self.wake()
+
+    async def create_partitions(self, months: Iterable[date]) -> None:
+        """
+        Creates the monthly partitions of user_audit that this writer has not created yet.
+
+        A failure is logged and the month is not tried again until the writer restarts, its
+        rows landing in the default partition meanwhile, since auditing must neither prevent
+        the application from starting nor slow every flush down.
+
+        Args:
+            months (Iterable[date]): The first days of the months.
+        """
+        months = sorted(set(months) - self._partitioned_months)
+        if not months:
+            return
+        self._partitioned_months.update(months)
+        try:
+            async with engine.begin() as connection:
+                for month in months:
+                    await connection.execute(text(user_audit_partition_ddl(month)))
+        except Exception: # pylint: disable=broad-exception-caught
+            logger.exception('Failed to create the user_audit partitions.')
+
+    async def record(self, user_id: uuid.UUID, action: str,
+                     changes: Optional[dict[str, Any]] = None) -> None:
+        """
+        Queues a change made to a user, waiting for room when the queue is full.
+
+        Args:
+            user_id (uuid.UUID): The user that changed.
+            action (str): The kind of change, such as create, update or status.
+            changes (Optional[dict[str, Any]]): The new values of the changed columns.
+            Redacted columns are recorded without their value.
+        """
+        await self.record_many([user_id], action, changes)
+
+    async def record_many(self, user_ids: Iterable[uuid.UUID], action: str,
+                          changes: Optional[dict[str, Any]] = None) -> None:
+        """
+        Queues the same change made to many users. The changes are committed by the time
+        they are recorded, so while the writer is stopped they are dropped with a warning
+        rather than failing the request that made them.
+
+        Args:
+            user_ids (Iterable[uuid.UUID]): The users that changed.
+            action (str): The kind of change, such as create, update or status.
+            changes (Optional[dict[str, Any]]): The new values of the changed columns.
+        """
+        if not self.running:
+            logger.warning('Dropped the %s audit records of %d users, the writer is stopped.',
+                           action, len(list(user_ids)))
+            return
+        when = datetime.now(timezone.utc)
+        encoded = _encode_changes(changes)
+        for user_id in user_ids:
+            if self._queue.full():
+                self.wake()
+            await self._queue.put((when, user_id, action, encoded))
+            if self._queue.qsize() >= self.flush_max_entries:
+                self.wake()
+
+    async def flush(self) -> None:
+        """
+        Copies the queued changes to user_audit, flush_max_entries rows per COPY, after
+        creating the partitions of their months.
+
+        If a COPY fails, its rows and the following ones are kept and retried first on the
+        next flush. At most max_queued kept rows are taken at once, so while the database is
+        unavailable the queue stays full and producers keep waiting.
+        """
+        records, self._unflushed = self._unflushed, []
+        while (self._queue is not None and not self._queue.empty()
+               and len(records) < self.max_queued):
+            records.append(self._queue.get_nowait())
+        if not records:
+            return
+
+        written = 0
+        try:
+            await self.create_partitions({when.date().replace(day=1) for when, *_ in records})
+            async with engine.connect() as connection:
+                raw_connection = await connection.get_raw_connection()
+                while written < len(records):
+                    batch = records[written:written + self.flush_max_entries]
+                    await raw_connection.driver_connection.copy_records_to_table(
+                        'user_audit', records=batch, columns=AUDIT_COLUMNS)
+                    written += len(batch)
+        except (Exception, asyncio.CancelledError) as exc: # pylint: disable=broad-exception-caught
+            self._unflushed = records[written:] + self._unflushed
+            if isinstance(exc, asyncio.CancelledError):
+                raise
+            logger.exception('Failed to write %d audit records, retrying later.',
+                             len(records) - written)
+
+def _encode_changes(changes: Optional[dict[str, Any]]) -> Optional[str]:
+    """
+    Encodes the changed values as JSON, hiding the values of redacted columns.
+    """
+    if changes is None:
+        return None
+    return orjson.dumps({field: '[REDACTED]' if field in AUDIT_REDACTED_FIELDS else value
+                         for field, value in changes.items()}).decode()
+
+user_audit_writer = UserAuditWriter(settings.AUDIT_FLUSH_INTERVAL_MS,
+                                    settings.AUDIT_FLUSH_MAX_ENTRIES,
+                                    settings.AUDIT_MAX_QUEUED)
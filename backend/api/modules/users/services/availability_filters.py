@@ -0,0 +1,172 @@
+"""
+This module contains the UserAvailabilityFilters class, which keeps one in-memory Bloom
+filter per unique user field (email, CPF/CNPJ and WhatsApp). The signup availability check
+asks the filters first and only queries the database when a value might already be taken.
+"""
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy import select, union_all
+
+from api.modules.users.models.User import User
+from api.modules.users.models.UserArchive import UserArchive
+from api.shared.configs.settings import settings
+from api.shared.database.connection import engine
+from api.shared.validators.email_validator import normalize_email
+from api.utils.bloom_filter import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+AVAILABILITY_FIELDS = ('email', 'cpf_cnpj', 'whatsapp')
+
+def normalize_availability_value(field: str, value: str) -> str:
+    """
+    Normalizes a value the same way it is stored, so that it hashes identically.
+
+    Args:
+        field (str): One of AVAILABILITY_FIELDS.
+        value (str): The raw value.
+
+    Returns:
+        str: The normalized value.
+    """
+    if field == 'email':
+        return normalize_email(value)
+    return value.strip()
+
+class UserAvailabilityFilters:
+    """
+    The Bloom filters of the values already taken by users, one per unique field.
+
+    The filters are filled in the background when the application starts, from the users
+    table and from the archive, whose users keep their values reserved, and receive every
+    value written by this process afterwards. Until the build is
+    finished they are not ready and every check goes to the database. They only hold values
+    written through this process, so with several workers a value registered moments ago by
+    another worker may be reported as available; the unique indexes remain the authority
+    when the user is created.
+
+    Attributes:
+        capacity (int): The number of values each filter is sized for.
+        error_rate (float): The target false-positive rate of each filter.
+        ready (bool): Whether the filters hold every existing user.
+        checks (int): The number of values checked.
+        database_checks (int): The number of checks that needed the database.
+    """
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.ready = False
+        self.checks = 0
+        self.database_checks = 0
+        self._filters = self._new_filters()
+        self._task: Optional[asyncio.Task] = None
+
+    def _new_filters(self) -> dict[str, BloomFilter]:
+        return {field: BloomFilter(self.capacity, self.error_rate)
+                for field in AVAILABILITY_FIELDS}
+
+    def start(self) -> None:
+        """
+        Resets the filters and starts filling them from the users table in the background.
+        """
+        self.ready = False
+        self.checks = self.database_checks = 0
+        self._filters = self._new_filters()
+        self._task = asyncio.create_task(self.build())
+
+    async def stop(self) -> None:
+        """
+        Cancels the build if it is still running.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def wait_ready(self) -> None:
+        """
+        Waits for the background build to finish.
+        """
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    async def build(self) -> None:
+        """
+        Streams the unique fields of every user, archived or not, into the filters.
+
+        Values added while the build runs go into the same filters, so none is missed.
+        """
+        statement = union_all(*(
+            select(*(model.__table__.c[field] for field in AVAILABILITY_FIELDS))
+            for model in (User, UserArchive))).execution_options(
+                yield_per=settings.EXPORT_CHUNK_SIZE)
+        try:
+            async with engine.connect() as connection:
+                result = await connection.stream(statement)
+                async for rows in result.partitions():
+                    for row in rows:
+                        self.add(dict(zip(AVAILABILITY_FIELDS, row)))
+        except Exception: # pylint: disable=broad-exception-caught
+            logger.exception('Failed to build the availability filters, using the database.')
+            return
+        self.ready = True
+
+    def add(self, values: dict) -> None:
+        """
+        Records values that are now taken.
+
+        Args:
+            values (dict): The new values, keyed by field. Other keys are ignored.
+        """
+        for field in AVAILABILITY_FIELDS:
+            if values.get(field) is not None:
+                self._filters[field].add(normalize_availability_value(field, values[field]))
+
+    def might_be_taken(self, field: str, value: str) -> bool:
+        """
+        Checks whether a value may already be taken.
+
+        Args:
+            field (str): One of AVAILABILITY_FIELDS.
+            value (str): The normalized value.
+
+        Returns:
+            bool: False if the value is certainly available, True if the database must
+            confirm it.
+        """
+        self.checks += 1
+        if self.ready and value not in self._filters[field]:
+            return False
+        self.database_checks += 1
+        return True
+
+    def stats(self) -> dict:
+        """
+        Reports the configuration, memory use and accuracy of the filters.
+
+        Returns:
+            dict: The global counters and the statistics of each filter.
+        """
+        return {
+            'ready': self.ready,
+            'checks': self.checks,
+            'database_checks': self.database_checks,
+            'filters': [{
+                'field': field,
+                'capacity': bloom.capacity,
+                'error_rate': bloom.error_rate,
+                'estimated_error_rate': bloom.estimated_error_rate,
+                'items': bloom.count,
+                'bit_count': bloom.bit_count,
+                'hash_count': bloom.hash_count,
+                'memory_bytes': bloom.memory_bytes,
+            } for field, bloom in self._filters.items()],
+        }
+
+availability_filters = UserAvailabilityFilters(settings.AVAILABILITY_BLOOM_CAPACITY,
+                                               settings.AVAILABILITY_BLOOM_ERROR_RATE)
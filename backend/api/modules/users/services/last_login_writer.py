@@ -0,0 +1,153 @@
+"""
+This module contains the LastLoginWriter class, a write-behind buffer for the users'
+last login timestamps. Instead of issuing one UPDATE per login, logins are coalesced per user
+in memory and written periodically with a single UPDATE ... FROM (VALUES ...) statement.
+"""
+import asyncio
+import heapq
+import logging
+import uuid
+from datetime import datetime, timezone
+from operator import itemgetter
+from typing import Optional
+
+from sqlalchemy import DateTime, column, or_, update, values
+from sqlalchemy.dialects.postgresql import UUID
+
+from api.modules.users.models.User import User
+from api.shared.configs.settings import settings
+from api.shared.database.connection import async_session
+from api.utils.background_worker import BackgroundWorker
+
+logger = logging.getLogger(__name__)
+
+class LastLoginWriter(BackgroundWorker):
+    """
+    A write-behind buffer that coalesces last login timestamps per user.
+
+    The buffer is flushed every flush interval, as soon as it holds flush_max_entries users,
+    and when the writer stops. At most max_pending users are buffered: once the buffer is
+    full, recording a new user waits for the next flush, and a batch that fails to be written
+    is merged back without exceeding it, the oldest logins being dropped. The last login is
+    not part of the row version, so writing it never invalidates the ETags held by clients.
+
+    Attributes:
+        flush_max_entries (int): The number of buffered users that triggers a flush, and the
+        maximum number of rows written by one statement.
+        max_pending (int): The maximum number of buffered users.
+    """
+    def __init__(self, flush_interval_ms: int, flush_max_entries: int, max_pending: int):
+        super().__init__(flush_interval_ms)
+        self.flush_max_entries = flush_max_entries
+        self.max_pending = max_pending
+        self._pending: dict[uuid.UUID, datetime] = {}
+        self._space_available: Optional[asyncio.Condition] = None
+
+    async def on_start(self) -> None:
+        """
+        Creates the condition the recordings wait on while the buffer is full.
+        """
+        self._space_available = asyncio.Condition()
+
+    async def on_stop(self) -> None:
+        """
+        Writes every buffered login.
+        """
+        await self.flush()
+
+    async def run_once(self) -> None:
+        """
+        Writes the logins buffered since the last flush.
+        """
+        await self.flush()
+
+    async def record(self, user_id: uuid.UUID, when: Optional[datetime] = None) -> None:
+        """
+        Buffers a login of a user, keeping only the most recent timestamp per user.
+
+        Args:
+            user_id (uuid.UUID): The user who logged in.
+            when (Optional[datetime]): The login time, now by default.
+
+        Raises:
+            RuntimeError: If the writer is not running.
+        """
+        if not self.running:
+            raise RuntimeError('LastLoginWriter is not running.')
+        when = when or datetime.now(timezone.utc)
+
+        if user_id not in self._pending and len(self._pending) >= self.max_pending:
+            self.wake()
+            async with self._space_available:
+                await self._space_available.wait_for(
+                    lambda: user_id in self._pending or len(self._pending) < self.max_pending)
+
+        current = self._pending.get(user_id)
+        if current is None or when > current:
+            self._pending[user_id] = when
+        if len(self._pending) >= self.flush_max_entries:
+            self.wake()
+
+    async def flush(self) -> None:
+        """
+        Writes the buffered logins, one statement per flush_max_entries users.
+
+        A row is only updated when the buffered login is newer than the stored one. If the
+        write fails, the batch is merged back into the buffer and retried on the next flush.
+        """
+        batch, self._pending = self._pending, {}
+        if self._space_available is not None:
+            async with self._space_available:
+                self._space_available.notify_all()
+        if not batch:
+            return
+
+        logins = list(batch.items())
+        try:
+            async with async_session() as session:
+                for start in range(0, len(logins), self.flush_max_entries):
+                    await session.execute(
+                        _build_update(logins[start:start + self.flush_max_entries]))
+                await session.commit()
+        except (Exception, asyncio.CancelledError) as exc: # pylint: disable=broad-exception-caught
+            self._merge_back(logins)
+            if isinstance(exc, asyncio.CancelledError):
+                raise
+            logger.exception('Failed to write %d last logins, retrying later.', len(logins))
+
+    def _merge_back(self, logins: list[tuple[uuid.UUID, datetime]]) -> None:
+        """
+        Merges a batch that failed to be written back into the buffer, keeping the most
+        recent timestamp per user and dropping the oldest logins beyond max_pending.
+        """
+        for user_id, when in logins:
+            current = self._pending.get(user_id)
+            if current is None or when > current:
+                self._pending[user_id] = when
+
+        dropped = len(self._pending) - self.max_pending
+        if dropped > 0:
+            oldest = heapq.nsmallest(dropped, self._pending.items(), key=itemgetter(1))
+            for user_id, _ in oldest:
+                del self._pending[user_id]
+            logger.warning('Dropped the %d oldest last logins, the buffer is full.', dropped)
+
+def _build_update(logins: list[tuple[uuid.UUID, datetime]]):
+    """
+    Builds the UPDATE users ... FROM (VALUES ...) statement for a batch of logins.
+    """
+    table = User.__table__
+    logins_values = values(column('id', UUID(as_uuid=True)),
+                           column('date_login', DateTime(timezone=True)),
+                           name='logins').data(logins)
+    return (
+        update(table)
+        .where(table.c.id == logins_values.c.id)
+        .where(or_(table.c.date_login.is_(None),
+                   table.c.date_login < logins_values.c.date_login))
+        .values(date_login=logins_values.c.date_login)
+    )
+
+last_login_writer = LastLoginWriter(settings.LOGIN_FLUSH_INTERVAL_MS,
+                                    settings.LOGIN_FLUSH_MAX_ENTRIES,
+                                    settings.LOGIN_MAX_PENDING)
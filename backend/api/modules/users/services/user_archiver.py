@@ -0,0 +1,148 @@
+"""
+This module contains the UserArchiver class, the job that keeps the users table small by
+moving long-inactive and suspended users, with their profile photos, to the users_archive
+and user_photos_archive tables. Each batch is moved by a single statement, so a user is
+always either in the hot tables or in the archive, never in both or neither.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import Insert, delete, exists, func, insert, literal, select
+
+from api.modules.users.models.User import ACTIVE_STATUS, User
+from api.modules.users.models.UserArchive import UserArchive
+from api.modules.users.models.UserPhoto import UserPhoto
+from api.modules.users.models.UserPhotoArchive import UserPhotoArchive
+from api.modules.users.services.audit_writer import user_audit_writer
+from api.shared.configs.settings import settings
+from api.shared.database.connection import engine
+
+logger = logging.getLogger(__name__)
+
+class UserArchiver:
+    """
+    A batched job moving the users that are not active and have not logged in for a while
+    to the archive.
+
+    A user is archived once its status is not ACTIVE_STATUS and its last login, or its
+    creation when it never logged in, is older than inactive_days. Candidates are found on
+    the partial index ix_users_inactive_last_activity, which only covers inactive and
+    suspended users, and locked with SKIP LOCKED, so the job never waits for a user being
+    changed by a request and several jobs can run at once. Each batch is committed on its
+    own and followed by a pause, so locks are short and replicas keep up. Users still
+    referenced by rows that do not follow them to the archive, such as the products of a
+    seller, are left in place.
+
+    Archived users are still found by UserService lookups, and their email, CPF/CNPJ and
+    WhatsApp stay reserved. Every archived user is recorded in the audit log, so the audit
+    writer must be running.
+
+    Attributes:
+        inactive_days (int): The number of days without activity after which an inactive or
+        suspended user is archived.
+        batch_size (int): The maximum number of users moved per transaction.
+        pause (float): The time, in seconds, to sleep between batches.
+    """
+    def __init__(self, inactive_days: int, batch_size: int, pause_ms: int):
+        self.inactive_days = inactive_days
+        self.batch_size = batch_size
+        self.pause = pause_ms / 1000
+
+    async def archive(self, now: Optional[datetime] = None) -> int:
+        """
+        Archives every eligible user, batch by batch, until none is left.
+
+        Args:
+            now (Optional[datetime]): The moment inactivity is measured from, now by default.
+
+        Returns:
+            int: The number of users archived.
+        """
+        cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=self.inactive_days)
+        started = time.monotonic()
+        archived = 0
+        while True:
+            moved = await self.archive_batch(cutoff)
+            archived += moved
+            if moved:
+                elapsed = time.monotonic() - started
+                logger.info('Archived %d users (%.0f users/s)', archived,
+                            archived / elapsed if elapsed else archived)
+            if moved < self.batch_size:
+                break
+            await asyncio.sleep(self.pause)
+
+        return archived
+
+    async def archive_batch(self, cutoff: datetime) -> int:
+        """
+        Moves one batch of users inactive since before the cutoff, with their photos.
+
+        Args:
+            cutoff (datetime): The last activity before which users are archived.
+
+        Returns:
+            int: The number of users moved.
+        """
+        async with engine.begin() as connection:
+            result = await connection.execute(build_archive_statement(cutoff, self.batch_size))
+            archived_ids = result.scalars().all()
+        await user_audit_writer.record_many(archived_ids, 'archive')
+
+        return len(archived_ids)
+
+def build_archive_statement(cutoff: datetime, batch_size: int) -> Insert:
+    """
+    Builds the statement moving one batch of users and their photos to the archive.
+
+    Users referenced by a foreign key that does not cascade, from any table of the metadata,
+    are skipped: deleting them would fail the whole batch. The users are deleted with
+    DELETE ... RETURNING, and so are their photos, in
+    data-modifying CTEs whose rows feed the INSERT statements into the archive tables. The
+    whole move is a single statement and therefore atomic.
+
+    Args:
+        cutoff (datetime): The last activity before which users are archived.
+        batch_size (int): The maximum number of users moved.
+
+    Returns:
+        Insert: The statement, returning the identifiers of the archived users.
+    """
+    users = User.__table__
+    photos = UserPhoto.__table__
+    users_archive = UserArchive.__table__
+    photos_archive = UserPhotoArchive.__table__
+
+    last_activity = func.coalesce(users.c.date_login, users.c.date_created) # pylint: disable=assignment-from-no-return
+    referenced = [~exists().where(foreign_key.parent == users.c.id)
+                  for table in users.metadata.tables.values()
+                  for foreign_key in table.foreign_keys
+                  if foreign_key.column is users.c.id and foreign_key.ondelete != 'CASCADE']
+    candidates = (select(users.c.id)
+                  .where(users.c.status != literal(ACTIVE_STATUS, literal_execute=True),
+                         last_activity < cutoff, *referenced)
+                  .order_by(last_activity)
+                  .limit(batch_size)
+                  .with_for_update(skip_locked=True))
+    moved_users = (delete(users)
+                   .where(users.c.id.in_(candidates))
+                   .returning(*users.c)
+                   .cte('moved_users'))
+    moved_photos = (delete(photos)
+                    .where(photos.c.user_id.in_(select(moved_users.c.id)))
+                    .returning(*photos.c)
+                    .cte('moved_photos'))
+    archived_photos = (insert(photos_archive)
+                       .from_select(list(photos.c.keys()), select(*moved_photos.c))
+                       .cte('archived_photos'))
+
+    return (insert(users_archive)
+            .from_select(list(users.c.keys()), select(*moved_users.c))
+            .returning(users_archive.c.id)
+            .add_cte(archived_photos))
+
+user_archiver = UserArchiver(settings.ARCHIVE_INACTIVE_DAYS, settings.ARCHIVE_BATCH_SIZE,
+                             settings.ARCHIVE_BATCH_PAUSE_MS)
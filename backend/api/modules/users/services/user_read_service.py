@@ -0,0 +1,83 @@
+"""
+This module contains the UserReadService class, the read-only fast path for list and report
+queries. It runs Core statements on the session connection, so rows come back as plain
+tuples without ORM instances, identity map or change tracking, and validates each page
+in a single call to a Pydantic TypeAdapter instead of one model validation per user.
+"""
+import uuid
+from typing import Optional
+
+from pydantic import TypeAdapter
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.modules.users.models.User import User, user_status_is
+from api.modules.users.schemas.user_schema import (UserListItemResponse, UserListResponse,
+                                                   UserStatusReportResponse)
+from api.shared.handlers.database_handler import handle_database_exceptions
+
+USER_LIST_ADAPTER = TypeAdapter(list[UserListItemResponse])
+USER_STATUS_REPORT_ADAPTER = TypeAdapter(list[UserStatusReportResponse])
+
+class UserReadService:
+    """
+    A service class for read-only user queries that bypass the ORM.
+
+    Attributes:
+        session (AsyncSession): An instance of AsyncSession whose connection runs the queries.
+    """
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @handle_database_exceptions
+    async def list_users(self, limit: int, after: Optional[uuid.UUID] = None,
+                         user_status: Optional[int] = None) -> UserListResponse:
+        """
+        Fetches a page of users ordered by identifier, using keyset pagination.
+
+        The page starts right after the given identifier, so each page is an index range
+        scan on the primary key whatever its depth, unlike OFFSET pagination; pages of
+        active users scan the smaller partial index ix_users_active_id instead. One extra
+        row is fetched to know whether a next page exists.
+
+        Args:
+            limit (int): The maximum number of users in the page.
+            after (Optional[uuid.UUID]): The last identifier of the previous page.
+            user_status (Optional[int]): When given, only users with this status are listed.
+
+        Returns:
+            UserListResponse: The users of the page and the cursor of the next one.
+        """
+        table = User.__table__
+        statement = select(*(table.c[field] for field in UserListItemResponse.model_fields))
+        if after is not None:
+            statement = statement.where(table.c.id > after)
+        if user_status is not None:
+            statement = statement.where(user_status_is(user_status))
+        statement = statement.order_by(table.c.id).limit(limit + 1)
+
+        connection = await self.session.connection()
+        rows = (await connection.execute(statement)).mappings().all()
+        items = USER_LIST_ADAPTER.validate_python(rows[:limit])
+        next_after = items[-1].id if len(rows) > limit else None
+
+        return UserListResponse(items=items, next_after=next_after)
+
+    @handle_database_exceptions
+    async def status_report(self) -> list[UserStatusReportResponse]:
+        """
+        Counts the users in each status.
+
+        Returns:
+            list[UserStatusReportResponse]: The number of users per status, by status.
+        """
+        table = User.__table__
+        total = func.count().label('total') # pylint: disable=not-callable
+        statement = (select(table.c.status, total)
+                     .group_by(table.c.status)
+                     .order_by(table.c.status))
+
+        connection = await self.session.connection()
+        rows = (await connection.execute(statement)).mappings().all()
+
+        return USER_STATUS_REPORT_ADAPTER.validate_python(rows)
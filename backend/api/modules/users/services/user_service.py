@@ -2,13 +2,51 @@
 This module contains the UserService class, which provides methods for managing user-related
 database operations. It includes functionality to create new users based on data validated
 by pydantic models, handle database transactions, and apply business logic such as setting
-the user's creation date and status.
+the user's creation date and status. It also streams user exports straight from a
+server-side cursor so that memory usage stays flat regardless of the table size, and
+processes profile photos into cacheable thumbnails in a process pool. Signup availability
+checks are answered from in-memory Bloom filters, reaching the database only on possible hits.
+Bulk status changes run as chunked UPDATE ... RETURNING statements instead of per-user loads.
+Every committed create, update and status change is queued to the user audit log.
+Lookups by identifier and email fall back to the archive of long-inactive users, whose
+unique values stay reserved.
 """
+import asyncio
+import csv
+import io
+import uuid
+from typing import AsyncGenerator, Optional, Sequence, Union
+
+import orjson
+from sqlalchemy import (Exists, Row, Select, Update, any_, bindparam, case, exists, func, null,
+                        or_, select, update)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.modules.users.models.User import User
-from api.modules.users.schemas.user_schema import UserCreateRequest, UserResponse
+from api.modules.users.models.User import User, user_status_is
+from api.modules.users.models.UserArchive import UserArchive
+from api.modules.users.models.UserPhoto import UserPhoto
+from api.modules.users.models.UserPhotoArchive import UserPhotoArchive
+from api.modules.users.services.audit_writer import user_audit_writer
+from api.modules.users.services.availability_filters import (AVAILABILITY_FIELDS,
+                                                             availability_filters,
+                                                             normalize_availability_value)
+from api.modules.users.schemas.user_schema import (UserCreateRequest, UserUpdateRequest,
+                                                   UserResponse, UserExportFormat,
+                                                   UserPhotoVariant, UserStatusChangeRequest,
+                                                   UserStatusChangeResponse, UserStatusFilter)
+from api.shared.configs.settings import settings
+from api.shared.database.connection import engine
+from api.shared.exceptions.archived_user_conflict_exception import ArchivedUserConflictException
+from api.shared.exceptions.archived_user_exception import ArchivedUserException
+from api.shared.exceptions.not_found_exception import NotFoundException
+from api.shared.exceptions.precondition_failed_exception import PreconditionFailedException
+from api.shared.exceptions.profile_photo_exception import ProfilePhotoException
 from api.shared.handlers.database_handler import handle_database_exceptions
+from api.shared.validators.email_validator import normalize_email
+from api.utils.http_cache import make_etag, parse_etags
+from api.utils.image_processing import PHOTO_CONTENT_TYPE, process_profile_photo
+from api.utils.process_pool import run_in_process
 from api.utils.crypt_password import has_password
 
 class UserService:
@@ -35,16 +73,450 @@ class UserService:
             validated through pydantic.
 
         Raises:
+            ArchivedUserException: If an archived user has the same email, CPF/CNPJ or
+            WhatsApp.
             Exception: Captures any exceptions during the transaction, 
             rolls back the session, and logs the error.
         """
         user_data = data_user.model_dump()
-        hashed_password = has_password(user_data['password'])
+        await self._check_archived_values(user_data)
+        hashed_password = await asyncio.to_thread(has_password, user_data['password'])
         user_data['password'] = hashed_password
 
         new_user = User(**user_data)
         self.session.add(new_user)
         await self.session.commit()
         await self.session.refresh(new_user)
+        availability_filters.add(user_data)
+        await user_audit_writer.record(new_user.id, 'create', user_data)
 
         return new_user
+
+    @handle_database_exceptions
+    async def update_user(self, user_id: uuid.UUID, data_user: UserUpdateRequest,
+                          versions: Optional[list[int]] = None) -> Row:
+        """
+        Applies a partial update to a user with a single UPDATE ... RETURNING statement.
+
+        Only the columns sent by the client are written, the row version is incremented in
+        the same statement, and the password is rehashed in a worker thread only when it
+        changes. When versions are given, the UPDATE only matches a row whose current version
+        is one of them, so a concurrent change is detected without reading the row first.
+
+        Args:
+            user_id (uuid.UUID): The identifier of the user.
+            data_user (UserUpdateRequest): The fields to change, validated by pydantic.
+            versions (Optional[list[int]]): The versions the client is allowed to overwrite,
+            or None to accept any current version.
+
+        Returns:
+            Row: The updated user columns, including the new version.
+
+        Raises:
+            NotFoundException: If the user does not exist.
+            ArchivedUserConflictException: If the user is archived.
+            PreconditionFailedException: If the user version is not one of the given versions.
+            ArchivedUserException: If an archived user has the new email, CPF/CNPJ or
+            WhatsApp.
+        """
+        values = data_user.model_dump(exclude_unset=True)
+        await self._check_archived_values(values)
+        if 'password' in values:
+            values['password'] = await asyncio.to_thread(has_password, values['password'])
+
+        table = User.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == user_id)
+            .values(**values, version=table.c.version + 1)
+            .returning(*(table.c[field] for field in UserResponse.model_fields), table.c.version)
+        )
+        if versions is not None:
+            statement = statement.where(table.c.version.in_(versions))
+
+        result = await self.session.execute(statement)
+        updated_user = result.one_or_none()
+        if updated_user is None:
+            user = await self.session.execute(select(table.c.version).where(table.c.id == user_id))
+            found = user.scalar_one_or_none() is not None
+            archived = not found and user_id in await self._archived_among([user_id])
+            await self.session.rollback()
+            if archived:
+                raise ArchivedUserConflictException(f'Key (id)=({user_id}) The user is archived '
+                                                    'and cannot be changed.')
+            if not found:
+                raise NotFoundException(f'Key (id)=({user_id}) User not found.')
+            raise PreconditionFailedException(f'Key (id)=({user_id}) The user was modified by '
+                                              'another request. Reload it and retry.')
+        await self.session.commit()
+        availability_filters.add(values)
+        await user_audit_writer.record(user_id, 'update', values)
+
+        return updated_user
+
+    @handle_database_exceptions
+    async def get_user(self, user_id: uuid.UUID) -> Union[User, UserArchive]:
+        """
+        Fetches a user by its identifier, looking in the archive when it is not active.
+
+        Args:
+            user_id (uuid.UUID): The identifier of the user.
+
+        Returns:
+            Union[User, UserArchive]: The user, including its current version.
+
+        Raises:
+            NotFoundException: If the user does not exist.
+        """
+        user = await self.session.get(User, user_id)
+        if user is None:
+            user = await self.session.get(UserArchive, user_id)
+        if user is None:
+            raise NotFoundException(f'Key (id)=({user_id}) User not found.')
+
+        return user
+
+    @handle_database_exceptions
+    async def get_user_by_email(self, email: str) -> Optional[Union[User, UserArchive]]:
+        """
+        Fetches a user by email, ignoring case, looking in the archive when no user of the
+        users table has it.
+
+        Args:
+            email (str): The email address, in any case.
+
+        Returns:
+            Optional[Union[User, UserArchive]]: The user, or None if no user has this email.
+            When several archived users had it, the last one archived.
+        """
+        result = await self.session.execute(select_user_by_email(email))
+        user = result.scalar_one_or_none()
+        if user is None:
+            result = await self.session.execute(
+                select_user_by_email(email, UserArchive)
+                .order_by(UserArchive.date_archived.desc()).limit(1))
+            user = result.scalar_one_or_none()
+
+        return user
+
+    @handle_database_exceptions
+    async def change_users_status(self, data: UserStatusChangeRequest
+                                  ) -> UserStatusChangeResponse:
+        """
+        Sets the status of many users without loading them.
+
+        Users given by identifier are changed with UPDATE ... WHERE id = ANY(:ids) RETURNING id,
+        one statement per STATUS_CHANGE_CHUNK_SIZE identifiers. Users given by filter are
+        changed STATUS_CHANGE_CHUNK_SIZE at a time, each chunk selected and locked by a
+        subquery, until no matching user is left. Every chunk is committed on its own, so
+        row locks are held for one chunk only, and the row version of every changed user is
+        incremented so its ETag stays accurate. Users already in the target status are not
+        written. Archived users are never changed: those given by identifier are reported
+        apart from the missing ones.
+
+        Args:
+            data (UserStatusChangeRequest): The target status and the identifiers or filter
+            of the users to change, validated by pydantic.
+
+        Returns:
+            UserStatusChangeResponse: The users that changed and, for identifiers, the ones
+            that are archived and the ones that did not exist or already had the status.
+        """
+        table = User.__table__
+        chunk_size = settings.STATUS_CHANGE_CHUNK_SIZE
+        changed = []
+
+        if data.ids is not None:
+            ids = list(dict.fromkeys(data.ids))
+            for start in range(0, len(ids), chunk_size):
+                chunk = bindparam('ids', ids[start:start + chunk_size],
+                                  type_=ARRAY(UUID(as_uuid=True)))
+                result = await self.session.execute(
+                    _build_status_update(data.status).where(table.c.id == any_(chunk)))
+                chunk_changed = result.scalars().all()
+                await self.session.commit()
+                await user_audit_writer.record_many(chunk_changed, 'status',
+                                                    {'status': data.status})
+                changed.extend(chunk_changed)
+            changed_ids = set(changed)
+            unchanged = [user_id for user_id in ids if user_id not in changed_ids]
+            archived_ids = await self._archived_among(unchanged)
+            archived = [user_id for user_id in unchanged if user_id in archived_ids]
+            unchanged = [user_id for user_id in unchanged if user_id not in archived_ids]
+        else:
+            conditions = _build_status_filter(data.filter)
+            while True:
+                chunk = (select(table.c.id)
+                         .where(*conditions, table.c.status != data.status)
+                         .limit(chunk_size)
+                         .with_for_update())
+                result = await self.session.execute(
+                    _build_status_update(data.status).where(*conditions,
+                                                            table.c.id.in_(chunk)))
+                chunk_changed = result.scalars().all()
+                await self.session.commit()
+                await user_audit_writer.record_many(chunk_changed, 'status',
+                                                    {'status': data.status})
+                changed.extend(chunk_changed)
+                if len(chunk_changed) < chunk_size:
+                    break
+            unchanged, archived = [], []
+
+        return UserStatusChangeResponse(status=data.status, changed=changed, unchanged=unchanged,
+                                        archived=archived)
+
+    @handle_database_exceptions
+    async def check_availability(self, values: dict[str, str]) -> dict[str, bool]:
+        """
+        Checks whether signup values are still available.
+
+        Each value is first looked up in the Bloom filter of its field. A value the filter
+        has never seen is available without touching the database; only possible hits are
+        confirmed with indexed EXISTS queries on the users and archive tables. The answer is
+        advisory: the unique indexes still reject a duplicate when the user is created.
+
+        Args:
+            values (dict[str, str]): The values to check, keyed by email, cpf_cnpj or
+            whatsapp.
+
+        Returns:
+            dict[str, bool]: For each checked field, True if the value is available.
+        """
+        availability = {}
+        for field, value in values.items():
+            value = normalize_availability_value(field, value)
+            if not availability_filters.might_be_taken(field, value):
+                availability[field] = True
+                continue
+            result = await self.session.execute(
+                select(or_(*(_value_taken(model, field, value)
+                             for model in (User, UserArchive)))))
+            availability[field] = not result.scalar_one()
+
+        return availability
+
+    async def _check_archived_values(self, values: dict) -> None:
+        """
+        Rejects unique values that belong to an archived user.
+
+        The unique indexes of the users table do not cover the archive, so the values are
+        checked there before they are written. The check runs one indexed EXISTS query, and
+        none when no unique value is written.
+
+        Args:
+            values (dict): The values about to be written, keyed by column.
+
+        Raises:
+            ArchivedUserException: If an archived user has one of the values.
+        """
+        fields = [field for field in AVAILABILITY_FIELDS if values.get(field) is not None]
+        if not fields:
+            return
+        result = await self.session.execute(select(*(
+            _value_taken(UserArchive, field, values[field]).label(field) for field in fields)))
+        for field, taken in result.mappings().one().items():
+            if taken:
+                raise ArchivedUserException(f'Key ({field})=({values[field]}) already exists.')
+
+    async def _archived_among(self, user_ids: list[uuid.UUID]) -> set[uuid.UUID]:
+        """
+        Finds which of the given users are archived, with one query on the primary key of
+        the archive, and none when no user is given.
+
+        Args:
+            user_ids (list[uuid.UUID]): The identifiers of users missing from the users table.
+
+        Returns:
+            set[uuid.UUID]: The identifiers of the archived users among them.
+        """
+        if not user_ids:
+            return set()
+        ids = bindparam('archived_ids', user_ids, type_=ARRAY(UUID(as_uuid=True)))
+        result = await self.session.execute(
+            select(UserArchive.id).where(UserArchive.id == any_(ids)))
+        return set(result.scalars())
+
+    async def export_users(self, columns: Sequence[str], export_format: UserExportFormat,
+                           user_status: Optional[int] = None) -> AsyncGenerator[bytes, None]:
+        """
+        Streams the users table as CSV or NDJSON chunks.
+
+        The rows are read through a server-side cursor on a dedicated connection, so the
+        export keeps working after the request session is closed and only one chunk of
+        plain row tuples is held in memory at a time. The query selects table columns
+        directly, skipping ORM instances and the identity map.
+
+        Args:
+            columns (Sequence[str]): The validated column names to export, in output order.
+            export_format (UserExportFormat): The output format of the stream.
+            user_status (Optional[int]): When given, only users with this status are exported.
+
+        Yields:
+            bytes: The encoded chunk of rows, preceded by the CSV header when applicable.
+        """
+        table = User.__table__
+        statement = select(*(table.c[column] for column in columns))
+        if user_status is not None:
+            statement = statement.where(user_status_is(user_status))
+        statement = statement.execution_options(yield_per=settings.EXPORT_CHUNK_SIZE)
+
+        if export_format is UserExportFormat.CSV:
+            yield _encode_csv([columns])
+
+        async with engine.connect() as connection:
+            result = await connection.stream(statement)
+            async for rows in result.partitions():
+                if export_format is UserExportFormat.CSV:
+                    yield _encode_csv(rows)
+                else:
+                    yield b''.join(orjson.dumps(dict(zip(columns, row))) + b'\n'
+                                   for row in rows)
+
+    @handle_database_exceptions
+    async def save_profile_photo(self, user_id: uuid.UUID, photo: bytes) -> Sequence[Row]:
+        """
+        Processes an uploaded profile photo and stores every thumbnail variant.
+
+        Decoding, resizing and encoding run in the shared process pool so the event loop
+        is never blocked. All variants are written with a single upsert.
+
+        Args:
+            user_id (uuid.UUID): The owner of the photo.
+            photo (bytes): The uploaded image file.
+
+        Returns:
+            Sequence[Row]: The variant, content type and entity tag of each stored variant.
+
+        Raises:
+            NotFoundException: If the user does not exist.
+            ProfilePhotoException: If the upload is too large or is not a supported image.
+        """
+        if len(photo) > settings.PHOTO_MAX_UPLOAD_BYTES:
+            raise ProfilePhotoException(f'Key (profile_photo) The photo must be at most '
+                                        f'{settings.PHOTO_MAX_UPLOAD_BYTES} bytes.')
+        user = await self.session.execute(select(User.id).where(User.id == user_id))
+        if user.scalar_one_or_none() is None:
+            raise NotFoundException(f'Key (id)=({user_id}) User not found.')
+
+        try:
+            variants = await run_in_process(process_profile_photo, photo)
+        except ValueError as exc:
+            raise ProfilePhotoException(f'Key (profile_photo) {exc}') from exc
+
+        statement = insert(UserPhoto).values([
+            {'user_id': user_id, 'variant': variant, 'content': content,
+             'content_type': PHOTO_CONTENT_TYPE, 'etag': make_etag(content)}
+            for variant, content in variants.items()])
+        statement = statement.on_conflict_do_update(
+            index_elements=[UserPhoto.user_id, UserPhoto.variant],
+            set_={'content': statement.excluded.content,
+                  'content_type': statement.excluded.content_type,
+                  'etag': statement.excluded.etag,
+                  'date_created': statement.excluded.date_created}
+        ).returning(UserPhoto.variant, UserPhoto.content_type, UserPhoto.etag)
+        result = await self.session.execute(statement)
+        stored = result.all()
+        await self.session.commit()
+
+        return stored
+
+    @handle_database_exceptions
+    async def get_profile_photo(self, user_id: uuid.UUID, variant: UserPhotoVariant,
+                                if_none_match: Optional[str] = None) -> Row:
+        """
+        Fetches one variant of a user's profile photo.
+
+        When the client sends entity tags, the photo bytes are only read if none of them
+        matches, so revalidations never transfer the image from the database. Photos of
+        archived users are read from the archive.
+
+        Args:
+            user_id (uuid.UUID): The owner of the photo.
+            variant (UserPhotoVariant): The thumbnail variant to fetch.
+            if_none_match (Optional[str]): The If-None-Match header sent by the client.
+
+        Returns:
+            Row: The etag, content_type and content of the variant. The content is None
+            when it matches one of the client entity tags.
+
+        Raises:
+            NotFoundException: If the user has no photo.
+        """
+        candidates = parse_etags(if_none_match)
+        for model in (UserPhoto, UserPhotoArchive):
+            content = model.content
+            if candidates:
+                content = case((model.etag.in_(candidates), null()), else_=model.content)
+
+            result = await self.session.execute(
+                select(model.etag, model.content_type, content.label('content'))
+                .where(model.user_id == user_id, model.variant == variant.value))
+            photo = result.one_or_none()
+            if photo is not None:
+                return photo
+
+        raise NotFoundException(f'Key (id)=({user_id}) Profile photo not found.')
+
+def select_user_by_email(email: str, model: type = User) -> Select:
+    """
+    Builds the query that finds a user by email.
+
+    Every lookup by email must go through this function: it filters on lower(email), the
+    exact expression of the unique ix_users_email_lower index, or of
+    ix_users_archive_email_lower in the archive, so the lookup is an index scan whatever
+    the case used by the caller.
+
+    Args:
+        email (str): The email address, in any case.
+        model (type): User, or UserArchive to look in the archive.
+
+    Returns:
+        Select: The query selecting the matching users.
+    """
+    return select(model).where(func.lower(model.email) == normalize_email(email))
+
+def _value_taken(model: type, field: str, value: str) -> Exists:
+    """
+    Builds the EXISTS condition that is true when a user of the model table has the value.
+    """
+    if field == 'email':
+        return select_user_by_email(value, model).exists()
+    return exists().where(getattr(model, field) == value)
+
+def _build_status_update(user_status: int) -> Update:
+    """
+    Builds the UPDATE users statement that sets a status, skipping users that already have it.
+    """
+    table = User.__table__
+    return (
+        update(table)
+        .where(table.c.status != user_status)
+        .values(status=user_status, version=table.c.version + 1)
+        .returning(table.c.id)
+    )
+
+def _build_status_filter(status_filter: UserStatusFilter) -> list:
+    """
+    Builds the WHERE conditions of a bulk status change filter.
+    """
+    table = User.__table__
+    conditions = []
+    if status_filter.status is not None:
+        conditions.append(user_status_is(status_filter.status))
+    if status_filter.date_created_from is not None:
+        conditions.append(table.c.date_created >= status_filter.date_created_from)
+    if status_filter.date_created_to is not None:
+        conditions.append(table.c.date_created < status_filter.date_created_to)
+    return conditions
+
+def _encode_csv(rows: Sequence[Sequence]) -> bytes:
+    """
+    Encodes a chunk of rows as CSV lines, writing dates in ISO 8601 and nulls as empty fields.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(
+        ['' if value is None else value.isoformat() if hasattr(value, 'isoformat') else value
+         for value in row]
+        for row in rows)
+    return buffer.getvalue().encode('utf-8')
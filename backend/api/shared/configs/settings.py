@@ -7,6 +7,7 @@ The `Settings` class automatically loads these configurations from a .env file o
 providing a single object that can be used throughout the application to access configuration data.
 """
 import os
+from typing import Optional
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -25,6 +26,60 @@ class Settings(BaseSettings):
     DATABASE_PORT: str
     DATABASE_VOLUME: str
     DATABASE_CONTAINER_NAME: str
+    EXPORT_CHUNK_SIZE: int = 1000
+    USER_LIST_DEFAULT_LIMIT: int = 50
+    USER_LIST_MAX_LIMIT: int = 500
+    STATUS_CHANGE_CHUNK_SIZE: int = 5000
+    STATUS_CHANGE_MAX_IDS: int = 100_000
+    PHOTO_MAX_UPLOAD_BYTES: int = 5 * 1024 * 1024
+    PHOTO_CACHE_MAX_AGE: int = 86400
+    PROCESS_POOL_WORKERS: int = 2
+    LOGIN_FLUSH_INTERVAL_MS: int = 1000
+    LOGIN_FLUSH_MAX_ENTRIES: int = 500
+    LOGIN_MAX_PENDING: int = 10000
+    AUDIT_FLUSH_INTERVAL_MS: int = 1000
+    AUDIT_FLUSH_MAX_ENTRIES: int = 1000
+    AUDIT_MAX_QUEUED: int = 10000
+    AVAILABILITY_BLOOM_CAPACITY: int = 1_000_000
+    AVAILABILITY_BLOOM_ERROR_RATE: float = 0.01
+    ARCHIVE_INACTIVE_DAYS: int = 365
+    ARCHIVE_BATCH_SIZE: int = 1000
+    ARCHIVE_BATCH_PAUSE_MS: int = 100
+    PRODUCT_LIST_DEFAULT_LIMIT: int = 50
+    PRODUCT_LIST_MAX_LIMIT: int = 500
+    PRODUCT_SEARCH_DEFAULT_LIMIT: int = 20
+    PRODUCT_SEARCH_MAX_LIMIT: int = 100
+    STOCK_CHANGE_MAX_QUANTITY: int = 1_000_000
+    STOCK_ALERT_POLL_INTERVAL_MS: int = 30_000
+    STOCK_ALERT_BATCH_SIZE: int = 100
+    SALE_MAX_ITEMS: int = 100
+    CUSTOMER_DEBTORS_DEFAULT_LIMIT: int = 20
+    CUSTOMER_DEBTORS_MAX_LIMIT: int = 500
+    RECONCILE_BATCH_SIZE: int = 1000
+    REPORT_TIMEZONE: str = 'America/Sao_Paulo'
+    REPORT_ROLLUP_GRACE_MINUTES: int = 15
+    REPORT_MAX_DAYS: int = 366
+    REPORT_DEFAULT_DAYS: int = 30
+    REPORT_PRODUCTS_DEFAULT_LIMIT: int = 20
+    REPORT_PRODUCTS_MAX_LIMIT: int = 500
+    SYNC_MAX_SALES: int = 100
+    SYNC_CHUNK_SIZE: int = 1000
+    FEED_QUEUE_SIZE: int = 100
+    FEED_HEARTBEAT_SECONDS: float = 15.0
+    FEED_CHECK_INTERVAL_MS: int = 5000
+    REPORT_CACHE_TTL_SECONDS: float = 30.0
+    REPORT_CACHE_CLOSED_TTL_SECONDS: float = 3600.0
+    REPORT_CACHE_MAX_ENTRIES: int = 10_000
+    PROFILER_TOKEN: Optional[str] = None
+    PROFILER_SAMPLE_RATE: float = 0.0
+    PROFILER_INTERVAL_MS: float = 1.0
+    PROFILER_OUTPUT_DIR: str = 'profiles'
+    PROFILER_FORMAT: str = 'speedscope'
+    TRACING_ENABLED: bool = False
+    TRACING_EXPORT_PATH: str = '-'
+    TRACING_SLOW_THRESHOLD_MS: float = 500.0
+    TRACING_MAX_SPANS: int = 1000
+    TRACING_SERVICE_NAME: str = 'gerenciador-vendas-api'
 
     class ConfigDict:
         """
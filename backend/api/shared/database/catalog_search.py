@@ -0,0 +1,124 @@
+"""
+This module holds the full-text search of the product catalogs. The name of every product is
+kept in the generated search_vector column as a Portuguese tsvector of its stemmed,
+unaccented words, so "pão" and "pao" find the same products, and the matches are ranked
+against it.
+
+The GIN index does not hold search_vector itself but its seller terms: its lexemes prefixed
+with the seller of the product, built by catalog_seller_terms. A catalog search matches the
+beginning of words, and GIN resolves a prefix by collecting every row of every lexeme
+starting with it: on a plain index, a search for "pao" in one catalog would go through the
+"pão" of every seller. The seller terms are the seller-leading key of the index, so the
+prefixes built by catalog_seller_query only reach the lexemes of one catalog.
+
+Accents are removed by the catalog_unaccent function. A generated column can only call
+immutable functions, which the unaccent function of the extension is not declared to be, so
+catalog_unaccent wraps it with an explicit dictionary. Where the unaccent extension cannot be
+installed, catalog_unaccent falls back to translating the accented letters of Portuguese,
+so the catalog search works the same, only without the rarer letters unaccent also folds.
+
+Available Functions:
+- search_words(search) -> list[str]: Takes the words out of a search.
+- build_prefix_query(words) -> str: Builds the prefix tsquery text of the words of a search.
+"""
+import re
+
+# The text search configuration of the catalogs, with the Portuguese stemmer and stop words.
+SEARCH_CONFIG = 'portuguese'
+
+# The accented letters of Portuguese and the letters they are folded into, when the unaccent
+# extension is not available.
+ACCENTED_LETTERS = 'ÀÁÂÃÄàáâãäÈÉÊËèéêëÌÍÎÏìíîïÒÓÔÕÖòóôõöÙÚÛÜùúûüÇçÑñ'
+UNACCENTED_LETTERS = 'AAAAAaaaaaEEEEeeeeIIIIiiiiOOOOOoooooUUUUuuuuCcNn'
+
+CATALOG_UNACCENT_FUNCTION = f"""
+    DO $do$
+    DECLARE
+        extension_schema text;
+    BEGIN
+        IF EXISTS (SELECT FROM pg_available_extensions WHERE name = 'unaccent') THEN
+            BEGIN
+                CREATE EXTENSION IF NOT EXISTS unaccent;
+            EXCEPTION WHEN insufficient_privilege THEN
+                RAISE NOTICE 'Not allowed to create the unaccent extension, translating.';
+            END;
+        END IF;
+        SELECT quote_ident(nspname) INTO extension_schema
+        FROM pg_extension JOIN pg_namespace ON pg_namespace.oid = pg_extension.extnamespace
+        WHERE extname = 'unaccent';
+        IF extension_schema IS NOT NULL THEN
+            EXECUTE 'CREATE OR REPLACE FUNCTION catalog_unaccent(text) RETURNS text '
+                || 'LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE AS '
+                || quote_literal('SELECT ' || extension_schema || '.unaccent('
+                                 || quote_literal(extension_schema || '.unaccent')
+                                 || ', $1)');
+        ELSE
+            CREATE OR REPLACE FUNCTION catalog_unaccent(text) RETURNS text
+            LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE
+            AS $f$ SELECT translate($1, '{ACCENTED_LETTERS}', '{UNACCENTED_LETTERS}') $f$;
+        END IF;
+    END
+    $do$
+"""
+
+# The seller terms of a search vector: its lexemes, without positions, each prefixed with the
+# 32 hexadecimal digits of the seller.
+CATALOG_SELLER_TERMS_FUNCTION = """
+    CREATE OR REPLACE FUNCTION catalog_seller_terms(uuid, tsvector) RETURNS tsvector
+    LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE
+    AS $f$
+        SELECT array_to_tsvector(ARRAY(
+            SELECT replace(CAST($1 AS text), '-', '') || lexeme FROM unnest($2)))
+    $f$
+"""
+
+# The tsquery matching the seller terms that start with every word of a search, the words
+# being stemmed and unaccented like the names. The words are letters and digits only, so
+# quote_literal quotes their lexemes as tsquery operands. Stop words are left out: a search
+# of stop words only gives NULL, which matches nothing.
+CATALOG_SELLER_QUERY_FUNCTION = f"""
+    CREATE OR REPLACE FUNCTION catalog_seller_query(uuid, text) RETURNS tsquery
+    LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE
+    AS $f$
+        SELECT CAST(string_agg(
+            quote_literal(replace(CAST($1 AS text), '-', '') || lexeme) || ':*', ' & ')
+            AS tsquery)
+        FROM regexp_split_to_table($2, ' ') AS word,
+             unnest(to_tsvector('{SEARCH_CONFIG}', catalog_unaccent(word)))
+    $f$
+"""
+
+# The expression of the generated search_vector column of products, written as PostgreSQL
+# reflects it, so the autogenerate comparison of Alembic finds no difference.
+SEARCH_VECTOR = f"to_tsvector('{SEARCH_CONFIG}'::regconfig, catalog_unaccent((name)::text))"
+
+# The words of a search: letters and digits, whatever the punctuation around them.
+SEARCH_WORD = re.compile(r'[^\W_]+')
+
+def search_words(search: str) -> list[str]:
+    """
+    Takes the words out of a search, so no operator typed by the client reaches the text
+    search functions.
+
+    Args:
+        search (str): The search, as typed.
+
+    Returns:
+        list[str]: The words of the search, in order.
+    """
+    return SEARCH_WORD.findall(search)
+
+def build_prefix_query(words: list[str]) -> str:
+    """
+    Builds the text of a tsquery matching the names with words starting with every word of
+    a search, as typed at the point of sale: "pao fran" finds "Pão francês". The text is
+    unaccented and stemmed by the database, with the function and configuration of the
+    names.
+
+    Args:
+        words (list[str]): The words of the search, as returned by search_words.
+
+    Returns:
+        str: The tsquery text.
+    """
+    return ' & '.join(f'{word}:*' for word in words)
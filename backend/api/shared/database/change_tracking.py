@@ -0,0 +1,89 @@
+"""
+This module records the changes made to the tables synced to the devices of the sellers.
+Every tracked row carries the moment and the transaction of its last change, in the
+updated_at and change_xid columns of ChangeTrackedMixin, and every deleted row leaves a
+tombstone in the sync_tombstones table, so a device can fetch only what changed since its
+last sync.
+
+Both are maintained by triggers rather than by the application, so every statement that
+writes a tracked table, from the ORM, Core or a migration, is recorded the same way.
+Inserts get their change_xid from the column default; the triggers only run on updates and
+deletes.
+
+Available Functions:
+- change_tracking_triggers(table_name, entity, seller_column, columns) -> list[str]: Builds
+  the CREATE TRIGGER statements tracking the changes of a table.
+- track_changes(table, entity, seller_column, columns) -> None: Creates the trigger
+  functions and the triggers of a table with the table itself.
+"""
+from typing import Optional, Sequence
+
+from sqlalchemy import DDL, Table, event
+
+# The 64-bit identifier of the current transaction. Identifiers of committed transactions
+# are compared with the xmin of a snapshot to tell what a previous sync could not see yet.
+CURRENT_XID = 'CAST(CAST(pg_current_xact_id() AS text) AS bigint)'
+
+CHANGE_TRACKING_FUNCTION = f"""
+    CREATE OR REPLACE FUNCTION track_change() RETURNS trigger AS $$
+    BEGIN
+        NEW.updated_at := now();
+        NEW.change_xid := {CURRENT_XID};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+"""
+TOMBSTONE_FUNCTION = """
+    CREATE OR REPLACE FUNCTION record_tombstone() RETURNS trigger AS $$
+    DECLARE
+        owner uuid;
+    BEGIN
+        EXECUTE 'SELECT ($1).' || quote_ident(TG_ARGV[1]) INTO owner USING OLD;
+        INSERT INTO sync_tombstones (seller_id, entity, entity_id)
+        VALUES (owner, TG_ARGV[0], OLD.id)
+        ON CONFLICT (seller_id, entity, entity_id) DO UPDATE
+        SET change_xid = EXCLUDED.change_xid, date_deleted = EXCLUDED.date_deleted;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+"""
+
+def change_tracking_triggers(table_name: str, entity: str, seller_column: str = 'seller_id',
+                             columns: Optional[Sequence[str]] = None) -> list[str]:
+    """
+    Builds the statements creating the triggers that track the changes of a table.
+
+    Args:
+        table_name (str): The tracked table, which must have an id column.
+        entity (str): The name of the rows of the table in the sync stream.
+        seller_column (str): The column holding the seller the rows are synced to.
+        columns (Optional[Sequence[str]]): When given, only updates of these columns are
+        changes; every update is by default.
+
+    Returns:
+        list[str]: The CREATE TRIGGER statements.
+    """
+    update_of = f' OF {", ".join(columns)}' if columns else ''
+    return [
+        f'CREATE TRIGGER {table_name}_track_change BEFORE UPDATE{update_of} ON {table_name} '
+        'FOR EACH ROW EXECUTE FUNCTION track_change()',
+        f'CREATE TRIGGER {table_name}_record_tombstone AFTER DELETE ON {table_name} '
+        f"FOR EACH ROW EXECUTE FUNCTION record_tombstone('{entity}', '{seller_column}')",
+    ]
+
+def track_changes(table: Table, entity: str, seller_column: str = 'seller_id',
+                  columns: Optional[Sequence[str]] = None) -> None:
+    """
+    Creates the trigger functions and the change tracking triggers of a table whenever the
+    table is created from the metadata. Migrations create them with the same statements.
+
+    Args:
+        table (Table): The tracked table.
+        entity (str): The name of the rows of the table in the sync stream.
+        seller_column (str): The column holding the seller the rows are synced to.
+        columns (Optional[Sequence[str]]): When given, only updates of these columns are
+        changes.
+    """
+    for statement in (CHANGE_TRACKING_FUNCTION, TOMBSTONE_FUNCTION,
+                      *change_tracking_triggers(table.name, entity, seller_column, columns)):
+        event.listen(table, 'after_create', DDL(statement))
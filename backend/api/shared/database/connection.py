@@ -10,13 +10,20 @@ Globals:
     Base (declarative_base): A base class for declarative class definitions.
     engine (create_async_engine): The SQLAlchemy engine configured for async communication.
     async_session (sessionmaker): A configured sessionmaker for creating asynchronous ORM sessions.
+    ASYNCPG_DATABASE_URL (str): The database URL without the SQLAlchemy driver, for tools that
+    talk to asyncpg directly.
+
+Functions:
+    connect_listener(): Opens a dedicated asyncpg connection for LISTEN, outside of the pool.
 """
+import asyncpg
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from api.shared.configs.settings import settings
 
 DATABASE_URL = settings.DATABASE_URL
+ASYNCPG_DATABASE_URL = DATABASE_URL.replace('postgresql+asyncpg://', 'postgresql://')
 
 Base = declarative_base()
 
@@ -27,3 +34,17 @@ async_session = sessionmaker(
     class_=AsyncSession,
     expire_on_commit=False
 )
+
+async def connect_listener() -> asyncpg.Connection:
+    """
+    Opens a dedicated asyncpg connection for LISTEN, outside of the engine pool.
+
+    A listening connection must stay open for as long as notifications are expected, so it
+    would permanently take one of the pool connections serving requests. It is opened once
+    per worker, without the SQLAlchemy layer, whose connections cannot register notification
+    callbacks.
+
+    Returns:
+        asyncpg.Connection: The connection, closed by the caller.
+    """
+    return await asyncpg.connect(ASYNCPG_DATABASE_URL)
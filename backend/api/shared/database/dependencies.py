@@ -1,11 +1,17 @@
 """
 This module provides a utility function to yield database sessions. It is designed to be used
 with FastAPI's dependency injection system to ensure that database sessions are handled
-correctly within the context of asynchronous web requests.
+correctly within the context of asynchronous web requests. It also provides the seller of a
+request, the user whose products, customers and sales the request works on, and sessions
+scoped to that seller.
 """
+import uuid
 from typing import AsyncGenerator
 
+from fastapi import Depends, Header
+
 from api.shared.database.connection import async_session
+from api.shared.database.seller_scope import seller_session
 
 async def get_session() -> AsyncGenerator[AsyncGenerator, None]:
     """
@@ -17,4 +23,35 @@ async def get_session() -> AsyncGenerator[AsyncGenerator, None]:
     """
     async with async_session() as session:
         yield session
-        
\ No newline at end of file
+
+async def get_seller_id(x_seller_id: uuid.UUID = Header(
+        ..., description='The identifier of the user selling.')) -> uuid.UUID:
+    """
+    Provides the identifier of the seller making the request.
+
+    The seller is read from the X-Seller-Id header, set by the gateway that authenticates
+    the user. Services only ever read and write the rows of this seller.
+
+    Args:
+        x_seller_id (uuid.UUID): The X-Seller-Id header.
+
+    Returns:
+        uuid.UUID: The identifier of the seller.
+    """
+    return x_seller_id
+
+async def get_seller_session(seller_id: uuid.UUID = Depends(get_seller_id)
+                             ) -> AsyncGenerator[AsyncGenerator, None]:
+    """
+    Provides an asynchronous generator that yields a database session scoped to the seller
+    making the request.
+
+    Every ORM statement of the session only reads and changes the rows of that seller in
+    the seller-owned tables, such as products, customers and sales, whatever its WHERE
+    clause. Core statements are not rewritten and must still filter on seller_id.
+
+    Args:
+        seller_id (uuid.UUID): The seller making the request.
+    """
+    async with seller_session(info={'seller_id': seller_id}) as session:
+        yield session
@@ -0,0 +1,71 @@
+"""
+This module publishes the sales and stock changes of the sellers on the seller_feed
+PostgreSQL channel, which the seller feed of every worker listens to. The notifications are
+sent by statement-level triggers, so every statement that registers sales or moves stock is
+published, and the notifications of a transaction are only delivered once it commits.
+
+Each notification is a JSON object with a type, 'sale' or 'stock', and the seller it
+belongs to. The triggers read the transition tables of the statement: a sale of a whole
+cart publishes one sale and one stock notification, however many products it takes.
+"""
+
+# The channel the notifications are published on.
+FEED_CHANNEL = 'seller_feed'
+
+# NOTIFY payloads are limited to 8000 bytes, so stock changes are published in chunks of at
+# most this many products.
+STOCK_NOTIFICATION_PRODUCTS = 50
+
+SALE_FEED_FUNCTION = f"""
+    CREATE OR REPLACE FUNCTION notify_sales() RETURNS trigger AS $$
+    DECLARE
+        payload text;
+    BEGIN
+        FOR payload IN
+            SELECT CAST(json_build_object(
+                'type', 'sale', 'seller_id', seller_id, 'id', id, 'customer_id', customer_id,
+                'total', CAST(total AS text), 'debt', CAST(debt AS text),
+                'date_created', date_created) AS text)
+            FROM new_sales
+        LOOP
+            PERFORM pg_notify('{FEED_CHANNEL}', payload);
+        END LOOP;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+"""
+SALE_FEED_TRIGGER = """
+    CREATE TRIGGER sales_notify_feed AFTER INSERT ON sales
+    REFERENCING NEW TABLE AS new_sales
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_sales()
+"""
+STOCK_FEED_FUNCTION = f"""
+    CREATE OR REPLACE FUNCTION notify_stock() RETURNS trigger AS $$
+    DECLARE
+        payload text;
+    BEGIN
+        FOR payload IN
+            SELECT CAST(json_build_object(
+                'type', 'stock', 'seller_id', seller_id,
+                'products', json_agg(json_build_object('id', id, 'quantity', quantity))) AS text)
+            FROM (SELECT new_products.seller_id, new_products.id, new_products.quantity,
+                         (row_number() OVER (PARTITION BY new_products.seller_id
+                                             ORDER BY new_products.id) - 1)
+                         / {STOCK_NOTIFICATION_PRODUCTS} AS chunk
+                  FROM new_products JOIN old_products
+                  ON old_products.seller_id = new_products.seller_id
+                  AND old_products.id = new_products.id
+                  WHERE old_products.quantity <> new_products.quantity) AS changed
+            GROUP BY seller_id, chunk
+        LOOP
+            PERFORM pg_notify('{FEED_CHANNEL}', payload);
+        END LOOP;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+"""
+STOCK_FEED_TRIGGER = """
+    CREATE TRIGGER products_notify_feed AFTER UPDATE ON products
+    REFERENCING OLD TABLE AS old_products NEW TABLE AS new_products
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_stock()
+"""
@@ -0,0 +1,176 @@
+"""
+This module provides helpers for Alembic migrations that must run against live production
+data without blocking it. They are called from the upgrade and downgrade functions of the
+scripts in alembic/versions, exactly like the op directives they wrap.
+
+Every helper runs outside of the migration transaction, in an autocommit block, so the work
+done before a failure is kept. Rerunning the migration resumes where it stopped: indexes
+left invalid by an interrupted concurrent build are dropped and built again, and backfills
+only select the rows that are still pending.
+
+Available Functions:
+- create_index_concurrently(index_name, table_name, columns, ...) -> None: Builds an index
+  without blocking writes.
+- drop_index_concurrently(index_name, table_name) -> None: Drops an index without blocking
+  writes.
+- backfill_in_batches(table_name, set_clause, pending, ...) -> int: Updates the pending rows
+  of a table in small, throttled transactions.
+"""
+# The local alembic directory hides the proxy members of alembic.op from pylint.
+# pylint: disable=no-member
+import logging
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional, Sequence, Union
+
+from sqlalchemy import Connection, TextClause, text
+from alembic import op
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+# How long a helper waits for a lock before failing, instead of queueing every query behind it.
+LOCK_TIMEOUT = '5s'
+
+@contextmanager
+def _autocommit_block() -> Iterator[Connection]:
+    """
+    Leaves the migration transaction and sets a lock timeout for the duration of the block.
+    """
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        bind.execute(text(f"SET lock_timeout = '{LOCK_TIMEOUT}'"))
+        try:
+            yield bind
+        finally:
+            bind.execute(text('RESET lock_timeout'))
+
+def create_index_concurrently(index_name: str, table_name: str, # pylint: disable=too-many-arguments
+                              columns: Sequence[Union[str, TextClause]],
+                              unique: bool = False,
+                              where: Optional[str] = None,
+                              using: Optional[str] = None) -> None:
+    """
+    Builds an index with CREATE INDEX CONCURRENTLY, outside of the migration transaction.
+
+    Reads and writes go on while the index is built. A concurrent build that fails leaves
+    an invalid index behind; it is dropped first, so the migration can simply be rerun.
+    PostgreSQL cannot build the index of a partitioned table concurrently: the index of each
+    partition is built concurrently instead, named after the index and the partition, then
+    the index of the partitioned table is created, which only attaches them.
+
+    Args:
+        index_name (str): The name of the index.
+        table_name (str): The indexed table.
+        columns (Sequence[Union[str, TextClause]]): The indexed columns or expressions.
+        unique (bool): Whether the index is unique.
+        where (Optional[str]): The predicate of a partial index.
+        using (Optional[str]): The index access method, such as 'brin', btree by default.
+    """
+    options = {'unique': unique, 'if_not_exists': True, 'postgresql_using': using,
+               'postgresql_where': text(where) if where is not None else None}
+    with _autocommit_block() as bind:
+        partitions = _partitions(bind, table_name)
+        for partition in partitions:
+            partition_index = f'{index_name}{partition[len(table_name):]}'
+            _drop_invalid_index(bind, partition_index, partition)
+            op.create_index(partition_index, partition, columns,
+                            postgresql_concurrently=True, **options)
+        if partitions:
+            op.create_index(index_name, table_name, columns, **options)
+        else:
+            _drop_invalid_index(bind, index_name, table_name)
+            op.create_index(index_name, table_name, columns, postgresql_concurrently=True,
+                            **options)
+
+def drop_index_concurrently(index_name: str, table_name: str) -> None:
+    """
+    Drops an index with DROP INDEX CONCURRENTLY, outside of the migration transaction.
+
+    The index of a partitioned table cannot be dropped concurrently; it is dropped with the
+    indexes of its partitions by a plain DROP INDEX, which only holds its locks briefly.
+
+    Args:
+        index_name (str): The name of the index.
+        table_name (str): The indexed table.
+    """
+    with _autocommit_block() as bind:
+        op.drop_index(index_name, table_name=table_name, if_exists=True,
+                      postgresql_concurrently=not _partitions(bind, table_name))
+
+def _partitions(bind: Connection, table_name: str) -> list[str]:
+    """
+    Lists the partitions of a partitioned table, or nothing for a regular table.
+    """
+    return bind.execute(text(
+        'SELECT CAST(CAST(inhrelid AS regclass) AS text) FROM pg_inherits '
+        'WHERE inhparent = CAST(:table_name AS regclass) ORDER BY 1'),
+        {'table_name': table_name}).scalars().all()
+
+def _drop_invalid_index(bind: Connection, index_name: str, table_name: str) -> None:
+    """
+    Drops an index left invalid by an interrupted concurrent build, if any.
+    """
+    invalid = bind.execute(text(
+        'SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid '
+        'WHERE pg_class.relname = :index_name AND NOT pg_index.indisvalid'),
+        {'index_name': index_name}).scalar()
+    if invalid:
+        logger.info('Dropping invalid index %s left by an interrupted build', index_name)
+        op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True,
+                      if_exists=True)
+
+def backfill_in_batches(table_name: str, set_clause: str, # pylint: disable=too-many-arguments
+                        pending: str, batch_size: int = 10_000, pause: float = 0.1,
+                        key: str = 'id') -> int:
+    """
+    Updates the pending rows of a table batch by batch, each batch in its own transaction.
+
+    Batches walk the table in key order, so each one is an index range scan that only locks
+    batch_size rows for the duration of a single short transaction. The pending condition
+    must become false once a row is updated, such as new_column IS NULL: it makes the
+    backfill resumable, since a rerun skips the rows already done, and lets rows written by
+    the application during the backfill be left alone. Progress is logged after each batch.
+
+    Args:
+        table_name (str): The table to update.
+        set_clause (str): The SQL assignments of the UPDATE, such as "a = lower(b)".
+        pending (str): The SQL condition selecting the rows still to update.
+        batch_size (int): The maximum number of rows updated per transaction.
+        pause (float): The time, in seconds, to sleep between batches to throttle the load
+        on the database and its replicas.
+        key (str): A unique, indexed column used to walk the table in order.
+
+    Returns:
+        int: The number of rows updated.
+    """
+    def batch_statement(after_key: bool) -> TextClause:
+        return text(
+            f'WITH batch AS (SELECT {key} FROM {table_name} '
+            f'WHERE ({pending}){f" AND {key} > :last_key" if after_key else ""} '
+            f'ORDER BY {key} LIMIT :batch_size) '
+            f'UPDATE {table_name} SET {set_clause} FROM batch '
+            f'WHERE {table_name}.{key} = batch.{key} '
+            f'RETURNING {table_name}.{key}')
+
+    with _autocommit_block() as bind:
+        total = bind.execute(text(f'SELECT count(*) FROM {table_name} WHERE {pending}')).scalar()
+        logger.info('Backfilling %d rows of %s in batches of %d', total, table_name, batch_size)
+
+        started = time.monotonic()
+        updated, last_key = 0, None
+        while True:
+            keys = bind.execute(batch_statement(last_key is not None),
+                                {'last_key': last_key, 'batch_size': batch_size}
+                                ).scalars().all()
+            if not keys:
+                break
+            updated += len(keys)
+            last_key = max(keys)
+            elapsed = time.monotonic() - started
+            logger.info('Backfilled %d/%d rows of %s (%.0f rows/s)', updated, total,
+                        table_name, updated / elapsed if elapsed else updated)
+            if len(keys) < batch_size:
+                break
+            time.sleep(pause)
+
+    return updated
@@ -0,0 +1,88 @@
+"""
+This module provides declarative mixins shared by the ORM models built on Base.
+
+Classes:
+    UUIDv7PrimaryKeyMixin: Adds an 'id' primary key generated with time-ordered UUIDv7 values.
+    SellerOwnedMixin: Adds a 'seller_id' column leading the primary key of the rows a seller
+    owns.
+    ChangeTrackedMixin: Adds the 'updated_at' and 'change_xid' columns of the rows synced to
+    the devices of the sellers.
+
+Constants:
+    UUID_GENERATE_V7_FUNCTION: The uuid_generate_v7() SQL function, the server default of the
+    UUIDv7 primary keys, created with the tables.
+"""
+import uuid
+from datetime import datetime
+from sqlalchemy import DDL, BigInteger, DateTime, ForeignKey, event, func, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.shared.database.change_tracking import CURRENT_XID
+from api.shared.database.connection import Base
+from api.utils.uuid7 import uuid7
+
+# A random uuid4 whose first 48 bits are replaced by the Unix time in milliseconds and whose
+# version nibble is changed from 4 to 7 by setting bits 52 and 53, as created by the
+# migration a91d6f4b2c58.
+UUID_GENERATE_V7_FUNCTION = """
+    CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+    BEGIN
+        RETURN encode(
+            set_bit(set_bit(
+                overlay(uuid_send(gen_random_uuid())
+                        PLACING substring(int8send(floor(
+                            extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                        FROM 1 FOR 6),
+                52, 1),
+            53, 1),
+            'hex')::uuid;
+    END
+    $$ LANGUAGE plpgsql VOLATILE
+"""
+
+event.listen(Base.metadata, 'before_create', DDL(UUID_GENERATE_V7_FUNCTION))
+
+class UUIDv7PrimaryKeyMixin: # pylint: disable=too-few-public-methods
+    """
+    Mixin for models identified by a UUID primary key.
+
+    The key defaults to a UUIDv7, so rows are inserted in key order and the primary key
+    index stays compact and cache friendly. Existing uuid4 values remain valid keys. The
+    application generates the keys itself, so it knows them before inserting; the server
+    default uuid_generate_v7() gives the same keys to rows inserted in SQL, and matches the
+    schema built by the migrations.
+    """
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True,
+                                          default=uuid7,
+                                          server_default=text('uuid_generate_v7()'),
+                                          sort_order=-1)
+
+class SellerOwnedMixin: # pylint: disable=too-few-public-methods
+    """
+    Mixin for the rows a seller owns, such as their products, customers and sales.
+
+    The seller leads the primary key, so the rows of a seller are clustered together in the
+    primary key index, every lookup of a row is a probe of that index scoped to its seller,
+    and the table can be hash partitioned by seller. Rows referencing another row of the
+    seller use composite foreign keys that include seller_id, so they can never reference
+    the rows of another seller. Sessions created by get_seller_session only see the rows of
+    their seller.
+    """
+    seller_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True),
+                                                 ForeignKey('users.id', ondelete='RESTRICT'),
+                                                 primary_key=True, sort_order=-2)
+
+class ChangeTrackedMixin: # pylint: disable=too-few-public-methods
+    """
+    Mixin for the rows synced to the devices of the sellers.
+
+    The columns hold the moment and the transaction of the last change of the row. They are
+    set by the column defaults on insert and by the triggers created by track_changes on
+    update, never by the application, and the sync API streams the rows whose change_xid is
+    not older than the cursor of a device.
+    """
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False,
+                                                 server_default=func.now()) # pylint: disable=not-callable
+    change_xid: Mapped[int] = mapped_column(BigInteger(), nullable=False,
+                                            server_default=text(CURRENT_XID))
@@ -0,0 +1,125 @@
+"""
+This module converts the tables of seller-owned rows into tables hash partitioned by
+seller. Partitioning is optional: the seller-leading primary keys already keep the rows of a
+seller together in every index, and a few large tables only start to benefit from smaller
+per-partition indexes, vacuums and autovacuum thresholds at tens of millions of rows.
+
+Converting a table rewrites it under an ACCESS EXCLUSIVE lock, so it is run from the
+scripts.partition_by_seller script during a maintenance window, never from a migration.
+The conversion is a single transaction: it either completes or leaves the table untouched.
+Partitioned tables have no way back to the layout keyed by id alone, so migrations past
+b3e7f1a9c254 cannot be downgraded once a table is partitioned.
+
+Available Functions:
+- seller_partition_name(table_name, remainder) -> str: Names a partition of a table.
+- partition_by_seller(connection, table_name, modulus) -> int: Rebuilds a table as
+  modulus hash partitions by seller_id.
+"""
+import logging
+import re
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+logger = logging.getLogger(__name__)
+
+# Matches the names of the partitions, which are never declared as models.
+SELLER_PARTITION_PATTERN = re.compile(r'_seller_p\d+$')
+
+def seller_partition_name(table_name: str, remainder: int) -> str:
+    """
+    Names the partition of a table holding the sellers whose hash has the given remainder.
+
+    Args:
+        table_name (str): The partitioned table.
+        remainder (int): The remainder of the partition.
+
+    Returns:
+        str: The name of the partition.
+    """
+    return f'{table_name}_seller_p{remainder}'
+
+async def partition_by_seller(connection: AsyncConnection, table_name: str,
+                              modulus: int) -> int:
+    """
+    Rebuilds a table as a table partitioned by HASH (seller_id) into modulus partitions.
+
+    The table is locked, its rows are copied into a new partitioned table created LIKE it,
+    with its defaults, checks and generated columns, and the old table is dropped. Its
+    primary key, unique and foreign key constraints, its indexes and the foreign keys of
+    other tables referencing it are then recreated on the partitioned table under their
+    original names, and so are its triggers, such as those of change tracking. Every unique
+    constraint must include seller_id, as PostgreSQL requires the partition key in the
+    unique constraints of a partitioned table; otherwise the conversion fails and the
+    transaction leaves the table unchanged.
+
+    Args:
+        connection (AsyncConnection): A connection inside a transaction, committed by the
+        caller.
+        table_name (str): The table to partition, which must have a seller_id column.
+        modulus (int): The number of partitions.
+
+    Returns:
+        int: The number of rows copied.
+
+    Raises:
+        ValueError: If the table is already partitioned.
+    """
+    kind = await connection.scalar(
+        text('SELECT CAST(relkind AS text) FROM pg_class WHERE oid = CAST(:table AS regclass)'),
+        {'table': table_name})
+    if kind == 'p':
+        raise ValueError(f'Table {table_name} is already partitioned.')
+
+    await connection.execute(text(f'LOCK TABLE {table_name} IN ACCESS EXCLUSIVE MODE'))
+    parameters = {'table': table_name}
+    own_constraints = (await connection.execute(text(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = CAST(:table AS regclass) AND contype IN ('p', 'u', 'x', 'f') "
+        "AND conparentid = 0 ORDER BY contype = 'f', conname"), parameters)).all()
+    referencing = (await connection.execute(text(
+        "SELECT CAST(conrelid AS regclass), conname, pg_get_constraintdef(oid) "
+        "FROM pg_constraint WHERE confrelid = CAST(:table AS regclass) AND contype = 'f' "
+        "AND conrelid <> confrelid AND conparentid = 0 ORDER BY conname"), parameters)).all()
+    indexes_and_triggers = (await connection.execute(text(
+        '(SELECT pg_get_indexdef(indexrelid) FROM pg_index '
+        'WHERE indrelid = CAST(:table AS regclass) AND indexrelid NOT IN '
+        '(SELECT conindid FROM pg_constraint WHERE conrelid = CAST(:table AS regclass)) '
+        'ORDER BY indexrelid) UNION ALL '
+        '(SELECT pg_get_triggerdef(oid) FROM pg_trigger WHERE tgrelid = CAST(:table AS regclass) '
+        'AND NOT tgisinternal AND tgparentid = 0 ORDER BY tgname)'), parameters)).scalars().all()
+    columns = ', '.join((await connection.execute(text(
+        "SELECT attname FROM pg_attribute WHERE attrelid = CAST(:table AS regclass) "
+        "AND attnum > 0 AND NOT attisdropped AND attgenerated = '' ORDER BY attnum"),
+        parameters)).scalars().all())
+
+    for referencing_table, name, _ in referencing:
+        await connection.execute(text(f'ALTER TABLE {referencing_table} DROP CONSTRAINT {name}'))
+
+    partitioned = f'{table_name}_partitioned'
+    await connection.execute(text(
+        f'CREATE TABLE {partitioned} (LIKE {table_name} INCLUDING DEFAULTS '
+        'INCLUDING CONSTRAINTS INCLUDING GENERATED INCLUDING STORAGE INCLUDING COMMENTS) '
+        'PARTITION BY HASH (seller_id)'))
+    for remainder in range(modulus):
+        await connection.execute(text(
+            f'CREATE TABLE {seller_partition_name(table_name, remainder)} '
+            f'PARTITION OF {partitioned} '
+            f'FOR VALUES WITH (MODULUS {modulus}, REMAINDER {remainder})'))
+    copied = (await connection.execute(text(
+        f'INSERT INTO {partitioned} ({columns}) SELECT {columns} FROM {table_name}'))).rowcount
+    logger.info('Copied %d rows of %s into %d partitions', copied, table_name, modulus)
+
+    await connection.execute(text(f'DROP TABLE {table_name}'))
+    await connection.execute(text(f'ALTER TABLE {partitioned} RENAME TO {table_name}'))
+    for name, definition in own_constraints:
+        await connection.execute(text(
+            f'ALTER TABLE {table_name} ADD CONSTRAINT {name} {definition}'))
+    for definition in indexes_and_triggers:
+        await connection.execute(text(definition))
+    for referencing_table, name, definition in referencing:
+        await connection.execute(text(
+            f'ALTER TABLE {referencing_table} ADD CONSTRAINT {name} {definition}'))
+    await connection.execute(text(f'ANALYZE {table_name}'))
+
+    return copied
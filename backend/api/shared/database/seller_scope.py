@@ -0,0 +1,46 @@
+"""
+This module provides the sessions scoped to a seller. Every ORM statement executed by such a
+session, SELECT, UPDATE or DELETE, is restricted to the rows of its seller in the tables of
+the models built on SellerOwnedMixin, including the rows loaded through joins and aliases.
+
+The scope is a safety net for ORM queries that forget the seller. Core statements built on
+tables and executed through the session connection are not rewritten, so the services keep
+filtering on seller_id themselves, which the seller-leading primary keys turn into index
+range scans.
+
+Globals:
+    seller_session (sessionmaker): A sessionmaker for asynchronous sessions scoped to the
+    seller given as info={'seller_id': ...}.
+"""
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker, with_loader_criteria
+
+from api.shared.database.connection import engine
+from api.shared.database.mixins import SellerOwnedMixin
+
+class SellerScopedSession(Session):
+    """
+    A session only seeing the rows of the seller stored in its info under 'seller_id'.
+    """
+
+@event.listens_for(SellerScopedSession, 'do_orm_execute')
+def _scope_to_seller(execute_state: ORMExecuteState) -> None:
+    """
+    Adds the seller criteria to every seller-owned entity of an ORM statement.
+    """
+    if not (execute_state.is_select or execute_state.is_update or execute_state.is_delete):
+        return
+    if execute_state.is_column_load or execute_state.is_relationship_load:
+        return
+    seller_id = execute_state.session.info['seller_id']
+    execute_state.statement = execute_state.statement.options(
+        with_loader_criteria(SellerOwnedMixin, lambda cls: cls.seller_id == seller_id,
+                             include_aliases=True))
+
+seller_session = sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    sync_session_class=SellerScopedSession,
+    expire_on_commit=False
+)
@@ -0,0 +1,22 @@
+"""
+This module defines custom exceptions for handling changes made to archived users within a
+FastAPI application.
+It includes the `ArchivedUserConflictException` class, which extends FastAPI's
+`HTTPException` to reject a change of a user that was moved to the archive, which only
+serves reads until the user is restored.
+"""
+from fastapi import HTTPException, status
+
+class ArchivedUserConflictException(HTTPException):
+    """
+    A custom exception for handling changes of archived users in FastAPI routes.
+
+    This exception is raised when a request changes a user that exists only in the archive.
+    It sets the HTTP status code to 409 Conflict: the user can still be read, but its
+    archived state does not allow the change, unlike a missing user, which gets 404.
+
+    Attributes:
+        detail (str): A human-readable description of the error.
+    """
+    def __init__(self, detail: str):
+        super().__init__(status_code=status.HTTP_409_CONFLICT, detail=detail)
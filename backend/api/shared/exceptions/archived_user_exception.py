@@ -0,0 +1,22 @@
+"""
+This module defines custom exceptions for handling values reserved by archived users within
+a FastAPI application.
+It includes the `ArchivedUserException` class, which extends FastAPI's `HTTPException`
+to reject a user whose email, CPF/CNPJ or WhatsApp belongs to a user moved to the archive,
+which the unique indexes of the users table no longer cover.
+"""
+from fastapi import HTTPException, status
+
+class ArchivedUserException(HTTPException):
+    """
+    A custom exception for handling unique values taken by archived users in FastAPI routes.
+
+    This exception is raised when a created or updated user would reuse a unique value of
+    an archived user. It sets the HTTP status code to 400 Bad Request, like the violation
+    of a unique index.
+
+    Attributes:
+        detail (str): A human-readable description of the error.
+    """
+    def __init__(self, detail: str):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
@@ -0,0 +1,22 @@
+"""
+This module defines custom exceptions for handling availability check errors
+within a FastAPI application.
+It includes the `AvailabilityQueryException` class, which extends FastAPI's `HTTPException`
+to provide a specific exception for availability checks that name no value to check.
+"""
+from fastapi import HTTPException, status
+
+class AvailabilityQueryException(HTTPException):
+    """
+    A custom exception for handling invalid availability checks in FastAPI routes.
+
+    This exception is raised when an availability check is requested without any email,
+    CPF/CNPJ or WhatsApp value. It automatically sets the HTTP status code to 422
+    Unprocessable Entity, which is appropriate for situations where the client submits
+    data that the server recognizes as structurally correct but semantically incorrect.
+
+    Attributes:
+        detail (str): A human-readable description of the error.
+    """
+    def __init__(self, detail: str):
+        super().__init__(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
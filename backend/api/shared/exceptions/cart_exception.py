@@ -0,0 +1,22 @@
+"""
+This module defines custom exceptions for handling cart validation errors within a FastAPI
+application.
+It includes the `CartValidationException` class, which extends FastAPI's `HTTPException`
+to reject the items of a sale before any stock is touched, so that an invalid cart is
+never partially registered.
+"""
+from fastapi import HTTPException, status
+
+class CartValidationException(HTTPException):
+    """
+    A custom exception for handling invalid sale carts in FastAPI routes.
+
+    This exception is raised when the items of a sale, once merged by product, ask for more
+    units of a product than a single sale may take. It automatically sets the HTTP status
+    code to 422 Unprocessable Entity.
+
+    Attributes:
+        detail (str): A human-readable description of the error.
+    """
+    def __init__(self, detail: str):
+        super().__init__(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
@@ -6,6 +6,7 @@ them into HTTP responses with appropriate status codes and detailed error messag
 import re
 from fastapi import HTTPException, status
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError, OperationalError, DataError
+from sqlalchemy.orm.exc import StaleDataError
 
 class DataBaseTransactionException(HTTPException):
     """
@@ -27,6 +28,9 @@ class DataBaseTransactionException(HTTPException):
         elif isinstance(exception, DataError):
             error_message = f"Data formatting error in database operation: {exception.orig}"
             status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+        elif isinstance(exception, StaleDataError):
+            error_message = "The record was modified by another request. Reload it and retry."
+            status_code = status.HTTP_409_CONFLICT
         elif isinstance(exception, OperationalError):
             error_message = f"Operational error in database transaction: {exception.orig}"
             status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
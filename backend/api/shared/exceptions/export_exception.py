@@ -0,0 +1,25 @@
+"""
+This module defines custom exceptions for handling export parameter validation
+errors within a FastAPI application.
+It includes the `ExportColumnException` class, which extends FastAPI's `HTTPException`
+to provide a specific exception for handling unknown or forbidden export columns.
+This exception is raised before any row is streamed, so the client still receives
+a proper error status instead of a truncated file.
+"""
+from fastapi import HTTPException, status
+
+class ExportColumnException(HTTPException):
+    """
+    A custom exception for handling invalid export column selections in FastAPI routes.
+
+    This exception is raised when a requested export column does not exist or is not
+    allowed to leave the database (such as password hashes). It automatically
+    sets the HTTP status code to 422 Unprocessable Entity, which is appropriate for situations
+    where the client submits data that the server recognizes as structurally correct but
+    semantically incorrect.
+
+    Attributes:
+        detail (str): A human-readable description of the error.
+    """
+    def __init__(self, detail: str):
+        super().__init__(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
@@ -0,0 +1,21 @@
+"""
+This module defines custom exceptions for handling missing resources within a
+FastAPI application.
+It includes the `NotFoundException` class, which extends FastAPI's `HTTPException`
+to provide a specific exception for requests that reference a record, such as a user
+or one of its photos, that does not exist in the database.
+"""
+from fastapi import HTTPException, status
+
+class NotFoundException(HTTPException):
+    """
+    A custom exception for handling references to missing records in FastAPI routes.
+
+    This exception is raised when the requested resource cannot be found. It automatically
+    sets the HTTP status code to 404 Not Found.
+
+    Attributes:
+        detail (str): A human-readable description of the error.
+    """
+    def __init__(self, detail: str):
+        super().__init__(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
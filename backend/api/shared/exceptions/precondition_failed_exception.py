@@ -0,0 +1,22 @@
+"""
+This module defines custom exceptions for handling failed conditional requests
+within a FastAPI application.
+It includes the `PreconditionFailedException` class, which extends FastAPI's `HTTPException`
+to provide a specific exception for updates whose If-Match entity tag no longer matches the
+current version of the record, meaning another request changed it in the meantime.
+"""
+from fastapi import HTTPException, status
+
+class PreconditionFailedException(HTTPException):
+    """
+    A custom exception for handling lost updates in FastAPI routes.
+
+    This exception is raised when the version sent in the If-Match header is not the
+    current version of the record. It automatically sets the HTTP status code to
+    412 Precondition Failed, telling the client to reload the record before retrying.
+
+    Attributes:
+        detail (str): A human-readable description of the error.
+    """
+    def __init__(self, detail: str):
+        super().__init__(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=detail)
@@ -0,0 +1,22 @@
+"""
+This module defines custom exceptions for handling unconditional update requests
+within a FastAPI application.
+It includes the `PreconditionRequiredException` class, which extends FastAPI's
+`HTTPException` to provide a specific exception for updates sent without an If-Match
+header, which would otherwise silently overwrite concurrent changes.
+"""
+from fastapi import HTTPException, status
+
+class PreconditionRequiredException(HTTPException):
+    """
+    A custom exception for handling updates without an If-Match header in FastAPI routes.
+
+    This exception is raised when a route requires optimistic concurrency control and the
+    client did not send the entity tag of the version it is changing. It automatically sets
+    the HTTP status code to 428 Precondition Required.
+
+    Attributes:
+        detail (str): A human-readable description of the error.
+    """
+    def __init__(self, detail: str):
+        super().__init__(status_code=status.HTTP_428_PRECONDITION_REQUIRED, detail=detail)
@@ -0,0 +1,23 @@
+"""
+This module defines custom exceptions for handling profile photo validation
+errors within a FastAPI application.
+It includes the `ProfilePhotoException` class, which extends FastAPI's `HTTPException`
+to provide a specific exception for handling uploads that are too large, are not images
+or use a format other than JPEG, PNG or WebP.
+"""
+from fastapi import HTTPException, status
+
+class ProfilePhotoException(HTTPException):
+    """
+    A custom exception for handling invalid profile photo uploads in FastAPI routes.
+
+    This exception is raised when an uploaded photo cannot be decoded or does not meet
+    the accepted formats and size. It automatically sets the HTTP status code to
+    422 Unprocessable Entity, which is appropriate for situations where the client submits
+    data that the server recognizes as structurally correct but semantically incorrect.
+
+    Attributes:
+        detail (str): A human-readable description of the error.
+    """
+    def __init__(self, detail: str):
+        super().__init__(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
@@ -0,0 +1,21 @@
+"""
+This module defines custom exceptions for handling report period validation errors within
+a FastAPI application.
+It includes the `ReportPeriodException` class, which extends FastAPI's `HTTPException`
+to reject report periods that are reversed or too long, before any sale is read.
+"""
+from fastapi import HTTPException, status
+
+class ReportPeriodException(HTTPException):
+    """
+    A custom exception for handling invalid report periods in FastAPI routes.
+
+    This exception is raised when the start of a report period is after its end, or when
+    the period spans more days than a report may cover. It automatically sets the HTTP
+    status code to 422 Unprocessable Entity.
+
+    Attributes:
+        detail (str): A human-readable description of the error.
+    """
+    def __init__(self, detail: str):
+        super().__init__(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
@@ -0,0 +1,25 @@
+"""
+This module defines custom exceptions for handling 
+user status validation errors within a FastAPI application.
+It includes the `StatusValidationException` class, which extends FastAPI's `HTTPException` 
+to provide a specific exception for handling unknown user status codes. This exception is
+used to ensure that bulk status changes only ever write the status codes the application
+understands.
+"""
+from fastapi import HTTPException, status
+
+class StatusValidationException(HTTPException):
+    """
+    A custom exception for handling invalid user status codes in FastAPI routes.
+
+    This exception is raised when a status code fails validation checks, indicating that
+    the input data does not conform to the expected validity. It automatically
+    sets the HTTP status code to 422 Unprocessable Entity, which is appropriate for situations
+    where the client submits data that the server recognizes as structurally correct but 
+    semantically incorrect.
+
+    Attributes:
+        detail (str): A human-readable description of the error.
+    """
+    def __init__(self, detail: str):
+        super().__init__(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
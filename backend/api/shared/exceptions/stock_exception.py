@@ -0,0 +1,22 @@
+"""
+This module defines custom exceptions for handling stock shortages within a FastAPI
+application.
+It includes the `InsufficientStockException` class, which extends FastAPI's `HTTPException`
+to reject a stock decrement that would take the quantity of a product below zero, so that
+a product is never sold more times than it is in stock.
+"""
+from fastapi import HTTPException, status
+
+class InsufficientStockException(HTTPException):
+    """
+    A custom exception for handling stock decrements larger than the stock in FastAPI routes.
+
+    This exception is raised when the requested quantity is not available. It sets the
+    HTTP status code to 409 Conflict: the request is valid, but conflicts with the current
+    stock, which other sales may have just changed.
+
+    Attributes:
+        detail (str): A human-readable description of the error.
+    """
+    def __init__(self, detail: str):
+        super().__init__(status_code=status.HTTP_409_CONFLICT, detail=detail)
@@ -3,11 +3,13 @@ This module provides a decorator for handling database exceptions consistently.
 """
 from functools import wraps
 from api.shared.exceptions.database_exception import DataBaseTransactionException
+from api.utils.tracing import span
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError, OperationalError, DataError
 
 def handle_database_exceptions(func):
     """
-    Decorator to handle database exceptions and raise a custom exception.
+    Decorator to handle database exceptions and raise a custom exception. Each call is also
+    timed as a span of the current request trace, named after the decorated method.
 
     Args:
         func (callable): The function to be decorated.
@@ -18,7 +20,8 @@ def handle_database_exceptions(func):
     @wraps(func)
     async def wrapper(*args, **kwargs):
         try:
-            return await func(*args, **kwargs)
+            with span(func.__qualname__):
+                return await func(*args, **kwargs)
         except (IntegrityError, OperationalError, DataError, SQLAlchemyError) as e:
             raise DataBaseTransactionException(e) from e
     return wrapper
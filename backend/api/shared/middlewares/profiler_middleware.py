@@ -0,0 +1,119 @@
+"""
+This module provides the ProfilerMiddleware class, an opt-in profiler for single requests.
+
+A profiled request runs under the pyinstrument sampling profiler in async mode, so the
+time the request spends awaiting, whether on the database, on bcrypt in a worker thread or
+on the process pool, is attributed to the await that waited for it instead of being lost.
+When the response is complete the profile is written to a local directory as a speedscope
+file, which https://www.speedscope.app opens as a flamegraph, or as a pyinstrument HTML
+page. The middleware is only installed when profiling is configured, so it costs nothing
+otherwise.
+"""
+import asyncio
+import hmac
+import logging
+import random
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from pyinstrument import Profiler
+from pyinstrument.renderers import HTMLRenderer, SpeedscopeRenderer
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# The request header carrying the profiling token, and the response header naming the file.
+PROFILE_HEADER = b'x-profile'
+PROFILE_FILE_HEADER = 'X-Profile-File'
+
+PROFILE_RENDERERS = {
+    'speedscope': (SpeedscopeRenderer, 'speedscope.json'),
+    'html': (HTMLRenderer, 'html'),
+}
+
+class ProfilerMiddleware: # pylint: disable=too-few-public-methods
+    """
+    A pure ASGI middleware that profiles the requests carrying the profiling token and a
+    random sample of the others.
+
+    Requests that are not profiled only pay for a header lookup and, with a sample rate, a
+    random draw. A profiled response carries the name of its profile file in the
+    X-Profile-File header. Profiles are rendered and written in a worker thread once the
+    response is sent, so writing them never blocks the event loop.
+
+    Attributes:
+        app (ASGIApp): The wrapped application.
+        output_dir (Path): The directory the profiles are written to.
+        token (Optional[str]): The value of the X-Profile header that requests a profile,
+        or None to ignore the header.
+        sample_rate (float): The fraction of the other requests that are profiled.
+        interval (float): The sampling interval of the profiler, in seconds.
+        output_format (str): The format of the profiles, speedscope or html.
+    """
+    def __init__(self, app: ASGIApp, output_dir: str, # pylint: disable=too-many-arguments
+                 token: Optional[str] = None, sample_rate: float = 0.0,
+                 interval_ms: float = 1.0, output_format: str = 'speedscope'):
+        if output_format not in PROFILE_RENDERERS:
+            raise ValueError(f'Unknown profile format {output_format!r}, expected one of '
+                             f'{", ".join(PROFILE_RENDERERS)}.')
+        self.app = app
+        self.output_dir = Path(output_dir)
+        self.token = token.encode() if token else None
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000
+        self.output_format = output_format
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        path = self._profile_path(scope)
+
+        async def send_with_profile_header(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                MutableHeaders(scope=message).append(PROFILE_FILE_HEADER, path.name)
+            await send(message)
+
+        profiler = Profiler(interval=self.interval, async_mode='enabled')
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_header)
+        finally:
+            profiler.stop()
+            await asyncio.to_thread(self._write_profile, profiler, path)
+
+    def _should_profile(self, scope: Scope) -> bool:
+        """
+        Decides whether a request is profiled, from its token or the sample rate.
+        """
+        if self.token is not None:
+            for name, value in scope['headers']:
+                if name == PROFILE_HEADER:
+                    return hmac.compare_digest(value, self.token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _profile_path(self, scope: Scope) -> Path:
+        """
+        Names the profile file of a request after its time, method and path.
+        """
+        _, extension = PROFILE_RENDERERS[self.output_format]
+        route = re.sub(r'[^A-Za-z0-9]+', '_', scope['path']).strip('_')[:80] or 'root'
+        started = datetime.now(timezone.utc)
+        return self.output_dir / f'{started:%Y%m%dT%H%M%S%f}-{scope["method"]}-{route}.{extension}'
+
+    def _write_profile(self, profiler: Profiler, path: Path) -> None:
+        """
+        Renders a finished profile and writes it, logging instead of failing the request.
+        """
+        renderer, _ = PROFILE_RENDERERS[self.output_format]
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            path.write_text(profiler.output(renderer()), encoding='utf-8')
+        except Exception: # pylint: disable=broad-exception-caught
+            logger.exception('Failed to write the profile %s.', path)
+            return
+        logger.info('Wrote the profile %s.', path)
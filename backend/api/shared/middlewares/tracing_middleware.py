@@ -0,0 +1,81 @@
+"""
+This module provides the TracingMiddleware class, which opens one trace per HTTP request.
+
+Every span recorded while the request is served, by the traced validators, the password
+hashing, the service calls and the SQL statements, joins the trace of the request. When the
+response is complete, the Tracer decides whether the trace is slow enough to be kept, and
+kept traces are written by its exporter in a worker thread.
+"""
+import asyncio
+import re
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.utils.tracing import Tracer
+
+# The W3C Trace Context header, whose trace is continued when a caller sends one.
+TRACEPARENT_HEADER = b'traceparent'
+TRACEPARENT_PATTERN = re.compile(r'^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$')
+TRACE_ID_HEADER = 'X-Trace-Id'
+
+class TracingMiddleware: # pylint: disable=too-few-public-methods
+    """
+    A pure ASGI middleware that traces each HTTP request.
+
+    The trace continues the one of a valid traceparent header, and its identifier is sent
+    back in the X-Trace-Id response header so that a slow response can be matched with its
+    exported trace. The root span of a response with a 5xx status is marked as failed.
+
+    Attributes:
+        app (ASGIApp): The wrapped application.
+        tracer (Tracer): The tracer starting, sampling and exporting the traces.
+    """
+    def __init__(self, app: ASGIApp, tracer: Tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        trace_id, parent_span_id = _parse_traceparent(scope)
+        trace = self.tracer.start_trace(f'{scope["method"]} {scope["path"]}', trace_id,
+                                        parent_span_id,
+                                        **{'http.request.method': scope['method'],
+                                           'url.path': scope['path']})
+
+        async def send_with_trace_id(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                MutableHeaders(scope=message).append(TRACE_ID_HEADER, trace.trace_id)
+                trace.root.attributes['http.response.status_code'] = message['status']
+                if message['status'] >= 500:
+                    trace.root.error = f'HTTP {message["status"]}'
+            await send(message)
+
+        error: Optional[BaseException] = None
+        try:
+            await self.app(scope, receive, send_with_trace_id)
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            route = scope.get('route')
+            if route is not None:
+                trace.root.name = f'{scope["method"]} {route.path}'
+                trace.root.attributes['http.route'] = route.path
+            if self.tracer.finish_trace(trace, error):
+                await asyncio.to_thread(self.tracer.exporter.export, trace)
+
+def _parse_traceparent(scope: Scope) -> tuple[Optional[str], Optional[str]]:
+    """
+    Reads the trace and parent span identifiers of a traceparent request header.
+    """
+    for name, value in scope['headers']:
+        if name == TRACEPARENT_HEADER:
+            match = TRACEPARENT_PATTERN.match(value.decode('latin-1').strip())
+            if match and set(match.group(1)) != {'0'} and set(match.group(2)) != {'0'}:
+                return match.group(1), match.group(2)
+    return None, None
@@ -0,0 +1,38 @@
+"""
+This module provides functionalities for validating the cart of a sale. It merges the lines
+of the same product, checks the merged quantities and orders the cart by product, so a sale
+lists its items in the same order whatever the order they were scanned in.
+
+Functions:
+- validate_cart(items: Iterable[tuple[uuid.UUID, int]], max_quantity: int)
+  -> list[tuple[uuid.UUID, int]]
+"""
+
+import uuid
+from typing import Iterable
+from api.shared.exceptions.cart_exception import CartValidationException
+
+def validate_cart(items: Iterable[tuple[uuid.UUID, int]],
+                  max_quantity: int) -> list[tuple[uuid.UUID, int]]:
+    """
+    Merges the lines of a cart by product and checks the merged quantities.
+
+    Args:
+        items (Iterable[tuple[uuid.UUID, int]]): The product and quantity of each line.
+        max_quantity (int): The maximum number of units of a product per sale.
+
+    Returns:
+        list[tuple[uuid.UUID, int]]: One line per product, ordered by product.
+
+    Raises:
+        CartValidationException: If the merged quantity of a product exceeds max_quantity.
+    """
+    quantities: dict[uuid.UUID, int] = {}
+    for product_id, quantity in items:
+        quantities[product_id] = quantities.get(product_id, 0) + quantity
+
+    for product_id, quantity in quantities.items():
+        if quantity > max_quantity:
+            raise CartValidationException(f"Key (product_id)=({product_id}) A sale may take "
+                                          f"at most {max_quantity} units of a product.")
+    return sorted(quantities.items())
@@ -0,0 +1,20 @@
+"""
+This module provides functionalities for normalizing email addresses so that the same
+mailbox is always stored and looked up with the same spelling. Emails are compared
+case-insensitively, which matches how providers treat them in practice.
+
+Functions:
+- normalize_email(email: str) -> str
+"""
+
+def normalize_email(email: str) -> str:
+    """
+    Normalizes an email address by trimming surrounding spaces and lowering its case.
+
+    Args:
+        email (str): The email address as a string.
+
+    Returns:
+        str: The normalized email address.
+    """
+    return email.strip().lower()
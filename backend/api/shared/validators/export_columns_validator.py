@@ -0,0 +1,39 @@
+"""
+This module provides functionalities for validating the column selection of data exports.
+It parses a comma-separated list of column names and ensures that only columns explicitly
+allowed for export are requested.
+
+Functions:
+- validate_export_columns(columns: Optional[str], allowed_columns: Sequence[str]) -> list[str]
+"""
+
+from typing import Optional, Sequence
+from api.shared.exceptions.export_exception import ExportColumnException
+
+def validate_export_columns(columns: Optional[str], allowed_columns: Sequence[str]) -> list[str]:
+    """
+    Validates a comma-separated column selection against the allowed export columns.
+
+    Args:
+        columns (Optional[str]): The comma-separated column names, or None to export
+        every allowed column.
+        allowed_columns (Sequence[str]): The columns that may be exported, in default order.
+
+    Returns:
+        list[str]: The selected column names, without duplicates and in the requested order.
+
+    Raises:
+        ExportColumnException: If a column is unknown or not allowed for export.
+    """
+    if columns is None or not columns.strip():
+        return list(allowed_columns)
+
+    selected = []
+    for column in columns.split(','):
+        column = column.strip()
+        if column not in allowed_columns:
+            raise ExportColumnException(f"Key (columns)=({column}) Column is not available for "
+                                        f"export. Allowed columns: {', '.join(allowed_columns)}.")
+        if column not in selected:
+            selected.append(column)
+    return selected
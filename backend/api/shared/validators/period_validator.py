@@ -0,0 +1,33 @@
+"""
+This module provides functionalities for validating the period of a report. It ensures
+that the period is not reversed and does not span more days than a report may cover.
+
+Functions:
+- validate_period(start: date, end: date, max_days: int) -> tuple[date, date]
+"""
+
+from datetime import date
+from api.shared.exceptions.report_exception import ReportPeriodException
+
+def validate_period(start: date, end: date, max_days: int) -> tuple[date, date]:
+    """
+    Validates a report period, both days included.
+
+    Args:
+        start (date): The first day of the period.
+        end (date): The last day of the period.
+        max_days (int): The maximum number of days in the period.
+
+    Returns:
+        tuple[date, date]: The period.
+
+    Raises:
+        ReportPeriodException: If start is after end or the period is too long.
+    """
+    if start > end:
+        raise ReportPeriodException(f"Key (start)=({start}) The start of the period must not "
+                                    f"be after its end, {end}.")
+    if (end - start).days + 1 > max_days:
+        raise ReportPeriodException(f"Key (start)=({start}) A report may cover at most "
+                                    f"{max_days} days.")
+    return start, end
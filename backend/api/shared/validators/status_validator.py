@@ -0,0 +1,31 @@
+"""
+This module provides functionalities for validating user status codes to ensure they conform
+to accepted values. It validates that the status code is one of the specified valid options.
+
+Functions:
+- validate_status(value: int) -> int
+"""
+
+from api.shared.exceptions.status_exception import StatusValidationException
+
+# 1 for active, 2 for inactive and 99 for suspended users.
+VALID_STATUSES = {1, 2, 99}
+
+def validate_status(value: int) -> int:
+    """
+    Validates a user status code to ensure it is one of the accepted values (1, 2 or 99).
+
+    Args:
+        value (int): The status code to validate.
+
+    Returns:
+        int: The status code if it is valid.
+
+    Raises:
+        StatusValidationException: If the status code is not one of the accepted values.
+    """
+    if value not in VALID_STATUSES:
+        raise StatusValidationException(f"Key (status)=({value}) "
+                                        "Invalid status code. Must be 1 for active, "
+                                        "2 for inactive or 99 for suspended.")
+    return value
@@ -3,15 +3,21 @@
 This module sets up fixtures for testing the API. It includes fixtures to manage the
 event loop, set up the database for tests, and create a test client using HTTPX with ASGI support.
 These fixtures help manage database state between tests and ensure that each test
-has a fresh database and can run asynchronously.
+has a fresh database and can run asynchronously. Factory fixtures insert the rows that tests
+need directly into the database.
 """
+from datetime import date
+from decimal import Decimal
 import pytest
 from httpx import AsyncClient, ASGITransport
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
 from api.app import app
-from api.shared.database.connection import Base
+from api.modules.products.models.Product import Product
+from api.modules.users.models.User import User
+from api.shared.database.connection import Base, engine as app_engine
 from api.shared.configs.settings import settings
 
 DATABASE_URL = settings.DATABASE_URL
@@ -31,6 +37,7 @@ async def setup_database():
     async with async_session() as session:
         yield session
 
+    await app_engine.dispose()
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
     await engine.dispose()
@@ -39,6 +46,80 @@ async def setup_database():
 async def client():
     """ Creates an asynchronous HTTP client to test the application. """
     transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url='http://test') as ac:
-        yield ac
-        
\ No newline at end of file
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(transport=transport, base_url='http://test') as ac:
+            yield ac
+
+@pytest.fixture
+def create_user(setup_database): # pylint: disable=redefined-outer-name
+    """
+    Returns a coroutine inserting a user directly into the database. The user is Ana Souza,
+    with any field given as a keyword argument replaced.
+    """
+    async def create(**fields) -> User:
+        user = User(**{'email': 'ana@example.com', 'cpf_cnpj': '88877936037',
+                       'whatsapp': '14991396707', 'name': 'Ana Souza', 'password': 'hash',
+                       'sex': 'F', 'date_birthday': date(1990, 1, 1), **fields})
+        setup_database.add(user)
+        await setup_database.commit()
+        return user
+    return create
+
+@pytest.fixture
+def create_users(setup_database): # pylint: disable=redefined-outer-name
+    """
+    Returns a coroutine inserting a number of active users directly into the database,
+    numbered from 0, with any field given as a keyword argument set on every user.
+    """
+    async def create(count: int, **fields) -> list[User]:
+        users = [User(**{'email': f'user{index}@example.com', 'cpf_cnpj': f'{index:011d}',
+                         'whatsapp': f'1499139{index:04d}', 'name': f'User Number {index}',
+                         'password': 'hash', 'sex': 'O', 'date_birthday': date(1990, 1, 1),
+                         **fields})
+                 for index in range(count)]
+        setup_database.add_all(users)
+        await setup_database.commit()
+        return users
+    return create
+
+@pytest.fixture
+def create_seller(setup_database): # pylint: disable=redefined-outer-name
+    """
+    Returns a coroutine inserting a user who sells products directly into the database,
+    numbered by the index given, 0 by default.
+    """
+    async def create(index: int = 0) -> User:
+        seller = User(email=f'seller{index}@example.com', cpf_cnpj=f'{index:011d}',
+                      whatsapp=f'1499139{index:04d}', name=f'Seller Number {index}',
+                      password='hash', sex='O', date_birthday=date(1990, 1, 1))
+        setup_database.add(seller)
+        await setup_database.commit()
+        return seller
+    return create
+
+@pytest.fixture
+def create_products(setup_database): # pylint: disable=redefined-outer-name
+    """
+    Returns a coroutine inserting products of a seller directly into the database, one per
+    price and quantity given.
+    """
+    async def create(seller: User, *stock: tuple[str, int]) -> list[Product]:
+        products = [Product(seller_id=seller.id, name=f'Product {index}',
+                            price=Decimal(price), quantity=quantity)
+                    for index, (price, quantity) in enumerate(stock)]
+        setup_database.add_all(products)
+        await setup_database.commit()
+        return products
+    return create
+
+@pytest.fixture
+def stock_of(setup_database): # pylint: disable=redefined-outer-name
+    """
+    Returns a coroutine reading the current quantity of each of the products given.
+    """
+    async def read(products: list[Product]) -> list[int]:
+        result = await setup_database.execute(select(Product.id, Product.quantity)
+                                              .execution_options(populate_existing=True))
+        quantities = dict(result.all())
+        return [quantities[product.id] for product in products]
+    return read
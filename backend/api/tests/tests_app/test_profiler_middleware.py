@@ -0,0 +1,71 @@
+"""
+This test module contains tests for the opt-in request profiler. It wraps the application
+in ProfilerMiddleware and tests that requests carrying the profiling token or drawn by the
+sample rate are profiled into a file, across the awaits of the request, and that the others
+are left alone.
+"""
+import json
+from pathlib import Path
+import pytest
+from httpx import AsyncClient, ASGITransport
+from fastapi import status
+
+from api.app import app
+from api.shared.middlewares.profiler_middleware import ProfilerMiddleware
+
+USER_DATA = {
+    "email": "lucas.camargo@gmail.com",
+    "cpf_cnpj": "88877936037",
+    "whatsapp": "14991396707",
+    "name": "Lucas Camargo",
+    "password": "159753Lucas$",
+    "sex": "M",
+    "date_birthday": "1990-01-01"
+}
+
+async def profiled_client(profiler: ProfilerMiddleware) -> AsyncClient:
+    """
+    Creates a client of the application wrapped in the given profiler.
+    """
+    return AsyncClient(transport=ASGITransport(app=profiler), base_url='http://test')
+
+@pytest.mark.asyncio
+async def test_profile_request_with_token(setup_database, tmp_path: Path) -> None: # pylint: disable=unused-argument
+    """
+    Test that a request with the token is profiled into a speedscope file, and others are not.
+    """
+    profiler = ProfilerMiddleware(app, output_dir=str(tmp_path / 'profiles'), token='secret')
+    async with app.router.lifespan_context(app):
+        async with await profiled_client(profiler) as client:
+            response = await client.post('/users/', json=USER_DATA,
+                                         headers={'X-Profile': 'secret'})
+            assert response.status_code == status.HTTP_201_CREATED
+            profile_name = response.headers['X-Profile-File']
+
+            response = await client.get('/', headers={'X-Profile': 'wrong'})
+            assert 'X-Profile-File' not in response.headers
+            response = await client.get('/')
+            assert 'X-Profile-File' not in response.headers
+
+    files = list((tmp_path / 'profiles').iterdir())
+    assert [file.name for file in files] == [profile_name]
+    assert profile_name.endswith('-POST-users.speedscope.json')
+    profile = json.loads(files[0].read_text(encoding='utf-8'))
+    frames = {frame['name'] for frame in profile['shared']['frames']}
+    assert 'create_new_user' in frames
+
+@pytest.mark.asyncio
+async def test_profile_sampled_requests(tmp_path: Path) -> None:
+    """
+    Test that the sample rate profiles requests without a token, as HTML when configured.
+    """
+    profiler = ProfilerMiddleware(app, output_dir=str(tmp_path), sample_rate=1.0,
+                                  output_format='html')
+    async with await profiled_client(profiler) as client:
+        response = await client.get('/')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['X-Profile-File'].endswith('-GET-root.html')
+    assert (tmp_path / response.headers['X-Profile-File']).exists()
+
+    with pytest.raises(ValueError):
+        ProfilerMiddleware(app, output_dir=str(tmp_path), output_format='svg')
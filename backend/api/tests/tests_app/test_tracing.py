@@ -0,0 +1,89 @@
+"""
+This test module contains tests for request tracing. It wraps the application in
+TracingMiddleware with an instrumented engine and tests that the spans of the validators,
+the password hashing, the service calls and the SQL statements join the trace of their
+request, that traces are exported as OTLP/JSON and that fast traces are dropped.
+"""
+import json
+from pathlib import Path
+import pytest
+from httpx import AsyncClient, ASGITransport, Response
+from fastapi import status
+from sqlalchemy import event
+
+from api.app import app
+from api.shared.database.connection import engine
+from api.shared.middlewares.tracing_middleware import TracingMiddleware
+from api.utils.tracing import SQL_LISTENERS, OTLPJsonExporter, Tracer, instrument_engine
+
+USER_DATA = {
+    "email": "lucas.camargo@gmail.com",
+    "cpf_cnpj": "88877936037",
+    "whatsapp": "14991396707",
+    "name": "Lucas Camargo",
+    "password": "159753Lucas$",
+    "sex": "M",
+    "date_birthday": "1990-01-01"
+}
+
+@pytest.fixture
+def instrumented_engine():
+    """ Instruments the application engine for the duration of a test. """
+    instrument_engine(engine)
+    yield engine
+    for identifier, listener in SQL_LISTENERS.items():
+        event.remove(engine.sync_engine, identifier, listener)
+
+async def post_user(tracer: Tracer, headers: dict) -> Response:
+    """
+    Creates a user through the traced application and returns the response.
+    """
+    traced_app = TracingMiddleware(app, tracer)
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(transport=ASGITransport(app=traced_app),
+                               base_url='http://test') as client:
+            return await client.post('/users/', json=USER_DATA, headers=headers)
+
+@pytest.mark.asyncio
+async def test_trace_signup(setup_database, instrumented_engine, tmp_path: Path) -> None: # pylint: disable=unused-argument,redefined-outer-name
+    """
+    Test that every layer of a signup is a span of one trace, exported as OTLP/JSON.
+    """
+    output = tmp_path / 'traces.jsonl'
+    tracer = Tracer(OTLPJsonExporter(str(output), 'test-api'), 0, 1000)
+    trace_id, parent_id = '4bf92f3577b34da6a3ce929d0e0e4736', '00f067aa0ba902b7'
+    response = await post_user(tracer, {'traceparent': f'00-{trace_id}-{parent_id}-01'})
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.headers['X-Trace-Id'] == trace_id
+
+    [line] = output.read_text(encoding='utf-8').splitlines()
+    resource_spans = json.loads(line)['resourceSpans'][0]
+    assert resource_spans['resource']['attributes'] == [
+        {'key': 'service.name', 'value': {'stringValue': 'test-api'}}]
+    spans = resource_spans['scopeSpans'][0]['spans']
+    by_name = {span['name']: span for span in spans}
+    assert {span['traceId'] for span in spans} == {trace_id}
+
+    root = by_name['POST /users/']
+    assert root['parentSpanId'] == parent_id
+    assert {'key': 'http.response.status_code', 'value': {'intValue': '201'}} in root['attributes']
+    for name in ('UserCreateRequest.email_validator', 'UserCreateRequest.cpf_cnpj_validator',
+                 'UserCreateRequest.password_validator', 'UserService.create_new_user'):
+        assert by_name[name]['parentSpanId'] == root['spanId']
+    service_id = by_name['UserService.create_new_user']['spanId']
+    assert by_name['has_password']['parentSpanId'] == service_id
+    sql_spans = [span for span in spans if span['kind'] == 3]
+    assert 'INSERT' in {span['name'] for span in sql_spans}
+    assert all(span['parentSpanId'] == service_id for span in sql_spans)
+
+@pytest.mark.asyncio
+async def test_fast_traces_are_dropped(setup_database, instrumented_engine, tmp_path: Path) -> None: # pylint: disable=unused-argument,redefined-outer-name
+    """
+    Test that traces faster than the threshold are not exported.
+    """
+    output = tmp_path / 'traces.jsonl'
+    tracer = Tracer(OTLPJsonExporter(str(output), 'test-api'), 60_000, 1000)
+    response = await post_user(tracer, {'traceparent': 'invalid'})
+    assert response.status_code == status.HTTP_201_CREATED
+    assert len(response.headers['X-Trace-Id']) == 32
+    assert not output.exists()
@@ -0,0 +1,167 @@
+"""
+This test module contains tests for the customer debt functionalities within the
+application. It tests that the running balance of a customer follows their sales on credit
+and payments, that the customers who owe the most are read from an index, and that the
+balance reconciler detects and fixes drifted balances.
+"""
+import uuid
+from decimal import Decimal
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import postgresql
+
+from api.modules.customers.models.Customer import Customer
+from api.modules.customers.services.balance_reconciler import BalanceReconciler
+from api.modules.customers.services.customer_service import CustomerService
+from api.modules.sales.models.Sale import Sale
+
+async def create_customer(client: AsyncClient, seller, name: str = 'Dona Maria') -> dict:
+    """
+    Creates a customer of the seller through the API.
+    """
+    response = await client.post('/customers/', headers={'X-Seller-Id': str(seller.id)},
+                                 json={'name': name})
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.json()
+
+async def balance_of(session, customer: dict) -> Decimal:
+    """
+    Reads the current balance of a customer.
+    """
+    return await session.scalar(select(Customer.balance)
+                                .where(Customer.id == uuid.UUID(customer['id']))
+                                .execution_options(populate_existing=True))
+
+@pytest.mark.asyncio
+async def test_balance_follows_sales_and_payments(client: AsyncClient, setup_database,
+                                                  create_seller, create_products) -> None:
+    """
+    Test that sales on credit add to the balance and payments take from it.
+    """
+    seller = await create_seller()
+    product, = await create_products(seller, ('10.00', 10))
+    customer = await create_customer(client, seller)
+    headers = {'X-Seller-Id': str(seller.id)}
+    assert customer['balance'] == '0.00'
+
+    response = await client.post('/sales/', headers=headers, json={
+        'items': [{'product_id': str(product.id), 'quantity': 3}],
+        'customer_id': customer['id'], 'amount_paid': '5.50'})
+    assert response.status_code == status.HTTP_201_CREATED
+    assert (response.json()['total'], response.json()['debt']) == ('30.00', '24.50')
+
+    response = await client.post('/sales/', headers=headers, json={
+        'items': [{'product_id': str(product.id), 'quantity': 1}],
+        'customer_id': customer['id']})
+    assert response.json()['debt'] == '0.00'
+    assert await balance_of(setup_database, customer) == Decimal('24.50')
+
+    response = await client.post(f'/customers/{customer["id"]}/payments', headers=headers,
+                                 json={'amount': '20'})
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json() == {'id': customer['id'], 'balance': '4.50'}
+
+    response = await client.get(f'/customers/{customer["id"]}', headers=headers)
+    assert response.json()['balance'] == '4.50'
+
+    other = await create_seller(1)
+    response = await client.post(f'/customers/{customer["id"]}/payments',
+                                 headers={'X-Seller-Id': str(other.id)}, json={'amount': '1'})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+@pytest.mark.asyncio
+async def test_sale_on_credit_rejected(client: AsyncClient, setup_database, create_seller,
+                                       create_products) -> None:
+    """
+    Test that a sale on credit without a valid customer, or overpaid, registers nothing.
+    """
+    seller = await create_seller()
+    product, = await create_products(seller, ('10.00', 10))
+    customer = await create_customer(client, seller)
+    headers = {'X-Seller-Id': str(seller.id)}
+    items = [{'product_id': str(product.id), 'quantity': 1}]
+
+    response = await client.post('/sales/', headers=headers,
+                                 json={'items': items, 'amount_paid': '5'})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    response = await client.post('/sales/', headers=headers, json={
+        'items': items, 'customer_id': customer['id'], 'amount_paid': '10.01'})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    other = await create_seller(1)
+    foreign = await create_customer(client, other)
+    response = await client.post('/sales/', headers=headers, json={
+        'items': items, 'customer_id': foreign['id'], 'amount_paid': '0'})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    assert await setup_database.scalar(select(func.count()).select_from(Sale)) == 0 # pylint: disable=not-callable
+    assert await balance_of(setup_database, foreign) == 0
+
+@pytest.mark.asyncio
+async def test_list_debtors(client: AsyncClient, setup_database, create_seller) -> None:
+    """
+    Test that the customers who owe the most are listed first, from the balance index.
+    """
+    seller = await create_seller()
+    customers = [await create_customer(client, seller, f'Customer {index}')
+                 for index in range(4)]
+    for customer, balance in zip(customers, ('5', '50', '0', '-3')):
+        await setup_database.execute(
+            text('UPDATE customers SET balance = :balance WHERE id = :id'),
+            {'balance': Decimal(balance), 'id': uuid.UUID(customer['id'])})
+    await setup_database.commit()
+
+    response = await client.get('/customers/debtors', params={'limit': 10},
+                                headers={'X-Seller-Id': str(seller.id)})
+    assert response.status_code == status.HTTP_200_OK
+    assert [(item['name'], item['balance']) for item in response.json()['items']] == [
+        ('Customer 1', '50.00'), ('Customer 0', '5.00')]
+
+    table = Customer.__table__
+    statement = (select(table.c.id).where(table.c.seller_id == seller.id, table.c.balance > 0)
+                 .order_by(table.c.balance.desc(), table.c.id).limit(10))
+    sql = str(statement.compile(dialect=postgresql.dialect(),
+                                compile_kwargs={'literal_binds': True}))
+    await setup_database.execute(text('SET LOCAL enable_seqscan = off'))
+    plan = '\n'.join((await setup_database.execute(text(f'EXPLAIN {sql}'))).scalars().all())
+    assert 'ix_customers_seller_id_balance' in plan
+    assert 'Sort' not in plan
+
+@pytest.mark.asyncio
+async def test_reconcile_balances(client: AsyncClient, setup_database, create_seller,
+                                  create_products) -> None:
+    """
+    Test that drifted balances are reported, and fixed unless only reported.
+    """
+    seller = await create_seller()
+    product, = await create_products(seller, ('10.00', 10))
+    customers = [await create_customer(client, seller, f'Customer {index}')
+                 for index in range(3)]
+    headers = {'X-Seller-Id': str(seller.id)}
+    for customer in customers:
+        await client.post('/sales/', headers=headers, json={
+            'items': [{'product_id': str(product.id), 'quantity': 2}],
+            'customer_id': customer['id'], 'amount_paid': '0'})
+    await client.post(f'/customers/{customers[1]["id"]}/payments', headers=headers,
+                      json={'amount': '5'})
+    await setup_database.execute(text("UPDATE customers SET balance = 1 WHERE id = :id"),
+                                 {'id': uuid.UUID(customers[1]['id'])})
+    await setup_database.commit()
+
+    checked, drifts = await BalanceReconciler(2, fix=False).reconcile()
+    assert checked == 3
+    assert [(str(drift.customer_id), drift.stored, drift.derived) for drift in drifts] == [
+        (customers[1]['id'], Decimal('1.00'), Decimal('15.00'))]
+    assert await balance_of(setup_database, customers[1]) == Decimal('1.00')
+
+    _, drifts = await BalanceReconciler(2).reconcile()
+    assert len(drifts) == 1
+    assert await balance_of(setup_database, customers[1]) == Decimal('15.00')
+    assert (await BalanceReconciler(2).reconcile())[1] == []
+
+    customer = await CustomerService(setup_database).get_customer(
+        seller.id, uuid.UUID(customers[0]['id']))
+    assert customer.balance == Decimal('20.00')
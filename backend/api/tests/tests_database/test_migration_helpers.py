@@ -0,0 +1,99 @@
+"""
+This test module contains tests for the online migration helpers. It runs them through a
+real Alembic migration context, as a migration script would, and tests that indexes are
+built concurrently and rebuilt when a previous build left them invalid, and that batched
+backfills update every pending row and resume without redoing finished work.
+"""
+# The local alembic directory hides the proxy members of alembic.op from pylint.
+# pylint: disable=no-member
+import asyncio
+from datetime import date
+from typing import Callable
+import pytest
+from sqlalchemy import Column, String, create_engine, text
+from alembic import op
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+
+from api.modules.users.models.User import User
+from api.shared.configs.settings import settings
+from api.shared.database.migration_helpers import (backfill_in_batches,
+                                                   create_index_concurrently,
+                                                   drop_index_concurrently)
+
+SYNC_DATABASE_URL = settings.DATABASE_URL.replace('asyncpg', 'psycopg2')
+
+def run_migration(upgrade: Callable[[], object]) -> object:
+    """
+    Runs a function inside a migration transaction, with the op proxy configured.
+    """
+    engine = create_engine(SYNC_DATABASE_URL)
+    try:
+        with engine.connect() as connection:
+            context = MigrationContext.configure(connection)
+            with context.begin_transaction(), Operations.context(context):
+                return upgrade()
+    finally:
+        engine.dispose()
+
+async def create_users(session, count: int) -> None:
+    """
+    Inserts users directly into the database.
+    """
+    session.add_all(User(email=f'user{index}@example{index % 2}.com', cpf_cnpj=f'{index:011d}',
+                         whatsapp=f'1499139{index:04d}', name=f'User Number {index}',
+                         password='hash', sex='O', date_birthday=date(1990, 1, 1))
+                    for index in range(count))
+    await session.commit()
+
+def index_is_valid(name: str) -> bool:
+    """
+    Returns whether an index exists and is valid.
+    """
+    return run_migration(lambda: op.get_bind().execute(text(
+        'SELECT indisvalid FROM pg_index JOIN pg_class ON pg_class.oid = indexrelid '
+        'WHERE relname = :name'), {'name': name}).scalar())
+
+@pytest.mark.asyncio
+async def test_create_index_concurrently(setup_database) -> None:
+    """
+    Test that a partial index is built concurrently and rebuilt if it was left invalid.
+    """
+    await create_users(setup_database, 3)
+    arguments = ('ix_users_name_active', 'users', ['name'])
+
+    await asyncio.to_thread(run_migration,
+                            lambda: create_index_concurrently(*arguments, where='status = 1'))
+    assert await asyncio.to_thread(index_is_valid, 'ix_users_name_active') is True
+
+    await asyncio.to_thread(run_migration, lambda: op.execute(
+        'UPDATE pg_index SET indisvalid = false '
+        "WHERE indexrelid = 'ix_users_name_active'::regclass"))
+    assert await asyncio.to_thread(index_is_valid, 'ix_users_name_active') is False
+    await asyncio.to_thread(run_migration,
+                            lambda: create_index_concurrently(*arguments, where='status = 1'))
+    assert await asyncio.to_thread(index_is_valid, 'ix_users_name_active') is True
+
+    await asyncio.to_thread(run_migration,
+                            lambda: drop_index_concurrently('ix_users_name_active', 'users'))
+    assert await asyncio.to_thread(index_is_valid, 'ix_users_name_active') is None
+
+@pytest.mark.asyncio
+async def test_backfill_in_batches(setup_database) -> None:
+    """
+    Test that every pending row is updated in batches and that a rerun has nothing to do.
+    """
+    await create_users(setup_database, 7)
+    await asyncio.to_thread(run_migration, lambda: op.add_column(
+        'users', Column('email_domain', String(50), nullable=True)))
+
+    def backfill() -> int:
+        return backfill_in_batches('users', "email_domain = split_part(email, '@', 2)",
+                                   'email_domain IS NULL', batch_size=3, pause=0)
+
+    assert await asyncio.to_thread(run_migration, backfill) == 7
+    assert await asyncio.to_thread(run_migration, backfill) == 0
+
+    result = await setup_database.execute(
+        text('SELECT email_domain, count(*) FROM users GROUP BY 1 ORDER BY 1'))
+    assert result.all() == [('example0.com', 4), ('example1.com', 3)]
@@ -0,0 +1,116 @@
+"""
+This test module contains tests for the seller-leading layout of the seller-owned tables.
+It tests that sessions scoped to a seller only see and change the rows of that seller, that
+composite foreign keys keep rows from referencing the rows of another seller, and that
+tables can be hash partitioned by seller and keep working, with pruned plans.
+"""
+# The local alembic directory hides the proxy members of alembic.op from pylint.
+# pylint: disable=no-member
+import asyncio
+from decimal import Decimal
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+from sqlalchemy import func, select, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
+from alembic import op
+
+from api.modules.products.models.Product import Product
+from api.modules.sales.models.Sale import Sale
+from api.modules.sales.models.SaleItem import SaleItem
+from api.shared.database.connection import engine
+from api.shared.database.migration_helpers import create_index_concurrently
+from api.shared.database.seller_partitions import partition_by_seller, seller_partition_name
+from api.shared.database.seller_scope import seller_session
+from api.tests.tests_database.test_migration_helpers import index_is_valid, run_migration
+
+@pytest.mark.asyncio
+async def test_seller_session_scopes_orm_queries(setup_database, create_seller,
+                                                 create_products) -> None:
+    """
+    Test that ORM selects and updates of a scoped session only touch its seller's rows.
+    """
+    seller, other = await create_seller(), await create_seller(1)
+    mine = await create_products(seller, ('5.00', 10))
+    await create_products(other, ('7.00', 10))
+
+    async with seller_session(info={'seller_id': seller.id}) as session:
+        products = (await session.scalars(select(Product))).all()
+        assert [product.id for product in products] == [mine[0].id]
+        alias = aliased(Product)
+        assert await session.scalar(select(func.count()).select_from(alias)) == 1
+        await session.execute(update(Product).values(quantity=0))
+        await session.commit()
+
+    quantities = await setup_database.execute(
+        select(Product.seller_id, Product.quantity).execution_options(populate_existing=True))
+    assert dict(quantities.all()) == {seller.id: 0, other.id: 10}
+
+@pytest.mark.asyncio
+async def test_rows_cannot_reference_other_sellers(setup_database, create_seller,
+                                                   create_products) -> None:
+    """
+    Test that a sale item cannot reference the product of another seller.
+    """
+    seller, other = await create_seller(), await create_seller(1)
+    products = await create_products(other, ('5.00', 10))
+    sale = Sale(seller_id=seller.id, total=Decimal('5.00'))
+    setup_database.add(sale)
+    await setup_database.commit()
+
+    setup_database.add(SaleItem(seller_id=seller.id, sale_id=sale.id,
+                                product_id=products[0].id, quantity=1,
+                                unit_price=Decimal('5.00')))
+    with pytest.raises(IntegrityError, match='sale_items_product_id_fkey'):
+        await setup_database.commit()
+
+@pytest.mark.asyncio
+async def test_partition_by_seller(client: AsyncClient, setup_database, create_seller,
+                                   create_products) -> None:
+    """
+    Test that partitioned tables keep their keys, indexes, triggers and references, serve
+    sales and prune the partitions of other sellers.
+    """
+    seller = await create_seller()
+    products = await create_products(seller, ('5.00', 10), ('2.50', 10))
+    async with engine.begin() as connection:
+        assert await partition_by_seller(connection, 'products', 4) == 2
+        assert await partition_by_seller(connection, 'sale_items', 4) == 0
+        with pytest.raises(ValueError, match='already partitioned'):
+            await partition_by_seller(connection, 'products', 4)
+        triggers = await connection.execute(text(
+            "SELECT tgname FROM pg_trigger WHERE tgrelid = CAST('products' AS regclass) "
+            'AND NOT tgisinternal ORDER BY tgname'))
+        assert triggers.scalars().all() == ['products_notify_feed', 'products_record_tombstone',
+                                            'products_track_change']
+
+    response = await client.post('/sales/', headers={'X-Seller-Id': str(seller.id)},
+                                 json={'items': [{'product_id': str(products[0].id),
+                                                  'quantity': 2}]})
+    assert response.status_code == status.HTTP_201_CREATED
+    response = await client.post('/sales/', headers={'X-Seller-Id': str(seller.id)},
+                                 json={'items': [{'product_id': str(products[0].id),
+                                                  'quantity': 20}]})
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    await setup_database.execute(text('SET LOCAL enable_seqscan = off'))
+    plan = '\n'.join((await setup_database.execute(text(
+        'EXPLAIN SELECT id FROM products WHERE seller_id = :seller_id ORDER BY id LIMIT 10'),
+        {'seller_id': seller.id})).scalars().all())
+    partitions = [seller_partition_name('products', remainder) for remainder in range(4)]
+    assert sum(f' {partition} ' in plan for partition in partitions) == 1
+    await setup_database.rollback()
+
+    with pytest.raises(IntegrityError, match='still referenced from table "sale_items"'):
+        await setup_database.execute(text('DELETE FROM products'))
+    await setup_database.rollback()
+
+    await asyncio.to_thread(run_migration, lambda: create_index_concurrently(
+        'ix_products_seller_id_name', 'products', ['seller_id', 'name']))
+    for partition in partitions:
+        name = f'ix_products_seller_id_name{partition[len("products"):]}'
+        assert await asyncio.to_thread(index_is_valid, name) is True
+    assert await asyncio.to_thread(run_migration, lambda: op.get_bind().scalar(text(
+        "SELECT count(*) FROM pg_inherits WHERE inhparent = "
+        "'ix_products_seller_id_name'::regclass"))) == 4
@@ -0,0 +1,115 @@
+"""
+This test module contains tests for the live feed of the sellers within the application. It
+tests that committed sales and stock changes are pushed to the subscribers of their seller
+only, that subscribers falling behind are dropped, and that the feed is served as
+Server-Sent Events.
+"""
+import asyncio
+import json
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+
+from api.modules.feed.services.seller_feed import FeedSubscription, SellerFeed, feed_events
+
+async def next_events(subscription: FeedSubscription, count: int = 2) -> dict[str, dict]:
+    """
+    Waits for the next events of a subscription, a sale and its stock change by default,
+    and returns them by type.
+    """
+    events = subscription.events(heartbeat=5)
+    payloads = [json.loads(await asyncio.wait_for(anext(events), 5)) for _ in range(count)]
+    await events.aclose()
+    return {payload['type']: payload for payload in payloads}
+
+@pytest.mark.asyncio
+async def test_feed_fan_out(client: AsyncClient, create_seller, create_products) -> None:
+    """
+    Test that a sale is pushed, with its stock change, to every subscriber of its seller and
+    to no one else.
+    """
+    seller, other = await create_seller(), await create_seller(1)
+    products = await create_products(seller, ('4.50', 10), ('2.25', 5))
+    feed = SellerFeed(max_queued=10, check_interval_ms=1000)
+    await feed.start()
+    try:
+        async with (feed.subscribe(seller.id) as first, feed.subscribe(seller.id) as second,
+                    feed.subscribe(other.id) as unrelated):
+            assert feed.subscriber_count == 3
+            response = await client.post('/sales/', headers={'X-Seller-Id': str(seller.id)},
+                                         json={'items': [{'product_id': str(products[0].id),
+                                                          'quantity': 2},
+                                                         {'product_id': str(products[1].id),
+                                                          'quantity': 1}]})
+            assert response.status_code == status.HTTP_201_CREATED
+            sale = response.json()
+
+            for subscription in (first, second):
+                events = await next_events(subscription)
+                assert (events['sale']['id'], events['sale']['total']) == (sale['id'], '11.25')
+                assert sorted((product['id'], product['quantity'])
+                              for product in events['stock']['products']) == sorted(
+                    [(str(products[0].id), 8), (str(products[1].id), 4)])
+
+            await asyncio.sleep(0.1)
+            events = unrelated.events(heartbeat=0.01)
+            assert await anext(events) is None
+            await events.aclose()
+        assert feed.subscriber_count == 0
+    finally:
+        await feed.stop()
+
+@pytest.mark.asyncio
+async def test_feed_drops_slow_subscribers(client: AsyncClient, create_seller,
+                                           create_products) -> None:
+    """
+    Test that a subscriber whose queue is full is dropped without holding the others back.
+    """
+    seller = await create_seller()
+    products = await create_products(seller, ('1.00', 10))
+    feed = SellerFeed(max_queued=3, check_interval_ms=1000)
+    await feed.start()
+    try:
+        async with feed.subscribe(seller.id) as slow, feed.subscribe(seller.id) as fast:
+            for quantity in (9, 8):
+                response = await client.post('/sales/', headers={'X-Seller-Id': str(seller.id)},
+                                             json={'items': [{'product_id': str(products[0].id),
+                                                              'quantity': 1}]})
+                assert response.status_code == status.HTTP_201_CREATED
+                events = await next_events(fast)
+                assert events['stock']['products'][0]['quantity'] == quantity
+
+            assert slow.dropped and feed.subscriber_count == 1
+            assert [event async for event in slow.events(heartbeat=1)] == []
+
+            await feed.stop()
+            events = fast.events(heartbeat=1)
+            assert await asyncio.wait_for(anext(events, 'ended'), 5) == 'ended'
+            assert fast.dropped is False
+    finally:
+        await feed.stop()
+
+@pytest.mark.asyncio
+async def test_feed_events_stream(client: AsyncClient, create_seller, create_products) -> None:
+    """
+    Test that the Server-Sent Events stream announces the subscription, then sends the
+    events of the seller as data lines.
+    """
+    seller = await create_seller()
+    products = await create_products(seller, ('3.00', 10))
+    stream = feed_events(seller.id)
+    assert await anext(stream) == b': subscribed\n\n'
+
+    response = await client.post('/sales/', headers={'X-Seller-Id': str(seller.id)},
+                                 json={'items': [{'product_id': str(products[0].id),
+                                                  'quantity': 1}]})
+    events = [await asyncio.wait_for(anext(stream), 5) for _ in range(2)]
+    await stream.aclose()
+    assert all(event.startswith(b'data: ') and event.endswith(b'\n\n') for event in events)
+    sale = next(json.loads(event[6:]) for event in events if b'"sale"' in event)
+    assert sale == {'type': 'sale', 'seller_id': str(seller.id), 'id': response.json()['id'],
+                    'customer_id': None, 'total': '3.00', 'debt': '0.00',
+                    'date_created': sale['date_created']}
+
+    response = await client.get('/feed/events')
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -0,0 +1,80 @@
+"""
+This test module contains tests for the product creation and lookup functionalities within
+the application. It tests that products are created for the seller of the request, listed
+one keyset page at a time, and never visible to other sellers.
+"""
+import uuid
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+
+@pytest.mark.asyncio
+async def test_create_and_get_product(client: AsyncClient, create_seller) -> None:
+    """
+    Test that a product is created for the seller and only that seller can read it.
+    """
+    seller = await create_seller()
+    other = await create_seller(1)
+    headers = {'X-Seller-Id': str(seller.id)}
+
+    response = await client.post('/products/', headers=headers,
+                                 json={'name': 'Pão de queijo', 'price': '4.50', 'quantity': 30})
+    assert response.status_code == status.HTTP_201_CREATED
+    product = response.json()
+    assert product['seller_id'] == str(seller.id)
+    assert (product['name'], product['price'], product['quantity']) == ('Pão de queijo',
+                                                                         '4.50', 30)
+
+    response = await client.get(f'/products/{product["id"]}', headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == product
+
+    response = await client.get(f'/products/{product["id"]}',
+                                headers={'X-Seller-Id': str(other.id)})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+@pytest.mark.asyncio
+async def test_list_products(client: AsyncClient, create_seller) -> None:
+    """
+    Test that the products of the seller are listed in keyset pages.
+    """
+    seller = await create_seller()
+    other = await create_seller(1)
+    for index in range(3):
+        await client.post('/products/', headers={'X-Seller-Id': str(seller.id)},
+                          json={'name': f'Product {index}', 'price': '1.00'})
+    await client.post('/products/', headers={'X-Seller-Id': str(other.id)},
+                      json={'name': 'Other product', 'price': '1.00'})
+
+    response = await client.get('/products/', params={'limit': 2},
+                                headers={'X-Seller-Id': str(seller.id)})
+    assert response.status_code == status.HTTP_200_OK
+    page = response.json()
+    assert [item['name'] for item in page['items']] == ['Product 0', 'Product 1']
+
+    response = await client.get('/products/', params={'limit': 2, 'after': page['next_after']},
+                                headers={'X-Seller-Id': str(seller.id)})
+    assert response.json()['next_after'] is None
+    assert [item['name'] for item in response.json()['items']] == ['Product 2']
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("headers, data, expected_status", [
+    ({}, {'name': 'Product', 'price': '1.00'}, status.HTTP_422_UNPROCESSABLE_ENTITY),
+    ({'X-Seller-Id': 'nope'}, {'name': 'Product', 'price': '1.00'},
+     status.HTTP_422_UNPROCESSABLE_ENTITY),
+    ({'X-Seller-Id': str(uuid.UUID(int=1))}, {'name': 'Product', 'price': '1.00'},
+     status.HTTP_400_BAD_REQUEST),
+    (None, {'name': 'Product', 'price': '-1.00'}, status.HTTP_422_UNPROCESSABLE_ENTITY),
+    (None, {'name': 'Product', 'price': '1.001'}, status.HTTP_422_UNPROCESSABLE_ENTITY),
+    (None, {'name': 'Product', 'price': '1.00', 'quantity': -1},
+     status.HTTP_422_UNPROCESSABLE_ENTITY),
+])
+async def test_create_product_invalid(client: AsyncClient, headers: dict,
+                                      data: dict, expected_status: int, create_seller) -> None:
+    """
+    Test that products without a valid seller or with invalid values are rejected.
+    """
+    if headers is None:
+        headers = {'X-Seller-Id': str((await create_seller()).id)}
+    response = await client.post('/products/', headers=headers, json=data)
+    assert response.status_code == expected_status
@@ -0,0 +1,152 @@
+"""
+This test module contains tests for the low stock alerts of products within the
+application. It tests that only the stock decrements crossing a threshold raise an alert,
+that pending alerts are deduplicated, delivered to the seller in the background and kept
+when delivery fails, and that the low stock listing reads its partial index.
+"""
+import asyncio
+import logging
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+from sqlalchemy import func, select, text
+
+from api.modules.products.models.Product import Product
+from api.modules.products.models.StockAlert import StockAlert
+from api.modules.products.services.product_service import ProductService
+from api.modules.products.services.stock_alert_dispatcher import StockAlertDispatcher
+
+async def create_product(session, seller, quantity: int, threshold: int) -> Product:
+    """
+    Inserts a product of the seller with a low stock threshold.
+    """
+    product = Product(seller_id=seller.id, name='Coxinha', price=5, quantity=quantity,
+                      low_stock_threshold=threshold)
+    session.add(product)
+    await session.commit()
+    return product
+
+async def pending_alerts(session) -> int:
+    """
+    Counts the alerts not delivered yet.
+    """
+    return (await session.execute(select(func.count()).select_from(StockAlert)
+                                  .where(StockAlert.date_delivered.is_(None)))).scalar_one()
+
+@pytest.mark.asyncio
+async def test_only_crossings_raise_alerts(setup_database, create_seller) -> None:
+    """
+    Test that an alert is raised when the stock reaches the threshold, not again while it
+    stays below, and once more after the stock is replenished and taken below again.
+    """
+    seller = await create_seller()
+    product = await create_product(setup_database, seller, 10, 5)
+    product_service = ProductService(setup_database)
+
+    stock = await product_service.decrement_stock(seller.id, product.id, 3)
+    assert (stock.quantity, stock.crossed_low_stock) == (7, False)
+    stock = await product_service.decrement_stock(seller.id, product.id, 2)
+    assert (stock.quantity, stock.crossed_low_stock) == (5, True)
+    stock = await product_service.decrement_stock(seller.id, product.id, 1)
+    assert stock.crossed_low_stock is False
+    assert await pending_alerts(setup_database) == 1
+
+    # A second crossing before the first alert is delivered is deduplicated.
+    await product_service.increment_stock(seller.id, product.id, 10)
+    await product_service.decrement_stock(seller.id, product.id, 10)
+    assert await pending_alerts(setup_database) == 1
+
+    delivered = []
+    async def collect(alerts) -> None:
+        delivered.extend(alerts)
+    assert await StockAlertDispatcher(60_000, 10, collect).dispatch() == 1
+    assert [(alert.product_id, alert.quantity, alert.threshold, alert.seller_email)
+            for alert in delivered] == [(product.id, 5, 5, 'seller0@example.com')]
+    assert await pending_alerts(setup_database) == 0
+
+    await product_service.increment_stock(seller.id, product.id, 10)
+    await product_service.decrement_stock(seller.id, product.id, 12)
+    assert await pending_alerts(setup_database) == 1
+
+@pytest.mark.asyncio
+async def test_failed_delivery_keeps_alerts(setup_database, create_seller) -> None:
+    """
+    Test that alerts stay pending when the notifier fails.
+    """
+    seller = await create_seller()
+    product = await create_product(setup_database, seller, 3, 2)
+    await ProductService(setup_database).decrement_stock(seller.id, product.id, 2)
+
+    async def fail(_) -> None:
+        raise ConnectionError('notification service unavailable')
+    with pytest.raises(ConnectionError):
+        await StockAlertDispatcher(60_000, 10, fail).dispatch()
+    assert await pending_alerts(setup_database) == 1
+
+@pytest.mark.asyncio
+async def test_sale_alerts_are_delivered(client: AsyncClient, setup_database,
+                                         caplog: pytest.LogCaptureFixture, create_seller) -> None:
+    """
+    Test that a sale crossing thresholds raises one alert per product, delivered in the
+    background right after the sale commits.
+    """
+    seller = await create_seller()
+    crossing = await create_product(setup_database, seller, 10, 4)
+    above = await create_product(setup_database, seller, 10, 2)
+    without = Product(seller_id=seller.id, name='Pastel', price=7, quantity=10)
+    setup_database.add(without)
+    await setup_database.commit()
+
+    with caplog.at_level(logging.WARNING):
+        response = await client.post('/sales/', headers={'X-Seller-Id': str(seller.id)},
+                                     json={'items': [
+                                         {'product_id': str(crossing.id), 'quantity': 6},
+                                         {'product_id': str(above.id), 'quantity': 6},
+                                         {'product_id': str(without.id), 'quantity': 10}]})
+        assert response.status_code == status.HTTP_201_CREATED
+        for _ in range(50):
+            if await pending_alerts(setup_database) == 0:
+                break
+            await asyncio.sleep(0.02)
+
+    alerts = (await setup_database.execute(select(StockAlert))).scalars().all()
+    assert [(alert.product_id, alert.quantity) for alert in alerts] == [(crossing.id, 4)]
+    assert alerts[0].date_delivered is not None
+    assert f'Product Coxinha ({crossing.id}) of seller Seller Number 0' in caplog.text
+
+@pytest.mark.asyncio
+async def test_low_stock_listing(client: AsyncClient, setup_database, create_seller) -> None:
+    """
+    Test that the listing shows the products at or below their threshold, lowest quantity
+    first, from the partial index.
+    """
+    seller = await create_seller()
+    headers = {'X-Seller-Id': str(seller.id)}
+    low = await create_product(setup_database, seller, 1, 5)
+    at_threshold = await create_product(setup_database, seller, 5, 5)
+    await create_product(setup_database, seller, 6, 5)
+    untracked = await create_product(setup_database, seller, 0, 5)
+
+    response = await client.put(f'/products/{untracked.id}/low-stock-threshold',
+                                headers=headers, json={'low_stock_threshold': None})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['low_stock_threshold'] is None
+    response = await client.put(f'/products/{untracked.id}/low-stock-threshold',
+                                headers=headers, json={'low_stock_threshold': -1})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    response = await client.get('/products/low-stock', headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert [item['id'] for item in response.json()['items']] == [str(low.id),
+                                                                 str(at_threshold.id)]
+
+    other = await create_seller(1)
+    response = await client.get('/products/low-stock', headers={'X-Seller-Id': str(other.id)})
+    assert response.json() == {'items': []}
+
+    await setup_database.execute(text('SET LOCAL enable_seqscan = off'))
+    plan = (await setup_database.execute(text(
+        'EXPLAIN SELECT id FROM products WHERE seller_id = :seller_id '
+        'AND quantity <= low_stock_threshold ORDER BY quantity, id LIMIT 20'),
+        {'seller_id': seller.id})).scalars().all()
+    assert 'ix_products_low_stock' in '\n'.join(plan)
@@ -0,0 +1,82 @@
+"""
+This test module contains tests for the catalog search of products within the application.
+It tests that a search matches the beginning of the words of the names regardless of
+accents, ranks the matches, only searches the catalog of the seller and reads the GIN index
+of the seller terms.
+"""
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+from sqlalchemy import text
+
+from api.modules.products.models.Product import Product
+from api.shared.database.catalog_search import build_prefix_query, search_words
+
+async def search(client: AsyncClient, seller, q: str, **params) -> list[str]:
+    """
+    Searches the catalog of a seller and returns the names found, in order.
+    """
+    response = await client.get('/products/search', headers={'X-Seller-Id': str(seller.id)},
+                                params={'q': q, **params})
+    assert response.status_code == status.HTTP_200_OK
+    return [product['name'] for product in response.json()['items']]
+
+@pytest.mark.asyncio
+async def test_search_products(client: AsyncClient, setup_database, create_seller) -> None:
+    """
+    Test that a search ignores accents and case, matches prefixes of every word, ranks the
+    names repeating its words first and never returns the products of another seller.
+    """
+    seller, other = await create_seller(), await create_seller(1)
+    setup_database.add_all([
+        Product(seller_id=seller.id, name=name, price=1, quantity=1)
+        for name in ('Pão francês', 'Pão de queijo', 'Pão de milho com pão doce', 'Café',
+                     'Queijo minas')])
+    setup_database.add(Product(seller_id=other.id, name='Pão francês', price=1, quantity=1))
+    await setup_database.commit()
+
+    assert await search(client, seller, 'pao') == ['Pão de milho com pão doce', 'Pão de queijo',
+                                                   'Pão francês']
+    assert await search(client, seller, 'PAO FRAN') == ['Pão francês']
+    assert await search(client, seller, 'café') == await search(client, seller, 'caf') == [
+        'Café']
+    assert await search(client, seller, 'queij') == ['Pão de queijo', 'Queijo minas']
+    assert await search(client, seller, 'pao', limit=1) == ['Pão de milho com pão doce']
+    assert await search(client, seller, 'arroz') == []
+    assert await search(client, seller, "') | !(") == []
+
+    response = await client.get('/products/search', headers={'X-Seller-Id': str(seller.id)})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+def test_search_words() -> None:
+    """
+    Test that only the words of a search reach the text search, each as a prefix.
+    """
+    assert search_words('pão  fran') == ['pão', 'fran']
+    assert search_words("leite' & !moça:*") == ['leite', 'moça']
+    assert search_words('coca-cola_2l') == ['coca', 'cola', '2l']
+    assert search_words(' :* & ') == []
+    assert build_prefix_query(['pão', 'fran']) == 'pão:* & fran:*'
+
+@pytest.mark.asyncio
+async def test_search_reads_seller_terms(setup_database, create_seller) -> None:
+    """
+    Test that the search terms are prefixed with the seller, stop words left out, and that
+    the search condition is served by the GIN index of the seller terms.
+    """
+    seller = await create_seller()
+    hex_id = seller.id.hex
+    query = (await setup_database.execute(text(
+        "SELECT CAST(catalog_seller_query(:seller_id, 'Pão de queijo') AS text)"),
+        {'seller_id': seller.id})).scalar_one()
+    assert query == f"'{hex_id}pao':* & '{hex_id}queij':*"
+    assert (await setup_database.execute(text(
+        "SELECT catalog_seller_query(:seller_id, 'de')"),
+        {'seller_id': seller.id})).scalar_one() is None
+
+    await setup_database.execute(text('SET LOCAL enable_seqscan = off'))
+    plan = (await setup_database.execute(text(
+        'EXPLAIN SELECT id FROM products WHERE catalog_seller_terms(seller_id, search_vector) '
+        "@@ catalog_seller_query(:seller_id, 'pao')"),
+        {'seller_id': seller.id})).scalars().all()
+    assert 'ix_products_search_terms' in '\n'.join(plan)
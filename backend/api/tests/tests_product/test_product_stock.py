@@ -0,0 +1,81 @@
+"""
+This test module contains tests for the stock movements of products within the application.
+It tests atomic decrements and increments, the rejection of decrements larger than the
+stock, and that concurrent decrements of the same product never oversell it.
+"""
+import asyncio
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+from sqlalchemy import select
+
+from api.modules.products.models.Product import Product
+from api.modules.products.services.product_service import ProductService
+from api.shared.database.connection import async_session
+from api.shared.exceptions.stock_exception import InsufficientStockException
+
+async def create_product(session, seller, quantity: int) -> Product:
+    """
+    Inserts a product of the seller directly into the database.
+    """
+    product = Product(seller_id=seller.id, name='Coxinha', price=5, quantity=quantity)
+    session.add(product)
+    await session.commit()
+    return product
+
+@pytest.mark.asyncio
+async def test_decrement_and_increment_stock(client: AsyncClient, setup_database,
+                                             create_seller) -> None:
+    """
+    Test that stock moves atomically and a decrement larger than the stock is rejected.
+    """
+    seller = await create_seller()
+    product = await create_product(setup_database, seller, 5)
+    headers = {'X-Seller-Id': str(seller.id)}
+
+    response = await client.post(f'/products/{product.id}/stock/decrement', headers=headers,
+                                 json={'quantity': 3})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {'id': str(product.id), 'quantity': 2}
+
+    response = await client.post(f'/products/{product.id}/stock/decrement', headers=headers,
+                                 json={'quantity': 3})
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert response.json()['detail'] == 'Key (quantity)=(3) Only 2 units are in stock.'
+
+    response = await client.post(f'/products/{product.id}/stock/increment', headers=headers,
+                                 json={'quantity': 10})
+    assert response.json() == {'id': str(product.id), 'quantity': 12}
+
+    for movement in ('decrement', 'increment'):
+        response = await client.post(f'/products/{product.id}/stock/{movement}',
+                                     headers=headers, json={'quantity': 0})
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    other = await create_seller(1)
+    response = await client.post(f'/products/{product.id}/stock/decrement',
+                                 headers={'X-Seller-Id': str(other.id)}, json={'quantity': 1})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+@pytest.mark.asyncio
+async def test_concurrent_decrements_never_oversell(setup_database, create_seller) -> None:
+    """
+    Test that many sellers decrementing the same product at once sell exactly its stock.
+    """
+    seller = await create_seller()
+    product = await create_product(setup_database, seller, 10)
+
+    async def sell() -> bool:
+        async with async_session() as session:
+            try:
+                await ProductService(session).decrement_stock(seller.id, product.id, 1)
+            except InsufficientStockException:
+                return False
+            return True
+
+    sold = await asyncio.gather(*(sell() for _ in range(25)))
+    assert sum(sold) == 10
+    quantity = await setup_database.scalar(
+        select(Product.quantity).where(Product.id == product.id)
+        .execution_options(populate_existing=True))
+    assert quantity == 0
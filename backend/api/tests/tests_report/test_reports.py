@@ -0,0 +1,171 @@
+"""
+This test module contains tests for the sales reports within the application. It tests
+that the rollup job rolls closed days up incrementally, that reports combine the rollups
+with the live sales of the later days, and that reports are cached per seller and period.
+"""
+from datetime import datetime, time, timedelta, timezone
+from decimal import Decimal
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+from sqlalchemy import select
+
+from api.modules.customers.models.Customer import Customer
+from api.modules.reports.models.ReportRollupState import ReportRollupState
+from api.modules.reports.models.SalesDaily import SalesDaily
+from api.modules.reports.services.report_rollup import ReportRollup
+from api.modules.reports.services.report_service import REPORT_ZONE, report_cache
+from api.modules.sales.models.Sale import Sale
+from api.modules.sales.models.SaleItem import SaleItem
+from api.shared.configs.settings import settings
+
+TODAY = datetime.now(REPORT_ZONE).date()
+
+@pytest.fixture(autouse=True)
+def clear_report_cache():
+    """
+    Starts every test with an empty report cache.
+    """
+    report_cache.clear()
+
+async def add_sale(session, seller, created: datetime, *items: tuple, debt: str = '0') -> None:
+    """
+    Inserts a sale created at a given moment, with (product, quantity) items.
+    """
+    total = sum(product.price * quantity for product, quantity in items)
+    customer = None
+    if Decimal(debt):
+        customer = Customer(seller_id=seller.id, name='Dona Maria', balance=Decimal(debt))
+        session.add(customer)
+        await session.flush()
+    sale = Sale(seller_id=seller.id, customer_id=customer and customer.id, total=total,
+                debt=Decimal(debt), date_created=created)
+    session.add(sale)
+    await session.flush()
+    session.add_all([SaleItem(seller_id=seller.id, sale_id=sale.id, product_id=product.id,
+                              quantity=quantity, unit_price=product.price)
+                     for product, quantity in items])
+    await session.commit()
+
+def at_noon(days_ago: int) -> datetime:
+    """
+    Builds the moment at noon, in the report time zone, a number of days ago.
+    """
+    return datetime.combine(TODAY - timedelta(days=days_ago), time(12), REPORT_ZONE)
+
+@pytest.mark.asyncio
+async def test_reports_combine_rollups_and_live_sales(client: AsyncClient, setup_database,
+                                                      create_seller, create_products) -> None:
+    """
+    Test that reports are the same before and after the closed days are rolled up.
+    """
+    seller = await create_seller()
+    other = await create_seller(1)
+    coffee, bread = await create_products(seller, ('3.00', 100), ('0.50', 100))
+    other_product, = await create_products(other, ('9.00', 100))
+    await add_sale(setup_database, seller, at_noon(2), (coffee, 2), (bread, 4), debt='8')
+    await add_sale(setup_database, seller, at_noon(1), (coffee, 1))
+    await add_sale(setup_database, seller, at_noon(0), (bread, 10))
+    await add_sale(setup_database, seller, at_noon(0), (coffee, 1), (bread, 2))
+    await add_sale(setup_database, other, at_noon(1), (other_product, 5))
+
+    headers = {'X-Seller-Id': str(seller.id)}
+    params = {'start': str(TODAY - timedelta(days=6)), 'end': str(TODAY)}
+    expected_sales = {
+        'start': params['start'], 'end': params['end'], 'sales_count': 4,
+        'revenue': '20.00', 'debt': '8.00', 'days': [
+            {'day': str(TODAY - timedelta(days=2)), 'sales_count': 1, 'revenue': '8.00',
+             'debt': '8.00'},
+            {'day': str(TODAY - timedelta(days=1)), 'sales_count': 1, 'revenue': '3.00',
+             'debt': '0.00'},
+            {'day': str(TODAY), 'sales_count': 2, 'revenue': '9.00', 'debt': '0.00'}]}
+    expected_products = [(str(coffee.id), 'Product 0', 4, '12.00'),
+                         (str(bread.id), 'Product 1', 16, '8.00')]
+
+    async def check_reports() -> None:
+        response = await client.get('/reports/sales', params=params, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == expected_sales
+        response = await client.get('/reports/products', params=params, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert [(item['product_id'], item['name'], item['quantity'], item['revenue'])
+                for item in response.json()['items']] == expected_products
+
+    await check_reports()
+
+    rollup = ReportRollup(settings.REPORT_TIMEZONE, 0)
+    assert await rollup.refresh() == 2
+    assert await rollup.refresh() == 0
+    state = await setup_database.scalar(select(ReportRollupState.rolled_up_through))
+    assert state == TODAY - timedelta(days=1)
+    days = (await setup_database.execute(
+        select(SalesDaily.seller_id, SalesDaily.day, SalesDaily.sales_count)
+        .order_by(SalesDaily.day, SalesDaily.sales_count))).all()
+    assert len(days) == 3
+
+    report_cache.clear()
+    await check_reports()
+
+    response = await client.get('/reports/products', headers=headers, params={
+        'start': str(TODAY - timedelta(days=1)), 'end': str(TODAY - timedelta(days=1))})
+    assert [item['quantity'] for item in response.json()['items']] == [1]
+
+@pytest.mark.asyncio
+async def test_reports_are_cached(client: AsyncClient, setup_database, create_seller,
+                                  create_products) -> None:
+    """
+    Test that a report is served from the cache until it expires, per seller and period.
+    """
+    seller = await create_seller()
+    coffee, = await create_products(seller, ('3.00', 100))
+    await add_sale(setup_database, seller, at_noon(0), (coffee, 1))
+    headers = {'X-Seller-Id': str(seller.id)}
+
+    response = await client.get('/reports/sales', headers=headers)
+    assert response.json()['revenue'] == '3.00'
+    assert response.json()['end'] == str(TODAY)
+
+    await add_sale(setup_database, seller, at_noon(0), (coffee, 1))
+    response = await client.get('/reports/sales', headers=headers)
+    assert response.json()['revenue'] == '3.00'
+
+    response = await client.get('/reports/sales', headers=headers,
+                                params={'start': str(TODAY), 'end': str(TODAY)})
+    assert response.json()['revenue'] == '6.00'
+    assert report_cache.hits == 1 and len(report_cache) == 2
+
+@pytest.mark.asyncio
+async def test_report_days_follow_the_report_time_zone(client: AsyncClient, setup_database,
+                                                       create_seller, create_products) -> None:
+    """
+    Test that a sale just after midnight UTC belongs to the previous day in Sao Paulo.
+    """
+    seller = await create_seller()
+    coffee, = await create_products(seller, ('3.00', 100))
+    created = datetime.combine(TODAY - timedelta(days=3), time(2), timezone.utc)
+    await add_sale(setup_database, seller, created, (coffee, 1))
+    headers = {'X-Seller-Id': str(seller.id)}
+
+    response = await client.get('/reports/sales', headers=headers)
+    assert [day['day'] for day in response.json()['days']] == [str(TODAY - timedelta(days=4))]
+
+    await ReportRollup(settings.REPORT_TIMEZONE, 0).refresh()
+    report_cache.clear()
+    response = await client.get('/reports/sales', headers=headers)
+    assert [day['day'] for day in response.json()['days']] == [str(TODAY - timedelta(days=4))]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("params", [
+    {'start': '2026-02-01', 'end': '2026-01-01'},
+    {'start': '2024-01-01', 'end': '2026-01-01'},
+    {'start': 'yesterday'},
+])
+async def test_report_invalid_period(client: AsyncClient,
+                                     params: dict, create_seller) -> None:
+    """
+    Test that reversed, too long or malformed periods are rejected.
+    """
+    seller = await create_seller()
+    response = await client.get('/reports/sales', params=params,
+                                headers={'X-Seller-Id': str(seller.id)})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
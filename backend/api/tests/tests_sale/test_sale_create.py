@@ -0,0 +1,110 @@
+"""
+This test module contains tests for the sale registration functionalities within the
+application. It tests that a whole cart is registered in one transaction, with its products
+locked in order and their stock taken by a single statement, and that a cart with any
+unavailable product registers nothing.
+"""
+import uuid
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+from sqlalchemy import event, func, select
+
+from api.modules.sales.models.Sale import Sale
+from api.modules.sales.models.SaleItem import SaleItem
+from api.shared.database.connection import engine
+
+@pytest.mark.asyncio
+async def test_create_sale(client: AsyncClient, create_seller, create_products, stock_of) -> None:
+    """
+    Test that a cart is registered with merged lines, current prices and a single UPDATE
+    after locking its products in order.
+    """
+    seller = await create_seller()
+    products = await create_products(seller, ('4.50', 10), ('2.25', 5), ('1.00', 1))
+    headers = {'X-Seller-Id': str(seller.id)}
+    cart = [{'product_id': str(products[0].id), 'quantity': 2},
+            {'product_id': str(products[1].id), 'quantity': 5},
+            {'product_id': str(products[0].id), 'quantity': 1}]
+
+    statements = []
+    def record(conn, cursor, statement, *args): # pylint: disable=unused-argument
+        statements.append(statement)
+    event.listen(engine.sync_engine, 'before_cursor_execute', record)
+    try:
+        response = await client.post('/sales/', headers=headers, json={'items': cart})
+    finally:
+        event.remove(engine.sync_engine, 'before_cursor_execute', record)
+    assert [statement.split()[0] for statement in statements] == ['SELECT', 'UPDATE',
+                                                                   'INSERT', 'INSERT']
+    assert statements[0].endswith('ORDER BY products.id FOR UPDATE')
+
+    assert response.status_code == status.HTTP_201_CREATED
+    sale = response.json()
+    assert sale['total'] == '24.75'
+    assert sorted((item['product_id'], item['quantity'], item['unit_price'])
+                  for item in sale['items']) == sorted([(str(products[0].id), 3, '4.50'),
+                                                        (str(products[1].id), 5, '2.25')])
+    assert await stock_of(products) == [7, 0, 1]
+
+    response = await client.get(f'/sales/{sale["id"]}', headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == sale
+
+    other = await create_seller(1)
+    response = await client.get(f'/sales/{sale["id"]}', headers={'X-Seller-Id': str(other.id)})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+@pytest.mark.asyncio
+async def test_create_sale_unavailable(client: AsyncClient, setup_database, create_seller,
+                                       create_products, stock_of) -> None:
+    """
+    Test that a cart with a missing or short product registers nothing.
+    """
+    seller = await create_seller()
+    products = await create_products(seller, ('1.00', 10), ('1.00', 2))
+    headers = {'X-Seller-Id': str(seller.id)}
+
+    response = await client.post('/sales/', headers=headers, json={'items': [
+        {'product_id': str(products[0].id), 'quantity': 1},
+        {'product_id': str(products[1].id), 'quantity': 3}]})
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert response.json()['detail'] == (f'Key (quantity)=(3) Only 2 units of product '
+                                         f'{products[1].id} are in stock.')
+
+    missing = uuid.UUID(int=1)
+    response = await client.post('/sales/', headers=headers, json={'items': [
+        {'product_id': str(products[0].id), 'quantity': 1},
+        {'product_id': str(missing), 'quantity': 1}]})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()['detail'] == f'Key (product_id)=({missing}) Product not found.'
+
+    other = await create_seller(1)
+    response = await client.post('/sales/', headers={'X-Seller-Id': str(other.id)},
+                                 json={'items': [{'product_id': str(products[0].id),
+                                                  'quantity': 1}]})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    assert await stock_of(products) == [10, 2]
+    for model in (Sale, SaleItem):
+        count = await setup_database.scalar(select(func.count()).select_from(model)) # pylint: disable=not-callable
+        assert count == 0
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("items", [
+    [],
+    [{'product_id': str(uuid.UUID(int=1)), 'quantity': 0}],
+    [{'product_id': 'nope', 'quantity': 1}],
+    [{'product_id': str(uuid.UUID(int=index)), 'quantity': 1} for index in range(101)],
+    [{'product_id': str(uuid.UUID(int=1)), 'quantity': 1_000_000},
+     {'product_id': str(uuid.UUID(int=1)), 'quantity': 1}],
+])
+async def test_create_sale_invalid_cart(client: AsyncClient,
+                                        items: list, create_seller) -> None:
+    """
+    Test that invalid carts are rejected before any stock is touched.
+    """
+    seller = await create_seller()
+    response = await client.post('/sales/', headers={'X-Seller-Id': str(seller.id)},
+                                 json={'items': items})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -0,0 +1,143 @@
+"""
+This test module contains tests for the sync of the devices of the sellers within the
+application. It tests that a sync streams only the rows changed or deleted since its cursor,
+including the changes of transactions that committed late, and that sales made offline are
+uploaded in idempotent batches.
+"""
+import json
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+from sqlalchemy import delete, text, update
+
+from api.modules.customers.models.Customer import Customer
+from api.modules.products.models.Product import Product
+from api.modules.users.models.User import User
+from api.shared.database.connection import engine
+from api.utils.uuid7 import uuid7
+
+async def sync(client: AsyncClient, seller: User, since=None) -> tuple[list[dict], str]:
+    """
+    Syncs a seller and returns the lines of the stream and the cursor of the next sync.
+    """
+    params = {'since': since} if since is not None else {}
+    response = await client.get('/sync/', headers={'X-Seller-Id': str(seller.id)},
+                                params=params)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    return lines[:-1], lines[-1]['cursor']
+
+@pytest.mark.asyncio
+async def test_sync_changes(client: AsyncClient, setup_database, create_seller,
+                            create_products) -> None:
+    """
+    Test that a sync streams every row first, then only the rows changed since its cursor.
+    """
+    seller, other = await create_seller(), await create_seller(1)
+    products = await create_products(seller, ('4.50', 10), ('2.25', 5))
+    customer = Customer(seller_id=seller.id, name='Maria')
+    setup_database.add(customer)
+    await setup_database.commit()
+
+    lines, cursor = await sync(client, seller)
+    assert sorted((line['entity'], line['id']) for line in lines) == sorted(
+        [('user', str(seller.id)), ('customer', str(customer.id))]
+        + [('product', str(product.id)) for product in products])
+    product = next(line for line in lines if line['id'] == str(products[0].id))
+    assert (product['price'], product['quantity']) == ('4.50', 10)
+    assert [line['entity'] for line in (await sync(client, other))[0]] == ['user']
+
+    response = await client.post('/sales/', headers={'X-Seller-Id': str(seller.id)},
+                                 json={'items': [{'product_id': str(products[0].id),
+                                                  'quantity': 2}]})
+    sale = response.json()
+    await setup_database.execute(text('UPDATE users SET date_login = now()'))
+    await setup_database.commit()
+
+    lines, cursor = await sync(client, seller, cursor)
+    assert lines == [
+        {'entity': 'product', 'id': str(products[0].id), 'name': 'Product 0', 'price': '4.50',
+         'quantity': 8, 'low_stock_threshold': None,
+         'date_created': product['date_created']},
+        {'entity': 'sale', 'id': sale['id'], 'customer_id': None, 'total': '9.00',
+         'debt': '0.00', 'date_created': sale['date_created'].replace('Z', '+00:00')},
+        {'entity': 'sale_item', 'sale_id': sale['id'], 'product_id': str(products[0].id),
+         'quantity': 2, 'unit_price': '4.50'}]
+
+    await setup_database.execute(update(User).where(User.id == seller.id)
+                                 .values(name='Ana Paula'))
+    await setup_database.commit()
+    lines, cursor = await sync(client, seller, cursor)
+    assert [(line['entity'], line['name']) for line in lines] == [('user', 'Ana Paula')]
+    assert (await sync(client, seller, cursor))[0] == []
+
+@pytest.mark.asyncio
+async def test_sync_late_commit(client: AsyncClient, create_seller, create_products) -> None:
+    """
+    Test that a change committed after a sync that started before it is in the next sync.
+    """
+    seller = await create_seller()
+    products = await create_products(seller, ('1.00', 5))
+    _, cursor = await sync(client, seller)
+
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        await connection.execute(update(Product).values(quantity=4))
+        lines, next_cursor = await sync(client, seller, cursor)
+        assert lines == []
+        await transaction.commit()
+
+    lines, _ = await sync(client, seller, next_cursor)
+    assert [(line['id'], line['quantity']) for line in lines] == [(str(products[0].id), 4)]
+
+@pytest.mark.asyncio
+async def test_sync_tombstones(client: AsyncClient, setup_database, create_seller,
+                               create_products) -> None:
+    """
+    Test that deleted rows are streamed as tombstones, only to syncs with a cursor.
+    """
+    seller = await create_seller()
+    products = await create_products(seller, ('1.00', 5), ('2.00', 5))
+    _, cursor = await sync(client, seller)
+
+    await setup_database.execute(delete(Product).where(Product.id == products[1].id))
+    await setup_database.commit()
+
+    lines, _ = await sync(client, seller, cursor)
+    assert lines == [{'entity': 'product', 'id': str(products[1].id), 'deleted': True}]
+    lines, _ = await sync(client, seller)
+    assert [line['id'] for line in lines if line['entity'] == 'product'] == [str(products[0].id)]
+
+@pytest.mark.asyncio
+async def test_upload_offline_sales(client: AsyncClient, create_seller, create_products,
+                                    stock_of) -> None:
+    """
+    Test that each uploaded sale is registered, rejected or reported as a duplicate on its
+    own, so a batch can be uploaded again safely.
+    """
+    seller = await create_seller()
+    products = await create_products(seller, ('1.00', 5), ('2.00', 1))
+    headers = {'X-Seller-Id': str(seller.id)}
+    sold, short = str(uuid7()), str(uuid7())
+    batch = [{'id': sold, 'items': [{'product_id': str(products[0].id), 'quantity': 2}]},
+             {'id': short, 'items': [{'product_id': str(products[1].id), 'quantity': 3}]},
+             {'id': sold, 'items': [{'product_id': str(products[0].id), 'quantity': 2}]}]
+
+    response = await client.post('/sync/', headers=headers, json={'sales': batch})
+    assert response.status_code == status.HTTP_200_OK
+    results = response.json()['results']
+    assert [(result['id'], result['status'], result['status_code']) for result in results] == [
+        (sold, 'created', None), (short, 'rejected', 409), (sold, 'duplicate', None)]
+    assert 'Only 1 units' in results[1]['detail']
+
+    response = await client.post('/sync/', headers=headers, json={'sales': batch[:1]})
+    assert response.json()['results'][0]['status'] == 'duplicate'
+    assert await stock_of(products) == [3, 1]
+
+    response = await client.get(f'/sales/{sold}', headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['total'] == '2.00'
+
+    response = await client.post('/sync/', headers=headers, json={'sales': []})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
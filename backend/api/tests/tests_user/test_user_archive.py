@@ -0,0 +1,176 @@
+"""
+This test module contains tests for the cold storage of long-inactive users within the
+application. It tests that the archival job moves users and their photos in batches, that
+lookups fall back to the archive, that archived users cannot be changed, that archived
+values stay reserved and that active-user queries can use the partial indexes of the users
+table.
+"""
+import uuid
+from datetime import date, datetime, timedelta, timezone
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import postgresql
+
+from api.modules.products.models.Product import Product
+from api.modules.users.models.User import User, user_status_is
+from api.modules.users.models.UserArchive import UserArchive
+from api.modules.users.models.UserPhoto import UserPhoto
+from api.modules.users.models.UserPhotoArchive import UserPhotoArchive
+from api.modules.users.services.user_archiver import UserArchiver
+from api.modules.users.services.user_service import UserService
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+OLD = NOW - timedelta(days=400)
+RECENT = NOW - timedelta(days=30)
+
+USER_DATA = {
+    "email": "lucas.camargo@gmail.com",
+    "cpf_cnpj": "88877936037",
+    "whatsapp": "14991396707",
+    "name": "Lucas Camargo",
+    "password": "159753Lucas$",
+    "sex": "M",
+    "date_birthday": "1990-01-01"
+}
+
+def make_user(index: int, user_status: int, date_login: datetime) -> User:
+    """
+    Builds a user with the given status and last login.
+    """
+    return User(email=f'user{index}@example.com', cpf_cnpj=f'{index:011d}',
+                whatsapp=f'1499139{index:04d}', name=f'User Number {index}', password='hash',
+                sex='O', date_birthday=date(1990, 1, 1), date_created=OLD, status=user_status,
+                date_login=date_login, profile_photo=b'legacy photo')
+
+@pytest.mark.asyncio
+async def test_archive_inactive_users(client: AsyncClient, setup_database) -> None: # pylint: disable=unused-argument
+    """
+    Test that only long-inactive users are moved, batch by batch, with their photos.
+    """
+    active_old = make_user(0, 1, OLD)
+    inactive_recent = make_user(1, 2, RECENT)
+    archived = [make_user(2, 2, OLD), make_user(3, 99, OLD), make_user(4, 99, None)]
+    setup_database.add_all([active_old, inactive_recent, *archived])
+    await setup_database.commit()
+    setup_database.add(UserPhoto(user_id=archived[0].id, variant='small', content=b'small',
+                                 content_type='image/webp', etag='"small"'))
+    await setup_database.commit()
+
+    assert await UserArchiver(365, 2, 0).archive(NOW) == 3
+    assert await UserArchiver(365, 2, 0).archive(NOW) == 0
+
+    remaining = await setup_database.execute(select(User.id).order_by(User.id))
+    assert remaining.scalars().all() == sorted([active_old.id, inactive_recent.id])
+    result = await setup_database.execute(
+        select(UserArchive.id, UserArchive.status, UserArchive.version,
+               UserArchive.profile_photo).order_by(UserArchive.id))
+    assert [tuple(row) for row in result] == [(user.id, user.status, 1, b'legacy photo')
+                                              for user in sorted(archived, key=lambda u: u.id)]
+    assert (await setup_database.execute(select(func.count()).select_from(UserPhoto))
+            ).scalar_one() == 0
+    photo = (await setup_database.execute(select(UserPhotoArchive))).scalar_one()
+    assert (photo.user_id, photo.variant, photo.content) == (archived[0].id, 'small', b'small')
+
+@pytest.mark.asyncio
+async def test_archived_user_lookups(client: AsyncClient, setup_database) -> None:
+    """
+    Test that archived users and their photos are still found by identifier and email.
+    """
+    user = make_user(0, 99, OLD)
+    setup_database.add(user)
+    await setup_database.commit()
+    setup_database.add(UserPhoto(user_id=user.id, variant='small', content=b'small',
+                                 content_type='image/webp', etag='"small"'))
+    await setup_database.commit()
+    assert await UserArchiver(365, 10, 0).archive(NOW) == 1
+
+    response = await client.get(f'/users/{user.id}')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['status'] == 99
+    assert response.headers['ETag'] == '"1"'
+
+    response = await client.get(f'/users/{user.id}/photo/small')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == b'small'
+
+    archived = await UserService(setup_database).get_user_by_email('USER0@example.com')
+    assert isinstance(archived, UserArchive) and archived.id == user.id
+
+@pytest.mark.asyncio
+async def test_archived_users_cannot_change(client: AsyncClient, setup_database) -> None:
+    """
+    Test that updating an archived user is a conflict rather than a missing user, and that
+    a status change reports archived users apart from the missing ones.
+    """
+    user = make_user(0, 99, OLD)
+    setup_database.add(user)
+    await setup_database.commit()
+    assert await UserArchiver(365, 10, 0).archive(NOW) == 1
+
+    response = await client.patch(f'/users/{user.id}', headers={'If-Match': '"1"'},
+                                  json={'name': 'Ana Souza'})
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert response.json()['detail'] == (f'Key (id)=({user.id}) The user is archived and '
+                                         'cannot be changed.')
+
+    unknown = str(uuid.uuid4())
+    response = await client.post('/users/status', json={'status': 1,
+                                                        'ids': [str(user.id), unknown]})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {'status': 1, 'changed': [], 'unchanged': [unknown],
+                               'archived': [str(user.id)]}
+
+    response = await client.patch(f'/users/{unknown}', headers={'If-Match': '*'},
+                                  json={'name': 'Ana Souza'})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+@pytest.mark.asyncio
+async def test_archived_values_stay_reserved(client: AsyncClient, setup_database) -> None:
+    """
+    Test that a new user cannot take the email, CPF/CNPJ or WhatsApp of an archived user.
+    """
+    response = await client.post('/users/', json=USER_DATA)
+    assert response.status_code == status.HTTP_201_CREATED
+    await setup_database.execute(text("UPDATE users SET status = 2, date_login = :old"),
+                                 {'old': OLD})
+    await setup_database.commit()
+    assert await UserArchiver(365, 10, 0).archive(NOW) == 1
+
+    response = await client.post('/users/', json=USER_DATA)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()['detail'] == 'Key (email)=(lucas.camargo@gmail.com) already exists.'
+
+    response = await client.get('/users/availability',
+                                params={'cpf_cnpj': '88877936037', 'whatsapp': '14991396707'})
+    assert response.json() == {'cpf_cnpj': False, 'whatsapp': False}
+
+@pytest.mark.asyncio
+async def test_active_users_use_partial_index(setup_database) -> None:
+    """
+    Test that the active status is inlined, so the planner can pick the partial index.
+    """
+    statement = select(User.id).where(user_status_is(1)).order_by(User.id).limit(10)
+    sql = str(statement.compile(dialect=postgresql.dialect(),
+                                compile_kwargs={'literal_binds': True}))
+    assert 'users.status = 1' in sql
+
+    await setup_database.execute(text('SET LOCAL enable_seqscan = off'))
+    plan = (await setup_database.execute(text(f'EXPLAIN {sql}'))).scalars().all()
+    assert 'ix_users_active_id' in '\n'.join(plan)
+
+@pytest.mark.asyncio
+async def test_archive_skips_sellers(client: AsyncClient, setup_database) -> None: # pylint: disable=unused-argument
+    """
+    Test that inactive users still owning products are not archived.
+    """
+    seller, other = make_user(0, 2, OLD), make_user(1, 2, OLD)
+    setup_database.add_all([seller, other])
+    await setup_database.commit()
+    setup_database.add(Product(seller_id=seller.id, name='Coxinha', price=5))
+    await setup_database.commit()
+
+    assert await UserArchiver(365, 10, 0).archive(NOW) == 1
+    remaining = await setup_database.execute(select(User.id))
+    assert remaining.scalars().all() == [seller.id]
@@ -0,0 +1,127 @@
+"""
+This test module contains tests for the user audit log within the application. It tests
+that creates, updates and status changes are copied to the append-only user_audit table,
+that secrets are redacted, that a full queue applies backpressure instead of growing, that
+every queued change is written when the writer stops, or dropped and counted when it cannot
+be, and that the changes land in the partition of their month.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timezone
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+from sqlalchemy import select, text
+from sqlalchemy.exc import DBAPIError
+
+from api.modules.users.models.UserAudit import UserAudit
+from api.modules.users.services.audit_writer import UserAuditWriter, user_audit_writer
+
+USER_DATA = {
+    "email": "lucas.camargo@gmail.com",
+    "cpf_cnpj": "88877936037",
+    "whatsapp": "14991396707",
+    "name": "Lucas Camargo",
+    "password": "159753Lucas$",
+    "sex": "M",
+    "date_birthday": "1990-01-01"
+}
+
+@pytest.mark.asyncio
+async def test_user_changes_are_audited(client: AsyncClient, setup_database) -> None:
+    """
+    Test that every change made through the API ends up in user_audit, in order.
+    """
+    response = await client.post('/users/', json=USER_DATA)
+    assert response.status_code == status.HTTP_201_CREATED
+    user_id = response.json()['id']
+    response = await client.patch(f'/users/{user_id}', headers={'If-Match': '*'},
+                                  json={'name': 'Lucas Camargo Lima', 'password': '753159Lucas$'})
+    assert response.status_code == status.HTTP_200_OK
+    response = await client.post('/users/status', json={'status': 99, 'ids': [user_id]})
+    assert response.status_code == status.HTTP_200_OK
+    await user_audit_writer.flush()
+
+    result = await setup_database.execute(
+        select(UserAudit.action, UserAudit.changes)
+        .where(UserAudit.user_id == uuid.UUID(user_id)).order_by(UserAudit.id))
+    audit = result.all()
+    assert [row.action for row in audit] == ['create', 'update', 'status']
+    assert audit[0].changes['email'] == 'lucas.camargo@gmail.com'
+    assert audit[0].changes['password'] == '[REDACTED]'
+    assert audit[1].changes == {'name': 'Lucas Camargo Lima', 'password': '[REDACTED]'}
+    assert audit[2].changes == {'status': 99}
+
+@pytest.mark.asyncio
+async def test_user_audit_is_append_only(client: AsyncClient, setup_database) -> None:
+    """
+    Test that audit rows can be inserted but neither updated nor deleted.
+    """
+    response = await client.post('/users/', json=USER_DATA)
+    assert response.status_code == status.HTTP_201_CREATED
+    await user_audit_writer.flush()
+
+    for statement in ("UPDATE user_audit SET action = 'forged'", 'DELETE FROM user_audit'):
+        with pytest.raises(DBAPIError, match='append-only'):
+            await setup_database.execute(text(statement))
+        await setup_database.rollback()
+
+    result = await setup_database.execute(text('SELECT count(*) FROM user_audit'))
+    assert result.scalar_one() == 1
+
+@pytest.mark.asyncio
+async def test_audit_writer_backpressure_and_shutdown(setup_database) -> None:
+    """
+    Test that a full queue makes producers wait for a flush and that stop writes the rest.
+    """
+    writer = UserAuditWriter(flush_interval_ms=60_000, flush_max_entries=100, max_queued=2)
+    await writer.start()
+    user_ids = [uuid.uuid4() for _ in range(5)]
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*(writer.record(user_id, 'create') for user_id in user_ids)),
+            timeout=5)
+    finally:
+        await writer.stop()
+
+    result = await setup_database.execute(select(UserAudit.user_id))
+    assert sorted(result.scalars()) == sorted(user_ids)
+
+@pytest.mark.asyncio
+async def test_audit_writer_drops_unwritable_changes_on_shutdown(
+        setup_database, caplog: pytest.LogCaptureFixture) -> None:
+    """
+    Test that stop gives up once a flush fails, counting the dropped changes, and that
+    changes recorded while the writer is stopped are dropped without failing the caller.
+    """
+    writer = UserAuditWriter(flush_interval_ms=60_000, flush_max_entries=100, max_queued=3)
+    await writer.start()
+    await writer.record(uuid.uuid4(), 'create')
+    await writer.record(uuid.uuid4(), 'an action too long for its column')
+    await writer.record(uuid.uuid4(), 'create')
+    with caplog.at_level(logging.WARNING):
+        await asyncio.wait_for(writer.stop(), timeout=5)
+        await writer.record(uuid.uuid4(), 'update')
+
+    assert 'Dropped 3 audit records that could not be written on shutdown.' in caplog.text
+    assert 'Dropped the update audit records of 1 users, the writer is stopped.' in caplog.text
+    result = await setup_database.execute(text('SELECT count(*) FROM user_audit'))
+    assert result.scalar_one() == 0
+
+@pytest.mark.asyncio
+async def test_audit_changes_land_in_their_month_partition(setup_database) -> None:
+    """
+    Test that a flush creates the partitions of the months of its changes before writing
+    them, so none of them lands in the default partition.
+    """
+    writer = UserAuditWriter(flush_interval_ms=60_000, flush_max_entries=100, max_queued=10)
+    user_id = uuid.uuid4()
+    writer._unflushed = [ # pylint: disable=protected-access
+        (datetime(2031, 5, 2, tzinfo=timezone.utc), user_id, 'create', None),
+        (datetime(2031, 6, 30, tzinfo=timezone.utc), user_id, 'update', None)]
+    await writer.flush()
+
+    result = await setup_database.execute(text(
+        'SELECT CAST(tableoid::regclass AS text) FROM user_audit ORDER BY date_created'))
+    assert result.scalars().all() == ['user_audit_2031_05', 'user_audit_2031_06']
@@ -0,0 +1,87 @@
+"""
+This test module contains tests for the signup availability check within the application.
+It tests that values never registered are answered from the Bloom filters without touching
+the database, that possible hits are confirmed by the database, and that the filters are
+rebuilt from the users table on startup.
+"""
+from datetime import date
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+
+from api.modules.users.models.User import User
+from api.modules.users.services.availability_filters import availability_filters
+from api.utils.bloom_filter import BloomFilter
+
+USER_DATA = {
+    "email": "lucas.camargo@gmail.com",
+    "cpf_cnpj": "88877936037",
+    "whatsapp": "14991396707",
+    "name": "Lucas Camargo",
+    "password": "159753Lucas$",
+    "sex": "M",
+    "date_birthday": "1990-01-01"
+}
+
+@pytest.mark.asyncio
+async def test_availability(client: AsyncClient, setup_database) -> None: # pylint: disable=unused-argument
+    """
+    Test that taken values are reported after signup and free values skip the database.
+    """
+    await availability_filters.wait_ready()
+    response = await client.post('/users/', json=USER_DATA)
+    assert response.status_code == status.HTTP_201_CREATED
+
+    response = await client.get('/users/availability',
+                                params={'email': 'Lucas.Camargo@Gmail.com',
+                                        'cpf_cnpj': '88877936037', 'whatsapp': '14991396707'})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {'email': False, 'cpf_cnpj': False, 'whatsapp': False}
+
+    response = await client.get('/users/availability', params={'email': 'ana@example.com'})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {'email': True}
+
+    stats = (await client.get('/users/availability/stats')).json()
+    assert stats['ready'] is True
+    assert stats['checks'] == 4
+    assert stats['database_checks'] == 3
+    assert {bloom['field']: bloom['items'] for bloom in stats['filters']} == {
+        'email': 1, 'cpf_cnpj': 1, 'whatsapp': 1}
+
+@pytest.mark.asyncio
+async def test_availability_rebuilt_on_start(client: AsyncClient, setup_database) -> None:
+    """
+    Test that users already in the table are loaded into the filters on startup.
+    """
+    setup_database.add(User(email='ana@example.com', cpf_cnpj='52998224725',
+                            whatsapp='14991396708', name='Ana Souza', password='hash',
+                            sex='F', date_birthday=date(1990, 1, 1)))
+    await setup_database.commit()
+    await availability_filters.stop()
+    availability_filters.start()
+    await availability_filters.wait_ready()
+
+    response = await client.get('/users/availability', params={'cpf_cnpj': '52998224725'})
+    assert response.json() == {'cpf_cnpj': False}
+
+@pytest.mark.asyncio
+async def test_availability_without_values(client: AsyncClient) -> None:
+    """
+    Test that a check without any value is rejected.
+    """
+    response = await client.get('/users/availability')
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+def test_bloom_filter_error_rate() -> None:
+    """
+    Test that the filter never misses an added value and stays near its error rate.
+    """
+    bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+    for index in range(10_000):
+        bloom.add(f'user{index}@example.com')
+
+    assert all(f'user{index}@example.com' in bloom for index in range(10_000))
+    false_positives = sum(f'other{index}@example.com' in bloom for index in range(10_000))
+    assert false_positives < 200
+    assert bloom.estimated_error_rate == pytest.approx(0.01, rel=0.2)
@@ -0,0 +1,70 @@
+"""
+This test module contains tests for the case-insensitive email identity of users.
+It tests that emails are normalized on write, that addresses differing only by case cannot
+both register, and that lookups by email are answered by the lower(email) unique index.
+"""
+from datetime import date
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from api.modules.users.models.User import User
+from api.modules.users.services.user_service import UserService, select_user_by_email
+
+USER_DATA = {
+    "email": "Lucas.Camargo@Gmail.com",
+    "cpf_cnpj": "88877936037",
+    "whatsapp": "14991396707",
+    "name": "Lucas Camargo",
+    "password": "159753Lucas$",
+    "sex": "M",
+    "date_birthday": "1990-01-01"
+}
+
+@pytest.mark.asyncio
+async def test_email_is_normalized(client: AsyncClient, setup_database) -> None:
+    """
+    Test that the email is stored in lower case and found whatever the case used.
+    """
+    response = await client.post('/users/', json=USER_DATA)
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()['email'] == 'lucas.camargo@gmail.com'
+
+    user = await UserService(setup_database).get_user_by_email('LUCAS.camargo@gmail.COM')
+    assert user is not None
+    assert user.email == 'lucas.camargo@gmail.com'
+
+@pytest.mark.asyncio
+async def test_email_case_duplicate(client: AsyncClient, setup_database) -> None:
+    """
+    Test that an email differing only by case from an existing one is rejected.
+    """
+    setup_database.add(User(email='Lucas.Camargo@gmail.com', cpf_cnpj='52998224725',
+                            whatsapp='14991396708', name='Lucas Camargo', password='hash',
+                            sex='M', date_birthday=date(1990, 1, 1)))
+    await setup_database.commit()
+
+    response = await client.post('/users/', json=USER_DATA)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+@pytest.mark.asyncio
+async def test_email_lookup_uses_index(setup_database) -> None:
+    """
+    Test with EXPLAIN that the lookup by email is an index scan on lower(email).
+    """
+    setup_database.add_all([
+        User(email=f'user{i}@example.com', cpf_cnpj=f'{i:011d}', whatsapp=f'149913967{i:02d}',
+             name='Ana Souza', password='hash', sex='F', date_birthday=date(1990, 1, 1))
+        for i in range(50)])
+    await setup_database.commit()
+
+    statement = select_user_by_email('User7@Example.com').compile(
+        dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True})
+    await setup_database.execute(text('SET enable_seqscan = off'))
+    result = await setup_database.execute(text(f'EXPLAIN {statement}'))
+    plan = '\n'.join(result.scalars())
+
+    assert 'ix_users_email_lower' in plan
+    assert 'Seq Scan' not in plan
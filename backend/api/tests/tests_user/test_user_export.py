@@ -0,0 +1,75 @@
+"""
+This test module contains tests for the user export functionality within the application.
+It tests that the API streams the users table as CSV or NDJSON, honours the column
+selection and status filter, and never exposes password hashes.
+"""
+import csv
+import io
+import json
+from datetime import date
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+
+async def create_export_users(create_user) -> None:
+    """
+    Inserts two active users and one suspended user with the create_user fixture.
+    """
+    await create_user()
+    await create_user(email='bruno@example.com', cpf_cnpj='52998224725',
+                      whatsapp='14991396708', name='Bruno Lima', sex='M',
+                      date_birthday=date(1985, 5, 20))
+    await create_user(email='carla@example.com', cpf_cnpj='11144477735',
+                      whatsapp='14991396709', name='Carla Dias', sex='F',
+                      date_birthday=date(1979, 3, 9), status=99)
+
+@pytest.mark.asyncio
+async def test_export_users_csv(client: AsyncClient, create_user) -> None:
+    """
+    Test the CSV export with every exportable column.
+    """
+    await create_export_users(create_user)
+
+    response = await client.get('/users/export')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['content-type'].startswith('text/csv')
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 3
+    assert 'password' not in rows[0]
+    assert 'profile_photo' not in rows[0]
+    assert {row['email'] for row in rows} == {
+        'ana@example.com', 'bruno@example.com', 'carla@example.com'}
+    assert rows[0]['date_login'] == ''
+
+@pytest.mark.asyncio
+async def test_export_users_ndjson_with_filters(client: AsyncClient, create_user) -> None:
+    """
+    Test the NDJSON export with a column selection and a status filter.
+    """
+    await create_export_users(create_user)
+
+    response = await client.get('/users/export',
+                                params={'format': 'ndjson', 'columns': 'email,status',
+                                        'status': 1})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(rows, key=lambda row: row['email']) == [
+        {'email': 'ana@example.com', 'status': 1},
+        {'email': 'bruno@example.com', 'status': 1},
+    ]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("columns", [
+    "password",
+    "profile_photo",
+    "email,unknown",
+])
+async def test_export_invalid_columns(client: AsyncClient, columns: str) -> None:
+    """
+    Test that unknown or forbidden columns are rejected before streaming starts.
+    """
+    response = await client.get('/users/export', params={'columns': columns})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -0,0 +1,62 @@
+"""
+This test module contains tests for reading single users within the application.
+It tests that user responses carry an ETag derived from the row version, that conditional
+requests are answered with 304 Not Modified and that concurrent ORM updates are detected.
+"""
+import uuid
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+
+from api.modules.users.models.User import User
+
+@pytest.mark.asyncio
+async def test_get_user_with_etag(client: AsyncClient, setup_database, create_user) -> None:
+    """
+    Test that the ETag follows the row version and enables 304 responses.
+    """
+    user = await create_user()
+
+    response = await client.get(f'/users/{user.id}')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['email'] == 'ana@example.com'
+    etag = response.headers['etag']
+    assert etag == '"1"'
+
+    response = await client.get(f'/users/{user.id}', headers={'If-None-Match': etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers['etag'] == etag
+
+    user.name = 'Ana Souza Lima'
+    await setup_database.commit()
+
+    response = await client.get(f'/users/{user.id}', headers={'If-None-Match': etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['etag'] == '"2"'
+    assert response.json()['name'] == 'Ana Souza Lima'
+
+@pytest.mark.asyncio
+async def test_get_user_not_found(client: AsyncClient) -> None:
+    """
+    Test the response for an unknown user.
+    """
+    response = await client.get(f'/users/{uuid.uuid4()}')
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+@pytest.mark.asyncio
+async def test_concurrent_update_is_detected(setup_database, create_user) -> None:
+    """
+    Test that an update based on a stale version matches no row and is rejected.
+    """
+    user = await create_user()
+
+    async with AsyncSession(bind=setup_database.bind) as other_session:
+        other_user = await other_session.get(User, user.id)
+        other_user.name = 'Ana Pereira'
+        await other_session.commit()
+
+    user.name = 'Ana Costa'
+    with pytest.raises(StaleDataError):
+        await setup_database.commit()
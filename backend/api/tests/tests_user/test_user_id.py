@@ -0,0 +1,38 @@
+"""
+This test module contains tests for the time-ordered user identifiers.
+It tests that new users get UUIDv7 primary keys and that the generated keys are ordered by
+creation time, even when many of them are generated within the same millisecond.
+"""
+from datetime import date, datetime, timedelta, timezone
+import pytest
+from sqlalchemy import select
+
+from api.modules.users.models.User import User
+from api.utils.uuid7 import uuid7, uuid7_datetime
+
+def test_uuid7_is_monotonic() -> None:
+    """
+    Test the layout and the ordering of identifiers generated in a tight loop.
+    """
+    identifiers = [uuid7() for _ in range(20000)]
+
+    assert identifiers == sorted(identifiers)
+    assert len(set(identifiers)) == len(identifiers)
+    assert all(identifier.version == 7 for identifier in identifiers)
+    assert abs(uuid7_datetime(identifiers[0]) - datetime.now(timezone.utc)) < timedelta(seconds=5)
+
+@pytest.mark.asyncio
+async def test_users_get_uuid7_keys(setup_database) -> None:
+    """
+    Test that users inserted one after another get increasing UUIDv7 keys.
+    """
+    for i in range(3):
+        setup_database.add(User(email=f'user{i}@example.com', cpf_cnpj=f'{i:011d}',
+                                whatsapp=f'149913967{i:02d}', name='Ana Souza', password='hash',
+                                sex='F', date_birthday=date(1990, 1, 1)))
+        await setup_database.commit()
+
+    result = await setup_database.execute(select(User.id, User.email).order_by(User.id))
+    users = result.all()
+    assert [user.email for user in users] == [f'user{i}@example.com' for i in range(3)]
+    assert all(user.id.version == 7 for user in users)
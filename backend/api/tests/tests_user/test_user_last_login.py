@@ -0,0 +1,130 @@
+"""
+This test module contains tests for the batched last login writer.
+It tests that logins are coalesced per user, written with a single statement per flush,
+never move a login back in time, keep the row versions and respect the bounded buffer size,
+even when a write fails.
+"""
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.exc import OperationalError
+
+from api.modules.users.models.User import User
+from api.modules.users.services.last_login_writer import LastLoginWriter
+from api.shared.database.connection import engine
+
+async def get_logins(session) -> dict:
+    """
+    Reads the stored last login and version of every user.
+    """
+    result = await session.execute(select(User.id, User.date_login, User.version))
+    return {row.id: (row.date_login, row.version) for row in result}
+
+@pytest.mark.asyncio
+async def test_logins_are_coalesced(setup_database, create_users) -> None:
+    """
+    Test that many logins of two users are written by one UPDATE with the latest times,
+    leaving the row versions untouched.
+    """
+    users = await create_users(2)
+    start = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+    writer = LastLoginWriter(flush_interval_ms=60000, flush_max_entries=100, max_pending=100)
+    statements = []
+
+    def count_statement(conn, cursor, statement, *args): # pylint: disable=unused-argument
+        statements.append(statement)
+
+    await writer.start()
+    for minute in range(5):
+        await writer.record(users[0].id, start + timedelta(minutes=minute))
+        await writer.record(users[1].id, start - timedelta(minutes=minute))
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', count_statement)
+    try:
+        await writer.stop()
+    finally:
+        event.remove(engine.sync_engine, 'before_cursor_execute', count_statement)
+
+    assert len(statements) == 1
+    assert statements[0].startswith('UPDATE users SET date_login=logins.date_login')
+    logins = await get_logins(setup_database)
+    assert logins[users[0].id] == (start + timedelta(minutes=4), 1)
+    assert logins[users[1].id] == (start, 1)
+
+@pytest.mark.asyncio
+async def test_older_login_does_not_overwrite(setup_database, create_users) -> None:
+    """
+    Test that a buffered login older than the stored one is ignored.
+    """
+    users = await create_users(1)
+    now = datetime.now(timezone.utc)
+    writer = LastLoginWriter(flush_interval_ms=60000, flush_max_entries=100, max_pending=100)
+
+    await writer.start()
+    await writer.record(users[0].id, now)
+    await writer.flush()
+    await writer.record(users[0].id, now - timedelta(days=1))
+    await writer.stop()
+
+    logins = await get_logins(setup_database)
+    assert logins[users[0].id] == (now, 1)
+
+@pytest.mark.asyncio
+async def test_full_buffer_waits_for_flush(setup_database, create_users) -> None:
+    """
+    Test that recording beyond the buffer bound triggers a flush instead of growing.
+    """
+    users = await create_users(5)
+    writer = LastLoginWriter(flush_interval_ms=60000, flush_max_entries=100, max_pending=2)
+
+    await writer.start()
+    for user in users:
+        await writer.record(user.id)
+        assert len(writer._pending) <= 2 # pylint: disable=protected-access
+    await writer.stop()
+
+    logins = await get_logins(setup_database)
+    assert all(date_login is not None for date_login, _ in logins.values())
+
+@pytest.mark.asyncio
+async def test_failed_write_keeps_newest_logins(setup_database, create_users) -> None:
+    """
+    Test that a batch that fails to be written is merged back without exceeding the buffer
+    bound, dropping the oldest logins.
+    """
+    users = await create_users(3)
+    start = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+    writer = LastLoginWriter(flush_interval_ms=60000, flush_max_entries=100, max_pending=2)
+
+    def fail_statement(*args): # pylint: disable=unused-argument
+        raise OperationalError('UPDATE users', {}, Exception('connection lost'))
+
+    await writer.start()
+    await writer.record(users[0].id, start)
+    await writer.record(users[1].id, start + timedelta(minutes=1))
+    event.listen(engine.sync_engine, 'before_cursor_execute', fail_statement)
+    try:
+        await writer.flush()
+    finally:
+        event.remove(engine.sync_engine, 'before_cursor_execute', fail_statement)
+    assert writer._pending == {users[0].id: start, # pylint: disable=protected-access
+                               users[1].id: start + timedelta(minutes=1)}
+
+    writer._merge_back([(users[2].id, start + timedelta(minutes=2))]) # pylint: disable=protected-access
+    assert writer._pending == {users[1].id: start + timedelta(minutes=1), # pylint: disable=protected-access
+                               users[2].id: start + timedelta(minutes=2)}
+    await writer.stop()
+
+    logins = await get_logins(setup_database)
+    assert logins[users[0].id] == (None, 1)
+    assert logins[users[1].id] == (start + timedelta(minutes=1), 1)
+    assert logins[users[2].id] == (start + timedelta(minutes=2), 1)
+
+@pytest.mark.asyncio
+async def test_record_requires_running_writer() -> None:
+    """
+    Test that logins cannot be buffered while the writer is stopped.
+    """
+    writer = LastLoginWriter(flush_interval_ms=1000, flush_max_entries=10, max_pending=10)
+    with pytest.raises(RuntimeError):
+        await writer.record(None)
@@ -0,0 +1,70 @@
+"""
+This test module contains tests for the read-only list and report endpoints within the
+application. It tests keyset pagination over the user identifiers, the status filter and
+the per-status report, all served by Core queries without ORM instances.
+"""
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+
+from api.modules.users.models.User import User
+
+async def suspend_every_third(session, users: list[User]) -> None:
+    """
+    Suspends every third user, starting with the first one.
+    """
+    for user in users[::3]:
+        user.status = 99
+    await session.commit()
+
+@pytest.mark.asyncio
+async def test_list_users_pages(client: AsyncClient, setup_database, create_users) -> None:
+    """
+    Test that following the next_after cursor walks every user once, in identifier order.
+    """
+    users = await create_users(5)
+    await suspend_every_third(setup_database, users)
+
+    listed, after = [], None
+    while True:
+        params = {'limit': 2} if after is None else {'limit': 2, 'after': after}
+        response = await client.get('/users/', params=params)
+        assert response.status_code == status.HTTP_200_OK
+        page = response.json()
+        assert len(page['items']) <= 2
+        listed.extend(page['items'])
+        after = page['next_after']
+        if after is None:
+            break
+
+    assert [item['id'] for item in listed] == sorted(str(user.id) for user in users)
+    assert listed[0]['email'].endswith('@example.com')
+    assert 'password' not in listed[0]
+
+@pytest.mark.asyncio
+async def test_list_users_by_status(client: AsyncClient, setup_database, create_users) -> None:
+    """
+    Test the status filter and the limit bounds.
+    """
+    await suspend_every_third(setup_database, await create_users(6))
+
+    response = await client.get('/users/', params={'status': 99})
+    assert response.status_code == status.HTTP_200_OK
+    page = response.json()
+    assert {item['status'] for item in page['items']} == {99}
+    assert len(page['items']) == 2
+    assert page['next_after'] is None
+
+    response = await client.get('/users/', params={'limit': 0})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+@pytest.mark.asyncio
+async def test_report_users_by_status(client: AsyncClient, setup_database, create_users) -> None:
+    """
+    Test that users are counted per status.
+    """
+    await suspend_every_third(setup_database, await create_users(6))
+
+    response = await client.get('/users/report/status')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [{'status': 1, 'total': 4}, {'status': 99, 'total': 2}]
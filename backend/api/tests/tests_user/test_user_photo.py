@@ -0,0 +1,81 @@
+"""
+This test module contains tests for the profile photo functionalities within the application.
+It tests that uploads are turned into fixed-size thumbnails, that the variants are served
+with cache validators and that invalid uploads are rejected.
+"""
+import io
+import uuid
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+from PIL import Image
+
+def make_image(image_format: str = 'PNG', size: tuple = (600, 400)) -> bytes:
+    """
+    Builds an image file in memory.
+    """
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (200, 30, 30)).save(buffer, format=image_format)
+    return buffer.getvalue()
+
+@pytest.mark.asyncio
+async def test_upload_and_get_profile_photo(client: AsyncClient, create_user) -> None:
+    """
+    Test the upload of a photo and the conditional requests on its variants.
+    """
+    user = await create_user()
+
+    response = await client.put(f'/users/{user.id}/photo',
+                                files={'photo': ('photo.png', make_image(), 'image/png')})
+    assert response.status_code == status.HTTP_200_OK
+    variants = {variant['variant']: variant for variant in response.json()}
+    assert set(variants) == {'small', 'medium', 'large'}
+
+    response = await client.get(f'/users/{user.id}/photo/small')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['content-type'] == 'image/webp'
+    assert response.headers['etag'] == variants['small']['etag']
+    assert 'max-age' in response.headers['cache-control']
+    with Image.open(io.BytesIO(response.content)) as image:
+        assert image.size == (64, 64)
+
+    response = await client.get(f'/users/{user.id}/photo/small',
+                                headers={'If-None-Match': variants['small']['etag']})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b''
+
+    response = await client.get(f'/users/{user.id}/photo/large',
+                                headers={'If-None-Match': variants['small']['etag']})
+    assert response.status_code == status.HTTP_200_OK
+    with Image.open(io.BytesIO(response.content)) as image:
+        assert image.size == (256, 256)
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("content", [
+    b'not an image',
+    make_image('GIF'),
+])
+async def test_upload_invalid_profile_photo(client: AsyncClient,
+                                            content: bytes, create_user) -> None:
+    """
+    Test that files other than JPEG, PNG or WebP images are rejected.
+    """
+    user = await create_user()
+
+    response = await client.put(f'/users/{user.id}/photo',
+                                files={'photo': ('photo.bin', content, 'image/gif')})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+@pytest.mark.asyncio
+async def test_profile_photo_not_found(client: AsyncClient, create_user) -> None:
+    """
+    Test the responses for unknown users and users without a photo.
+    """
+    user = await create_user()
+
+    response = await client.put(f'/users/{uuid.uuid4()}/photo',
+                                files={'photo': ('photo.png', make_image(), 'image/png')})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    response = await client.get(f'/users/{user.id}/photo/medium')
+    assert response.status_code == status.HTTP_404_NOT_FOUND
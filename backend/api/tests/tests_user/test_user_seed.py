@@ -0,0 +1,54 @@
+"""
+This test module contains tests for the synthetic user generator and the seeding script.
+It tests that generated users pass every validator of the user schemas, that unique columns
+never collide across chunks, that a seed reproduces the same values, and that the parallel
+COPY-based seeder loads the requested number of users.
+"""
+import asyncio
+import pytest
+from sqlalchemy import func, select
+
+from api.modules.users.models.User import User
+from api.modules.users.schemas.user_schema import UserCreateRequest
+from api.utils.synthetic_users import (USER_COPY_COLUMNS, SyntheticUserGenerator,
+                                       seed_password)
+from scripts.seed_users import seed_users
+
+PASSWORD_HASHES = ['hash0', 'hash1', 'hash2']
+
+def test_synthetic_users_are_valid() -> None:
+    """
+    Test that every generated user is accepted by the user creation schema.
+    """
+    generator = SyntheticUserGenerator(seed=7, password_hashes=PASSWORD_HASHES)
+    for index, row in enumerate(generator.rows(0, 1000)):
+        user = dict(zip(USER_COPY_COLUMNS, row))
+        UserCreateRequest(email=user['email'], cpf_cnpj=user['cpf_cnpj'],
+                          whatsapp=user['whatsapp'], name=user['name'],
+                          password=seed_password(index % len(PASSWORD_HASHES)),
+                          sex=user['sex'], date_birthday=user['date_birthday'])
+        assert user['password'] == PASSWORD_HASHES[index % len(PASSWORD_HASHES)]
+
+def test_synthetic_users_are_unique_and_reproducible() -> None:
+    """
+    Test that unique columns never collide across chunks and that a seed is reproducible.
+    """
+    generator = SyntheticUserGenerator(seed=7, password_hashes=PASSWORD_HASHES)
+    rows = generator.rows(0, 5000) + generator.rows(5000, 5000)
+    for column in ('id', 'email', 'cpf_cnpj', 'whatsapp'):
+        position = USER_COPY_COLUMNS.index(column)
+        assert len({row[position] for row in rows}) == len(rows)
+
+    again = SyntheticUserGenerator(seed=7, password_hashes=PASSWORD_HASHES, now=generator.now)
+    assert [row[1:] for row in again.rows(5000, 5000)] == [row[1:] for row in rows[5000:]]
+
+@pytest.mark.asyncio
+async def test_seed_users(setup_database) -> None:
+    """
+    Test that the seeder loads every user with parallel workers.
+    """
+    await asyncio.to_thread(seed_users, rows=250, seed=3, workers=2, chunk_size=100,
+                            password_pool=2)
+
+    result = await setup_database.execute(select(func.count()).select_from(User)) # pylint: disable=not-callable
+    assert result.scalar_one() == 250
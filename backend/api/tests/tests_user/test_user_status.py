@@ -0,0 +1,74 @@
+"""
+This test module contains tests for the bulk user status change functionality within the
+application. It tests changes by identifiers and by filter, the chunking of large changes,
+the report of unchanged users and the validation of the request.
+"""
+import uuid
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+from sqlalchemy import select
+
+from api.modules.users.models.User import User
+from api.shared.configs.settings import settings
+
+@pytest.mark.asyncio
+async def test_change_status_by_ids(client: AsyncClient, setup_database,
+                                    monkeypatch, create_users) -> None:
+    """
+    Test that the requested users are suspended in chunks and the others are reported.
+    """
+    monkeypatch.setattr(settings, 'STATUS_CHANGE_CHUNK_SIZE', 2)
+    users = await create_users(6)
+    suspended = [str(user.id) for user in users[:5]]
+    unknown = str(uuid.uuid4())
+
+    response = await client.post('/users/status',
+                                 json={'status': 99, 'ids': suspended + [unknown]})
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert body['status'] == 99
+    assert sorted(body['changed']) == sorted(suspended)
+    assert body['unchanged'] == [unknown]
+
+    result = await setup_database.execute(
+        select(User.id, User.status, User.version).execution_options(populate_existing=True))
+    rows = {str(row.id): row for row in result}
+    assert all(rows[user_id].status == 99 and rows[user_id].version == 2
+               for user_id in suspended)
+    assert rows[str(users[5].id)].status == 1
+
+    response = await client.post('/users/status', json={'status': 99, 'ids': suspended[:1]})
+    assert response.json() == {'status': 99, 'changed': [], 'unchanged': suspended[:1],
+                               'archived': []}
+
+@pytest.mark.asyncio
+async def test_change_status_by_filter(client: AsyncClient,
+                                       monkeypatch, create_users) -> None:
+    """
+    Test that every user matching the filter is changed, chunk after chunk.
+    """
+    monkeypatch.setattr(settings, 'STATUS_CHANGE_CHUNK_SIZE', 2)
+    users = await create_users(5)
+
+    response = await client.post('/users/status', json={'status': 2, 'filter': {'status': 1}})
+    assert response.status_code == status.HTTP_200_OK
+    assert sorted(response.json()['changed']) == sorted(str(user.id) for user in users)
+
+    response = await client.post('/users/status', json={'status': 2, 'filter': {'status': 1}})
+    assert response.json()['changed'] == []
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("data", [
+    {"status": 5, "ids": [str(uuid.UUID(int=1))]},
+    {"status": 99},
+    {"status": 99, "ids": []},
+    {"status": 99, "ids": [str(uuid.UUID(int=1))], "filter": {"status": 1}},
+    {"status": 99, "filter": {}},
+])
+async def test_change_status_invalid_data(client: AsyncClient, data: dict) -> None:
+    """
+    Test that unknown statuses and ambiguous or empty targets are rejected.
+    """
+    response = await client.post('/users/status', json=data)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
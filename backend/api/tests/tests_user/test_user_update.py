@@ -0,0 +1,100 @@
+"""
+This test module contains tests for the partial user update functionality within the
+application. It tests that only the fields sent are validated and written, that the update
+is a single statement guarded by If-Match, and that stale versions are rejected.
+"""
+import uuid
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+from sqlalchemy import event, select
+
+from api.modules.users.models.User import User
+from api.modules.users.services.availability_filters import availability_filters
+from api.shared.database.connection import engine
+from api.utils.crypt_password import verify_password
+
+@pytest.mark.asyncio
+async def test_update_user(client: AsyncClient, create_user) -> None:
+    """
+    Test a partial update guarded by the current ETag, issued as a single statement.
+    """
+    user = await create_user()
+    await availability_filters.wait_ready()
+    statements = []
+
+    def count_statement(conn, cursor, statement, *args): # pylint: disable=unused-argument
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', count_statement)
+    try:
+        response = await client.patch(f'/users/{user.id}', json={'name': 'Ana Souza Lima'},
+                                      headers={'If-Match': '"1"'})
+    finally:
+        event.remove(engine.sync_engine, 'before_cursor_execute', count_statement)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['etag'] == '"2"'
+    body = response.json()
+    assert body['name'] == 'Ana Souza Lima'
+    assert body['email'] == 'ana@example.com'
+    assert len(statements) == 1
+    assert statements[0].startswith('UPDATE users SET name=')
+    assert 'profile_photo' not in statements[0].split('RETURNING')[0]
+
+@pytest.mark.asyncio
+async def test_update_user_password(client: AsyncClient, setup_database, create_user) -> None:
+    """
+    Test that a new password is hashed before being stored.
+    """
+    user = await create_user()
+
+    response = await client.patch(f'/users/{user.id}', json={'password': '159753Lucas$'},
+                                  headers={'If-Match': '*'})
+    assert response.status_code == status.HTTP_200_OK
+
+    result = await setup_database.execute(select(User.password).where(User.id == user.id))
+    assert verify_password('159753Lucas$', result.scalar_one())
+
+@pytest.mark.asyncio
+async def test_update_user_preconditions(client: AsyncClient, create_user) -> None:
+    """
+    Test the responses for missing and stale If-Match headers and unknown users.
+    """
+    user = await create_user()
+
+    response = await client.patch(f'/users/{user.id}', json={'name': 'Ana Souza Lima'})
+    assert response.status_code == status.HTTP_428_PRECONDITION_REQUIRED
+
+    response = await client.patch(f'/users/{user.id}', json={'name': 'Ana Souza Lima'},
+                                  headers={'If-Match': '"1"'})
+    assert response.status_code == status.HTTP_200_OK
+
+    response = await client.patch(f'/users/{user.id}', json={'name': 'Ana Pereira Lima'},
+                                  headers={'If-Match': '"1"'})
+    assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+
+    response = await client.patch(f'/users/{uuid.uuid4()}', json={'name': 'Ana Souza Lima'},
+                                  headers={'If-Match': '*'})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("data", [
+    {},
+    {"name": None},
+    {"name": "Lucas123"},
+    {"cpf_cnpj": "12345678901"},
+    {"whatsapp": "phone_number"},
+    {"password": "password"},
+    {"sex": "X"},
+    {"date_birthday": "2024-01-01"},
+])
+async def test_update_user_invalid_data(client: AsyncClient,
+                                        data: dict, create_user) -> None:
+    """
+    Test that the fields sent go through the same validation as user creation.
+    """
+    user = await create_user()
+
+    response = await client.patch(f'/users/{user.id}', json=data, headers={'If-Match': '*'})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
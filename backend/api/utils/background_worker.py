@@ -0,0 +1,101 @@
+"""
+This module contains the BackgroundWorker class, the lifecycle shared by the tasks the
+application runs in the background of each worker process, such as the write-behind
+buffers and the outbox dispatchers. The application starts them in its lifespan and stops
+them on shutdown.
+"""
+import asyncio
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+class BackgroundWorker:
+    """
+    A task of the event loop running the work of a subclass every interval, or as soon as it
+    is woken up, until it is stopped.
+
+    Subclasses implement run_once, the work of one round. An exception it raises is logged
+    and the work runs again on the next round, so a failure never ends the task. Subclasses
+    that need resources while running prepare them in on_start, and those holding work in
+    memory write it in on_stop, which stop awaits once the last round is over.
+
+    Attributes:
+        interval (float): The maximum time, in seconds, between two rounds.
+    """
+    def __init__(self, interval_ms: int):
+        self.interval = interval_ms / 1000
+        self._wake_requested: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        """
+        Whether the background task is running.
+        """
+        return self._task is not None
+
+    async def start(self) -> None:
+        """
+        Prepares the worker and starts the background task on the running event loop.
+        """
+        if self._task is None:
+            self._stopping = False
+            self._wake_requested = asyncio.Event()
+            await self.on_start()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stops the background task once its current round is over, then lets the worker
+        finish its work.
+        """
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wake_requested.set()
+        await self._task
+        self._task = None
+        await self.on_stop()
+
+    def wake(self) -> None:
+        """
+        Requests a round as soon as possible. Does nothing while the worker is stopped.
+        """
+        if self._task is not None:
+            self._wake_requested.set()
+
+    async def on_start(self) -> None:
+        """
+        Prepares the worker before its first round. Does nothing by default.
+        """
+
+    async def on_stop(self) -> None:
+        """
+        Finishes the work of the worker after its last round. Does nothing by default.
+        """
+
+    async def run_once(self) -> None:
+        """
+        Does the work of one round.
+        """
+        raise NotImplementedError
+
+    async def _run(self) -> None:
+        """
+        Runs a round every interval, or earlier when woken up, until the worker stops.
+        """
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wake_requested.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake_requested.clear()
+            if self._stopping:
+                break
+            try:
+                await self.run_once()
+            except Exception: # pylint: disable=broad-exception-caught
+                logger.exception('%s failed, retrying on its next round.',
+                                 type(self).__name__)
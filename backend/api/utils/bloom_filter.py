@@ -0,0 +1,69 @@
+"""
+This module provides a Bloom filter, a compact probabilistic set used to answer
+"definitely not present" without touching the database. A negative answer is always
+correct; a positive answer may be a false positive and must be confirmed elsewhere.
+
+Available Classes:
+- BloomFilter(capacity: int, error_rate: float): A fixed-size Bloom filter of strings.
+"""
+import hashlib
+import math
+
+class BloomFilter:
+    """
+    A Bloom filter of strings sized for a target capacity and false-positive rate.
+
+    Positions are derived from one BLAKE2b digest per value using double hashing, so adding
+    or checking a value costs a single hash computation whatever the number of hash functions.
+
+    Attributes:
+        capacity (int): The number of values the filter is sized for.
+        error_rate (float): The target false-positive rate at full capacity.
+        bit_count (int): The number of bits in the filter.
+        hash_count (int): The number of positions set for each value.
+        count (int): The number of values added so far.
+    """
+    def __init__(self, capacity: int, error_rate: float):
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError('The capacity must be positive and the error rate between 0 and 1.')
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bit_count = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.bit_count / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.bit_count + 7) // 8)
+
+    def _positions(self, value: str) -> list[int]:
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.bit_count for i in range(self.hash_count)]
+
+    def add(self, value: str) -> None:
+        """
+        Adds a value to the filter.
+
+        Args:
+            value (str): The value to add.
+        """
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7))
+                   for position in self._positions(value))
+
+    @property
+    def memory_bytes(self) -> int:
+        """
+        The size of the bit array, in bytes.
+        """
+        return len(self._bits)
+
+    @property
+    def estimated_error_rate(self) -> float:
+        """
+        The expected false-positive rate given the number of values added so far.
+        """
+        return (1 - math.exp(-self.hash_count * self.count / self.bit_count)) ** self.hash_count
@@ -1,6 +1,7 @@
 """
 This module uses bcrypt to provide secure hashing functionalities for passwords. 
 It includes functions to hash passwords and verify hashed passwords against plaintext passwords.
+Hashing is timed as a span of the current request trace, also in a worker thread.
 
 Available Functions:
 - hash_password(password: str) -> str: Hashes a plaintext password and returns the hashed value.
@@ -9,6 +10,9 @@ Checks if a plaintext password matches a hashed password.
 """
 import bcrypt
 
+from api.utils.tracing import traced
+
+@traced()
 def has_password(password: str) -> str:
     """
     Hashes a password using bcrypt.
@@ -0,0 +1,90 @@
+"""
+This module provides helpers for HTTP cache validators, used to answer conditional
+requests with 304 Not Modified instead of resending unchanged representations.
+
+Available Functions:
+- make_etag(content: bytes) -> str: Builds a strong ETag from the content bytes.
+- make_version_etag(version: int) -> str: Builds a strong ETag from a row version.
+- parse_etags(header: Optional[str]) -> list[str]: Splits an If-None-Match header.
+- parse_version_etags(header: str) -> Optional[list[int]]: Reads row versions from If-Match.
+- etag_matches(header: Optional[str], etag: str) -> bool: Checks an If-None-Match header.
+"""
+import hashlib
+from typing import Optional
+
+def make_etag(content: bytes) -> str:
+    """
+    Builds a strong entity tag from the SHA-256 digest of the content.
+
+    Args:
+        content (bytes): The representation bytes.
+
+    Returns:
+        str: The quoted entity tag.
+    """
+    return f'"{hashlib.sha256(content).hexdigest()}"'
+
+def make_version_etag(version: int) -> str:
+    """
+    Builds a strong entity tag from the version counter of a database row.
+
+    Args:
+        version (int): The row version, incremented on every update of the row.
+
+    Returns:
+        str: The quoted entity tag.
+    """
+    return f'"{version}"'
+
+def parse_etags(header: Optional[str]) -> list[str]:
+    """
+    Splits a conditional request header into quoted entity tags, dropping the weak prefix
+    so the tags can be compared with the weak comparison function.
+
+    Args:
+        header (Optional[str]): The raw If-None-Match header value, if present.
+
+    Returns:
+        list[str]: The entity tags, or ['*'] when the header matches any representation.
+    """
+    if not header:
+        return []
+    return [candidate.strip().removeprefix('W/') for candidate in header.split(',')
+            if candidate.strip()]
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """
+    Checks whether an If-None-Match header matches an entity tag, using the weak
+    comparison required for that header.
+
+    Args:
+        header (Optional[str]): The raw If-None-Match header value, if present.
+        etag (str): The current quoted entity tag of the representation.
+
+    Returns:
+        bool: True if the client already holds the current representation.
+    """
+    candidates = parse_etags(header)
+    return '*' in candidates or etag.removeprefix('W/') in candidates
+
+def parse_version_etags(header: str) -> Optional[list[int]]:
+    """
+    Reads the row versions listed in an If-Match header, using the strong comparison
+    required for that header. Weak or unknown entity tags can never match.
+
+    Args:
+        header (str): The raw If-Match header value.
+
+    Returns:
+        Optional[list[int]]: The accepted versions, or None when the header is '*' and any
+        current version is accepted.
+    """
+    versions = []
+    for candidate in header.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return None
+        if len(candidate) > 2 and candidate[0] == candidate[-1] == '"' \
+                and candidate[1:-1].isdigit():
+            versions.append(int(candidate[1:-1]))
+    return versions
@@ -0,0 +1,51 @@
+"""
+This module uses Pillow to turn uploaded profile photos into the fixed thumbnail variants
+served by the API. The processing function is pure and picklable so it can run in the
+shared process pool.
+
+Available Functions:
+- process_profile_photo(data: bytes) -> dict[str, bytes]: Decodes, crops, resizes and
+re-encodes a photo into every variant.
+"""
+import io
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# Variant name and the side, in pixels, of the square thumbnail.
+PHOTO_VARIANT_SIZES = {'small': 64, 'medium': 128, 'large': 256}
+PHOTO_CONTENT_TYPE = 'image/webp'
+PHOTO_ALLOWED_FORMATS = {'JPEG', 'PNG', 'WEBP'}
+PHOTO_QUALITY = 75
+PHOTO_MAX_PIXELS = 40_000_000
+
+def process_profile_photo(data: bytes) -> dict[str, bytes]:
+    """
+    Decodes a profile photo and re-encodes it as square WebP thumbnails.
+
+    Args:
+        data (bytes): The uploaded image file.
+
+    Returns:
+        dict[str, bytes]: The encoded image of each variant in PHOTO_VARIANT_SIZES.
+
+    Raises:
+        ValueError: If the data is not a JPEG, PNG or WebP image, or is too large to decode.
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            if image.format not in PHOTO_ALLOWED_FORMATS:
+                raise ValueError(f'Unsupported image format {image.format}.')
+            if image.width * image.height > PHOTO_MAX_PIXELS:
+                raise ValueError('The image has too many pixels.')
+            image = ImageOps.exif_transpose(image)
+            image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as exc:
+        raise ValueError('The file is not a valid image.') from exc
+
+    variants = {}
+    for variant, size in PHOTO_VARIANT_SIZES.items():
+        thumbnail = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        thumbnail.save(buffer, format='WEBP', quality=PHOTO_QUALITY, method=4)
+        variants[variant] = buffer.getvalue()
+    return variants
@@ -0,0 +1,56 @@
+"""
+This module manages a shared process pool used to run CPU-bound work, such as image
+processing, outside of the event loop. The pool is created lazily on first use and must be
+shut down when the application stops.
+
+Available Functions:
+- run_in_process(func, *args) -> Any: Runs a picklable function in the process pool.
+- shutdown_process_pool() -> None: Shuts down the process pool, if it was started.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+from api.shared.configs.settings import settings
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Returns the shared process pool, creating it on first use.
+
+    The workers are spawned instead of forked so they never inherit the event loop or
+    open database connections of the API process.
+
+    Returns:
+        ProcessPoolExecutor: The shared process pool.
+    """
+    global _process_pool # pylint: disable=global-statement
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=settings.PROCESS_POOL_WORKERS,
+                                            mp_context=multiprocessing.get_context('spawn'))
+    return _process_pool
+
+async def run_in_process(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Runs a function in the shared process pool without blocking the event loop.
+
+    Args:
+        func (Callable[..., Any]): A module-level, picklable function.
+        *args (Any): The picklable arguments passed to the function.
+
+    Returns:
+        Any: The value returned by the function.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_process_pool(), func, *args)
+
+def shutdown_process_pool() -> None:
+    """
+    Shuts down the shared process pool and waits for running tasks to finish.
+    """
+    global _process_pool # pylint: disable=global-statement
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=True)
+        _process_pool = None
@@ -0,0 +1,194 @@
+"""
+This module generates realistic synthetic users that pass every validator of the user
+schemas: CPFs and CNPJs with correct check digits, valid Brazilian mobile numbers, names
+accepted by the name validator and strong passwords. It is used to seed large tables for
+performance work.
+
+Each row is derived from its global index: unique columns come from a bijective mapping of
+the index, so rows generated by different processes never collide, and the other columns
+come from a random generator seeded with the seed and the first index of the chunk, so the
+same seed and chunk size always produce the same values whatever the number of processes.
+
+Available Classes:
+- SyntheticUserGenerator(seed: int, password_hashes: Sequence[str]): Generates user rows.
+
+Available Functions:
+- generate_cpf(base: int) -> str: Builds a CPF from a 9-digit base.
+- generate_cnpj(base: int) -> str: Builds a CNPJ from a 12-digit base.
+- seed_password(number: int) -> str: Returns the plain text of a seeded password.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Sequence
+
+from api.utils.uuid7 import uuid7
+
+# The columns of the rows generated by SyntheticUserGenerator, in order.
+USER_COPY_COLUMNS = ['id', 'email', 'cpf_cnpj', 'whatsapp', 'name', 'password', 'sex',
+                     'date_birthday', 'date_created', 'status', 'date_login']
+
+# The Brazilian area codes (DDD) of mobile numbers.
+AREA_CODES = (11, 12, 13, 14, 15, 16, 17, 18, 19, 21, 22, 24, 27, 28, 31, 32, 33, 34, 35, 37,
+              38, 41, 42, 43, 44, 45, 46, 47, 48, 49, 51, 53, 54, 55, 61, 62, 63, 64, 65, 66,
+              67, 68, 69, 71, 73, 74, 75, 77, 79, 81, 82, 83, 84, 85, 86, 87, 88, 89, 91, 92,
+              93, 94, 95, 96, 97, 98, 99)
+
+FIRST_NAMES = {
+    'M': ('Lucas', 'Gabriel', 'Rafael', 'Pedro', 'Mateus', 'Gustavo', 'Felipe', 'Bruno',
+          'Thiago', 'Rodrigo', 'Andre', 'Carlos', 'Eduardo', 'Joao', 'Jose', 'Marcelo',
+          'Leonardo', 'Vinicius', 'Diego', 'Renato', 'Fabio', 'Ricardo', 'Caio', 'Murilo'),
+    'F': ('Ana', 'Maria', 'Juliana', 'Fernanda', 'Beatriz', 'Camila', 'Larissa', 'Mariana',
+          'Leticia', 'Gabriela', 'Amanda', 'Bruna', 'Carolina', 'Patricia', 'Aline', 'Renata',
+          'Vanessa', 'Isabela', 'Natalia', 'Raquel', 'Priscila', 'Tatiane', 'Helena', 'Alice'),
+}
+LAST_NAMES = ('Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira', 'Alves',
+              'Pereira', 'Lima', 'Gomes', 'Costa', 'Ribeiro', 'Martins', 'Carvalho', 'Almeida',
+              'Lopes', 'Soares', 'Fernandes', 'Vieira', 'Barbosa', 'Rocha', 'Dias', 'Nascimento',
+              'Andrade', 'Moreira', 'Nunes', 'Marques', 'Machado', 'Mendes', 'Freitas', 'Cardoso',
+              'Ramos', 'Camargo', 'Teixeira', "D'Avila", 'Araujo', 'Monteiro', 'Moura', 'Correia')
+EMAIL_DOMAINS = ('gmail.com', 'hotmail.com', 'outlook.com', 'yahoo.com.br', 'uol.com.br',
+                 'bol.com.br', 'terra.com.br', 'icloud.com')
+
+# Multipliers coprime with the size of each key space, so index * multiplier + offset is a
+# bijection of that space and unique indexes always give unique values.
+CPF_SPACE, CPF_MULTIPLIER = 10**9, 387_420_489
+CNPJ_SPACE, CNPJ_MULTIPLIER = 10**12, 282_429_536_481
+PHONE_SPACE, PHONE_MULTIPLIER = len(AREA_CODES) * 10**8, 1_977_326_743
+
+def _check_digit(digits: str, weights: Sequence[int]) -> str:
+    remainder = sum(int(digit) * weight for digit, weight in zip(digits, weights)) % 11
+    return '0' if remainder < 2 else str(11 - remainder)
+
+def generate_cpf(base: int) -> str:
+    """
+    Builds a CPF from a 9-digit base by appending its two check digits.
+
+    Args:
+        base (int): The base number, between 0 and 999999999.
+
+    Returns:
+        str: The 11-digit CPF.
+    """
+    digits = f'{base:09d}'
+    digits += _check_digit(digits, range(10, 1, -1))
+    return digits + _check_digit(digits, range(11, 1, -1))
+
+def generate_cnpj(base: int) -> str:
+    """
+    Builds a CNPJ from a 12-digit base by appending its two check digits.
+
+    Args:
+        base (int): The base number, between 0 and 999999999999.
+
+    Returns:
+        str: The 14-digit CNPJ.
+    """
+    digits = f'{base:012d}'
+    digits += _check_digit(digits, (5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2))
+    return digits + _check_digit(digits, (6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2))
+
+def seed_password(number: int) -> str:
+    """
+    Returns the plain text of the seeded password with the given number. It satisfies the
+    password validator, so seeded users can log in with it.
+
+    Args:
+        number (int): The number of the password in the pool.
+
+    Returns:
+        str: The password.
+    """
+    return f'Seed{number:04d}Pass!'
+
+def _ascii(value: str) -> str:
+    return value.lower().translate(str.maketrans('éàëç', 'eaec', "'"))
+
+class SyntheticUserGenerator:
+    """
+    Generates synthetic user rows ready to be copied into the users table.
+
+    Passwords are taken from a pool of precomputed bcrypt hashes, since hashing every row
+    would take longer than everything else put together: user number i has the password
+    seed_password(i % len(password_hashes)). Identifiers are UUIDv7 generated at run time
+    and dates are relative to now, so they are the only values that change between runs.
+
+    Attributes:
+        seed (int): The seed of every derived value.
+        password_hashes (Sequence[str]): The bcrypt hashes of the seeded passwords.
+        now (datetime): The moment creation and login dates are generated up to.
+    """
+    def __init__(self, seed: int, password_hashes: Sequence[str],
+                 now: Optional[datetime] = None):
+        self.seed = seed
+        self.password_hashes = password_hashes
+        self.now = now or datetime.now(timezone.utc)
+        offsets = random.Random(seed)
+        self._cpf_offset = offsets.randrange(CPF_SPACE)
+        self._cnpj_offset = offsets.randrange(CNPJ_SPACE)
+        self._phone_offset = offsets.randrange(PHONE_SPACE)
+
+    def cpf_cnpj(self, index: int, company: bool) -> str:
+        """
+        Returns the unique CPF, or CNPJ for companies, of the user with the given index.
+
+        CPFs and CNPJs have different lengths, so they never collide. A base made of a single
+        repeated digit is rejected by the validators, so those rare users get the other kind.
+
+        Args:
+            index (int): The global index of the user.
+            company (bool): Whether the user is a company.
+
+        Returns:
+            str: The CPF or CNPJ.
+        """
+        cpf = generate_cpf((index * CPF_MULTIPLIER + self._cpf_offset) % CPF_SPACE)
+        cnpj = generate_cnpj((index * CNPJ_MULTIPLIER + self._cnpj_offset) % CNPJ_SPACE)
+        if company:
+            return cnpj if len(set(cnpj)) > 1 else cpf
+        return cpf if len(set(cpf)) > 1 else cnpj
+
+    def whatsapp(self, index: int) -> str:
+        """
+        Returns the unique mobile number, with area code, of the user with the given index.
+
+        Args:
+            index (int): The global index of the user.
+
+        Returns:
+            str: The 11-digit mobile number.
+        """
+        number = (index * PHONE_MULTIPLIER + self._phone_offset) % PHONE_SPACE
+        area_code, subscriber = divmod(number, 10**8)
+        return f'{AREA_CODES[area_code]}9{subscriber:08d}'
+
+    def rows(self, start: int, count: int) -> list[tuple]:
+        """
+        Generates the rows of the users with indexes start to start + count - 1.
+
+        Args:
+            start (int): The global index of the first user.
+            count (int): The number of users.
+
+        Returns:
+            list[tuple]: The rows, with the values of USER_COPY_COLUMNS.
+        """
+        rng = random.Random(f'{self.seed}:{start}')
+        rows = []
+        for index in range(start, start + count):
+            sex = rng.choices('MFO', weights=(48, 48, 4))[0]
+            first_name = rng.choice(FIRST_NAMES.get(sex) or FIRST_NAMES[rng.choice('MF')])
+            last_names = rng.sample(LAST_NAMES, rng.choice((1, 2, 2, 3)))
+            name = ' '.join((first_name, *last_names))
+            email = (f'{_ascii(first_name)}.{_ascii(last_names[-1])}.{index}'
+                     f'@{rng.choice(EMAIL_DOMAINS)}')
+            date_created = self.now - timedelta(seconds=rng.randrange(5 * 365 * 86400))
+            date_login = None
+            if rng.random() < 0.7:
+                date_login = date_created + (self.now - date_created) * rng.random()
+            rows.append((
+                uuid7(), email, self.cpf_cnpj(index, rng.random() < 0.2), self.whatsapp(index),
+                name, self.password_hashes[index % len(self.password_hashes)], sex,
+                self.now.date() - timedelta(days=rng.randrange(15 * 365, 80 * 365)),
+                date_created, rng.choices((1, 2, 99), weights=(90, 7, 3))[0], date_login,
+            ))
+        return rows
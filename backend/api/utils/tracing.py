@@ -0,0 +1,401 @@
+"""
+This module provides lightweight request tracing: spans grouped into one trace per request,
+kept in context variables so they follow the request across awaits, worker threads started
+with asyncio.to_thread and the greenlets of the SQLAlchemy asyncio engine.
+
+Traces are tail sampled: every span of a request is recorded in memory, and once the
+request is finished the whole trace is exported only if it was slow. Exported traces are
+written as OTLP/JSON, one ExportTraceServiceRequest per line, the format of the OpenTelemetry
+Collector file exporter, so they can be replayed into any OTLP backend.
+
+Outside of a trace every helper returns immediately, so instrumented code costs a context
+variable lookup when tracing is disabled.
+
+Available Classes:
+- Span: One timed operation of a trace.
+- Trace: The spans of one request.
+- Tracer(exporter, slow_threshold_ms, max_spans): Starts, finishes and samples traces.
+- OTLPJsonExporter(path, service_name): Writes traces as OTLP/JSON lines.
+
+Available Functions:
+- start_span(name, kind, attributes) -> Optional[Span]: Opens a span in the current trace.
+- end_span(span, error) -> None: Closes a span opened by start_span.
+- span(name, kind, **attributes): Context manager timing a block as a child span.
+- traced(name) -> Callable: Decorator timing every call of a function as a span.
+- instrument_engine(engine) -> None: Times every SQL statement of an engine as a span.
+"""
+import functools
+import inspect
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Optional
+
+import orjson
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# OTLP span kinds.
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+# OTLP status codes.
+STATUS_CODE_ERROR = 2
+
+# SQL statements longer than this are truncated in the db.statement attribute.
+MAX_STATEMENT_LENGTH = 1000
+
+class Span: # pylint: disable=too-many-instance-attributes
+    """
+    One timed operation of a trace.
+
+    Attributes:
+        name (str): The name of the operation.
+        kind (int): The OTLP span kind.
+        trace_id (str): The 32 hexadecimal digits of the trace identifier.
+        span_id (str): The 16 hexadecimal digits of the span identifier.
+        parent_span_id (Optional[str]): The identifier of the parent span, if any.
+        start_ns (int): The start time, in nanoseconds since the epoch.
+        end_ns (Optional[int]): The end time, or None while the span is open.
+        attributes (dict[str, Any]): The attributes describing the operation.
+        error (Optional[str]): The error that ended the span, if any.
+    """
+    __slots__ = ('name', 'kind', 'trace_id', 'span_id', 'parent_span_id', 'start_ns',
+                 'end_ns', 'attributes', 'error')
+
+    def __init__(self, name: str, kind: int, trace_id: str, # pylint: disable=too-many-arguments
+                 parent_span_id: Optional[str], attributes: Optional[dict[str, Any]] = None):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes or {}
+        self.error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        """
+        The duration of the span in milliseconds, up to now while it is open.
+        """
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+class Trace:
+    """
+    The spans recorded during one request.
+
+    Attributes:
+        trace_id (str): The 32 hexadecimal digits of the trace identifier.
+        root (Span): The span covering the whole request.
+        spans (list[Span]): Every span of the trace, the root first.
+        max_spans (int): The number of spans kept; later spans are only counted.
+        dropped_spans (int): The number of spans not kept.
+    """
+    def __init__(self, trace_id: str, root: Span, max_spans: int):
+        self.trace_id = trace_id
+        self.root = root
+        self.spans = [root]
+        self.max_spans = max_spans
+        self.dropped_spans = 0
+
+    def add(self, new_span: Span) -> None:
+        """
+        Adds a span to the trace, unless it already holds max_spans spans.
+
+        Args:
+            new_span (Span): The span to add.
+        """
+        if len(self.spans) < self.max_spans:
+            self.spans.append(new_span)
+        else:
+            self.dropped_spans += 1
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar('current_trace', default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar('current_span', default=None)
+
+def current_trace() -> Optional[Trace]:
+    """
+    Returns the trace of the current request, or None outside of a traced request.
+    """
+    return _current_trace.get()
+
+def start_span(name: str, kind: int = SPAN_KIND_INTERNAL,
+               attributes: Optional[dict[str, Any]] = None) -> Optional[Span]:
+    """
+    Opens a span in the current trace, as a child of the current span. The span does not
+    become the current span, so it suits leaf operations timed by callbacks, such as SQL
+    statements.
+
+    Args:
+        name (str): The name of the operation.
+        kind (int): The OTLP span kind.
+        attributes (Optional[dict[str, Any]]): The attributes describing the operation.
+
+    Returns:
+        Optional[Span]: The open span, or None outside of a trace.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return None
+    parent = _current_span.get()
+    new_span = Span(name, kind, trace.trace_id, parent.span_id if parent else None, attributes)
+    trace.add(new_span)
+    return new_span
+
+def end_span(opened: Optional[Span], error: Optional[BaseException] = None) -> None:
+    """
+    Closes a span opened by start_span.
+
+    Args:
+        opened (Optional[Span]): The span, or None when it was opened outside of a trace.
+        error (Optional[BaseException]): The exception that ended the operation, if any.
+    """
+    if opened is None:
+        return
+    opened.end_ns = time.time_ns()
+    if error is not None:
+        opened.error = f'{type(error).__name__}: {error}'
+
+@contextmanager
+def span(name: str, kind: int = SPAN_KIND_INTERNAL, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Times a block as a child of the current span; spans opened inside are its children.
+
+    Args:
+        name (str): The name of the operation.
+        kind (int): The OTLP span kind.
+        **attributes (Any): The attributes describing the operation.
+
+    Yields:
+        Optional[Span]: The open span, or None outside of a trace.
+    """
+    opened = start_span(name, kind, attributes)
+    if opened is None:
+        yield None
+        return
+    token = _current_span.set(opened)
+    try:
+        yield opened
+    except BaseException as exc:
+        end_span(opened, exc)
+        raise
+    else:
+        end_span(opened)
+    finally:
+        _current_span.reset(token)
+
+def traced(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    Builds a decorator that times every call of a function, sync or async, as a span.
+
+    Args:
+        name (Optional[str]): The name of the spans, the qualified name of the function by
+        default.
+
+    Returns:
+        Callable[[Callable], Callable]: The decorator.
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _current_trace.get() is None:
+                    return await func(*args, **kwargs)
+                with span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_trace.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+class OTLPJsonExporter:
+    """
+    Writes traces as OTLP/JSON lines to a file, or to standard output.
+
+    Attributes:
+        path (str): The file the traces are appended to, or '-' for standard output.
+        service_name (str): The service.name resource attribute of the traces.
+    """
+    def __init__(self, path: str, service_name: str):
+        self.path = path
+        self.service_name = service_name
+        self._lock = threading.Lock()
+
+    def export(self, trace: Trace) -> None:
+        """
+        Appends one trace as a line of OTLP/JSON. This blocks, so call it from a thread.
+
+        Args:
+            trace (Trace): The finished trace.
+        """
+        line = orjson.dumps(self.encode(trace)) + b'\n'
+        with self._lock:
+            if self.path == '-':
+                sys.stdout.buffer.write(line)
+                sys.stdout.buffer.flush()
+                return
+            with open(self.path, 'ab') as file:
+                file.write(line)
+
+    def encode(self, trace: Trace) -> dict:
+        """
+        Builds the OTLP ExportTraceServiceRequest of a trace.
+
+        Args:
+            trace (Trace): The finished trace.
+
+        Returns:
+            dict: The request, ready to be serialized as JSON.
+        """
+        spans = []
+        for recorded in trace.spans:
+            encoded = {
+                'traceId': recorded.trace_id,
+                'spanId': recorded.span_id,
+                'name': recorded.name,
+                'kind': recorded.kind,
+                'startTimeUnixNano': str(recorded.start_ns),
+                'endTimeUnixNano': str(recorded.end_ns or recorded.start_ns),
+                'attributes': _encode_attributes(recorded.attributes),
+            }
+            if recorded.parent_span_id is not None:
+                encoded['parentSpanId'] = recorded.parent_span_id
+            if recorded is trace.root and trace.dropped_spans:
+                encoded['attributes'].extend(_encode_attributes(
+                    {'trace.dropped_spans': trace.dropped_spans}))
+            if recorded.error is not None:
+                encoded['status'] = {'code': STATUS_CODE_ERROR, 'message': recorded.error}
+            spans.append(encoded)
+
+        return {'resourceSpans': [{
+            'resource': {'attributes': _encode_attributes({'service.name': self.service_name})},
+            'scopeSpans': [{'scope': {'name': __name__}, 'spans': spans}],
+        }]}
+
+def _encode_attributes(attributes: dict[str, Any]) -> list[dict]:
+    """
+    Encodes attributes as OTLP key-value pairs.
+    """
+    encoded = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            typed = {'boolValue': value}
+        elif isinstance(value, int):
+            typed = {'intValue': str(value)}
+        elif isinstance(value, float):
+            typed = {'doubleValue': value}
+        else:
+            typed = {'stringValue': str(value)}
+        encoded.append({'key': key, 'value': typed})
+    return encoded
+
+class Tracer:
+    """
+    Starts one trace per request and exports the finished traces worth keeping.
+
+    Tail sampling keeps a trace when its root span lasted at least slow_threshold_ms, and
+    discards every other trace once finished. Since the decision is taken at the end, every
+    request records its spans; max_spans bounds the memory of the largest ones.
+
+    Attributes:
+        exporter (OTLPJsonExporter): Where kept traces are written.
+        slow_threshold_ms (float): The duration from which a trace is kept.
+        max_spans (int): The maximum number of spans recorded per trace.
+    """
+    def __init__(self, exporter: OTLPJsonExporter, slow_threshold_ms: float, max_spans: int):
+        self.exporter = exporter
+        self.slow_threshold_ms = slow_threshold_ms
+        self.max_spans = max_spans
+
+    def start_trace(self, name: str, trace_id: Optional[str] = None,
+                    parent_span_id: Optional[str] = None, **attributes: Any) -> Trace:
+        """
+        Starts the trace of a request in the current context, with its root span as the
+        current span.
+
+        Args:
+            name (str): The name of the root span.
+            trace_id (Optional[str]): The trace identifier propagated by the caller, or None
+            to generate one.
+            parent_span_id (Optional[str]): The caller span, when propagated.
+            **attributes (Any): The attributes of the root span.
+
+        Returns:
+            Trace: The new trace.
+        """
+        trace_id = trace_id or os.urandom(16).hex()
+        root = Span(name, SPAN_KIND_SERVER, trace_id, parent_span_id, attributes)
+        trace = Trace(trace_id, root, self.max_spans)
+        _current_trace.set(trace)
+        _current_span.set(root)
+        return trace
+
+    def finish_trace(self, trace: Trace, error: Optional[BaseException] = None) -> bool:
+        """
+        Ends the root span of a trace and decides whether the trace is kept.
+
+        Args:
+            trace (Trace): The trace of the finished request.
+            error (Optional[BaseException]): The exception that ended the request, if any.
+
+        Returns:
+            bool: True if the trace must be exported.
+        """
+        end_span(trace.root, error)
+        _current_trace.set(None)
+        _current_span.set(None)
+        return trace.root.duration_ms >= self.slow_threshold_ms
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Times every SQL statement run by an engine as a client span of the current trace.
+    Instrumenting the same engine twice has no effect.
+
+    Args:
+        engine (AsyncEngine): The engine to instrument.
+    """
+    for identifier, listener in SQL_LISTENERS.items():
+        if not event.contains(engine.sync_engine, identifier, listener):
+            event.listen(engine.sync_engine, identifier, listener)
+
+def _before_cursor_execute(connection, _cursor, statement, _parameters, _context,
+                           executemany) -> None:
+    opened = start_span(statement.split(None, 1)[0].upper() if statement else 'SQL',
+                        SPAN_KIND_CLIENT,
+                        {'db.system': 'postgresql',
+                         'db.statement': statement[:MAX_STATEMENT_LENGTH],
+                         'db.executemany': executemany})
+    connection.info.setdefault('trace_spans', []).append(opened)
+
+def _after_cursor_execute(connection, _cursor, _statement, _parameters, _context,
+                          _executemany) -> None:
+    spans = connection.info.get('trace_spans')
+    if spans:
+        end_span(spans.pop())
+
+def _handle_error(exception_context) -> None:
+    connection = exception_context.connection
+    spans = connection.info.get('trace_spans') if connection is not None else None
+    if spans:
+        end_span(spans.pop(), exception_context.original_exception)
+
+SQL_LISTENERS = {
+    'before_cursor_execute': _before_cursor_execute,
+    'after_cursor_execute': _after_cursor_execute,
+    'handle_error': _handle_error,
+}
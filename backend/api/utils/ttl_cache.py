@@ -0,0 +1,74 @@
+"""
+This module provides a small in-process cache whose entries expire after a time to live,
+used to serve repeated expensive reads from memory. Each worker process has its own cache,
+so an entry may be served up to its time to live after the data it was built from changed.
+
+Available Classes:
+- TTLCache(max_entries: int): A bounded mapping of keys to values that expire.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+class TTLCache:
+    """
+    A bounded cache of values that expire after a per-entry time to live.
+
+    Entries are kept in least recently used order; once max_entries is reached, adding an
+    entry evicts the least recently used one. Expired entries are dropped when read.
+
+    Attributes:
+        max_entries (int): The maximum number of entries kept.
+        hits (int): The number of reads answered from the cache.
+        misses (int): The number of reads of a missing or expired entry.
+    """
+    def __init__(self, max_entries: int):
+        if max_entries <= 0:
+            raise ValueError('The cache must hold at least one entry.')
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Reads an entry that has not expired yet.
+
+        Args:
+            key (Hashable): The key of the entry.
+
+        Returns:
+            Optional[Any]: The cached value, or None if it is missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """
+        Stores an entry for ttl seconds, evicting the least recently used one if full.
+
+        Args:
+            key (Hashable): The key of the entry.
+            value (Any): The value to cache.
+            ttl (float): The time to live of the entry, in seconds.
+        """
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Drops every entry.
+        """
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,172 @@
+"""
+This benchmark measures the catalog search of products on a large catalog.
+
+Scratch sellers and their products are inserted inside a transaction that is rolled back at
+the end, so the database is left untouched: one million products by default, a thousand per
+seller, named from a vocabulary of accented Portuguese words like a grocery catalog. The
+searches are run through ProductService.search_products, as the endpoint runs them, for
+random sellers and typed prefixes of one and two words, without accents. The benchmark
+reports the latency percentiles of each kind of search and the shared buffers it touches.
+
+Usage:
+    python -m benchmarks.catalog_search --sellers 1000 --products 1000 --samples 2000
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from api.modules.products.services.product_service import ProductService
+from api.shared.database.catalog_search import (SEARCH_CONFIG, build_prefix_query,
+                                                search_words)
+from api.shared.database.connection import engine
+from benchmarks.seller_layout import seed_sellers
+
+NOUNS = ['pão', 'café', 'açúcar', 'feijão', 'arroz', 'leite', 'queijo', 'maçã', 'limão',
+         'farinha', 'óleo', 'sabão', 'biscoito', 'macarrão', 'manteiga', 'iogurte', 'suco',
+         'refrigerante', 'água', 'chocolate', 'pimentão', 'melão', 'salsicha', 'presunto']
+QUALIFIERS = ['francês', 'integral', 'orgânico', 'light', 'tradicional', 'temperado',
+              'refinado', 'cristal', 'diet', 'zero', 'com gás', 'sem lactose', 'caseiro',
+              'da fazenda', 'maduro', 'congelado']
+BRANDS = ['Sol', 'Brasília', 'Aurora', 'Paraná', 'Boa Vista', 'São Jorge', 'Ipê', 'Jaú']
+SIZES = ['200g', '500g', '1kg', '2kg', '350ml', '1l', '2l', 'unidade']
+
+# The typed searches, without accents, as cashiers type them.
+SEARCHES = {
+    'one prefix': lambda: random.choice(NOUNS)[:3],
+    'one word': lambda: random.choice(NOUNS),
+    'two prefixes': lambda: f'{random.choice(NOUNS)[:4]} {random.choice(QUALIFIERS)[:3]}',
+}
+
+def unaccented(word: str) -> str:
+    """
+    Removes the accents of a word, as typed on a keyboard without them.
+    """
+    return word.translate(str.maketrans('ãáâçéêíóôõú', 'aaaceeiooou'))
+
+async def seed(connection: AsyncConnection, sellers: int, products: int) -> None:
+    """
+    Inserts the scratch sellers and, for each one, products with random names built from
+    the vocabulary.
+    """
+    await seed_sellers(connection, sellers)
+    await connection.execute(text(
+        'WITH words AS (SELECT CAST(:nouns AS text[]) AS nouns, '
+        'CAST(:qualifiers AS text[]) AS qualifiers, CAST(:brands AS text[]) AS brands, '
+        'CAST(:sizes AS text[]) AS sizes) '
+        'INSERT INTO products (id, seller_id, name, price, quantity, date_created) '
+        'SELECT uuid_generate_v7(), s.id, '
+        'concat_ws(\' \', nouns[1 + floor(random() * cardinality(nouns))], '
+        'qualifiers[1 + floor(random() * cardinality(qualifiers))], '
+        'brands[1 + floor(random() * cardinality(brands))], '
+        'sizes[1 + floor(random() * cardinality(sizes))]), 1 + n, 100, now() '
+        'FROM generate_series(1, :products) AS n CROSS JOIN bench_sellers AS s '
+        'CROSS JOIN words ORDER BY n'),
+        {'products': products, 'nouns': NOUNS, 'qualifiers': QUALIFIERS, 'brands': BRANDS,
+         'sizes': SIZES})
+    await connection.execute(text('ANALYZE users'))
+    await connection.execute(text('ANALYZE products'))
+
+async def mean_buffers(connection: AsyncConnection, seller_ids: list, typed,
+                       limit: int) -> float:
+    """
+    Returns the mean shared buffers touched by the search query for a sample of searches.
+    """
+    buffers = []
+    for _ in range(50):
+        words = search_words(unaccented(typed()))
+        plan = await connection.scalar(text(
+            'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) '
+            'SELECT id FROM products WHERE seller_id = :seller_id '
+            'AND catalog_seller_terms(seller_id, search_vector) '
+            '@@ catalog_seller_query(:seller_id, :words) '
+            f"ORDER BY ts_rank(search_vector, to_tsquery('{SEARCH_CONFIG}', "
+            'catalog_unaccent(:query))) DESC, name, id LIMIT :limit'),
+            {'seller_id': random.choice(seller_ids), 'limit': limit,
+             'words': ' '.join(words), 'query': build_prefix_query(words)})
+        node = plan[0]['Plan']
+        buffers.append(node['Shared Hit Blocks'] + node['Shared Read Blocks'])
+    return statistics.mean(buffers)
+
+async def measure(connection: AsyncConnection, samples: int, limit: int) -> list[dict]:
+    """
+    Runs every kind of search for random scratch sellers and collects its latencies and
+    buffers.
+    """
+    seller_ids = (await connection.execute(text('SELECT id FROM bench_sellers'))).scalars().all()
+    product_service = ProductService(AsyncSession(bind=connection))
+    results = []
+    for name, typed in SEARCHES.items():
+        latencies, found = [], []
+        for _ in range(samples):
+            search = unaccented(typed())
+            started = time.perf_counter()
+            page = await product_service.search_products(random.choice(seller_ids), search,
+                                                         limit)
+            latencies.append((time.perf_counter() - started) * 1000)
+            found.append(len(page.items))
+        percentiles = statistics.quantiles(latencies, n=100)
+        results.append({'search': name, 'p50': percentiles[49], 'p99': percentiles[98],
+                        'found': statistics.mean(found),
+                        'buffers': await mean_buffers(connection, seller_ids, typed, limit)})
+    return results
+
+async def run_benchmark(sellers: int, products: int, samples: int, limit: int) -> list[dict]:
+    """
+    Seeds the scratch catalogs and measures the searches, then rolls everything back.
+
+    Args:
+        sellers (int): The number of scratch sellers.
+        products (int): The number of products of each seller.
+        samples (int): The number of timed searches of each kind.
+        limit (int): The maximum number of products of each search.
+
+    Returns:
+        list[dict]: The p50 and p99 latencies, in milliseconds, the mean number of products
+        found and the mean shared buffers of each kind of search.
+    """
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        try:
+            started = time.perf_counter()
+            await seed(connection, sellers, products)
+            print(f'Seeded {sellers * products} products of {sellers} sellers in '
+                  f'{time.perf_counter() - started:.1f}s')
+            results = [{'state': 'pending list', **result}
+                       for result in await measure(connection, samples, limit)]
+            await connection.execute(text(
+                "SELECT gin_clean_pending_list('ix_products_search_terms')"))
+            return results + [{'state': 'flushed', **result}
+                              for result in await measure(connection, samples, limit)]
+        finally:
+            await transaction.rollback()
+
+async def main() -> None:
+    """
+    Runs the benchmark and prints its results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sellers', type=int, default=1000)
+    parser.add_argument('--products', type=int, default=1000)
+    parser.add_argument('--samples', type=int, default=2000)
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    try:
+        results = await run_benchmark(args.sellers, args.products, args.samples, args.limit)
+    finally:
+        await engine.dispose()
+
+    print(f"{'index':<13} {'search':<13} {'p50 ms':>8} {'p99 ms':>8} {'found':>6} "
+          f"{'buffers':>8}")
+    for result in results:
+        print(f"{result['state']:<13} {result['search']:<13} {result['p50']:>8.3f} "
+              f"{result['p99']:>8.3f} {result['found']:>6.1f} {result['buffers']:>8.1f}")
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,132 @@
+"""
+This benchmark measures the live feed of the sellers with thousands of idle subscribers.
+
+A SellerFeed listening on the seller_feed channel through a real connection holds the idle
+subscribers, spread over many sellers like open dashboards, plus one active subscriber of a
+separate seller. The benchmark reports:
+
+- memory: the memory allocated per subscriber, its subscription and queue, as traced by
+  tracemalloc. The socket and the request task of an SSE or WebSocket client come on top.
+- latency: the time from each pg_notify, sent by another connection on its own commit, to
+  its delivery to the active subscriber, with the idle subscribers in place.
+- fan-out: the time publish takes to queue one notification for every subscriber of a
+  single seller, the worst case being all the idle subscribers on that seller.
+
+No table is written: the notifications are sent with pg_notify directly.
+
+Usage:
+    python -m benchmarks.feed_subscribers --subscribers 5000 --sellers 1000 --events 1000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+import uuid
+from contextlib import AsyncExitStack
+
+import asyncpg
+import orjson
+
+from api.modules.feed.services.seller_feed import SellerFeed
+from api.shared.database.connection import ASYNCPG_DATABASE_URL
+from api.shared.database.feed_notifications import FEED_CHANNEL
+
+def percentile(values: list[float], fraction: float) -> float:
+    """
+    Returns the value below which the given fraction of the values lies.
+    """
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+async def measure_latency(feed: SellerFeed, events: int) -> list[float]:
+    """
+    Sends notifications to one active subscriber and measures their delivery.
+
+    Args:
+        feed (SellerFeed): The running feed.
+        events (int): The number of notifications.
+
+    Returns:
+        list[float]: The delivery time of each notification, in milliseconds.
+    """
+    seller_id = str(uuid.uuid4())
+    latencies = []
+    sender = await asyncpg.connect(ASYNCPG_DATABASE_URL)
+    try:
+        async with feed.subscribe(seller_id) as subscription:
+            received = subscription.events(heartbeat=5)
+            for index in range(events):
+                sent = time.perf_counter()
+                await sender.execute('SELECT pg_notify($1, $2)', FEED_CHANNEL, orjson.dumps(
+                    {'type': 'stock', 'seller_id': seller_id, 'index': index}).decode())
+                payload = await asyncio.wait_for(anext(received), 5)
+                latencies.append((time.perf_counter() - sent) * 1000)
+                assert payload is not None and orjson.loads(payload)['index'] == index
+            await received.aclose()
+    finally:
+        await sender.close()
+    return latencies
+
+async def measure_fan_out(feed: SellerFeed, subscribers: int) -> float:
+    """
+    Measures the time publish takes for a seller with every subscriber.
+
+    Args:
+        feed (SellerFeed): The feed, with no other subscriber.
+        subscribers (int): The number of subscribers of the seller.
+
+    Returns:
+        float: The time of one publish, in milliseconds.
+    """
+    seller_id = str(uuid.uuid4())
+    payload = orjson.dumps({'type': 'stock', 'seller_id': seller_id}).decode()
+    async with AsyncExitStack() as stack:
+        for _ in range(subscribers):
+            await stack.enter_async_context(feed.subscribe(seller_id))
+        started = time.perf_counter()
+        feed.publish(payload)
+        return (time.perf_counter() - started) * 1000
+
+async def main() -> None:
+    """
+    Runs the benchmark and prints its results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--subscribers', type=int, default=5000)
+    parser.add_argument('--sellers', type=int, default=1000)
+    parser.add_argument('--events', type=int, default=1000)
+    parser.add_argument('--queue-size', type=int, default=100)
+    args = parser.parse_args()
+
+    feed = SellerFeed(args.queue_size, check_interval_ms=5000)
+    await feed.start()
+    if not feed.running:
+        raise SystemExit('The seller feed could not start.')
+    sellers = [str(uuid.uuid4()) for _ in range(args.sellers)]
+    try:
+        async with AsyncExitStack() as stack:
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+            for index in range(args.subscribers):
+                await stack.enter_async_context(feed.subscribe(sellers[index % args.sellers]))
+            after = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+            print(f'{args.subscribers} idle subscribers of {args.sellers} sellers: '
+                  f'{allocated / args.subscribers / 1024:.2f} KiB per subscriber')
+
+            latencies = await measure_latency(feed, args.events)
+            print(f'NOTIFY to delivery over {args.events} events: '
+                  f'p50 {statistics.median(latencies):.2f} ms, '
+                  f'p99 {percentile(latencies, 0.99):.2f} ms, max {max(latencies):.2f} ms')
+
+        fan_out = await measure_fan_out(feed, args.subscribers)
+        print(f'Fan-out of one notification to {args.subscribers} subscribers of one '
+              f'seller: {fan_out:.2f} ms')
+    finally:
+        await feed.stop()
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,111 @@
+"""
+This benchmark compares the ORM and Core read paths used to list users.
+
+It inserts scratch users inside a transaction that is rolled back at the end, then reads
+them back through each path and reports the rows per second and the memory allocated per
+row, measured with tracemalloc:
+
+- orm: User instances from AsyncSession, each validated with UserResponse.model_validate.
+- orm-adapter: the same User instances validated in bulk with the list TypeAdapter.
+- core: UserReadService.list_users, Core rows validated in bulk with the list TypeAdapter.
+
+Usage:
+    python -m benchmarks.read_paths --rows 50000 --repeat 3
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+from datetime import date
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.modules.users.models.User import User
+from api.modules.users.schemas.user_schema import UserResponse
+from api.modules.users.services.user_read_service import USER_LIST_ADAPTER, UserReadService
+from api.shared.database.connection import engine
+
+async def read_orm(session: AsyncSession, rows: int) -> int:
+    """
+    Reads users as ORM instances and validates them one by one.
+    """
+    users = (await session.scalars(select(User).order_by(User.id).limit(rows))).all()
+    responses = [UserResponse.model_validate(user) for user in users]
+    session.expunge_all()
+    return len(responses)
+
+async def read_orm_adapter(session: AsyncSession, rows: int) -> int:
+    """
+    Reads users as ORM instances and validates them with a single TypeAdapter call.
+    """
+    users = (await session.scalars(select(User).order_by(User.id).limit(rows))).all()
+    responses = USER_LIST_ADAPTER.validate_python(users, from_attributes=True)
+    session.expunge_all()
+    return len(responses)
+
+async def read_core(session: AsyncSession, rows: int) -> int:
+    """
+    Reads users through the Core fast path of UserReadService.
+    """
+    page = await UserReadService(session).list_users(rows)
+    return len(page.items)
+
+READ_PATHS = {'orm': read_orm, 'orm-adapter': read_orm_adapter, 'core': read_core}
+
+async def run_benchmark(rows: int, repeat: int) -> list[dict]:
+    """
+    Inserts scratch users and measures every read path on them.
+
+    Args:
+        rows (int): The number of users to insert and read.
+        repeat (int): The number of timed reads per path; the best one is reported.
+
+    Returns:
+        list[dict]: The throughput and memory per row of each path.
+    """
+    results = []
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        try:
+            await connection.execute(insert(User), [
+                {'email': f'bench{index}@example.com', 'cpf_cnpj': f'{index:014d}',
+                 'whatsapp': f'{index:014d}', 'name': f'Bench User {index}',
+                 'password': 'hash', 'sex': 'O', 'date_birthday': date(1990, 1, 1)}
+                for index in range(rows)])
+            for name, read in READ_PATHS.items():
+                async with AsyncSession(bind=connection) as session:
+                    best = float('inf')
+                    for _ in range(repeat):
+                        started = time.perf_counter()
+                        count = await read(session, rows)
+                        best = min(best, time.perf_counter() - started)
+                    tracemalloc.start()
+                    await read(session, rows)
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+                results.append({'path': name, 'rows': count, 'rows_per_second': count / best,
+                                'bytes_per_row': peak / count})
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+    return results
+
+async def main() -> None:
+    """
+    Runs the benchmark and prints a comparison.
+    """
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=50_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'path':<12} {'rows':>10} {'rows/s':>12} {'peak bytes/row':>15}")
+    for result in await run_benchmark(args.rows, args.repeat):
+        print(f"{result['path']:<12} {result['rows']:>10} {result['rows_per_second']:>12.0f} "
+              f"{result['bytes_per_row']:>15.0f}")
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,203 @@
+"""
+This benchmark measures the queries of one seller among many, under three layouts of the
+seller-owned tables:
+
+- shared: tables keyed by id alone, with a plain index on seller_id, the layout of a table
+  shared by every seller.
+- seller-leading: the composite (seller_id, ...) primary keys and seller-leading indexes of
+  the models.
+- partitioned: the seller-leading layout, hash partitioned by seller_id.
+
+Each layout is built and seeded with scratch sellers inside a transaction that is rolled
+back at the end, so the database is left untouched. The rows of all sellers are inserted
+interleaved, as real traffic writes them. The benchmark reports the latency percentiles of
+every query for random sellers, and the shared buffers each one touches.
+
+Usage:
+    python -m benchmarks.seller_layout --sellers 10000 --products 20 --samples 2000
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from api.shared.database.connection import engine
+from api.shared.database.seller_partitions import partition_by_seller
+
+# The tables of the seller-owned rows the queries read, in foreign key order.
+TABLES = ['customers', 'products', 'sales', 'sale_items']
+
+QUERIES = {
+    'product page': 'SELECT id, name, price, quantity FROM products '
+                    'WHERE seller_id = :seller_id ORDER BY id LIMIT 50',
+    'product get': 'SELECT id, name, price, quantity FROM products '
+                   'WHERE seller_id = :seller_id AND id = :product_id',
+    'debtors': 'SELECT id, name, balance FROM customers WHERE seller_id = :seller_id '
+               'AND balance > 0 ORDER BY balance DESC, id LIMIT 20',
+    'recent sales': 'SELECT id, total FROM sales WHERE seller_id = :seller_id '
+                    "AND date_created >= now() - interval '30 days' "
+                    'ORDER BY date_created DESC LIMIT 50',
+    'sale items': 'SELECT product_id, quantity, unit_price FROM sale_items '
+                  'WHERE seller_id = :seller_id AND sale_id = :sale_id',
+}
+
+async def use_shared_layout(connection: AsyncConnection) -> None:
+    """
+    Replaces the seller-leading keys and indexes with id keys and a seller_id index.
+    """
+    for table in TABLES:
+        indexes = (await connection.execute(text(
+            'SELECT CAST(indexrelid AS regclass) FROM pg_index '
+            'WHERE indrelid = CAST(:table AS regclass) AND NOT indisprimary'),
+            {'table': table})).scalars().all()
+        for index in indexes:
+            await connection.execute(text(f'DROP INDEX {index}'))
+        key = 'sale_id, product_id' if table == 'sale_items' else 'id'
+        await connection.execute(text(f'ALTER TABLE {table} DROP CONSTRAINT {table}_pkey CASCADE'))
+        await connection.execute(text(f'ALTER TABLE {table} ADD PRIMARY KEY ({key})'))
+        await connection.execute(text(f'CREATE INDEX ON {table} (seller_id)'))
+
+async def use_partitioned_layout(connection: AsyncConnection, partitions: int) -> None:
+    """
+    Partitions the tables by seller.
+    """
+    for table in TABLES:
+        await partition_by_seller(connection, table, partitions)
+
+async def seed_sellers(connection: AsyncConnection, sellers: int) -> None:
+    """
+    Inserts the scratch sellers and lists them in the bench_sellers temporary table, dropped
+    with the transaction.
+    """
+    await connection.execute(text(
+        'INSERT INTO users (id, email, cpf_cnpj, whatsapp, name, password, sex, '
+        'date_birthday, date_created, status) '
+        "SELECT uuid_generate_v7(), 'bench' || n || '@example.com', '8' || lpad(n::text, 13, '0'), "
+        "'8' || lpad(n::text, 13, '0'), 'Bench Seller ' || n, 'hash', 'O', '1990-01-01', now(), 1 "
+        'FROM generate_series(1, :sellers) AS n'), {'sellers': sellers})
+    await connection.execute(text(
+        "CREATE TEMPORARY TABLE bench_sellers ON COMMIT DROP AS SELECT id FROM users "
+        "WHERE email LIKE 'bench%@example.com'"))
+
+async def seed(connection: AsyncConnection, sellers: int, products: int) -> None:
+    """
+    Inserts the scratch sellers and, for each one, products, a quarter as many customers,
+    and as many sales of one item as products, spread over the last 90 days.
+    """
+    await seed_sellers(connection, sellers)
+    await connection.execute(text(
+        'INSERT INTO products (id, seller_id, name, price, quantity, date_created) '
+        "SELECT uuid_generate_v7(), s.id, 'Product ' || n, 1 + n, 100, now() "
+        'FROM generate_series(1, :products) AS n CROSS JOIN bench_sellers AS s ORDER BY n'),
+        {'products': products})
+    await connection.execute(text(
+        'INSERT INTO customers (id, seller_id, name, balance, date_created) '
+        "SELECT uuid_generate_v7(), s.id, 'Customer ' || n, "
+        'CASE WHEN n % 2 = 0 THEN n * 10 ELSE 0 END, now() '
+        'FROM generate_series(1, :customers) AS n CROSS JOIN bench_sellers AS s ORDER BY n'),
+        {'customers': max(products // 4, 1)})
+    await connection.execute(text(
+        'CREATE TEMPORARY TABLE bench_sales ON COMMIT DROP AS '
+        'SELECT uuid_generate_v7() AS id, p.seller_id, p.id AS product_id, p.price, '
+        "now() - random() * interval '90 days' AS date_created "
+        'FROM products AS p JOIN bench_sellers AS s ON s.id = p.seller_id ORDER BY p.id'))
+    await connection.execute(text(
+        'INSERT INTO sales (id, seller_id, total, debt, date_created) '
+        'SELECT id, seller_id, price, 0, date_created FROM bench_sales ORDER BY id'))
+    await connection.execute(text(
+        'INSERT INTO sale_items (seller_id, sale_id, product_id, quantity, unit_price) '
+        'SELECT seller_id, id, product_id, 1, price FROM bench_sales ORDER BY id'))
+    for table in ('users', *TABLES):
+        await connection.execute(text(f'ANALYZE {table}'))
+
+async def measure(connection: AsyncConnection, samples: int) -> list[dict]:
+    """
+    Runs every query for random scratch sellers and collects its latencies and buffers.
+    """
+    targets = (await connection.execute(text(
+        'SELECT DISTINCT ON (s.seller_id) s.seller_id, i.product_id, s.id AS sale_id '
+        'FROM bench_sales AS s JOIN sale_items AS i '
+        'ON i.seller_id = s.seller_id AND i.sale_id = s.id ORDER BY s.seller_id'))).all()
+    results = []
+    for name, sql in QUERIES.items():
+        statement = text(sql)
+        latencies = []
+        for _ in range(samples):
+            target = random.choice(targets)
+            started = time.perf_counter()
+            (await connection.execute(statement, target._asdict())).all()
+            latencies.append((time.perf_counter() - started) * 1000)
+        buffers = []
+        for target in random.sample(targets, min(50, len(targets))):
+            plan = await connection.scalar(
+                text(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}'), target._asdict())
+            node = plan[0]['Plan']
+            buffers.append(node['Shared Hit Blocks'] + node['Shared Read Blocks'])
+        percentiles = statistics.quantiles(latencies, n=100)
+        results.append({'query': name, 'p50': percentiles[49], 'p99': percentiles[98],
+                        'buffers': statistics.mean(buffers)})
+    return results
+
+async def run_benchmark(layout: str, sellers: int, products: int, samples: int,
+                        partitions: int) -> list[dict]:
+    """
+    Builds a layout, seeds it and measures the queries, then rolls everything back.
+
+    Args:
+        layout (str): 'shared', 'seller-leading' or 'partitioned'.
+        sellers (int): The number of scratch sellers.
+        products (int): The number of products, and sales, of each seller.
+        samples (int): The number of timed executions of each query.
+        partitions (int): The number of partitions of the partitioned layout.
+
+    Returns:
+        list[dict]: The p50 and p99 latencies, in milliseconds, and the mean shared buffers
+        of each query.
+    """
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        try:
+            if layout == 'shared':
+                await use_shared_layout(connection)
+            elif layout == 'partitioned':
+                await use_partitioned_layout(connection, partitions)
+            started = time.perf_counter()
+            await seed(connection, sellers, products)
+            print(f'{layout}: seeded {sellers} sellers in '
+                  f'{time.perf_counter() - started:.1f}s')
+            return await measure(connection, samples)
+        finally:
+            await transaction.rollback()
+
+async def main() -> None:
+    """
+    Runs the benchmark for every layout and prints a comparison.
+    """
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sellers', type=int, default=10_000)
+    parser.add_argument('--products', type=int, default=20)
+    parser.add_argument('--samples', type=int, default=2000)
+    parser.add_argument('--partitions', type=int, default=16)
+    args = parser.parse_args()
+
+    rows = []
+    try:
+        for layout in ('shared', 'seller-leading', 'partitioned'):
+            for result in await run_benchmark(layout, args.sellers, args.products,
+                                              args.samples, args.partitions):
+                rows.append((layout, result))
+    finally:
+        await engine.dispose()
+
+    print(f"{'layout':<15} {'query':<13} {'p50 ms':>8} {'p99 ms':>8} {'buffers':>8}")
+    for layout, result in rows:
+        print(f"{layout:<15} {result['query']:<13} {result['p50']:>8.3f} "
+              f"{result['p99']:>8.3f} {result['buffers']:>8.1f}")
+
+if __name__ == '__main__':
+    asyncio.run(main())
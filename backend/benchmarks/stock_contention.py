@@ -0,0 +1,134 @@
+"""
+This benchmark measures stock decrements of a single product under contention.
+
+Many concurrent workers sell one unit at a time of the same scratch product, with a demand
+20% above its stock, through one of two strategies. The benchmark reports the throughput
+and the lost updates, the units sold that were never taken out of the stock:
+
+- atomic: the conditional UPDATE ... WHERE quantity >= :n RETURNING statement used by
+  ProductService.decrement_stock.
+- naive: a SELECT of the quantity followed by an UPDATE writing the value computed in
+  Python, the read-modify-write race the atomic statement avoids.
+
+The scratch seller and product are deleted at the end.
+
+Usage:
+    python -m benchmarks.stock_contention --workers 100 --stock 10000 --pool-size 50
+"""
+import argparse
+import asyncio
+import math
+import time
+from datetime import date
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+import api.app # pylint: disable=unused-import
+from api.modules.products.models.Product import Product
+from api.modules.products.services.product_service import build_stock_decrement
+from api.modules.users.models.User import User
+from api.shared.database.connection import DATABASE_URL
+
+async def sell_atomic(engine: AsyncEngine, seller_id, product_id) -> bool:
+    """
+    Sells one unit with the conditional UPDATE statement.
+    """
+    async with engine.begin() as connection:
+        result = await connection.execute(
+            build_stock_decrement(seller_id, 1).where(Product.__table__.c.id == product_id))
+        return result.one_or_none() is not None
+
+async def sell_naive(engine: AsyncEngine, seller_id, product_id) -> bool:
+    """
+    Sells one unit by reading the quantity and writing it back minus one.
+    """
+    table = Product.__table__
+    async with engine.begin() as connection:
+        quantity = await connection.scalar(
+            select(table.c.quantity).where(table.c.seller_id == seller_id,
+                                           table.c.id == product_id))
+        if quantity < 1:
+            return False
+        await connection.execute(update(table).where(table.c.id == product_id)
+                                 .values(quantity=quantity - 1))
+        return True
+
+STRATEGIES = {'atomic': sell_atomic, 'naive': sell_naive}
+
+# The number of sale attempts, relative to the stock, so that both strategies run out of it.
+DEMAND = 1.2
+
+async def run_benchmark(engine: AsyncEngine, strategy: str, workers: int, stock: int) -> dict:
+    """
+    Sells a scratch product out with concurrent workers.
+
+    Args:
+        engine (AsyncEngine): The engine whose pool the workers share.
+        strategy (str): 'atomic' or 'naive'.
+        workers (int): The number of concurrent workers.
+        stock (int): The initial stock of the product.
+
+    Returns:
+        dict: The units sold, the final quantity, the lost updates, the elapsed time and the
+        number of sale attempts per second.
+    """
+    sell = STRATEGIES[strategy]
+    async with engine.begin() as connection:
+        seller_id = await connection.scalar(insert(User).values(
+            email=f'bench.{strategy}@example.com', cpf_cnpj='00000000000000',
+            whatsapp='00000000000000', name='Bench Seller', password='hash', sex='O',
+            date_birthday=date(1990, 1, 1)).returning(User.id))
+        product_id = await connection.scalar(insert(Product).values(
+            seller_id=seller_id, name='Bench product', price=1, quantity=stock
+        ).returning(Product.id))
+
+    attempts = math.ceil(stock * DEMAND / workers)
+
+    async def worker() -> int:
+        sold = 0
+        for _ in range(attempts):
+            sold += await sell(engine, seller_id, product_id)
+        return sold
+
+    try:
+        started = time.perf_counter()
+        sold = sum(await asyncio.gather(*(worker() for _ in range(workers))))
+        elapsed = time.perf_counter() - started
+        async with engine.connect() as connection:
+            quantity = await connection.scalar(
+                select(Product.quantity).where(Product.id == product_id))
+    finally:
+        async with engine.begin() as connection:
+            await connection.execute(delete(Product).where(Product.id == product_id))
+            await connection.execute(delete(User).where(User.id == seller_id))
+
+    return {'strategy': strategy, 'sold': sold, 'quantity': quantity,
+            'lost_updates': sold - (stock - quantity), 'seconds': elapsed,
+            'attempts_per_second': attempts * workers / elapsed}
+
+async def main() -> None:
+    """
+    Runs the benchmark for both strategies and prints a comparison.
+    """
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=100)
+    parser.add_argument('--stock', type=int, default=10_000)
+    parser.add_argument('--pool-size', type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_async_engine(DATABASE_URL, pool_size=args.pool_size, max_overflow=0)
+    print(f"{'strategy':<8} {'sold':>8} {'quantity':>9} {'lost updates':>13} {'seconds':>8} "
+          f"{'attempts/s':>11}")
+    try:
+        for strategy in STRATEGIES:
+            result = await run_benchmark(engine, strategy, args.workers, args.stock)
+            print(f"{result['strategy']:<8} {result['sold']:>8} {result['quantity']:>9} "
+                  f"{result['lost_updates']:>13} {result['seconds']:>8.1f} "
+                  f"{result['attempts_per_second']:>11.0f}")
+    finally:
+        await engine.dispose()
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+"""
+This benchmark compares random uuid4 and time-ordered UUIDv7 primary keys.
+
+It loads the same number of rows into two scratch tables that only differ by how their key
+is generated, and reports the insert throughput and the size of each primary key index.
+Random keys split pages all over the index, while UUIDv7 keys always land on its right edge.
+
+Usage:
+    python -m benchmarks.uuid_insert --rows 10000000 --batch-size 50000
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+import asyncpg
+
+from api.shared.database.connection import ASYNCPG_DATABASE_URL
+from api.utils.uuid7 import uuid7
+
+GENERATORS = {'uuid4': uuid.uuid4, 'uuid7': uuid7}
+
+async def run_benchmark(key_type: str, rows: int, batch_size: int) -> dict:
+    """
+    Inserts rows into a scratch table keyed by the given generator.
+
+    Args:
+        key_type (str): 'uuid4' or 'uuid7'.
+        rows (int): The number of rows to insert.
+        batch_size (int): The number of rows inserted and committed per batch.
+
+    Returns:
+        dict: The elapsed time, throughput and primary key index size.
+    """
+    generator = GENERATORS[key_type]
+    table = f'bench_users_{key_type}'
+    connection = await asyncpg.connect(ASYNCPG_DATABASE_URL)
+    try:
+        await connection.execute(f'DROP TABLE IF EXISTS {table}')
+        await connection.execute(f'CREATE UNLOGGED TABLE {table} '
+                                 '(id uuid PRIMARY KEY, date_created timestamptz NOT NULL '
+                                 'DEFAULT now())')
+        started = time.perf_counter()
+        for start in range(0, rows, batch_size):
+            count = min(batch_size, rows - start)
+            await connection.copy_records_to_table(
+                table, records=[(generator(),) for _ in range(count)], columns=['id'])
+        elapsed = time.perf_counter() - started
+        index_size = await connection.fetchval(
+            "SELECT pg_relation_size(indexrelid) FROM pg_index "
+            "WHERE indrelid = $1::regclass AND indisprimary", table)
+        await connection.execute(f'DROP TABLE {table}')
+    finally:
+        await connection.close()
+
+    return {'key_type': key_type, 'rows': rows, 'seconds': elapsed,
+            'rows_per_second': rows / elapsed, 'index_bytes': index_size}
+
+async def main() -> None:
+    """
+    Runs the benchmark for both key types and prints a comparison.
+    """
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--batch-size', type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(f"{'key':<6} {'rows':>12} {'seconds':>10} {'rows/s':>12} {'pk index MB':>12}")
+    for key_type in GENERATORS:
+        result = await run_benchmark(key_type, args.rows, args.batch_size)
+        print(f"{result['key_type']:<6} {result['rows']:>12} {result['seconds']:>10.1f} "
+              f"{result['rows_per_second']:>12.0f} {result['index_bytes'] / 2**20:>12.1f}")
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,56 @@
+"""
+This script moves the users that are not active and have been inactive for longer than
+ARCHIVE_INACTIVE_DAYS, with their profile photos, from the users table to the archive.
+Run it periodically, such as nightly from cron; it stops once no eligible user is left and
+can run while the application serves requests.
+
+Usage:
+    python -m scripts.archive_users
+    python -m scripts.archive_users --inactive-days 730 --batch-size 5000
+"""
+import argparse
+import asyncio
+import time
+
+# Registers every model, so users referenced by other modules are left in place.
+import api.app # pylint: disable=unused-import
+from api.modules.users.services.audit_writer import user_audit_writer
+from api.modules.users.services.user_archiver import UserArchiver
+from api.shared.configs.settings import settings
+from api.shared.database.connection import engine
+
+async def archive_users(archiver: UserArchiver) -> int:
+    """
+    Runs the archival job with the audit writer running alongside it.
+
+    Args:
+        archiver (UserArchiver): The configured archival job.
+
+    Returns:
+        int: The number of users archived.
+    """
+    await user_audit_writer.start()
+    try:
+        return await archiver.archive()
+    finally:
+        await user_audit_writer.stop()
+        await engine.dispose()
+
+def main() -> None:
+    """
+    Parses the command line and archives the eligible users.
+    """
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--inactive-days', type=int, default=settings.ARCHIVE_INACTIVE_DAYS)
+    parser.add_argument('--batch-size', type=int, default=settings.ARCHIVE_BATCH_SIZE)
+    parser.add_argument('--pause-ms', type=int, default=settings.ARCHIVE_BATCH_PAUSE_MS)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    archived = asyncio.run(archive_users(
+        UserArchiver(args.inactive_days, args.batch_size, args.pause_ms)))
+    print(f'Archived {archived} users in {time.perf_counter() - started:.1f}s.')
+
+if __name__ == '__main__':
+    main()
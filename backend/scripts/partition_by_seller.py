@@ -0,0 +1,58 @@
+"""
+This script converts seller-owned tables into tables hash partitioned by seller, one
+transaction per table. Each table is locked for the whole time its rows are copied, so run
+it during a maintenance window, with the application stopped. Tables are converted in the
+order given; a table that fails is left unchanged and the script stops.
+
+Usage:
+    python -m scripts.partition_by_seller --partitions 16 sales sale_items
+"""
+import argparse
+import asyncio
+import time
+
+import api.app # pylint: disable=unused-import
+from api.shared.database.connection import Base, engine
+from api.shared.database.seller_partitions import partition_by_seller
+
+# The tables led by seller_id in every unique constraint, the only ones that can be
+# partitioned by seller.
+SELLER_OWNED_TABLES = sorted(
+    table.name for table in Base.metadata.tables.values()
+    if table.primary_key.columns and table.primary_key.columns[0].name == 'seller_id')
+
+async def partition_tables(tables: list[str], partitions: int) -> None:
+    """
+    Partitions every table and releases the connection pool.
+
+    Args:
+        tables (list[str]): The tables to partition.
+        partitions (int): The number of partitions of each table.
+    """
+    try:
+        for table in tables:
+            started = time.perf_counter()
+            async with engine.begin() as connection:
+                copied = await partition_by_seller(connection, table, partitions)
+            print(f'Partitioned {table}: {copied} rows into {partitions} partitions in '
+                  f'{time.perf_counter() - started:.1f}s.')
+    finally:
+        await engine.dispose()
+
+def main() -> None:
+    """
+    Parses the command line and partitions the tables.
+    """
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--partitions', type=int, default=16)
+    parser.add_argument('tables', nargs='+', choices=SELLER_OWNED_TABLES)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(partition_tables(args.tables, args.partitions))
+    except ValueError as exc:
+        parser.exit(1, f'{exc}\n')
+
+if __name__ == '__main__':
+    main()
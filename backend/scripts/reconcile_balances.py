@@ -0,0 +1,54 @@
+"""
+This script re-derives the balance of every customer from their sales and payments, reports
+the balances that drifted and sets them back to the derived value. Run it periodically,
+such as nightly from cron; it can run while the application serves requests.
+
+Usage:
+    python -m scripts.reconcile_balances
+    python -m scripts.reconcile_balances --dry-run --batch-size 5000
+"""
+import argparse
+import asyncio
+import time
+
+from api.modules.customers.services.balance_reconciler import BalanceReconciler
+from api.shared.configs.settings import settings
+from api.shared.database.connection import engine
+
+async def reconcile_balances(reconciler: BalanceReconciler) -> tuple[int, list]:
+    """
+    Runs the reconciliation job and releases the connection pool.
+
+    Args:
+        reconciler (BalanceReconciler): The configured reconciliation job.
+
+    Returns:
+        tuple[int, list]: The number of customers checked and the drifted balances.
+    """
+    try:
+        return await reconciler.reconcile()
+    finally:
+        await engine.dispose()
+
+def main() -> None:
+    """
+    Parses the command line, reconciles the balances and prints the drifted ones.
+    """
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--batch-size', type=int, default=settings.RECONCILE_BATCH_SIZE)
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Only report the drifted balances, without fixing them.')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    checked, drifts = asyncio.run(reconcile_balances(
+        BalanceReconciler(args.batch_size, fix=not args.dry_run)))
+    for drift in drifts:
+        print(f'{drift.seller_id} {drift.customer_id} stored={drift.stored} '
+              f'derived={drift.derived}')
+    print(f"Checked {checked} customers in {time.perf_counter() - started:.1f}s, "
+          f"{len(drifts)} {'drifted' if args.dry_run else 'fixed'}.")
+
+if __name__ == '__main__':
+    main()
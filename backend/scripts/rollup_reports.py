@@ -0,0 +1,38 @@
+"""
+This script rolls the sales of every day closed since its last run up into the daily report
+tables. Run it periodically, such as every hour from cron; it only rolls up days it has not
+rolled up yet, and can run while the application serves requests.
+
+Usage:
+    python -m scripts.rollup_reports
+"""
+import asyncio
+import time
+
+# Registers every model, so the rollup tables can reference users and products.
+import api.app # pylint: disable=unused-import
+from api.modules.reports.services.report_rollup import report_rollup
+from api.shared.database.connection import engine
+
+async def rollup_reports() -> int:
+    """
+    Runs the rollup job and releases the connection pool.
+
+    Returns:
+        int: The number of days rolled up.
+    """
+    try:
+        return await report_rollup.refresh()
+    finally:
+        await engine.dispose()
+
+def main() -> None:
+    """
+    Rolls up the closed days.
+    """
+    started = time.perf_counter()
+    rolled = asyncio.run(rollup_reports())
+    print(f'Rolled up {rolled} days in {time.perf_counter() - started:.1f}s.')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+This script seeds the users table with realistic synthetic users for performance work.
+
+Rows are generated by SyntheticUserGenerator in worker processes, one chunk at a time, and
+each worker bulk-loads its chunks with the PostgreSQL COPY protocol through asyncpg. Every
+value passes the validators of the user schemas, and user number i can log in with the
+password seed_password(i % password_pool).
+
+Unique columns are derived from the global index of each user, so seeding more users into a
+table seeded before only requires the same seed and a --start past the existing users.
+
+Usage:
+    python -m scripts.seed_users --rows 5000000 --workers 8 --seed 42
+    python -m scripts.seed_users --rows 1000000 --start 5000000 --seed 42
+"""
+import argparse
+import asyncio
+import multiprocessing
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+import asyncpg
+
+from api.shared.database.connection import ASYNCPG_DATABASE_URL
+from api.utils.crypt_password import has_password
+from api.utils.synthetic_users import USER_COPY_COLUMNS, SyntheticUserGenerator, seed_password
+
+_generator: Optional[SyntheticUserGenerator] = None
+
+def _init_worker(seed: int, password_hashes: list[str], now: datetime) -> None:
+    """
+    Creates the generator of a worker process.
+    """
+    global _generator # pylint: disable=global-statement
+    _generator = SyntheticUserGenerator(seed, password_hashes, now)
+
+def _seed_chunk(chunk: tuple[int, int]) -> int:
+    """
+    Generates one chunk of users in a worker process and copies it into the users table.
+    """
+    start, count = chunk
+    rows = _generator.rows(start, count)
+
+    async def copy() -> None:
+        connection = await asyncpg.connect(ASYNCPG_DATABASE_URL)
+        try:
+            await connection.copy_records_to_table('users', records=rows,
+                                                   columns=USER_COPY_COLUMNS)
+        finally:
+            await connection.close()
+
+    asyncio.run(copy())
+    return count
+
+def seed_users(rows: int, start: int = 0, seed: int = 0, # pylint: disable=too-many-arguments
+               workers: int = 4, chunk_size: int = 50_000, password_pool: int = 16) -> float:
+    """
+    Seeds the users table with synthetic users.
+
+    Args:
+        rows (int): The number of users to insert.
+        start (int): The global index of the first user. Use the number of users seeded
+        before with the same seed to add more without collisions.
+        seed (int): The seed of the generated values.
+        workers (int): The number of worker processes.
+        chunk_size (int): The number of users generated and copied at once.
+        password_pool (int): The number of distinct passwords hashed with bcrypt.
+
+    Returns:
+        float: The elapsed time, in seconds.
+    """
+    started = time.perf_counter()
+    chunks = [(chunk_start, min(chunk_size, start + rows - chunk_start))
+              for chunk_start in range(start, start + rows, chunk_size)]
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(workers) as pool:
+        password_hashes = pool.map(has_password, map(seed_password, range(password_pool)))
+    with context.Pool(workers, initializer=_init_worker,
+                      initargs=(seed, password_hashes, datetime.now(timezone.utc))) as pool:
+        inserted = 0
+        for count in pool.imap_unordered(_seed_chunk, chunks):
+            inserted += count
+            print(f'{inserted}/{rows} users', flush=True)
+
+    return time.perf_counter() - started
+
+def main() -> None:
+    """
+    Parses the command line and seeds the users table.
+    """
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--start', type=int, default=0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count())
+    parser.add_argument('--chunk-size', type=int, default=50_000)
+    parser.add_argument('--password-pool', type=int, default=16)
+    args = parser.parse_args()
+
+    elapsed = seed_users(args.rows, args.start, args.seed, args.workers, args.chunk_size,
+                         args.password_pool)
+    print(f'Seeded {args.rows} users in {elapsed:.1f}s ({args.rows / elapsed:.0f} rows/s).')
+
+if __name__ == '__main__':
+    main()